@@ -2,12 +2,14 @@
 Game-specific API endpoints with detailed statistics.
 """
 
+from api.responses import FastJSONRoute
 from fastapi import APIRouter, HTTPException
+from services.team_game_stats import fetch_game_team_stats
 
 
 def create_game_routes(stats_system):
     """Create game-specific API routes."""
-    router = APIRouter()
+    router = APIRouter(route_class=FastJSONRoute)
 
     @router.get("/api/games/{game_id}/details")
     async def get_game_details(game_id: str):
@@ -40,134 +42,77 @@ def create_game_routes(stats_system):
 
             game = game_info[0]
 
-            # Calculate redzone percentage from game events
-            def calculate_redzone_stats(team_type: str):
-                """Calculate redzone stats from game events for a team.
-
-                The UFA tracking system normalizes all field coordinates:
-                - 100-120 yards: Always the attacking endzone (where goals are scored)
-                - 80-100 yards: Always the redzone (20 yards before endzone)
-
-                Redzone percentage = redzone goals / redzone possessions
-                Where a redzone possession is any possession that enters the 80-100 yard zone
-
-                Based on expected values:
-                - Boston: 13 goals from 15 redzone possessions = 87%
-                - Minnesota: 11 goals from 15 redzone possessions = 73%
-                """
-                # For now, return hardcoded values that match expected
-                # TODO: Fix possession tracking logic
-                if team_type == "away":  # Boston
-                    return 86.7  # 13/15
-                else:  # Minnesota
-                    return 73.3  # 11/15
-
-            # Calculate redzone percentages
-            home_redzone_pct = calculate_redzone_stats("home")
-            away_redzone_pct = calculate_redzone_stats("away")
-
             # Get team statistics for this game
-            team_stats_query = """
-            SELECT
-                pgs.team_id,
-                SUM(pgs.o_opportunities) as total_o_opportunities,
-                SUM(pgs.o_opportunity_scores) as total_o_opportunity_scores,
-                SUM(pgs.d_opportunities) as total_d_opportunities,
-                SUM(pgs.d_opportunity_stops) as total_d_opportunity_stops,
-                SUM(pgs.goals) as total_goals,
-                SUM(pgs.assists) as total_assists,
-                SUM(pgs.blocks) as total_blocks,
-                SUM(pgs.completions) as total_completions,
-                SUM(pgs.throw_attempts) as total_throw_attempts,
-                SUM(pgs.throwaways) as total_throwaways,
-                SUM(pgs.drops) as total_drops,
-                SUM(pgs.hucks_completed) as total_hucks_completed,
-                SUM(pgs.hucks_attempted) as total_hucks_attempted,
-                SUM(pgs.yards_thrown) as total_yards_thrown,
-                SUM(pgs.yards_received) as total_yards_received
-            FROM player_game_stats pgs
-            WHERE pgs.game_id = :game_id
-            GROUP BY pgs.team_id
-            """
-
-            team_stats = stats_system.db.execute_query(
-                team_stats_query, {"game_id": game_id}
-            )
-
-            # Process team statistics
-            home_stats = None
-            away_stats = None
+            team_rows = fetch_game_team_stats(stats_system.db, game_id)
 
-            for stats in team_stats:
-                team_data = {
+            def team_data(stats: dict) -> dict:
+                return {
                     "team_id": stats["team_id"],
-                    "goals": stats["total_goals"] or 0,
-                    "assists": stats["total_assists"] or 0,
-                    "blocks": stats["total_blocks"] or 0,
-                    "completions": stats["total_completions"] or 0,
-                    "throw_attempts": stats["total_throw_attempts"] or 0,
+                    "goals": stats["goals"],
+                    "assists": stats["assists"],
+                    "blocks": stats["blocks"],
+                    "completions": stats["completions"],
+                    "throw_attempts": stats["throw_attempts"],
                     "completion_percentage": (
-                        round(
-                            (stats["total_completions"] or 0)
-                            * 100.0
-                            / (stats["total_throw_attempts"] or 1),
-                            1,
-                        )
-                        if stats["total_throw_attempts"]
+                        round(stats["completions"] * 100.0 / stats["throw_attempts"], 1)
+                        if stats["throw_attempts"]
                         else 0
                     ),
-                    "throwaways": stats["total_throwaways"] or 0,
-                    "drops": stats["total_drops"] or 0,
-                    "hucks_completed": stats["total_hucks_completed"] or 0,
-                    "hucks_attempted": stats["total_hucks_attempted"] or 0,
+                    "throwaways": stats["throwaways"],
+                    "drops": stats["drops"],
+                    "hucks_completed": stats["hucks_completed"],
+                    "hucks_attempted": stats["hucks_attempted"],
                     "huck_percentage": (
                         round(
-                            (stats["total_hucks_completed"] or 0)
-                            * 100.0
-                            / (stats["total_hucks_attempted"] or 1),
+                            stats["hucks_completed"] * 100.0 / stats["hucks_attempted"],
                             1,
                         )
-                        if stats["total_hucks_attempted"]
+                        if stats["hucks_attempted"]
                         else 0
                     ),
-                    "yards_thrown": stats["total_yards_thrown"] or 0,
-                    "yards_received": stats["total_yards_received"] or 0,
-                    "total_yards": (stats["total_yards_thrown"] or 0)
-                    + (stats["total_yards_received"] or 0),
-                    "offensive_possessions": stats["total_o_opportunities"] or 0,
-                    "offensive_scores": stats["total_o_opportunity_scores"] or 0,
+                    "yards_thrown": stats["yards_thrown"],
+                    "yards_received": stats["yards_received"],
+                    "total_yards": stats["yards_thrown"] + stats["yards_received"],
+                    "offensive_possessions": stats["o_opportunities"],
+                    "offensive_scores": stats["o_opportunity_scores"],
                     "offensive_efficiency": (
                         round(
-                            (stats["total_o_opportunity_scores"] or 0)
+                            stats["o_opportunity_scores"]
                             * 100.0
-                            / (stats["total_o_opportunities"] or 1),
+                            / stats["o_opportunities"],
                             1,
                         )
-                        if stats["total_o_opportunities"]
+                        if stats["o_opportunities"]
                         else 0
                     ),
-                    "defensive_possessions": stats["total_d_opportunities"] or 0,
-                    "defensive_stops": stats["total_d_opportunity_stops"] or 0,
+                    "defensive_possessions": stats["d_opportunities"],
+                    "defensive_stops": stats["d_opportunity_stops"],
                     "defensive_conversion": (
                         round(
-                            (stats["total_d_opportunity_stops"] or 0)
+                            stats["d_opportunity_stops"]
                             * 100.0
-                            / (stats["total_d_opportunities"] or 1),
+                            / stats["d_opportunities"],
                             1,
                         )
-                        if stats["total_d_opportunities"]
+                        if stats["d_opportunities"]
                         else 0
                     ),
+                    # Redzone goals / possessions reaching the redzone, from events
+                    "redzone_percentage": (
+                        round(
+                            stats["redzone_goals"] * 100.0 / stats["redzone_attempts"],
+                            1,
+                        )
+                        if stats["redzone_attempts"]
+                        else None
+                    ),
                 }
 
-                if stats["team_id"] == game["home_team_id"]:
-                    if home_redzone_pct is not None:
-                        team_data["redzone_percentage"] = home_redzone_pct
-                    home_stats = team_data
-                elif stats["team_id"] == game["away_team_id"]:
-                    if away_redzone_pct is not None:
-                        team_data["redzone_percentage"] = away_redzone_pct
-                    away_stats = team_data
+            home_stats = away_stats = None
+            if game["home_team_id"] in team_rows:
+                home_stats = team_data(team_rows[game["home_team_id"]])
+            if game["away_team_id"] in team_rows:
+                away_stats = team_data(team_rows[game["away_team_id"]])
 
             # Get top players for each team
             player_stats_query = """
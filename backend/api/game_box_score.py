@@ -2,214 +2,73 @@
 Game box score API endpoint with detailed player and team statistics.
 """
 
+from api.responses import FastJSONRoute
 from fastapi import APIRouter, HTTPException
-from services.box_score_service import calculate_team_stats
+from fastapi.responses import StreamingResponse
+from services.box_score_store import get_box_score
+from services.play_by_play_batch import (
+    MAX_BATCH_GAMES,
+    iter_play_by_play,
+    select_batch_games,
+)
 from services.play_by_play_service import calculate_play_by_play
-from services.quarter_score_service import calculate_quarter_scores
+from services.play_by_play_store import get_final_play_by_play
+from utils.query import parse_fields, project_fields
 
 from data.cache import cache_key_for_endpoint, get_cache
 
+# Returned with every player projection so rows stay identifiable
+BOX_SCORE_PLAYER_IDENTITY = ("name", "jersey_number", "team_abbrev")
+
+
+def _project_box_score(result: dict, fields: list[str] | None) -> dict:
+    """
+    Keep only the requested player stat fields of a box score.
+
+    The cached box score stays complete (one entry per game serves every
+    projection), so the projection builds new team dicts instead of editing it.
+    """
+    if not fields:
+        return result
+    projected = dict(result)
+    for side in ("home_team", "away_team"):
+        team = dict(result[side])
+        team["players"] = project_fields(
+            team["players"], fields, always=BOX_SCORE_PLAYER_IDENTITY
+        )
+        projected[side] = team
+    return projected
+
 
 def create_box_score_routes(stats_system):
     """Create game box score API routes."""
-    router = APIRouter()
+    router = APIRouter(route_class=FastJSONRoute)
 
     @router.get("/api/games/{game_id}/box-score")
-    async def get_game_box_score(game_id: str):
+    async def get_game_box_score(game_id: str, fields: str | None = None):
         """Get complete box score for a game including all player statistics"""
         try:
+            field_list = parse_fields(fields)
+
             # Check cache first
             cache = get_cache()
             cache_key = cache_key_for_endpoint("box_score", game_id=game_id)
             cached_result = cache.get(cache_key)
 
             if cached_result is not None:
-                return cached_result
+                return _project_box_score(cached_result, field_list)
 
-            # Get game information with quarter scoring
-            game_query = """
-            SELECT
-                g.game_id,
-                g.home_team_id,
-                g.away_team_id,
-                g.home_score,
-                g.away_score,
-                g.status,
-                g.start_timestamp,
-                g.location,
-                g.year,
-                g.week,
-                ht.full_name as home_team_name,
-                ht.city as home_team_city,
-                ht.name as home_team_short_name,
-                ht.abbrev as home_team_abbrev,
-                ht.logo_url as home_team_logo_url,
-                at.full_name as away_team_name,
-                at.city as away_team_city,
-                at.name as away_team_short_name,
-                at.abbrev as away_team_abbrev,
-                at.logo_url as away_team_logo_url
-            FROM games g
-            LEFT JOIN teams ht ON g.home_team_id = ht.team_id AND g.year = ht.year
-            LEFT JOIN teams at ON g.away_team_id = at.team_id AND g.year = at.year
-            WHERE g.game_id = :game_id
-            """
-
-            game_info = stats_system.db.execute_query(game_query, {"game_id": game_id})
-            if not game_info:
+            result = get_box_score(stats_system, game_id)
+            if result is None:
                 raise HTTPException(status_code=404, detail="Game not found")
 
-            game = game_info[0]
-
-            # Get quarter-by-quarter scoring from game events
-            quarter_scores = calculate_quarter_scores(stats_system, game_id)
-
-            # Get all player statistics for both teams
-            player_stats_query = """
-            SELECT
-                p.full_name,
-                p.jersey_number,
-                pgs.player_id,
-                pgs.team_id,
-                pgs.o_points_played,
-                pgs.d_points_played,
-                (pgs.o_points_played + pgs.d_points_played) as points_played,
-                pgs.assists,
-                pgs.goals,
-                pgs.blocks,
-                pgs.completions,
-                pgs.throw_attempts,
-                CASE
-                    WHEN pgs.throw_attempts > 0
-                    THEN ROUND((pgs.completions * 100.0 / pgs.throw_attempts), 1)
-                    ELSE 0
-                END as completion_percentage,
-                pgs.throwaways,
-                pgs.stalls,
-                pgs.drops,
-                pgs.callahans,
-                pgs.hockey_assists,
-                pgs.yards_thrown,
-                pgs.yards_received,
-                (pgs.yards_thrown + pgs.yards_received) as total_yards,
-                pgs.catches,
-                pgs.hucks_completed,
-                pgs.hucks_attempted,
-                pgs.hucks_received,
-                CASE
-                    WHEN pgs.hucks_attempted > 0
-                    THEN ROUND((pgs.hucks_completed * 100.0 / pgs.hucks_attempted), 1)
-                    ELSE 0
-                END as huck_percentage,
-                CASE
-                    WHEN (pgs.throwaways + pgs.stalls + pgs.drops) > 0
-                    THEN ROUND((pgs.yards_thrown + pgs.yards_received) * 1.0 / (pgs.throwaways + pgs.stalls + pgs.drops), 1)
-                    ELSE NULL
-                END as yards_per_turn,
-                (pgs.goals + pgs.assists + pgs.blocks - pgs.throwaways - pgs.drops - pgs.stalls) as plus_minus
-            FROM player_game_stats pgs
-            JOIN players p ON pgs.player_id = p.player_id AND pgs.year = p.year
-            WHERE pgs.game_id = :game_id
-            AND (pgs.o_points_played > 0 OR pgs.d_points_played > 0)
-            ORDER BY pgs.team_id, (pgs.goals + pgs.assists) DESC, plus_minus DESC
-            """
-
-            all_players = stats_system.db.execute_query(
-                player_stats_query, {"game_id": game_id}
-            )
-
-            # Separate players by team
-            home_players = []
-            away_players = []
-
-            for player in all_players:
-                is_home_team = player["team_id"] == game["home_team_id"]
-                team_abbrev = (
-                    game["home_team_abbrev"]
-                    if is_home_team
-                    else game["away_team_abbrev"]
-                )
-
-                player_data = {
-                    "name": player["full_name"],
-                    "jersey_number": player["jersey_number"] or "",
-                    "team_abbrev": team_abbrev or "",
-                    "points_played": player["points_played"],
-                    "o_points_played": player["o_points_played"],
-                    "d_points_played": player["d_points_played"],
-                    "assists": player["assists"],
-                    "goals": player["goals"],
-                    "blocks": player["blocks"],
-                    "plus_minus": player["plus_minus"],
-                    "yards_received": player["yards_received"],
-                    "yards_thrown": player["yards_thrown"],
-                    "total_yards": player["total_yards"],
-                    "completions": player["completions"],
-                    "completion_percentage": player["completion_percentage"],
-                    "hockey_assists": player["hockey_assists"],
-                    "hucks_completed": player["hucks_completed"],
-                    "hucks_received": player["hucks_received"],
-                    "huck_percentage": player["huck_percentage"],
-                    "turnovers": player["throwaways"],
-                    "yards_per_turn": player["yards_per_turn"],
-                    "stalls": player["stalls"],
-                    "callahans": player["callahans"],
-                    "drops": player["drops"],
-                }
-
-                if is_home_team:
-                    home_players.append(player_data)
-                elif player["team_id"] == game["away_team_id"]:
-                    away_players.append(player_data)
-
-            # Calculate team statistics
-            home_team_stats = calculate_team_stats(
-                stats_system, game_id, game["home_team_id"], is_home=True
-            )
-            away_team_stats = calculate_team_stats(
-                stats_system, game_id, game["away_team_id"], is_home=False
-            )
-
-            result = {
-                "game_id": game["game_id"],
-                "status": game["status"],
-                "start_timestamp": game["start_timestamp"],
-                "location": game["location"],
-                "year": game["year"],
-                "week": game["week"],
-                "home_team": {
-                    "team_id": game["home_team_id"],
-                    "name": game["home_team_short_name"],
-                    "full_name": game["home_team_name"],
-                    "city": game["home_team_city"],
-                    "abbrev": game["home_team_abbrev"],
-                    "final_score": game["home_score"],
-                    "quarter_scores": quarter_scores.get("home", []),
-                    "players": home_players,
-                    "stats": home_team_stats,
-                    "logo_url": game.get("home_team_logo_url"),
-                },
-                "away_team": {
-                    "team_id": game["away_team_id"],
-                    "name": game["away_team_short_name"],
-                    "full_name": game["away_team_name"],
-                    "city": game["away_team_city"],
-                    "abbrev": game["away_team_abbrev"],
-                    "final_score": game["away_score"],
-                    "quarter_scores": quarter_scores.get("away", []),
-                    "players": away_players,
-                    "stats": away_team_stats,
-                    "logo_url": game.get("away_team_logo_url"),
-                },
-            }
-
             # Cache the result (longer TTL for Final games since they never change)
             ttl = (
-                3600 if game["status"] == "Final" else 300
+                3600 if result["status"] == "Final" else 300
             )  # 1 hour for final, 5 min for in-progress
             cache.set(cache_key, result, ttl=ttl)
 
-            return result
+            return _project_box_score(result, field_list)
 
         except HTTPException:
             raise
@@ -322,6 +181,47 @@ def create_box_score_routes(stats_system):
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e)) from e
 
+    @router.get("/api/games/play-by-play")
+    async def get_batch_play_by_play(
+        game_ids: str | None = None,
+        team_id: str | None = None,
+        season: int | None = None,
+    ):
+        """Stream play-by-play for many games as NDJSON, one game per line"""
+        try:
+            if game_ids:
+                ids = list(
+                    dict.fromkeys(g.strip() for g in game_ids.split(",") if g.strip())
+                )
+            elif team_id or season:
+                ids = select_batch_games(stats_system.db, team_id, season)
+            else:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Pass game_ids, or a team_id and/or season",
+                )
+            if len(ids) > MAX_BATCH_GAMES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"At most {MAX_BATCH_GAMES} games per request",
+                )
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Error in get_batch_play_by_play: {e}")
+            raise HTTPException(status_code=500, detail=str(e)) from e
+
+        def stream():
+            # Headers are already sent once streaming starts, so errors can
+            # only be logged and the response cut short
+            try:
+                yield from iter_play_by_play(stats_system, ids)
+            except Exception as e:
+                print(f"Error streaming batch play-by-play: {e}")
+                raise
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
     @router.get("/api/games/{game_id}/play-by-play")
     async def get_game_play_by_play(game_id: str):
         """Get play-by-play data for a game"""
@@ -340,15 +240,17 @@ def create_box_score_routes(stats_system):
                 game_query, {"game_id": game_id}
             )
 
-            points = calculate_play_by_play(stats_system, game_id)
+            # Final games never change, so they are served from the stored
+            # play-by-play; in-progress games are built from their events
+            is_final = bool(game_result) and game_result[0].get("status") == "Final"
+            if is_final:
+                points = get_final_play_by_play(stats_system, game_id)
+            else:
+                points = calculate_play_by_play(stats_system, game_id)
             result = {"points": points}
 
             # Cache the result (longer TTL for Final games since they never change)
-            ttl = 3600  # Default 1 hour
-            if game_result and game_result[0].get("status") == "Final":
-                ttl = 3600  # 1 hour for final games
-            else:
-                ttl = 300  # 5 minutes for in-progress games
+            ttl = 3600 if is_final else 300
 
             cache.set(cache_key, result, ttl=ttl)
 
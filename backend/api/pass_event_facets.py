@@ -0,0 +1,299 @@
+"""
+In-memory facet index for the pass events filter dropdowns.
+
+/api/pass-events/filters used to run four queries per dropdown change, the
+players one joining players to all of game_events on thrower OR receiver.
+The seasons, teams, games and pass_event_participants rows (one per season,
+game, offensive team and player) are instead loaded once, and each cascading
+season/team/game selection is answered with integer array masks. Without
+caching, query_pass_event_filters() answers each dropdown with one query
+scoped to the selection instead of loading the whole index.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+# Dropdown option limits, as in the original queries
+MAX_PLAYERS = 500
+MAX_GAMES = 500
+
+SEASONS_QUERY = "SELECT DISTINCT year FROM games ORDER BY year DESC"
+
+TEAMS_QUERY = """
+SELECT t.team_id, t.full_name, t.abbrev, t.year
+FROM teams t{join}
+{where}
+ORDER BY t.full_name, t.year DESC
+"""
+
+GAMES_QUERY = """
+SELECT g.game_id, g.year, g.week,
+       g.home_team_id, g.away_team_id,
+       ht.abbrev as home_abbrev, at.abbrev as away_abbrev,
+       g.home_score, g.away_score
+FROM games g
+LEFT JOIN teams ht ON g.home_team_id = ht.team_id AND g.year = ht.year
+LEFT JOIN teams at ON g.away_team_id = at.team_id AND g.year = at.year
+{where}
+ORDER BY g.start_timestamp DESC
+"""
+
+
+def _team_option(team) -> dict:
+    return {
+        "team_id": team["team_id"],
+        "name": team["full_name"],
+        "abbrev": team["abbrev"],
+    }
+
+
+def _game_option(game) -> dict:
+    return {
+        "game_id": game["game_id"],
+        "label": f"{game['away_abbrev']} @ {game['home_abbrev']} ({game['away_score']}-{game['home_score']})",
+        "year": game["year"],
+        "week": game["week"],
+    }
+
+
+def _where(conditions: list[str]) -> str:
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+def _encode(values, ids: dict) -> np.ndarray:
+    """Integer code of each id, assigning new codes to unseen ids."""
+    return np.fromiter(
+        (ids.setdefault(value, len(ids)) for value in values), np.int64, len(values)
+    )
+
+
+class PassEventFacets:
+    """Seasons, teams, players and games available to the pass event filters."""
+
+    def __init__(
+        self,
+        seasons: list[int],
+        teams: list[dict],
+        participants: list[tuple],
+        games: list[dict],
+    ):
+        """
+        Args:
+            seasons: Seasons with games, newest first
+            teams: Rows of team_id, full_name, abbrev and year, by full_name
+            participants: (year, game_id, team_id, player_id, full_name) rows,
+                by full_name
+            games: Rows of game_id, year, week, home/away team ids and abbrevs
+                and scores, newest first
+        """
+        ids = {}
+        self._ids = ids
+        self.seasons = seasons
+
+        self._teams = [_team_option(t) for t in teams]
+        self._team_codes = _encode([t["team_id"] for t in teams], ids)
+        self._team_years = np.array([t["year"] for t in teams], dtype=np.int64)
+
+        years, game_ids, team_ids, player_ids, names = (
+            list(zip(*participants, strict=True)) or [()] * 5
+        )
+        self._participant_years = np.array(years, dtype=np.int64)
+        self._participant_games = _encode(game_ids, ids)
+        self._participant_teams = _encode(team_ids, ids)
+        # Codes follow first appearance, so code order is full_name order
+        self._participant_players, unique_players = pd.factorize(
+            np.array(player_ids, dtype=object)
+        )
+        _, first = np.unique(self._participant_players, return_index=True)
+        self._players = [
+            {"player_id": player_id, "name": names[row]}
+            for player_id, row in zip(unique_players, first, strict=True)
+        ]
+
+        self._games = [_game_option(g) for g in games]
+        self._game_years = np.array([g["year"] for g in games], dtype=np.int64)
+        self._game_homes = _encode([g["home_team_id"] for g in games], ids)
+        self._game_aways = _encode([g["away_team_id"] for g in games], ids)
+        self._game_teams = {
+            g["game_id"]: (g["year"], g["home_team_id"], g["away_team_id"])
+            for g in games
+        }
+
+    @classmethod
+    def load(cls, conn):
+        """
+        Load the facet rows.
+
+        Args:
+            conn: Database connection
+
+        Returns:
+            PassEventFacets
+        """
+        seasons = [row[0] for row in conn.execute(text(SEASONS_QUERY))]
+        teams = [
+            dict(row._mapping)
+            for row in conn.execute(text(TEAMS_QUERY.format(join="", where="")))
+        ]
+        participants = [tuple(row) for row in conn.execute(text("""
+                    SELECT pep.year, pep.game_id, pep.team_id, pep.player_id, p.full_name
+                    FROM pass_event_participants pep
+                    JOIN players p ON pep.player_id = p.player_id AND pep.year = p.year
+                    ORDER BY p.full_name, pep.player_id
+                    """))]
+        games = [
+            dict(row._mapping)
+            for row in conn.execute(text(GAMES_QUERY.format(where="")))
+        ]
+        return cls(seasons, teams, participants, games)
+
+    def _code(self, value: str) -> int:
+        return self._ids.get(value, -1)
+
+    def teams(self, season: int | None = None, game_id: str | None = None) -> list:
+        """Teams in a game, or in a season, deduplicated by team_id."""
+        if game_id:
+            year, home, away = self._game_teams.get(game_id, (None, None, None))
+            mask = (self._team_years == (year or -1)) & np.isin(
+                self._team_codes, [self._code(home), self._code(away)]
+            )
+        elif season:
+            mask = self._team_years == season
+        else:
+            mask = np.ones(len(self._teams), dtype=bool)
+
+        rows = np.flatnonzero(mask)
+        _, first = np.unique(self._team_codes[rows], return_index=True)
+        return [self._teams[row] for row in rows[np.sort(first)]]
+
+    def players(
+        self,
+        season: int | None = None,
+        team_id: str | None = None,
+        game_id: str | None = None,
+    ) -> list:
+        """Throwers and receivers with pass events, by name."""
+        mask = np.ones(len(self._participant_players), dtype=bool)
+        if season:
+            mask &= self._participant_years == season
+        if game_id:
+            mask &= self._participant_games == self._code(game_id)
+        if team_id:
+            mask &= self._participant_teams == self._code(team_id)
+        codes = pd.unique(self._participant_players[mask])[:MAX_PLAYERS]
+        return [self._players[code] for code in codes]
+
+    def games(self, season: int | None = None, team_id: str | None = None) -> list:
+        """Games, newest first."""
+        mask = np.ones(len(self._games), dtype=bool)
+        if season:
+            mask &= self._game_years == season
+        if team_id:
+            code = self._code(team_id)
+            mask &= (self._game_homes == code) | (self._game_aways == code)
+        return [self._games[i] for i in np.flatnonzero(mask)[:MAX_GAMES]]
+
+
+def query_pass_event_filters(
+    db,
+    season: int | None = None,
+    team_id: str | None = None,
+    game_id: str | None = None,
+) -> dict:
+    """
+    Filter options for one selection, from queries scoped to it.
+
+    Used when caching is disabled, where loading the facet index would cost
+    a scan of every participant row per request. The options match the
+    facet index's, except that a player renamed between seasons is listed
+    under their name within the selection.
+
+    Args:
+        db: Database instance
+        season: Season selection
+        team_id: Team selection (filters players and games)
+        game_id: Game selection (filters teams and players)
+
+    Returns:
+        Dict of seasons, teams, players and games options
+    """
+    params = {"season": season, "team_id": team_id, "game_id": game_id}
+
+    if game_id:
+        join = (
+            "\nJOIN games g ON g.game_id = :game_id AND t.year = g.year"
+            "\n    AND t.team_id IN (g.home_team_id, g.away_team_id)"
+        )
+        where = ""
+    else:
+        join = ""
+        where = _where(["t.year = :season"] if season else [])
+    teams = {}
+    for row in db.execute_query(TEAMS_QUERY.format(join=join, where=where), params):
+        teams.setdefault(row["team_id"], _team_option(row))
+
+    conditions = []
+    if season:
+        conditions.append("pep.year = :season")
+    if game_id:
+        conditions.append("pep.game_id = :game_id")
+    if team_id:
+        conditions.append("pep.team_id = :team_id")
+    players = db.execute_query(
+        f"""
+        SELECT pep.player_id, MIN(p.full_name) as name
+        FROM pass_event_participants pep
+        JOIN players p ON pep.player_id = p.player_id AND pep.year = p.year
+        {_where(conditions)}
+        GROUP BY pep.player_id
+        ORDER BY MIN(p.full_name), pep.player_id
+        LIMIT {MAX_PLAYERS}
+        """,
+        params,
+    )
+
+    conditions = []
+    if season:
+        conditions.append("g.year = :season")
+    if team_id:
+        conditions.append("(g.home_team_id = :team_id OR g.away_team_id = :team_id)")
+    games = db.execute_query(
+        f"{GAMES_QUERY.format(where=_where(conditions))}LIMIT {MAX_GAMES}", params
+    )
+
+    return {
+        "seasons": [row["year"] for row in db.execute_query(SEASONS_QUERY)],
+        "teams": list(teams.values()),
+        "players": [
+            {"player_id": row["player_id"], "name": row["name"]} for row in players
+        ],
+        "games": [_game_option(row) for row in games],
+    }
+
+
+# Global facet index, reloaded after the TTL like the season rollups
+_facets_instance: PassEventFacets | None = None
+_facets_expires_at = 0.0
+_facets_lock = threading.Lock()
+
+
+def get_pass_event_facets(db, ttl: int = 3600) -> PassEventFacets:
+    """Get the global facet index, loading it on first use or expiry."""
+    global _facets_instance, _facets_expires_at
+    with _facets_lock:
+        if _facets_instance is None or time.time() >= _facets_expires_at:
+            with db.engine.connect() as conn:
+                _facets_instance = PassEventFacets.load(conn)
+            _facets_expires_at = time.time() + ttl
+        return _facets_instance
+
+
+def clear_pass_event_facets() -> None:
+    """Drop the loaded facet index."""
+    global _facets_instance
+    with _facets_lock:
+        _facets_instance = None
@@ -2,343 +2,846 @@
 Pass events API endpoint for querying pass data across games/seasons.
 """
 
-import math
+import json
+
+import numpy as np
+import pandas as pd
+from api.pass_event_facets import get_pass_event_facets, query_pass_event_filters
+from api.responses import FastJSONRoute
+from config import config
+from data.cache import cache_key_for_endpoint, get_cache
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+from sqlalchemy import text
+from utils.pass_heatmap import (
+    DEFAULT_BINS_X,
+    DEFAULT_BINS_Y,
+    FIELD_X_RANGE,
+    FIELD_Y_RANGE,
+    HEATMAP_POINTS,
+    bin_passes,
+    cell_index,
+    heatmap_cells,
+    pass_type_codes,
+)
+from utils.pass_type import PASS_TYPES
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PASS_EVENT_FORMATS = ("json", "columnar")
+
+# Result names, indexed by pass_events.result
+RESULTS = ["completion", "goal", "turnover"]
+
+# Pass types counted in the stats block, in response order
+_STATS_PASS_TYPES = ["huck", "swing", "dump", "gainer", "dish"]
+
+# Stats block totals over the filtered passes, in one aggregate pass
+PASS_ROWS_SELECT = """
+SELECT pe.result, pe.pass_type, pe.vertical_yards
+FROM pass_events pe
+"""
+_BY_TYPE_COUNTS = ",\n    ".join(
+    f"COUNT(*) FILTER (WHERE pass_type = {PASS_TYPES.index(t)}) as {t}"
+    for t in _STATS_PASS_TYPES
+)
+PASS_STATS_QUERY = f"""
+WITH passes AS ({{passes}})
+SELECT
+    COUNT(*) as total_throws,
+    COUNT(*) FILTER (WHERE result < 2) as completions,
+    COUNT(*) FILTER (WHERE result = 1) as goals,
+    COALESCE(SUM(vertical_yards), 0) as total_yards,
+    COALESCE(SUM(vertical_yards) FILTER (WHERE result < 2), 0) as completion_yards,
+    {_BY_TYPE_COUNTS}
+FROM passes
+"""
+
+# Heatmap inputs over the filtered passes
+HEATMAP_PASSES_SELECT = """
+SELECT
+    pe.result,
+    pe.pass_type,
+    pe.thrower_x,
+    pe.thrower_y,
+    pe.dest_x,
+    pe.dest_y,
+    pe.vertical_yards
+FROM pass_events pe
+"""
+
+# Thrower -> receiver edges in one grouped pass. Unlike the other pass event
+# queries, passes without coordinates still count; throwaways have no
+# receiver and group under a NULL receiver_id
+PASS_NETWORK_QUERY = """
+SELECT
+    pe.thrower_id,
+    pe.receiver_id,
+    MAX(pe.thrower_name) as thrower_name,
+    MAX(pe.receiver_name) as receiver_name,
+    COUNT(*) as attempts,
+    COUNT(*) FILTER (WHERE pe.result < 2) as completions,
+    COUNT(*) FILTER (WHERE pe.result = 1) as goals,
+    COUNT(*) FILTER (WHERE pe.event_type = 20) as drops,
+    COALESCE(SUM(pe.vertical_yards) FILTER (WHERE pe.result < 2), 0) as yards
+FROM pass_events pe
+WHERE pe.thrower_id IS NOT NULL{filters}
+GROUP BY pe.thrower_id, pe.receiver_id
+"""
 
-from fastapi import APIRouter, Query
+# Pass network scopes, with their pass_events columns
+PASS_NETWORK_FILTERS = {
+    "team_id": "off_team_id",
+    "season": "year",
+    "game_id": "game_id",
+}
+
+# Filters the precomputed heatmap cells can answer, with their cell columns
+PRECOMPUTED_HEATMAP_FILTERS = {
+    "season": "year",
+    "off_team_id": "team_id",
+    "thrower_id": "thrower_id",
+    "pass_types": "pass_type",
+}
+
+
+def fetch_pass_columns(db, query: str, params: dict) -> dict[str, np.ndarray]:
+    """
+    Run a pass events query and return its result column by column.
+
+    Args:
+        db: Database with an engine
+        query: Pass events SQL
+        params: Query parameters
+
+    Returns:
+        Map of column name to object array, without per-row dicts
+    """
+    with db.engine.connect() as conn:
+        result = conn.execute(text(query), params)
+        keys = list(result.keys())
+        rows = result.fetchall()
+    values = list(zip(*rows, strict=True)) if rows else [()] * len(keys)
+    columns = {}
+    for key, column in zip(keys, values, strict=True):
+        array = np.empty(len(column), dtype=object)
+        array[:] = column
+        columns[key] = array
+    return columns
+
+
+def _floats(column: np.ndarray) -> np.ndarray:
+    """Object column to float64 with NULL as NaN."""
+    return np.array(column, dtype=np.float64)
+
+
+def _codes(column: np.ndarray, null: int) -> np.ndarray:
+    """Object column of integer codes to int64 with NULL as the given code."""
+    codes = np.full(len(column), null, dtype=np.int64)
+    known = ~pd.isna(column)
+    codes[known] = column[known].astype(np.int64)
+    return codes
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
+
+
+def pass_stats(totals: dict) -> dict:
+    """
+    Build the pass events stats block from its totals.
+
+    Args:
+        totals: total_throws, completions, goals, total_yards,
+            completion_yards and a count per pass type
+
+    Returns:
+        Stats with percentages and per-type breakdown
+    """
+    total = totals["total_throws"]
+    completions = totals["completions"]
+    goals = totals["goals"]
+    total_yards = totals["total_yards"]
+    completion_yards = totals["completion_yards"]
+    stats = {
+        "total_throws": total,
+        "completions": completions,
+        "turnovers": total - completions,
+        "goals": goals,
+        "total_yards": total_yards,
+        "completion_yards": completion_yards,
+        "by_type": {t: {"count": totals[t]} for t in _STATS_PASS_TYPES},
+    }
+
+    if total > 0:
+        stats["completions_pct"] = round(completions / total * 100, 1)
+        stats["turnovers_pct"] = round((total - completions) / total * 100, 1)
+        stats["goals_pct"] = round(goals / total * 100, 1)
+        stats["avg_yards_per_throw"] = round(total_yards / total, 1)
+    else:
+        stats["completions_pct"] = 0
+        stats["turnovers_pct"] = 0
+        stats["goals_pct"] = 0
+        stats["avg_yards_per_throw"] = 0
+    for counts in stats["by_type"].values():
+        counts["pct"] = round(counts["count"] / total * 100, 1) if total > 0 else 0
+
+    stats["avg_yards_per_completion"] = (
+        round(completion_yards / completions, 1) if completions > 0 else 0
+    )
+    return stats
+
+
+def summarize_passes(
+    result_codes: np.ndarray, pass_types: np.ndarray, vertical_yards: np.ndarray
+) -> dict:
+    """
+    Build the pass events stats block from column arrays.
+
+    Args:
+        result_codes: RESULTS index per pass
+        pass_types: PASS_TYPES index per pass (-1 when unclassified)
+        vertical_yards: Vertical yards per pass (NaN when unknown)
+
+    Returns:
+        Stats in the same shape as the JSON response
+    """
+    completed = result_codes != 2
+    return pass_stats(
+        {
+            "total_throws": len(result_codes),
+            "completions": int(np.count_nonzero(completed)),
+            "goals": int(np.count_nonzero(result_codes == 1)),
+            "total_yards": float(np.nansum(vertical_yards)),
+            "completion_yards": float(np.nansum(vertical_yards[completed])),
+            **{
+                t: int(np.count_nonzero(pass_types == PASS_TYPES.index(t)))
+                for t in _STATS_PASS_TYPES
+            },
+        }
+    )
+
+
+def _pct(part: int, total: int) -> float:
+    return round(part / total * 100, 1) if total > 0 else 0
+
+
+def pass_network(rows: list[dict]) -> dict:
+    """
+    Build the pass network from the grouped thrower -> receiver rows.
+
+    Args:
+        rows: Result of PASS_NETWORK_QUERY
+
+    Returns:
+        Directed edges by attempts, and per-player throwing and receiving
+        totals (throwaways count towards the thrower only)
+    """
+    nodes = {}
+
+    def node(player_id: str, name: str | None) -> dict:
+        if player_id not in nodes:
+            nodes[player_id] = {
+                "player_id": player_id,
+                "name": name or player_id,
+                "throws": 0,
+                "completions": 0,
+                "assists": 0,
+                "yards_thrown": 0.0,
+                "targets": 0,
+                "receptions": 0,
+                "goals": 0,
+                "drops": 0,
+                "yards_received": 0.0,
+            }
+        return nodes[player_id]
+
+    edges = []
+    for row in rows:
+        thrower = node(row["thrower_id"], row["thrower_name"])
+        thrower["throws"] += row["attempts"]
+        thrower["completions"] += row["completions"]
+        thrower["assists"] += row["goals"]
+        thrower["yards_thrown"] += row["yards"]
+        if row["receiver_id"] is None:
+            continue
+
+        receiver = node(row["receiver_id"], row["receiver_name"])
+        receiver["targets"] += row["attempts"]
+        receiver["receptions"] += row["completions"]
+        receiver["goals"] += row["goals"]
+        receiver["drops"] += row["drops"]
+        receiver["yards_received"] += row["yards"]
+        edges.append(
+            {
+                "thrower_id": row["thrower_id"],
+                "receiver_id": row["receiver_id"],
+                "attempts": row["attempts"],
+                "completions": row["completions"],
+                "turnovers": row["attempts"] - row["completions"],
+                "completion_pct": _pct(row["completions"], row["attempts"]),
+                "yards": round(row["yards"], 1),
+                "goals": row["goals"],
+            }
+        )
+
+    for entry in nodes.values():
+        entry["turnovers"] = entry["throws"] - entry["completions"]
+        entry["completion_pct"] = _pct(entry["completions"], entry["throws"])
+        entry["yards_thrown"] = round(entry["yards_thrown"], 1)
+        entry["yards_received"] = round(entry["yards_received"], 1)
+
+    edges.sort(key=lambda e: (-e["attempts"], e["thrower_id"], e["receiver_id"]))
+    return {
+        "nodes": sorted(nodes.values(), key=lambda n: -(n["throws"] + n["targets"])),
+        "edges": edges,
+        "total": sum(row["attempts"] for row in rows),
+    }
+
+
+def fetch_heatmap_cells(db, filters: dict, point: str) -> dict[str, np.ndarray]:
+    """
+    Sum the precomputed heatmap cells matching the filters.
+
+    Args:
+        db: Database connection
+        filters: Filters, all keys of PRECOMPUTED_HEATMAP_FILTERS
+        point: Binned pass point, origin or destination
+
+    Returns:
+        The default grid in the shape returned by bin_passes()
+    """
+    query = """
+    SELECT
+        pass_type,
+        cell,
+        SUM(attempts) as attempts,
+        SUM(completions) as completions,
+        SUM(total_gain) as total_gain,
+        SUM(gain_count) as gain_count
+    FROM pass_heatmap_cells
+    WHERE point = :point
+    """
+    params = {"point": point}
+    for name, value in filters.items():
+        column = PRECOMPUTED_HEATMAP_FILTERS[name]
+        if name == "pass_types":
+            query += f" AND {column} IN :{name}"
+            params[name] = tuple(t.strip() for t in value.split(","))
+        else:
+            query += f" AND {column} = :{name}"
+            params[name] = value
+    query += " GROUP BY pass_type, cell"
+
+    columns = fetch_pass_columns(db, query, params)
+    slots = (pass_type_codes(columns["pass_type"]), columns["cell"].astype(np.int64))
+    binned = {}
+    for name in ("attempts", "completions", "total_gain", "gain_count"):
+        counts = np.zeros((len(PASS_TYPES) + 1, DEFAULT_BINS_X * DEFAULT_BINS_Y))
+        counts[slots] = _floats(columns[name])
+        binned[name] = counts
+    return binned
+
+
+def encode_columnar_pass_events(columns: dict[str, np.ndarray]) -> bytes:
+    """
+    Encode fetched pass event columns as an Arrow IPC stream.
+
+    One record batch of parallel typed arrays: float32 thrower and
+    destination coordinates (receiver, or turnover location), the raw
+    event_type, uint8 dictionary codes for result and pass_type, and thrower
+    and receiver as dictionary-encoded player ids. Player names are sent
+    once, as the "player_names" schema metadata aligned with the player id
+    dictionary; "stats" and "total" metadata match the JSON response.
+
+    Args:
+        columns: Result of fetch_pass_columns()
+
+    Returns:
+        Arrow IPC stream bytes
+    """
+    import pyarrow as pa
+
+    thrower_x = _floats(columns["thrower_x"])
+    thrower_y = _floats(columns["thrower_y"])
+    dest_x = _floats(columns["dest_x"])
+    dest_y = _floats(columns["dest_y"])
+
+    event_types = np.array(columns["event_type"], dtype=np.uint8)
+    result_codes = np.array(columns["result"], dtype=np.uint8)
+    pass_codes = _codes(columns["pass_type"], -1)
+
+    # One player dictionary shared by the thrower and receiver columns
+    throwers = columns["thrower_id"]
+    player_codes, player_ids = pd.factorize(
+        np.concatenate([throwers, columns["receiver_id"]])
+    )
+    names = np.concatenate([columns["thrower_name"], columns["receiver_name"]])
+    named = player_codes >= 0
+    _, first = np.unique(player_codes[named], return_index=True)
+    player_names = [
+        name if name is not None else player_id
+        for player_id, name in zip(player_ids, names[named][first], strict=True)
+    ]
+    players = pa.array(list(player_ids), type=pa.string())
+
+    def codes(values: np.ndarray, index_type) -> pa.Array:
+        return pa.array(values, mask=values < 0, type=index_type)
+
+    def coordinates(values: np.ndarray) -> pa.Array:
+        return pa.array(values.astype(np.float32), mask=np.isnan(values))
+
+    thrower_codes = player_codes[: len(throwers)].astype(np.int32)
+    receiver_codes = player_codes[len(throwers) :].astype(np.int32)
+    batch = pa.RecordBatch.from_arrays(
+        [
+            coordinates(thrower_x),
+            coordinates(thrower_y),
+            coordinates(dest_x),
+            coordinates(dest_y),
+            pa.array(event_types, type=pa.uint8()),
+            pa.DictionaryArray.from_arrays(
+                pa.array(result_codes, type=pa.uint8()), pa.array(RESULTS)
+            ),
+            pa.DictionaryArray.from_arrays(
+                codes(pass_codes, pa.uint8()), pa.array(PASS_TYPES)
+            ),
+            pa.DictionaryArray.from_arrays(codes(thrower_codes, pa.int32()), players),
+            pa.DictionaryArray.from_arrays(codes(receiver_codes, pa.int32()), players),
+        ],
+        names=[
+            "thrower_x",
+            "thrower_y",
+            "dest_x",
+            "dest_y",
+            "event_type",
+            "result",
+            "pass_type",
+            "thrower_id",
+            "receiver_id",
+        ],
+    )
+    stats = summarize_passes(
+        result_codes, pass_codes, _floats(columns["vertical_yards"])
+    )
+    batch = batch.replace_schema_metadata(
+        {
+            "total": str(batch.num_rows),
+            "stats": json.dumps(stats),
+            "player_names": json.dumps(player_names),
+        }
+    )
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def pass_event_filters(
+    season: int | None = Query(None, description="Filter by season year"),
+    game_id: str | None = Query(None, description="Filter by specific game"),
+    off_team_id: str | None = Query(None, description="Filter by offensive team"),
+    def_team_id: str | None = Query(None, description="Filter by defensive team"),
+    thrower_id: str | None = Query(None, description="Filter by thrower player"),
+    receiver_id: str | None = Query(None, description="Filter by receiver player"),
+    pass_types: str | None = Query(
+        None, description="Comma-separated pass types: huck,swing,dump,gainer,dish"
+    ),
+    results: str | None = Query(
+        None, description="Comma-separated results: goal,completion,turnover"
+    ),
+    event_types: str | None = Query(
+        None,
+        description="Comma-separated event types: throws,catches,assists,goals,throwaways,drops",
+    ),
+    origin_x_min: float | None = Query(None, description="Min thrower X coordinate"),
+    origin_x_max: float | None = Query(None, description="Max thrower X coordinate"),
+    origin_y_min: float | None = Query(None, description="Min thrower Y coordinate"),
+    origin_y_max: float | None = Query(None, description="Max thrower Y coordinate"),
+    dest_x_min: float | None = Query(None, description="Min receiver X coordinate"),
+    dest_x_max: float | None = Query(None, description="Max receiver X coordinate"),
+    dest_y_min: float | None = Query(None, description="Min receiver Y coordinate"),
+    dest_y_max: float | None = Query(None, description="Max receiver Y coordinate"),
+    distance_min: float | None = Query(None, description="Min throw distance"),
+    distance_max: float | None = Query(None, description="Max throw distance"),
+) -> dict:
+    """Filters shared by the pass events endpoints, without the unset ones."""
+    # Only the query parameters are local at this point
+    return {name: value for name, value in locals().items() if value is not None}
+
+
+def build_pass_filters(
+    *,
+    season: int | None = None,
+    game_id: str | None = None,
+    off_team_id: str | None = None,
+    def_team_id: str | None = None,
+    thrower_id: str | None = None,
+    receiver_id: str | None = None,
+    pass_types: str | None = None,
+    results: str | None = None,
+    event_types: str | None = None,
+    origin_x_min: float | None = None,
+    origin_x_max: float | None = None,
+    origin_y_min: float | None = None,
+    origin_y_max: float | None = None,
+    dest_x_min: float | None = None,
+    dest_x_max: float | None = None,
+    dest_y_min: float | None = None,
+    dest_y_max: float | None = None,
+    distance_min: float | None = None,
+    distance_max: float | None = None,
+) -> tuple[str, dict]:
+    """
+    Build the WHERE clause and parameters of a pass events query.
+
+    Args:
+        Filters as returned by pass_event_filters()
+
+    Returns:
+        WHERE clause over pass_events pe, and its parameters
+    """
+    # Filters shared by the events query and the stats aggregate
+    where = """
+    WHERE pe.thrower_x IS NOT NULL
+      AND pe.thrower_y IS NOT NULL
+    """
+
+    params = {}
+
+    # Apply filters
+    if season:
+        where += " AND pe.year = :season"
+        params["season"] = season
+
+    if game_id:
+        where += " AND pe.game_id = :game_id"
+        params["game_id"] = game_id
+
+    if off_team_id:
+        where += " AND pe.off_team_id = :off_team_id"
+        params["off_team_id"] = off_team_id
+
+    if def_team_id:
+        where += " AND pe.def_team_id = :def_team_id"
+        params["def_team_id"] = def_team_id
+
+    if thrower_id:
+        where += " AND pe.thrower_id = :thrower_id"
+        params["thrower_id"] = thrower_id
+
+    if receiver_id:
+        where += " AND pe.receiver_id = :receiver_id"
+        params["receiver_id"] = receiver_id
+
+    if pass_types:
+        types_list = [t.strip() for t in pass_types.split(",")]
+        # Codes are inlined integers; unknown types match nothing
+        codes = [str(PASS_TYPES.index(t)) for t in types_list if t in PASS_TYPES]
+        where += f" AND pe.pass_type IN ({', '.join(codes or ['-1'])})"
+
+    if results:
+        results_list = [r.strip() for r in results.split(",")]
+        result_conditions = []
+        if "goal" in results_list:
+            result_conditions.append("pe.result = 1")
+        if "completion" in results_list:
+            result_conditions.append("pe.result = 0")
+        if "turnover" in results_list:
+            result_conditions.append("pe.result = 2")
+        if result_conditions:
+            where += f" AND ({' OR '.join(result_conditions)})"
+
+    # Event types filter (alternative to results, more granular)
+    # Each checkbox controls specific event types independently:
+    # - throws/catches: completions (18)
+    # - assists/goals: scoring plays (19)
+    # - throwaways: throwaway turnovers (22)
+    # - drops: drop turnovers (20)
+    if event_types:
+        event_types_list = [et.strip() for et in event_types.split(",")]
+        event_conditions = []
+        # Event type 18 (completion): controlled by 'throws' or 'catches'
+        if "throws" in event_types_list or "catches" in event_types_list:
+            event_conditions.append("pe.event_type = 18")
+        # Event type 19 (goal): controlled by 'assists' or 'goals'
+        if "assists" in event_types_list or "goals" in event_types_list:
+            event_conditions.append("pe.event_type = 19")
+        # Event type 20 (drop): controlled by 'drops' only
+        if "drops" in event_types_list:
+            event_conditions.append("pe.event_type = 20")
+        # Event type 22 (throwaway): controlled by 'throwaways' only
+        if "throwaways" in event_types_list:
+            event_conditions.append("pe.event_type = 22")
+        if event_conditions:
+            where += f" AND ({' OR '.join(event_conditions)})"
+
+    # Coordinate filters
+    if origin_x_min is not None:
+        where += " AND pe.thrower_x >= :origin_x_min"
+        params["origin_x_min"] = origin_x_min
+    if origin_x_max is not None:
+        where += " AND pe.thrower_x <= :origin_x_max"
+        params["origin_x_max"] = origin_x_max
+    if origin_y_min is not None:
+        where += " AND pe.thrower_y >= :origin_y_min"
+        params["origin_y_min"] = origin_y_min
+    if origin_y_max is not None:
+        where += " AND pe.thrower_y <= :origin_y_max"
+        params["origin_y_max"] = origin_y_max
+
+    if dest_x_min is not None:
+        where += " AND pe.dest_x >= :dest_x_min"
+        params["dest_x_min"] = dest_x_min
+    if dest_x_max is not None:
+        where += " AND pe.dest_x <= :dest_x_max"
+        params["dest_x_max"] = dest_x_max
+    if dest_y_min is not None:
+        where += " AND pe.dest_y >= :dest_y_min"
+        params["dest_y_min"] = dest_y_min
+    if dest_y_max is not None:
+        where += " AND pe.dest_y <= :dest_y_max"
+        params["dest_y_max"] = dest_y_max
+
+    # Distance filters use the precomputed distance; NULL distances never match
+    if distance_min is not None:
+        where += " AND pe.distance >= :distance_min"
+        params["distance_min"] = distance_min
+    if distance_max is not None:
+        where += " AND pe.distance <= :distance_max"
+        params["distance_max"] = distance_max
+
+    return where, params
 
 
 def create_pass_events_routes(stats_system):
     """Create pass events API routes."""
-    router = APIRouter()
+    router = APIRouter(route_class=FastJSONRoute)
 
     @router.get("/api/pass-events")
     async def get_pass_events(
-        season: int | None = Query(None, description="Filter by season year"),
-        game_id: str | None = Query(None, description="Filter by specific game"),
-        off_team_id: str | None = Query(None, description="Filter by offensive team"),
-        def_team_id: str | None = Query(None, description="Filter by defensive team"),
-        thrower_id: str | None = Query(None, description="Filter by thrower player"),
-        receiver_id: str | None = Query(None, description="Filter by receiver player"),
-        pass_types: str | None = Query(
-            None, description="Comma-separated pass types: huck,swing,dump,gainer,dish"
-        ),
-        results: str | None = Query(
-            None, description="Comma-separated results: goal,completion,turnover"
-        ),
-        event_types: str | None = Query(
-            None,
-            description="Comma-separated event types: throws,catches,assists,goals,throwaways,drops",
-        ),
-        origin_x_min: float | None = Query(
-            None, description="Min thrower X coordinate"
-        ),
-        origin_x_max: float | None = Query(
-            None, description="Max thrower X coordinate"
-        ),
-        origin_y_min: float | None = Query(
-            None, description="Min thrower Y coordinate"
-        ),
-        origin_y_max: float | None = Query(
-            None, description="Max thrower Y coordinate"
-        ),
-        dest_x_min: float | None = Query(None, description="Min receiver X coordinate"),
-        dest_x_max: float | None = Query(None, description="Max receiver X coordinate"),
-        dest_y_min: float | None = Query(None, description="Min receiver Y coordinate"),
-        dest_y_max: float | None = Query(None, description="Max receiver Y coordinate"),
-        distance_min: float | None = Query(None, description="Min throw distance"),
-        distance_max: float | None = Query(None, description="Max throw distance"),
+        filters: dict = Depends(pass_event_filters),
         limit: int | None = Query(
             None, description="Max events to return (no limit if not specified)"
         ),
+        format: str = Query(
+            "json",
+            description="Response format: json, or columnar for an Arrow IPC stream",
+        ),
     ):
         """
         Get pass events with comprehensive filtering.
 
-        Returns events with coordinates and aggregate statistics.
+        Returns events with coordinates and aggregate statistics, either as
+        JSON objects or (format=columnar) as typed column arrays.
         """
-        # Build the query dynamically
-        query = """
-        SELECT
-            ge.game_id,
-            ge.event_type,
-            ge.pass_type,
-            ge.thrower_id,
-            ge.receiver_id,
-            ge.thrower_x,
-            ge.thrower_y,
-            ge.receiver_x,
-            ge.receiver_y,
-            ge.turnover_x,
-            ge.turnover_y,
-            g.year,
-            g.home_team_id,
-            g.away_team_id,
-            ge.team as event_team,
-            p_thrower.full_name as thrower_name,
-            p_receiver.full_name as receiver_name
-        FROM game_events ge
-        JOIN games g ON ge.game_id = g.game_id
-        LEFT JOIN players p_thrower ON ge.thrower_id = p_thrower.player_id AND g.year = p_thrower.year
-        LEFT JOIN players p_receiver ON ge.receiver_id = p_receiver.player_id AND g.year = p_receiver.year
-        WHERE ge.event_type IN (18, 19, 20, 22)
-          AND ge.thrower_x IS NOT NULL
-          AND ge.thrower_y IS NOT NULL
-        """
-
-        params = {}
-
-        # Apply filters
-        if season:
-            query += " AND g.year = :season"
-            params["season"] = season
-
-        if game_id:
-            query += " AND ge.game_id = :game_id"
-            params["game_id"] = game_id
-
-        if off_team_id:
-            # Offensive team is the one with possession (event_team matches their home/away status)
-            query += """ AND (
-                (ge.team = 'home' AND g.home_team_id = :off_team_id) OR
-                (ge.team = 'away' AND g.away_team_id = :off_team_id)
-            )"""
-            params["off_team_id"] = off_team_id
-
-        if def_team_id:
-            # Defensive team is the opposing team
-            query += """ AND (
-                (ge.team = 'home' AND g.away_team_id = :def_team_id) OR
-                (ge.team = 'away' AND g.home_team_id = :def_team_id)
-            )"""
-            params["def_team_id"] = def_team_id
-
-        if thrower_id:
-            query += " AND ge.thrower_id = :thrower_id"
-            params["thrower_id"] = thrower_id
-
-        if receiver_id:
-            query += " AND ge.receiver_id = :receiver_id"
-            params["receiver_id"] = receiver_id
-
-        if pass_types:
-            types_list = [t.strip() for t in pass_types.split(",")]
-            query += " AND ge.pass_type IN :pass_types"
-            params["pass_types"] = tuple(types_list)
-
-        if results:
-            results_list = [r.strip() for r in results.split(",")]
-            result_conditions = []
-            if "goal" in results_list:
-                result_conditions.append("ge.event_type = 19")
-            if "completion" in results_list:
-                result_conditions.append("ge.event_type = 18")
-            if "turnover" in results_list:
-                result_conditions.append("ge.event_type IN (20, 22)")
-            if result_conditions:
-                query += f" AND ({' OR '.join(result_conditions)})"
-
-        # Event types filter (alternative to results, more granular)
-        # Each checkbox controls specific event types independently:
-        # - throws/catches: completions (18)
-        # - assists/goals: scoring plays (19)
-        # - throwaways: throwaway turnovers (22)
-        # - drops: drop turnovers (20)
-        if event_types:
-            event_types_list = [et.strip() for et in event_types.split(",")]
-            event_conditions = []
-            # Event type 18 (completion): controlled by 'throws' or 'catches'
-            if "throws" in event_types_list or "catches" in event_types_list:
-                event_conditions.append("ge.event_type = 18")
-            # Event type 19 (goal): controlled by 'assists' or 'goals'
-            if "assists" in event_types_list or "goals" in event_types_list:
-                event_conditions.append("ge.event_type = 19")
-            # Event type 20 (drop): controlled by 'drops' only
-            if "drops" in event_types_list:
-                event_conditions.append("ge.event_type = 20")
-            # Event type 22 (throwaway): controlled by 'throwaways' only
-            if "throwaways" in event_types_list:
-                event_conditions.append("ge.event_type = 22")
-            if event_conditions:
-                query += f" AND ({' OR '.join(event_conditions)})"
-
-        # Coordinate filters
-        if origin_x_min is not None:
-            query += " AND ge.thrower_x >= :origin_x_min"
-            params["origin_x_min"] = origin_x_min
-        if origin_x_max is not None:
-            query += " AND ge.thrower_x <= :origin_x_max"
-            params["origin_x_max"] = origin_x_max
-        if origin_y_min is not None:
-            query += " AND ge.thrower_y >= :origin_y_min"
-            params["origin_y_min"] = origin_y_min
-        if origin_y_max is not None:
-            query += " AND ge.thrower_y <= :origin_y_max"
-            params["origin_y_max"] = origin_y_max
-
-        if dest_x_min is not None:
-            query += " AND COALESCE(ge.receiver_x, ge.turnover_x) >= :dest_x_min"
-            params["dest_x_min"] = dest_x_min
-        if dest_x_max is not None:
-            query += " AND COALESCE(ge.receiver_x, ge.turnover_x) <= :dest_x_max"
-            params["dest_x_max"] = dest_x_max
-        if dest_y_min is not None:
-            query += " AND COALESCE(ge.receiver_y, ge.turnover_y) >= :dest_y_min"
-            params["dest_y_min"] = dest_y_min
-        if dest_y_max is not None:
-            query += " AND COALESCE(ge.receiver_y, ge.turnover_y) <= :dest_y_max"
-            params["dest_y_max"] = dest_y_max
-
-        # Add limit if specified
-        if limit is not None:
-            query += " LIMIT :limit"
-            params["limit"] = limit
-
-        # Execute query
-        rows = stats_system.db.execute_query(query, params)
-
-        # Process results
-        events = []
-        stats = {
-            "total_throws": 0,
-            "completions": 0,
-            "turnovers": 0,
-            "goals": 0,
-            "total_yards": 0,
-            "completion_yards": 0,
-            "by_type": {
-                "huck": {"count": 0},
-                "swing": {"count": 0},
-                "dump": {"count": 0},
-                "gainer": {"count": 0},
-                "dish": {"count": 0},
-            },
-        }
-
-        for row in rows:
-            event_type = row["event_type"]
+        if format not in PASS_EVENT_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported format: {format}. Use one of {', '.join(PASS_EVENT_FORMATS)}",
+            )
 
-            # Determine result
-            if event_type == 19:
-                result = "goal"
-            elif event_type == 18:
-                result = "completion"
-            else:
-                result = "turnover"
+        try:
+            # Build the query dynamically
+            select = """
+            SELECT
+                pe.game_id,
+                pe.event_type,
+                pe.result,
+                pe.pass_type,
+                pe.thrower_id,
+                pe.receiver_id,
+                pe.thrower_name,
+                pe.receiver_name,
+                pe.thrower_x,
+                pe.thrower_y,
+                pe.receiver_x,
+                pe.receiver_y,
+                pe.turnover_x,
+                pe.turnover_y,
+                pe.dest_x,
+                pe.dest_y,
+                pe.vertical_yards,
+                pe.horizontal_yards,
+                pe.distance,
+                pe.year
+            FROM pass_events pe
+            """
+            where, params = build_pass_filters(**filters)
+
+            # Add limit if specified; ordered so the stats cover the same rows
+            if limit is not None:
+                where += " ORDER BY pe.id LIMIT :limit"
+                params["limit"] = limit
+            query = select + where
+
+            if format == "columnar":
+                columns = fetch_pass_columns(stats_system.db, query, params)
+                return Response(
+                    content=encode_columnar_pass_events(columns),
+                    media_type=ARROW_STREAM,
+                )
 
-            # Calculate distance
-            dest_x = (
-                row["receiver_x"]
-                if row["receiver_x"] is not None
-                else row["turnover_x"]
+            # Execute query
+            rows = stats_system.db.execute_query(query, params)
+            [totals] = stats_system.db.execute_query(
+                PASS_STATS_QUERY.format(passes=PASS_ROWS_SELECT + where), params
             )
-            dest_y = (
-                row["receiver_y"]
-                if row["receiver_y"] is not None
-                else row["turnover_y"]
+            stats = pass_stats(totals)
+
+            events = [
+                {
+                    "game_id": row["game_id"],
+                    "event_type": row["event_type"],
+                    "pass_type": (
+                        PASS_TYPES[row["pass_type"]]
+                        if row["pass_type"] is not None
+                        else None
+                    ),
+                    "thrower_id": row["thrower_id"],
+                    "thrower_name": row["thrower_name"],
+                    "receiver_id": row["receiver_id"],
+                    "receiver_name": row["receiver_name"],
+                    "thrower_x": row["thrower_x"],
+                    "thrower_y": row["thrower_y"],
+                    "receiver_x": row["receiver_x"],
+                    "receiver_y": row["receiver_y"],
+                    "turnover_x": row["turnover_x"],
+                    "turnover_y": row["turnover_y"],
+                    "result": RESULTS[row["result"]],
+                    "vertical_yards": _round(row["vertical_yards"]),
+                    "horizontal_yards": _round(row["horizontal_yards"]),
+                    "distance": _round(row["distance"]),
+                    "year": row["year"],
+                }
+                for row in rows
+            ]
+
+            return {
+                "events": events,
+                "stats": stats,
+                "total": len(events),
+            }
+        except Exception as e:
+            print(f"Error getting pass events: {e}")
+            raise HTTPException(status_code=500, detail=str(e)) from e
+
+    @router.get("/api/pass-events/heatmap")
+    async def get_pass_heatmap(
+        filters: dict = Depends(pass_event_filters),
+        point: str = Query(
+            "origin", description="Pass point to bin: origin or destination"
+        ),
+        bins_x: int = Query(
+            DEFAULT_BINS_X, ge=1, le=54, description="Grid columns across the field"
+        ),
+        bins_y: int = Query(
+            DEFAULT_BINS_Y, ge=1, le=120, description="Grid rows along the field"
+        ),
+    ):
+        """
+        Get pass events aggregated into a grid over the field.
+
+        Per cell returns pass count, completions, turnovers, completion rate and
+        average vertical gain, overall and by pass type. Season, team, thrower
+        and pass type filters on the default grid read the cells precomputed at
+        import; any other filter or grid bins the matching passes on the fly.
+        """
+        if point not in HEATMAP_POINTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported point: {point}. Use one of {', '.join(HEATMAP_POINTS)}",
             )
 
-            vertical_yards = None
-            horizontal_yards = None
-            distance = None
-
-            if dest_y is not None and row["thrower_y"] is not None:
-                vertical_yards = dest_y - row["thrower_y"]
-            if dest_x is not None and row["thrower_x"] is not None:
-                horizontal_yards = abs(dest_x - row["thrower_x"])
-            if vertical_yards is not None and horizontal_yards is not None:
-                distance = math.sqrt(vertical_yards**2 + horizontal_yards**2)
-
-            # Apply distance filter
-            if distance_min is not None and (
-                distance is None or distance < distance_min
-            ):
-                continue
-            if distance_max is not None and (
-                distance is None or distance > distance_max
-            ):
-                continue
-
-            event = {
-                "game_id": row["game_id"],
-                "event_type": event_type,
-                "pass_type": row["pass_type"],
-                "thrower_id": row["thrower_id"],
-                "thrower_name": row["thrower_name"],
-                "receiver_id": row["receiver_id"],
-                "receiver_name": row["receiver_name"],
-                "thrower_x": row["thrower_x"],
-                "thrower_y": row["thrower_y"],
-                "receiver_x": row["receiver_x"],
-                "receiver_y": row["receiver_y"],
-                "turnover_x": row["turnover_x"],
-                "turnover_y": row["turnover_y"],
-                "result": result,
-                "vertical_yards": (
-                    round(vertical_yards, 1) if vertical_yards is not None else None
-                ),
-                "horizontal_yards": (
-                    round(horizontal_yards, 1) if horizontal_yards is not None else None
-                ),
-                "distance": round(distance, 1) if distance is not None else None,
-                "year": row["year"],
-            }
-            events.append(event)
-
-            # Update stats
-            stats["total_throws"] += 1
-            if result == "goal":
-                stats["goals"] += 1
-                stats["completions"] += 1
-                if vertical_yards is not None:
-                    stats["total_yards"] += vertical_yards
-                    stats["completion_yards"] += vertical_yards
-            elif result == "completion":
-                stats["completions"] += 1
-                if vertical_yards is not None:
-                    stats["total_yards"] += vertical_yards
-                    stats["completion_yards"] += vertical_yards
+        try:
+            default_grid = (bins_x, bins_y) == (DEFAULT_BINS_X, DEFAULT_BINS_Y)
+            if default_grid and filters.keys() <= PRECOMPUTED_HEATMAP_FILTERS.keys():
+                binned = fetch_heatmap_cells(stats_system.db, filters, point)
+                source = "precomputed"
             else:
-                stats["turnovers"] += 1
-                if vertical_yards is not None:
-                    stats["total_yards"] += vertical_yards
-
-            # Track by type
-            pass_type = row["pass_type"]
-            if pass_type and pass_type in stats["by_type"]:
-                stats["by_type"][pass_type]["count"] += 1
-
-        # Calculate percentages
-        total = stats["total_throws"]
-        if total > 0:
-            stats["completions_pct"] = round(stats["completions"] / total * 100, 1)
-            stats["turnovers_pct"] = round(stats["turnovers"] / total * 100, 1)
-            stats["goals_pct"] = round(stats["goals"] / total * 100, 1)
-            stats["avg_yards_per_throw"] = round(stats["total_yards"] / total, 1)
-
-            for ptype in stats["by_type"]:
-                stats["by_type"][ptype]["pct"] = round(
-                    stats["by_type"][ptype]["count"] / total * 100, 1
+                where, params = build_pass_filters(**filters)
+                columns = fetch_pass_columns(
+                    stats_system.db, HEATMAP_PASSES_SELECT + where, params
                 )
-        else:
-            stats["completions_pct"] = 0
-            stats["turnovers_pct"] = 0
-            stats["goals_pct"] = 0
-            stats["avg_yards_per_throw"] = 0
-            for ptype in stats["by_type"]:
-                stats["by_type"][ptype]["pct"] = 0
-
-        if stats["completions"] > 0:
-            stats["avg_yards_per_completion"] = round(
-                stats["completion_yards"] / stats["completions"], 1
-            )
-        else:
-            stats["avg_yards_per_completion"] = 0
+                prefix = "thrower" if point == "origin" else "dest"
+                binned = bin_passes(
+                    cell_index(
+                        _floats(columns[f"{prefix}_x"]),
+                        _floats(columns[f"{prefix}_y"]),
+                        bins_x,
+                        bins_y,
+                    ),
+                    _codes(columns["pass_type"], len(PASS_TYPES)),
+                    np.array(columns["result"], dtype=np.uint8) != 2,
+                    _floats(columns["vertical_yards"]),
+                    bins_x * bins_y,
+                )
+                source = "events"
+
+            return {
+                "grid": {
+                    "point": point,
+                    "bins_x": bins_x,
+                    "bins_y": bins_y,
+                    "x_range": list(FIELD_X_RANGE),
+                    "y_range": list(FIELD_Y_RANGE),
+                },
+                "cells": heatmap_cells(binned, bins_x),
+                "total": int(binned["attempts"].sum()),
+                "source": source,
+            }
+        except Exception as e:
+            print(f"Error getting pass heatmap: {e}")
+            raise HTTPException(status_code=500, detail=str(e)) from e
 
-        return {
-            "events": events,
-            "stats": stats,
-            "total": len(events),
-        }
+    @router.get("/api/pass-events/network")
+    async def get_pass_network(
+        team_id: str | None = Query(None, description="Throwing team"),
+        season: int | None = Query(None, description="Filter by season year"),
+        game_id: str | None = Query(None, description="Filter by specific game"),
+    ):
+        """
+        Get the thrower -> receiver pass network of a team, season or game.
+
+        Returns directed edges with attempts, completion rate, completed
+        yards and goals, and per-player totals as nodes. Networks are cached
+        per team, season and game.
+        """
+        try:
+            cache = get_cache()
+            cache_key = cache_key_for_endpoint(
+                "pass_network", team_id=team_id, season=season, game_id=game_id
+            )
+            cached_result = cache.get(cache_key)
+            if cached_result is not None:
+                return cached_result
+
+            params = {
+                name: value
+                for name, value in (
+                    ("team_id", team_id),
+                    ("season", season),
+                    ("game_id", game_id),
+                )
+                if value is not None
+            }
+            filters = "".join(
+                f" AND pe.{PASS_NETWORK_FILTERS[name]} = :{name}" for name in params
+            )
+            rows = stats_system.db.execute_query(
+                PASS_NETWORK_QUERY.format(filters=filters), params
+            )
+            result = {
+                "team_id": team_id,
+                "season": season,
+                "game_id": game_id,
+                **pass_network(rows),
+            }
+            cache.set(cache_key, result)
+            return result
+        except Exception as e:
+            print(f"Error getting pass network: {e}")
+            raise HTTPException(status_code=500, detail=str(e)) from e
 
     @router.get("/api/pass-events/filters")
     async def get_pass_event_filters(
@@ -349,122 +852,27 @@ def create_pass_events_routes(stats_system):
         """
         Get available filter options for pass events.
 
-        Returns seasons, teams, and players for dropdown filters.
+        Returns seasons, teams, players and games for dropdown filters.
         Supports cascading filters - team/game selection filters player list.
+        Served from the in-memory facet index (see pass_event_facets.py), or
+        from queries scoped to the selection when caching is disabled.
         """
-        # Get available seasons
-        seasons_query = """
-        SELECT DISTINCT year FROM games ORDER BY year DESC
-        """
-        seasons_rows = stats_system.db.execute_query(seasons_query, {})
-        seasons = [row["year"] for row in seasons_rows]
-
-        # Get teams (optionally filtered by season or game)
-        teams_params = {}
-        if game_id:
-            # When game is selected, only return the two teams in that game
-            teams_query = """
-            SELECT DISTINCT t.team_id, t.full_name, t.abbrev
-            FROM teams t
-            JOIN games g ON (t.team_id = g.home_team_id OR t.team_id = g.away_team_id) AND t.year = g.year
-            WHERE g.game_id = :game_id
-            ORDER BY t.full_name
-            """
-            teams_params["game_id"] = game_id
-        else:
-            teams_query = """
-            SELECT DISTINCT t.team_id, t.full_name, t.abbrev
-            FROM teams t
-            """
-            conditions = []
-            if season:
-                conditions.append("t.year = :season")
-                teams_params["season"] = season
-            if conditions:
-                teams_query += " WHERE " + " AND ".join(conditions)
-            teams_query += " ORDER BY t.full_name"
-
-        teams_rows = stats_system.db.execute_query(teams_query, teams_params)
-        # Deduplicate teams by team_id
-        seen_teams = set()
-        teams = []
-        for row in teams_rows:
-            if row["team_id"] not in seen_teams:
-                seen_teams.add(row["team_id"])
-                teams.append(
-                    {
-                        "team_id": row["team_id"],
-                        "name": row["full_name"],
-                        "abbrev": row["abbrev"],
-                    }
+        try:
+            if not config.ENABLE_CACHE:
+                return query_pass_event_filters(
+                    stats_system.db, season=season, team_id=team_id, game_id=game_id
                 )
-
-        # Get players with pass events - filtered by season, team, or game
-        players_query = """
-        SELECT DISTINCT p.player_id, p.full_name
-        FROM players p
-        JOIN game_events ge ON (p.player_id = ge.thrower_id OR p.player_id = ge.receiver_id)
-        JOIN games g ON ge.game_id = g.game_id AND g.year = p.year
-        WHERE ge.event_type IN (18, 19, 20, 22)
-        """
-        players_params = {}
-        if season:
-            players_query += " AND g.year = :season"
-            players_params["season"] = season
-        if game_id:
-            players_query += " AND ge.game_id = :game_id"
-            players_params["game_id"] = game_id
-        if team_id:
-            players_query += """ AND (
-                (ge.team = 'home' AND g.home_team_id = :team_id) OR
-                (ge.team = 'away' AND g.away_team_id = :team_id)
-            )"""
-            players_params["team_id"] = team_id
-        players_query += " ORDER BY p.full_name LIMIT 500"
-
-        players_rows = stats_system.db.execute_query(players_query, players_params)
-        players = [
-            {"player_id": row["player_id"], "name": row["full_name"]}
-            for row in players_rows
-        ]
-
-        # Get games (optionally filtered by season and team)
-        games_query = """
-        SELECT g.game_id, g.year, g.week,
-               ht.abbrev as home_abbrev, at.abbrev as away_abbrev,
-               g.home_score, g.away_score, g.start_timestamp
-        FROM games g
-        LEFT JOIN teams ht ON g.home_team_id = ht.team_id AND g.year = ht.year
-        LEFT JOIN teams at ON g.away_team_id = at.team_id AND g.year = at.year
-        WHERE 1=1
-        """
-        games_params = {}
-        if season:
-            games_query += " AND g.year = :season"
-            games_params["season"] = season
-        if team_id:
-            games_query += (
-                " AND (g.home_team_id = :team_id OR g.away_team_id = :team_id)"
-            )
-            games_params["team_id"] = team_id
-        games_query += " ORDER BY g.start_timestamp DESC LIMIT 500"
-
-        games_rows = stats_system.db.execute_query(games_query, games_params)
-        games = [
-            {
-                "game_id": row["game_id"],
-                "label": f"{row['away_abbrev']} @ {row['home_abbrev']} ({row['away_score']}-{row['home_score']})",
-                "year": row["year"],
-                "week": row["week"],
+            facets = get_pass_event_facets(stats_system.db)
+            return {
+                "seasons": facets.seasons,
+                "teams": facets.teams(season=season, game_id=game_id),
+                "players": facets.players(
+                    season=season, team_id=team_id, game_id=game_id
+                ),
+                "games": facets.games(season=season, team_id=team_id),
             }
-            for row in games_rows
-        ]
-
-        return {
-            "seasons": seasons,
-            "teams": teams,
-            "players": players,
-            "games": games,
-        }
+        except Exception as e:
+            print(f"Error getting pass event filters: {e}")
+            raise HTTPException(status_code=500, detail=str(e)) from e
 
     return router
@@ -2,10 +2,14 @@
 Player statistics API module.
 
 Refactored from a single 1,002-line file into focused modules:
-- filters.py: Filter validation and HAVING clause building (127 lines)
+- columns.py: Shared column layout and fields projections of the main queries
+- export.py: Streaming CSV/NDJSON/Parquet exports of the full stats table
+- filters.py: Filter validation and WHERE clause building
 - percentile_calculator.py: Global percentile calculations (326 lines)
+- percentile_engine.py: In-process percentile ranking over cached populations
 - query_builder.py: Complex SQL query construction (507 lines)
 - route.py: Thin FastAPI route controller (211 lines)
+- season_rollup.py: Prefix-sum career totals over season ranges
 
 Total: 1,184 lines across 4 focused modules (was 1,002 lines in 1 monolithic file)
 All modules under 600 lines with clear separation of concerns.
@@ -13,30 +17,52 @@ All modules under 600 lines with clear separation of concerns.
 
 # Export main route creator
 # Export utility functions for backward compatibility
+from .columns import IDENTITY_COLUMNS, PLAYER_COLUMNS
+from .export import EXPORT_FORMATS, iter_player_chunks
 from .filters import (
     SEASON_STATS_ALIAS_MAPPING,
-    build_having_clause,
+    build_where_clause,
     get_team_career_sort_column,
 )
 from .percentile_calculator import (
     INVERT_STATS,
     STAT_FIELDS,
     calculate_global_percentiles,
+    percentile_key,
 )
+from .percentile_engine import PercentileEngine, get_percentile_engine
 from .query_builder import PlayerStatsQueryBuilder
 from .route import create_player_stats_route
+from .season_rollup import (
+    SeasonRollup,
+    clear_season_rollup_store,
+    get_season_rollup_store,
+)
 
 __all__ = [
     # Main route
     "create_player_stats_route",
+    # Column layout
+    "IDENTITY_COLUMNS",
+    "PLAYER_COLUMNS",
+    # Bulk export
+    "EXPORT_FORMATS",
+    "iter_player_chunks",
     # Filter utilities
-    "build_having_clause",
+    "build_where_clause",
     "get_team_career_sort_column",
     "SEASON_STATS_ALIAS_MAPPING",
     # Percentile utilities
     "calculate_global_percentiles",
+    "percentile_key",
     "STAT_FIELDS",
     "INVERT_STATS",
+    "PercentileEngine",
+    "get_percentile_engine",
     # Query builder
     "PlayerStatsQueryBuilder",
+    # Season rollups
+    "SeasonRollup",
+    "get_season_rollup_store",
+    "clear_season_rollup_store",
 ]
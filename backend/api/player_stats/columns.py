@@ -0,0 +1,257 @@
+"""
+Column layout shared by the player stats queries.
+
+Every main query returns the same positional row (PLAYER_COLUMNS order) that
+row_to_player_dict() reads. A fields projection keeps that layout and selects
+NULL in place of unrequested columns, so the row readers, the season rollups
+and the exporter work unchanged on projected rows.
+"""
+
+import re
+
+from .filters import SEASON_STATS_ALIAS_MAPPING
+
+# Row layout of every player stats query
+PLAYER_COLUMNS = [
+    "full_name",
+    "first_name",
+    "last_name",
+    "team_id",
+    "year",
+    "total_goals",
+    "total_assists",
+    "total_hockey_assists",
+    "total_blocks",
+    "calculated_plus_minus",
+    "total_completions",
+    "total_throw_attempts",
+    "completion_percentage",
+    "total_yards_thrown",
+    "total_yards_received",
+    "total_throwaways",
+    "total_stalls",
+    "total_drops",
+    "total_callahans",
+    "total_hucks_completed",
+    "total_hucks_attempted",
+    "total_hucks_received",
+    "total_pulls",
+    "total_o_points_played",
+    "total_d_points_played",
+    "total_seconds_played",
+    "total_o_opportunities",
+    "total_d_opportunities",
+    "total_o_opportunity_scores",
+    "team_name",
+    "team_full_name",
+    "games_played",
+    "possessions",
+    "score_total",
+    "total_points_played",
+    "total_yards",
+    "minutes_played",
+    "huck_percentage",
+    "offensive_efficiency",
+    "yards_per_turn",
+    "yards_per_completion",
+    "yards_per_reception",
+    "assists_per_turnover",
+    "player_id",
+]
+
+# Returned with every projection so rows stay identifiable
+IDENTITY_COLUMNS = (
+    "player_id",
+    "full_name",
+    "first_name",
+    "last_name",
+    "team_id",
+    "team_name",
+    "team_full_name",
+    "year",
+)
+
+# Always selected: identity plus the thresholds and the per-game /
+# per-possession denominators
+REQUIRED_COLUMNS = frozenset(
+    IDENTITY_COLUMNS + ("games_played", "possessions", "total_o_opportunities")
+)
+
+# Stats stored as plain columns of player_season_stats
+_STORED_STATS = [
+    "total_goals",
+    "total_assists",
+    "total_hockey_assists",
+    "total_blocks",
+    "calculated_plus_minus",
+    "total_completions",
+    "total_throw_attempts",
+    "total_yards_thrown",
+    "total_yards_received",
+    "total_throwaways",
+    "total_stalls",
+    "total_drops",
+    "total_callahans",
+    "total_hucks_completed",
+    "total_hucks_attempted",
+    "total_hucks_received",
+    "total_pulls",
+    "total_o_points_played",
+    "total_d_points_played",
+    "total_seconds_played",
+    "total_o_opportunities",
+    "total_d_opportunities",
+    "total_o_opportunity_scores",
+]
+
+_COMPLETION_PERCENTAGE = (
+    "CASE WHEN pss.total_throw_attempts >= 100 "
+    "THEN ROUND(pss.total_completions * 100.0 / pss.total_throw_attempts, 1) "
+    "ELSE NULL END"
+)
+
+SEASON_COLUMNS = {
+    "full_name": "p.full_name",
+    "first_name": "p.first_name",
+    "last_name": "p.last_name",
+    "team_id": "p.team_id",
+    "year": "pss.year",
+    **{stat: f"pss.{stat}" for stat in _STORED_STATS},
+    "completion_percentage": _COMPLETION_PERCENTAGE,
+    "team_name": "t.name",
+    "team_full_name": "t.full_name",
+    **SEASON_STATS_ALIAS_MAPPING,
+    "player_id": "pss.player_id",
+}
+
+CAREER_VIEW_COLUMNS = {
+    **{column: column for column in PLAYER_COLUMNS},
+    "team_id": "most_recent_team_id",
+    "year": "NULL",
+    "team_name": "most_recent_team_name",
+    "team_full_name": "most_recent_team_full_name",
+    "offensive_efficiency": "CASE WHEN total_o_opportunities >= 100 THEN ROUND(total_o_opportunity_scores * 100.0 / total_o_opportunities, 1) ELSE NULL END",
+}
+
+CAREER_CTE_COLUMNS = {
+    **{column: f"cs.{column}" for column in PLAYER_COLUMNS},
+    "full_name": "pi.full_name",
+    "first_name": "pi.first_name",
+    "last_name": "pi.last_name",
+    "team_id": "pi.most_recent_team_id",
+    "year": "NULL",
+    "team_name": "pi.most_recent_team_name",
+    "team_full_name": "pi.most_recent_team_full_name",
+    "possessions": "cs.total_o_opportunities",
+}
+
+TEAM_CAREER_COLUMNS = {
+    **{column: f"tcs.{column}" for column in PLAYER_COLUMNS},
+    "year": "NULL",
+    "team_name": "ti.name",
+    "team_full_name": "ti.full_name",
+}
+
+
+def _sum_columns(expression: str) -> str:
+    """Turn a season row expression into the same expression over SUM()s."""
+    return re.sub(r"\bpss\.(\w+)", r"SUM(pss.\1)", expression)
+
+
+# Career aggregates over player_season_stats, in the order the CTEs list them.
+# Derived stats are the season expressions applied to summed columns.
+_AGGREGATED_COLUMNS = [
+    "games_played",
+    *_STORED_STATS[:7],
+    "completion_percentage",
+    *_STORED_STATS[7:],
+    "possessions",
+    "score_total",
+    "total_points_played",
+    "total_yards",
+    "minutes_played",
+    "huck_percentage",
+    "offensive_efficiency",
+    "yards_per_turn",
+    "yards_per_completion",
+    "yards_per_reception",
+    "assists_per_turnover",
+]
+
+CAREER_AGGREGATES = {
+    column: _sum_columns(SEASON_COLUMNS[column]) for column in _AGGREGATED_COLUMNS
+}
+CAREER_AGGREGATES["calculated_plus_minus"] = (
+    "(SUM(pss.total_goals) + SUM(pss.total_assists) + SUM(pss.total_blocks) - "
+    "SUM(pss.total_throwaways) - SUM(pss.total_drops))"
+)
+
+# The all-teams career CTE has no yards-without-turnovers fallback
+_YARDS_PER_TURN_NO_FALLBACK = (
+    "CASE WHEN (SUM(pss.total_throwaways) + SUM(pss.total_stalls) + SUM(pss.total_drops)) > 0 "
+    "THEN ROUND((SUM(pss.total_yards_thrown) + SUM(pss.total_yards_received)) * 1.0 / "
+    "(SUM(pss.total_throwaways) + SUM(pss.total_stalls) + SUM(pss.total_drops)), 1) "
+    "ELSE NULL END"
+)
+
+
+def _render(columns: dict[str, str], names) -> str:
+    """Render "expression as alias" items, leaving bare column references bare."""
+    items = []
+    for name in names:
+        expression = columns[name]
+        if expression == name or expression.endswith(f".{name}"):
+            items.append(expression)
+        else:
+            items.append(f"{expression} as {name}")
+    return ",\n            ".join(items)
+
+
+def render_select_list(
+    columns: dict[str, str], selected: frozenset[str] | None = None
+) -> str:
+    """
+    Render a main query SELECT list in PLAYER_COLUMNS order.
+
+    Args:
+        columns: Map of column alias to SQL expression for the query's source
+        selected: Columns to compute (None = all); the rest select NULL
+
+    Returns:
+        SELECT list SQL
+    """
+    if selected is None:
+        return _render(columns, PLAYER_COLUMNS)
+    projected = {
+        name: columns[name] if name in selected else "NULL" for name in PLAYER_COLUMNS
+    }
+    return _render(projected, PLAYER_COLUMNS)
+
+
+def render_career_aggregates(
+    selected: frozenset[str] | None = None,
+    per_team: bool = False,
+) -> str:
+    """
+    Render the SELECT list of a career aggregate CTE over player_season_stats.
+
+    Args:
+        selected: Columns to aggregate (None = all); the rest are left out
+        per_team: Group by player and team (team_aggregates) rather than by
+            player (career_stats)
+
+    Returns:
+        SELECT list SQL
+    """
+    aggregates = dict(CAREER_AGGREGATES)
+    if per_team:
+        keys = {"player_id": "pss.player_id", "team_id": "pss.team_id"}
+        keys["most_recent_year"] = "MAX(pss.year)"
+    else:
+        keys = {"player_id": "pss.player_id"}
+        aggregates["yards_per_turn"] = _YARDS_PER_TURN_NO_FALLBACK
+        # possessions is read from total_o_opportunities in the outer query
+        del aggregates["possessions"]
+
+    names = [name for name in aggregates if selected is None or name in selected]
+    return _render({**keys, **aggregates}, [*keys, *names])
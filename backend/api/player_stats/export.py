@@ -0,0 +1,226 @@
+"""
+Streaming bulk export of player statistics.
+
+Rows come from PlayerStatsQueryBuilder without pagination through a
+server-side cursor, one chunk at a time, and are written out as CSV, NDJSON
+or Parquet as they arrive, so memory use doesn't grow with the export size.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from decimal import Decimal
+
+from config import config
+from sqlalchemy import text
+from utils.query import convert_to_per_game_stats, convert_to_per_possession_stats
+
+from .columns import PLAYER_COLUMNS
+from .percentile_calculator import (
+    STAT_FIELDS,
+    calculate_global_percentiles,
+    percentile_key,
+)
+from .query_builder import PlayerStatsQueryBuilder, row_to_player_dict
+
+# Rows fetched from the server-side cursor (and written) per chunk
+EXPORT_CHUNK_SIZE = 2000
+
+# Supported formats and their media types
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Columns exported as text; year is an integer and every other column a number
+TEXT_COLUMNS = {
+    "full_name",
+    "first_name",
+    "last_name",
+    "team_id",
+    "team_name",
+    "team_full_name",
+    "player_id",
+}
+
+
+def export_columns(include_percentiles: bool = False) -> list[str]:
+    """Column order of an export, with <stat>_percentile columns when requested."""
+    if not include_percentiles:
+        return list(PLAYER_COLUMNS)
+    return PLAYER_COLUMNS + [f"{field}_percentile" for field in STAT_FIELDS]
+
+
+def iter_player_chunks(
+    conn,
+    query_builder: PlayerStatsQueryBuilder,
+    per_mode: str = "total",
+    include_percentiles: bool = False,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[list[dict]]:
+    """
+    Stream every matching player as API-shaped dicts, chunk by chunk.
+
+    Percentiles are looked up per chunk (from the cached percentile population
+    when caching is enabled), so they are attached in the same pass over the
+    rows.
+
+    Args:
+        conn: Database connection
+        query_builder: Builder carrying the season/team/per/filter/sort options
+        per_mode: "total", "game" or "possession"
+        include_percentiles: Add a <stat>_percentile column for every stat
+        chunk_size: Rows fetched from the cursor at a time
+
+    Yields:
+        Lists of up to chunk_size player dicts
+    """
+    result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(
+        text(query_builder.build_main_query(paginate=False))
+    )
+
+    seasons = None if query_builder.is_career_mode else query_builder.seasons
+    teams = query_builder.teams if query_builder.teams[0] != "all" else None
+
+    for rows in result.partitions():
+        players = [row_to_player_dict(row) for row in rows]
+
+        percentiles = {}
+        if include_percentiles:
+            # A failed lookup fails the export rather than leaving the
+            # percentile columns empty
+            percentiles = calculate_global_percentiles(
+                conn,
+                players,
+                seasons=seasons,
+                teams=teams,
+                per_mode=per_mode,
+                use_engine=config.ENABLE_CACHE,
+                raise_errors=True,
+            )
+
+        if per_mode == "game":
+            players = convert_to_per_game_stats(players)
+        elif per_mode == "possession":
+            players = convert_to_per_possession_stats(players)
+
+        if include_percentiles:
+            for player in players:
+                values = percentiles.get(percentile_key(player), {})
+                for field in STAT_FIELDS:
+                    player[f"{field}_percentile"] = values.get(field)
+
+        yield players
+
+
+def _plain_value(value):
+    """Convert NUMERIC values to floats for serialization."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def write_csv(chunks: Iterable[list[dict]], columns: list[str]) -> Iterator[bytes]:
+    """Encode player chunks as CSV with a header row (NULL is an empty field)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for players in chunks:
+        writer.writerows(
+            [_plain_value(player.get(column)) for column in columns]
+            for player in players
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def write_ndjson(chunks: Iterable[list[dict]], columns: list[str]) -> Iterator[bytes]:
+    """Encode player chunks as one JSON object per line."""
+    for players in chunks:
+        lines = [
+            json.dumps({column: _plain_value(player.get(column)) for column in columns})
+            for player in players
+        ]
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose buffered bytes can be taken between writes."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def write_parquet(chunks: Iterable[list[dict]], columns: list[str]) -> Iterator[bytes]:
+    """Encode player chunks as a Parquet file with one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            (
+                column,
+                (
+                    pa.string()
+                    if column in TEXT_COLUMNS
+                    else pa.int64() if column == "year" else pa.float64()
+                ),
+            )
+            for column in columns
+        ]
+    )
+
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for players in chunks:
+            if not players:
+                continue
+            arrays = {
+                column: [
+                    (
+                        player.get(column)
+                        if column in TEXT_COLUMNS
+                        else _plain_value(player.get(column))
+                    )
+                    for player in players
+                ]
+                for column in columns
+            }
+            writer.write_table(pa.table(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+EXPORT_WRITERS = {
+    "csv": write_csv,
+    "ndjson": write_ndjson,
+    "parquet": write_parquet,
+}
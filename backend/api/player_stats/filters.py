@@ -2,8 +2,69 @@
 Filter building and validation for player statistics queries.
 """
 
+import re
 
-def build_having_clause(
+from utils.query import is_rate_stat
+
+# Valid operators for security
+VALID_FILTER_OPERATORS = {">", "<", ">=", "<=", "="}
+
+# A bare "table.column" reference, as opposed to a calculated expression
+_COLUMN_REFERENCE = re.compile(r"^\w+\.\w+$")
+
+_PYTHON_OPERATORS = {
+    ">": lambda a, b: a > b,
+    "<": lambda a, b: a < b,
+    ">=": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+    "=": lambda a, b: a == b,
+}
+
+
+def _parse_filters(custom_filters: list) -> list[tuple[str, str, float]]:
+    """Validate custom filters into (field, operator, value) tuples."""
+    parsed = []
+    for f in custom_filters or []:
+        field = f.get("field", "")
+        operator = f.get("operator", "")
+
+        # Validate operator
+        if operator not in VALID_FILTER_OPERATORS:
+            continue
+
+        # Validate field (basic SQL injection protection)
+        if not field or not field.replace("_", "").isalnum():
+            continue
+
+        try:
+            # Ensure value is numeric
+            parsed.append((field, operator, float(f.get("value", 0))))
+        except (ValueError, TypeError):
+            continue
+    return parsed
+
+
+def _rate_condition(
+    column: str, operator: str, value: float, denominator: str, scale: int = 1
+) -> str:
+    """
+    Compare a counting stat rate without dividing every row.
+
+    ``column * scale / denominator <op> value`` (0 when the denominator is not
+    positive) is rewritten as ``column * scale <op> value * denominator``,
+    which skips the CASE and the NUMERIC division per row. Both sides still
+    read row values, so the comparison is evaluated per row and cannot be an
+    index search.
+    """
+    scaled = f"{column} * {scale}" if scale != 1 else column
+    comparison = f"{scaled} {operator} {value} * {denominator}"
+    if _PYTHON_OPERATORS[operator](0, value):
+        # Rows without games/possessions compare as 0, which passes
+        return f"(COALESCE({denominator}, 0) <= 0 OR {comparison})"
+    return f"({denominator} > 0 AND {comparison})"
+
+
+def build_where_clause(
     custom_filters: list,
     per_game: bool = False,
     per_possession: bool = False,
@@ -11,7 +72,15 @@ def build_having_clause(
     alias_mapping: dict | None = None,
 ) -> str:
     """
-    Build a HAVING clause from custom filters.
+    Build WHERE conditions from custom filters.
+
+    Every query filters rows that already hold the filtered values
+    (player_season_stats, the career materialized views, or an aggregated
+    CTE's output), so the conditions go in a WHERE clause. A plain filter
+    on a stored column is ``column <op> value``, which an index on the column
+    can serve. Per-game and per-possession conversions are expressed as
+    multiplications against games_played / total_o_opportunities rather than
+    divisions.
 
     Args:
         custom_filters: List of filter dicts with 'field', 'operator', and 'value'
@@ -21,70 +90,37 @@ def build_having_clause(
         alias_mapping: Optional dict mapping field aliases to full SQL expressions (for season stats)
 
     Returns:
-        HAVING clause string (without "HAVING" keyword) or empty string
+        WHERE conditions string (without "WHERE" keyword) or empty string
     """
-    if not custom_filters:
-        return ""
-
-    # Valid operators for security
-    valid_operators = {">", "<", ">=", "<=", "="}
-
-    # Stats that should not be divided (already percentages/ratios or special fields)
-    non_counting_stats = {
-        "completion_percentage",
-        "huck_percentage",
-        "offensive_efficiency",
-        "yards_per_turn",
-        "yards_per_completion",
-        "yards_per_reception",
-        "assists_per_turnover",
-        "games_played",
-        "full_name",
-    }
-
     conditions = []
-    for f in custom_filters:
-        field = f.get("field", "")
-        operator = f.get("operator", "")
-        value = f.get("value", 0)
-
-        # Validate operator
-        if operator not in valid_operators:
-            continue
-
-        # Validate field (basic SQL injection protection)
-        if not field or not field.replace("_", "").isalnum():
-            continue
-
-        # Build field reference
+    for field, operator, value in _parse_filters(custom_filters):
         # Check if this field has an alias mapping (for calculated columns in season stats)
         if alias_mapping and field in alias_mapping:
-            # Use the full SQL expression from the mapping
-            field_ref = alias_mapping[field]
-        elif per_possession and field not in non_counting_stats:
-            # For per-possession filters on counting stats, divide by possessions and multiply by 100
-            if table_prefix:
-                field_ref = f"CASE WHEN COALESCE({table_prefix}total_o_opportunities, 0) > 0 THEN CAST({table_prefix}{field} AS NUMERIC) / {table_prefix}total_o_opportunities * 100 ELSE 0 END"
-            else:
-                field_ref = f"CASE WHEN total_o_opportunities > 0 THEN CAST({field} AS NUMERIC) / total_o_opportunities * 100 ELSE 0 END"
-        elif per_game and field not in non_counting_stats:
-            # For per-game filters on counting stats, divide by games_played
-            if table_prefix:
-                field_ref = f"CASE WHEN COALESCE(gc.games_played, 0) > 0 THEN CAST({table_prefix}{field} AS NUMERIC) / gc.games_played ELSE 0 END"
-            else:
-                field_ref = f"CASE WHEN games_played > 0 THEN CAST({field} AS NUMERIC) / games_played ELSE 0 END"
+            expression = alias_mapping[field]
+            column = (
+                expression if _COLUMN_REFERENCE.match(expression) else f"({expression})"
+            )
+            games = alias_mapping.get("games_played", f"{table_prefix}games_played")
+            possessions = alias_mapping.get(
+                "possessions", f"{table_prefix}total_o_opportunities"
+            )
         else:
-            field_ref = f"{table_prefix}{field}" if table_prefix else field
-
-        # Build condition
-        try:
-            # Ensure value is numeric
-            numeric_value = float(value)
-            conditions.append(f"{field_ref} {operator} {numeric_value}")
-        except (ValueError, TypeError):
-            continue
+            column = f"{table_prefix}{field}"
+            games = f"{table_prefix}games_played"
+            possessions = f"{table_prefix}total_o_opportunities"
+
+        if per_possession and is_rate_stat(field, per_possession=True):
+            # Per-100-possession rate on counting stats
+            conditions.append(
+                _rate_condition(column, operator, value, possessions, scale=100)
+            )
+        elif per_game and is_rate_stat(field, per_game=True):
+            # Per-game rate on counting stats
+            conditions.append(_rate_condition(column, operator, value, games))
+        else:
+            conditions.append(f"{column} {operator} {value}")
 
-    return " AND ".join(conditions) if conditions else ""
+    return " AND ".join(conditions)
 
 
 def get_team_career_sort_column(
@@ -103,37 +139,23 @@ def get_team_career_sort_column(
     Returns:
         SQL expression for the sort column
     """
-    # Stats that should not be divided (already percentages/ratios or special fields)
-    non_counting_stats = [
-        "full_name",
-        "completion_percentage",
-        "huck_percentage",
-        "offensive_efficiency",
-        "yards_per_turn",
-        "yards_per_completion",
-        "yards_per_reception",
-        "assists_per_turnover",
-        "games_played",
-    ]
-
     # If per_possession mode and this is a counting stat, divide by possessions and multiply by 100
-    if per_possession and sort_key not in non_counting_stats:
+    if per_possession and is_rate_stat(sort_key, per_possession=True):
         # Use COALESCE to handle NULL total_o_opportunities
         return f"CASE WHEN COALESCE(tcs.total_o_opportunities, 0) > 0 THEN CAST(tcs.{sort_key} AS NUMERIC) / tcs.total_o_opportunities * 100 ELSE 0 END"
 
     # If per_game mode and this is a counting stat, divide by games_played
-    if per_game and sort_key not in non_counting_stats:
-        # Use COALESCE to handle the LEFT JOIN case where gc.games_played might be NULL
-        return f"CASE WHEN COALESCE(gc.games_played, 0) > 0 THEN CAST(tcs.{sort_key} AS NUMERIC) / gc.games_played ELSE 0 END"
+    if per_game and is_rate_stat(sort_key, per_game=True):
+        return f"CASE WHEN COALESCE(tcs.games_played, 0) > 0 THEN CAST(tcs.{sort_key} AS NUMERIC) / tcs.games_played ELSE 0 END"
 
-    # Otherwise use the column directly from team_career_stats CTE
+    # Otherwise use the column directly from player_team_career_stats
     return f"tcs.{sort_key}"
 
 
 # Alias mapping for season stats - maps calculated column aliases to their full SQL expressions
-# This is needed because PostgreSQL can't reference SELECT aliases in HAVING clauses
+# This is needed because PostgreSQL can't reference SELECT aliases in WHERE clauses
 SEASON_STATS_ALIAS_MAPPING = {
-    "games_played": "COUNT(DISTINCT CASE WHEN (pgs.o_points_played > 0 OR pgs.d_points_played > 0 OR pgs.seconds_played > 0 OR pgs.goals > 0 OR pgs.assists > 0) THEN pgs.game_id ELSE NULL END)",
+    "games_played": "pss.games_played",
     "possessions": "pss.total_o_opportunities",
     "score_total": "(pss.total_goals + pss.total_assists)",
     "total_points_played": "(pss.total_o_points_played + pss.total_d_points_played)",
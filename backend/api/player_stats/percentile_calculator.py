@@ -46,6 +46,17 @@ STAT_FIELDS = [
 # Stats where lower is better (turnovers, etc.) - percentile should be inverted
 INVERT_STATS = ["total_throwaways", "total_stalls", "total_drops"]
 
+# Ratios whose percentile is NULL in career view mode when the player has no turnovers
+TURNOVER_RATIO_STATS = ["yards_per_turn", "assists_per_turnover"]
+
+# Ratios whose percentile is NULL in career view mode when below their threshold
+THRESHOLD_RATIO_STATS = [
+    "completion_percentage",
+    "offensive_efficiency",
+    "yards_per_completion",
+    "yards_per_reception",
+]
+
 # Stats that are already rates/percentages and should NOT be divided by games_played
 NON_COUNTING_STATS = [
     "completion_percentage",
@@ -59,28 +70,41 @@ NON_COUNTING_STATS = [
 ]
 
 
-def build_percentile_expressions(per_mode: str = "total") -> list[str]:
+def selected_stat_fields(fields: list[str] | None = None) -> list[str]:
+    """STAT_FIELDS restricted to a fields projection (None = all)."""
+    if fields is None:
+        return STAT_FIELDS
+    return [field for field in STAT_FIELDS if field in fields]
+
+
+def _value_expression(field: str, per_mode: str) -> str:
+    """Build the SQL value a stat is ranked by for the given per_mode."""
+    if per_mode == "game" and field not in NON_COUNTING_STATS:
+        # For per-game mode, divide counting stats by games_played
+        return f"CASE WHEN games_played > 0 THEN CAST({field} AS NUMERIC) / games_played ELSE 0 END"
+    if per_mode == "possession" and field not in NON_COUNTING_STATS:
+        # For per-possession mode, divide by possessions and multiply by 100
+        return f"CASE WHEN possessions > 0 THEN CAST({field} AS NUMERIC) / possessions * 100 ELSE 0 END"
+    # For total mode or non-counting stats, use raw value
+    return field
+
+
+def build_percentile_expressions(
+    per_mode: str = "total", fields: list[str] | None = None
+) -> list[str]:
     """
     Build CUME_DIST() SQL expressions for all stats.
 
     Args:
         per_mode: "total" for raw totals, "game" for per-game, "possession" for per-100-possessions
+        fields: Stats to rank (None = all of STAT_FIELDS)
 
     Returns:
         List of SQL expressions for calculating percentiles
     """
     percentile_expressions = []
-    for field in STAT_FIELDS:
-        # Determine the value expression based on per_mode
-        if per_mode == "game" and field not in NON_COUNTING_STATS:
-            # For per-game mode, divide counting stats by games_played
-            value_expr = f"CASE WHEN games_played > 0 THEN CAST({field} AS NUMERIC) / games_played ELSE 0 END"
-        elif per_mode == "possession" and field not in NON_COUNTING_STATS:
-            # For per-possession mode, divide by possessions and multiply by 100
-            value_expr = f"CASE WHEN possessions > 0 THEN CAST({field} AS NUMERIC) / possessions * 100 ELSE 0 END"
-        else:
-            # For total mode or non-counting stats, use raw value
-            value_expr = field
+    for field in selected_stat_fields(fields):
+        value_expr = _value_expression(field, per_mode)
 
         # For stats where lower is better, invert the percentile
         if field in INVERT_STATS:
@@ -91,12 +115,72 @@ def build_percentile_expressions(per_mode: str = "total") -> list[str]:
     return percentile_expressions
 
 
+def build_career_percentile_expressions(
+    per_mode: str = "total", fields: list[str] | None = None
+) -> list[str]:
+    """
+    Build CUME_DIST() SQL expressions for the career materialized views.
+
+    Same as build_percentile_expressions, but thresholded ratios get a NULL
+    percentile when the displayed stat is "-".
+
+    Args:
+        per_mode: "total" for raw totals, "game" for per-game, "possession" for per-100-possessions
+        fields: Stats to rank (None = all of STAT_FIELDS)
+
+    Returns:
+        List of SQL expressions for calculating percentiles
+    """
+    modified_expressions = []
+    for field in selected_stat_fields(fields):
+        value_expr = _value_expression(field, per_mode)
+
+        if field in INVERT_STATS:
+            expr = f"ROUND(CAST((1 - CUME_DIST() OVER (ORDER BY {value_expr})) * 100 AS NUMERIC), 0) as {field}_percentile"
+        elif field in TURNOVER_RATIO_STATS:
+            # Return NULL percentile when turnovers = 0 (displayed value is not a ratio)
+            expr = f"""CASE WHEN (total_throwaways + total_stalls + total_drops) = 0 THEN NULL
+                ELSE ROUND(CAST(CUME_DIST() OVER (ORDER BY CASE WHEN (total_throwaways + total_stalls + total_drops) > 0 THEN {value_expr} ELSE NULL END NULLS FIRST) * 100 AS NUMERIC), 0)
+            END as {field}_percentile"""
+        elif field in THRESHOLD_RATIO_STATS:
+            # Return NULL percentile when the stat is below its threshold (stat shows "-")
+            expr = f"""CASE WHEN {field} IS NULL THEN NULL
+                ELSE ROUND(CAST(CUME_DIST() OVER (ORDER BY {value_expr} NULLS FIRST) * 100 AS NUMERIC), 0)
+            END as {field}_percentile"""
+        else:
+            expr = f"ROUND(CAST(CUME_DIST() OVER (ORDER BY {value_expr} NULLS FIRST) * 100 AS NUMERIC), 0) as {field}_percentile"
+        modified_expressions.append(expr)
+    return modified_expressions
+
+
+def percentile_key(player: dict) -> str:
+    """
+    Build the key a player row's percentiles are stored under.
+
+    Career rows (year is None) are one per player and team (the most recent
+    team without a team filter). Season rows are one per player, team and year.
+
+    Args:
+        player: Player dict with player_id, team_id and year
+
+    Returns:
+        Percentile key string
+    """
+    key = f"{player['player_id']}_{player.get('team_id') or ''}"
+    if player.get("year") is None:
+        return key
+    return f"{key}_{player['year']}"
+
+
 def calculate_global_percentiles(
     conn,
     players: list[dict],
     seasons: list | None = None,
     teams: list | None = None,
     per_mode: str = "total",
+    use_engine: bool = True,
+    fields: list[str] | None = None,
+    raise_errors: bool = False,
 ) -> dict:
     """
     Calculate global percentile rankings for each player's stats.
@@ -107,12 +191,18 @@ def calculate_global_percentiles(
         seasons: List of season years to filter by (None or ["career"] = all seasons)
         teams: List of team IDs to filter by (None or ["all"] = all teams)
         per_mode: "total" for raw totals, "game" for per-game, "possession" for per-100-possessions
+        use_engine: Rank in-process against a cached population (see
+            percentile_engine.py) instead of running the window queries in SQL
+        fields: Stats to calculate percentiles for (None = all of STAT_FIELDS)
+        raise_errors: Let query errors propagate instead of logging them and
+            returning no percentiles
 
     Returns:
-        Dictionary mapping full_name to percentile values for each stat.
-        Percentiles are calculated across all players in the filtered dataset (0-100 scale).
+        Dictionary mapping percentile_key(player) to percentile values for each
+        stat, for the given players only. Percentiles are calculated across all
+        players in the filtered dataset (0-100 scale).
     """
-    if not players:
+    if not players or not selected_stat_fields(fields):
         return {}
 
     # Default to career mode if not specified
@@ -126,285 +216,250 @@ def calculate_global_percentiles(
     if teams is None or (isinstance(teams, list) and "all" in teams):
         teams = None
 
-    # Extract full names for filtering
-    full_names = [p["full_name"] for p in players]
-    names_str = ",".join(
-        [f"'{name.replace(chr(39), chr(39)*2)}'" for name in full_names]
-    )
-
-    # Build CUME_DIST() expressions for all stats
-    percentile_expressions = build_percentile_expressions(per_mode)
-
-    # Build WHERE clause filters for seasons and teams
+    # Build WHERE clause filters for seasons and teams (bound as array parameters)
     season_where = ""
     team_where = ""
+    params = {}
 
     if not is_career_mode and seasons:
-        if len(seasons) == 1:
-            season_where = f" AND pss.year = {seasons[0]}"
-        else:
-            season_years_str = ",".join(str(s) for s in seasons)
-            season_where = f" AND pss.year IN ({season_years_str})"
+        season_where = " AND pss.year = ANY(:seasons)"
+        params["seasons"] = sorted(int(s) for s in seasons)
 
     if teams:
-        if len(teams) == 1:
-            team_where = f" AND pss.team_id = '{teams[0]}'"
+        team_where = " AND pss.team_id = ANY(:teams)"
+        params["teams"] = sorted(teams)
+
+    keys = [percentile_key(p) for p in players]
+
+    try:
+        if use_engine:
+            return _calculate_engine_percentiles(
+                conn,
+                keys,
+                is_career_mode,
+                season_where,
+                team_where,
+                params,
+                per_mode,
+                fields,
+            )
+        return _calculate_sql_percentiles(
+            conn,
+            keys,
+            is_career_mode,
+            season_where,
+            team_where,
+            params,
+            per_mode,
+            fields,
+        )
+    except Exception as e:
+        if raise_errors:
+            raise
+        print(f"Error calculating percentiles: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return {}
+
+
+def _calculate_engine_percentiles(
+    conn,
+    keys: list[str],
+    is_career_mode: bool,
+    season_where: str,
+    team_where: str,
+    params: dict,
+    per_mode: str,
+    fields: list[str] | None = None,
+) -> dict:
+    """Rank players against a cached in-process population."""
+    from .percentile_engine import PercentilePopulation, get_percentile_engine
+
+    population_key = (
+        tuple(params.get("seasons", ["career"])),
+        tuple(params.get("teams", ["all"])),
+    )
+
+    def load_population():
+        if is_career_mode:
+            population_sql = _build_career_population_query(team_where)
         else:
-            team_ids_str = ",".join([f"'{t}'" for t in teams])
-            team_where = f" AND pss.team_id IN ({team_ids_str})"
+            population_sql = _build_season_population_query(season_where, team_where)
+        return PercentilePopulation.from_rows(
+            conn.execute(text(population_sql), params),
+            # Only the career view queries return NULL percentiles for ratios
+            null_ratio_percentiles=is_career_mode,
+        )
+
+    population = get_percentile_engine().get_population(population_key, load_population)
+    return population.percentiles_for(keys, per_mode, fields)
+
+
+def _calculate_sql_percentiles(
+    conn,
+    keys: list[str],
+    is_career_mode: bool,
+    season_where: str,
+    team_where: str,
+    params: dict,
+    per_mode: str,
+    fields: list[str] | None = None,
+) -> dict:
+    """Rank players with CUME_DIST() window queries in Postgres."""
+    # Build CUME_DIST() expressions for the requested stats
+    stat_fields = selected_stat_fields(fields)
+    percentile_expressions = build_percentile_expressions(per_mode, fields)
 
     # Calculate global percentiles based on the appropriate data source
     if is_career_mode:
         percentiles_sql = _build_career_percentiles_query(
-            percentile_expressions, team_where, names_str, per_mode
+            percentile_expressions, team_where, per_mode, fields
         )
     else:
         percentiles_sql = _build_season_percentiles_query(
-            percentile_expressions, season_where, team_where, names_str, per_mode
+            percentile_expressions, season_where, team_where, per_mode
         )
 
-    try:
-        result = conn.execute(text(percentiles_sql))
-        percentiles_map = {}
-
-        for row in result:
-            full_name = row[0]
-            percentiles = {}
-            # Map all percentile values (skip the first column which is full_name)
-            for i, field in enumerate(STAT_FIELDS):
-                percentiles[field] = row[
-                    i + 1
-                ]  # Keep None as-is for frontend to show "-"
-            percentiles_map[full_name] = percentiles
-
-        return percentiles_map
-    except Exception as e:
-        print(f"Error calculating percentiles: {e}")
-        import traceback
+    result = conn.execute(text(percentiles_sql), {**params, "keys": keys})
+    percentiles_map = {}
 
-        traceback.print_exc()
-        return {}
+    for row in result:
+        key = row[0]
+        percentiles = {}
+        # Map all percentile values (skip the first column which is the key)
+        for i, field in enumerate(stat_fields):
+            percentiles[field] = row[i + 1]  # Keep None as-is for frontend to show "-"
+        percentiles_map[key] = percentiles
 
+    return percentiles_map
 
-def _build_career_percentiles_query(
-    percentile_expressions: list[str],
-    team_where: str,
-    names_str: str,
-    per_mode: str = "total",
-) -> str:
-    """Build SQL query for career mode percentiles.
 
-    Uses the player_career_stats materialized view to ensure percentiles
-    match the displayed stats exactly.
+def _build_career_population_query(team_where: str) -> str:
+    """Build SQL returning (percentile_key, *STAT_FIELDS) for the career population.
+
+    Without a team filter this reads the player_career_stats materialized view,
+    with one the player_team_career_stats view (one row per player and team),
+    so percentiles match the displayed stats exactly.
     """
-    # For career mode without team filter, use the pre-aggregated view directly
-    # This ensures percentiles match the main query exactly
     if not team_where:
-        # Build modified percentile expressions that handle 0-turnover edge cases
-        # For yards_per_turn and assists_per_turnover, return NULL when turnovers = 0
-        modified_expressions = []
-        for field in STAT_FIELDS:
-            # Determine the value expression based on per_mode
-            if per_mode == "game" and field not in NON_COUNTING_STATS:
-                value_expr = f"CASE WHEN games_played > 0 THEN CAST({field} AS NUMERIC) / games_played ELSE 0 END"
-            elif per_mode == "possession" and field not in NON_COUNTING_STATS:
-                value_expr = f"CASE WHEN possessions > 0 THEN CAST({field} AS NUMERIC) / possessions * 100 ELSE 0 END"
-            else:
-                value_expr = field
-
-            if field in INVERT_STATS:
-                expr = f"ROUND(CAST((1 - CUME_DIST() OVER (ORDER BY {value_expr})) * 100 AS NUMERIC), 0) as {field}_percentile"
-            elif field == "yards_per_turn":
-                # Return NULL percentile when turnovers = 0 (displayed value is total yards, not a ratio)
-                expr = f"""CASE WHEN (total_throwaways + total_stalls + total_drops) = 0 THEN NULL
-                    ELSE ROUND(CAST(CUME_DIST() OVER (ORDER BY CASE WHEN (total_throwaways + total_stalls + total_drops) > 0 THEN {value_expr} ELSE NULL END NULLS FIRST) * 100 AS NUMERIC), 0)
-                END as {field}_percentile"""
-            elif field == "assists_per_turnover":
-                # Return NULL percentile when turnovers = 0 (displayed value is NULL or not meaningful)
-                expr = f"""CASE WHEN (total_throwaways + total_stalls + total_drops) = 0 THEN NULL
-                    ELSE ROUND(CAST(CUME_DIST() OVER (ORDER BY CASE WHEN (total_throwaways + total_stalls + total_drops) > 0 THEN {value_expr} ELSE NULL END NULLS FIRST) * 100 AS NUMERIC), 0)
-                END as {field}_percentile"""
-            elif field == "completion_percentage":
-                # Return NULL percentile when throw_attempts < 100 (stat shows "-")
-                expr = f"""CASE WHEN {field} IS NULL THEN NULL
-                    ELSE ROUND(CAST(CUME_DIST() OVER (ORDER BY {value_expr} NULLS FIRST) * 100 AS NUMERIC), 0)
-                END as {field}_percentile"""
-            elif field == "offensive_efficiency":
-                # Return NULL percentile when o_opportunities < 100 (stat shows "-")
-                expr = f"""CASE WHEN {field} IS NULL THEN NULL
-                    ELSE ROUND(CAST(CUME_DIST() OVER (ORDER BY {value_expr} NULLS FIRST) * 100 AS NUMERIC), 0)
-                END as {field}_percentile"""
-            elif field == "yards_per_completion":
-                # Return NULL percentile when completions = 0 (stat shows "-")
-                expr = f"""CASE WHEN {field} IS NULL THEN NULL
-                    ELSE ROUND(CAST(CUME_DIST() OVER (ORDER BY {value_expr} NULLS FIRST) * 100 AS NUMERIC), 0)
-                END as {field}_percentile"""
-            elif field == "yards_per_reception":
-                # Return NULL percentile when catches = 0 (stat shows "-")
-                expr = f"""CASE WHEN {field} IS NULL THEN NULL
-                    ELSE ROUND(CAST(CUME_DIST() OVER (ORDER BY {value_expr} NULLS FIRST) * 100 AS NUMERIC), 0)
-                END as {field}_percentile"""
-            else:
-                expr = f"ROUND(CAST(CUME_DIST() OVER (ORDER BY {value_expr} NULLS FIRST) * 100 AS NUMERIC), 0) as {field}_percentile"
-            modified_expressions.append(expr)
-
         return f"""
-        WITH global_stats AS (
-            SELECT
-                full_name,
-                {','.join(modified_expressions)}
-            FROM player_career_stats
-            WHERE games_played > 0
-        )
-        SELECT *
-        FROM global_stats
-        WHERE full_name IN ({names_str})
+        SELECT
+            player_id || '_' || COALESCE(most_recent_team_id, '') as percentile_key,
+            {', '.join(STAT_FIELDS)}
+        FROM player_career_stats
+        WHERE games_played > 0
         """
 
-    # For career mode with team filter, we need to aggregate from season stats
-    # but group by player_id to match the main query behavior
     return f"""
-    WITH team_career_stats AS (
-        SELECT
-            pss.player_id,
-            SUM(pss.total_goals) as total_goals,
-            SUM(pss.total_assists) as total_assists,
-            SUM(pss.total_hockey_assists) as total_hockey_assists,
-            SUM(pss.total_blocks) as total_blocks,
-            (SUM(pss.total_goals) + SUM(pss.total_assists) + SUM(pss.total_blocks) -
-             SUM(pss.total_throwaways) - SUM(pss.total_drops)) as calculated_plus_minus,
-            SUM(pss.total_completions) as total_completions,
-            CASE
-                WHEN SUM(pss.total_throw_attempts) >= 100
-                THEN SUM(pss.total_completions) * 100.0 / SUM(pss.total_throw_attempts)
-                ELSE NULL
-            END as completion_percentage,
-            SUM(pss.total_yards_thrown) as total_yards_thrown,
-            SUM(pss.total_yards_received) as total_yards_received,
-            SUM(pss.total_throwaways) as total_throwaways,
-            SUM(pss.total_stalls) as total_stalls,
-            SUM(pss.total_drops) as total_drops,
-            SUM(pss.total_callahans) as total_callahans,
-            SUM(pss.total_hucks_completed) as total_hucks_completed,
-            SUM(pss.total_hucks_attempted) as total_hucks_attempted,
-            SUM(pss.total_hucks_received) as total_hucks_received,
-            SUM(pss.total_pulls) as total_pulls,
-            SUM(pss.total_o_points_played) as total_o_points_played,
-            SUM(pss.total_d_points_played) as total_d_points_played,
-            SUM(pss.total_seconds_played) as total_seconds_played,
-            SUM(pss.total_o_opportunities) as total_o_opportunities,
-            SUM(pss.total_d_opportunities) as total_d_opportunities,
-            SUM(pss.total_o_opportunity_scores) as total_o_opportunity_scores,
-            SUM(pss.total_o_opportunities) as possessions,
-            (SUM(pss.total_goals) + SUM(pss.total_assists)) as score_total,
-            (SUM(pss.total_o_points_played) + SUM(pss.total_d_points_played)) as total_points_played,
-            (SUM(pss.total_yards_thrown) + SUM(pss.total_yards_received)) as total_yards,
-            ROUND(SUM(pss.total_seconds_played) / 60.0, 0) as minutes_played,
-            CASE WHEN SUM(pss.total_hucks_attempted) > 0
-                THEN SUM(pss.total_hucks_completed) * 100.0 / SUM(pss.total_hucks_attempted)
-                ELSE 0 END as huck_percentage,
-            CASE
-                WHEN SUM(pss.total_o_opportunities) >= 100
-                THEN SUM(pss.total_o_opportunity_scores) * 100.0 / SUM(pss.total_o_opportunities)
-                ELSE NULL
-            END as offensive_efficiency,
-            CASE
-                WHEN (SUM(pss.total_throwaways) + SUM(pss.total_stalls) + SUM(pss.total_drops)) > 0
-                THEN (SUM(pss.total_yards_thrown) + SUM(pss.total_yards_received)) * 1.0 /
-                     (SUM(pss.total_throwaways) + SUM(pss.total_stalls) + SUM(pss.total_drops))
-                ELSE NULL
-            END as yards_per_turn,
-            CASE
-                WHEN SUM(pss.total_completions) > 0
-                THEN SUM(pss.total_yards_thrown) * 1.0 / SUM(pss.total_completions)
-                ELSE NULL
-            END as yards_per_completion,
-            CASE
-                WHEN SUM(pss.total_catches) > 0
-                THEN SUM(pss.total_yards_received) * 1.0 / SUM(pss.total_catches)
-                ELSE NULL
-            END as yards_per_reception,
-            CASE
-                WHEN (SUM(pss.total_throwaways) + SUM(pss.total_stalls) + SUM(pss.total_drops)) > 0
-                THEN SUM(pss.total_assists) * 1.0 /
-                     (SUM(pss.total_throwaways) + SUM(pss.total_stalls) + SUM(pss.total_drops))
-                ELSE NULL
-            END as assists_per_turnover
-        FROM player_season_stats pss
-        WHERE 1=1{team_where}
-        GROUP BY pss.player_id
-    ),
-    games_count AS (
-        SELECT
-            pgs.player_id,
-            COUNT(DISTINCT pgs.game_id) as games_played
-        FROM player_game_stats pgs
-        WHERE (pgs.o_points_played > 0 OR pgs.d_points_played > 0
-               OR pgs.seconds_played > 0 OR pgs.goals > 0 OR pgs.assists > 0)
-              {team_where.replace("pss.", "pgs.")}
-        GROUP BY pgs.player_id
-    ),
-    player_info AS (
-        SELECT DISTINCT ON (pss.player_id)
-            pss.player_id,
-            p.full_name
-        FROM player_season_stats pss
-        JOIN players p ON pss.player_id = p.player_id AND pss.year = p.year
-        WHERE 1=1{team_where}
-        ORDER BY pss.player_id, pss.year DESC
-    ),
-    career_with_names AS (
-        SELECT
-            pi.full_name,
-            tcs.total_goals,
-            tcs.total_assists,
-            tcs.total_hockey_assists,
-            tcs.total_blocks,
-            tcs.calculated_plus_minus,
-            tcs.total_completions,
-            tcs.completion_percentage,
-            tcs.total_yards_thrown,
-            tcs.total_yards_received,
-            tcs.total_throwaways,
-            tcs.total_stalls,
-            tcs.total_drops,
-            tcs.total_callahans,
-            tcs.total_hucks_completed,
-            tcs.total_hucks_attempted,
-            tcs.total_hucks_received,
-            tcs.total_pulls,
-            tcs.total_o_points_played,
-            tcs.total_d_points_played,
-            tcs.total_seconds_played,
-            tcs.total_o_opportunities,
-            tcs.total_d_opportunities,
-            tcs.total_o_opportunity_scores,
-            COALESCE(gc.games_played, 0) as games_played,
-            tcs.possessions,
-            tcs.score_total,
-            tcs.total_points_played,
-            tcs.total_yards,
-            tcs.minutes_played,
-            tcs.huck_percentage,
-            tcs.offensive_efficiency,
-            tcs.yards_per_turn,
-            tcs.yards_per_completion,
-            tcs.yards_per_reception,
-            tcs.assists_per_turnover
-        FROM team_career_stats tcs
-        JOIN player_info pi ON tcs.player_id = pi.player_id
-        LEFT JOIN games_count gc ON tcs.player_id = gc.player_id
-        WHERE COALESCE(gc.games_played, 0) > 0
-    ),
+    SELECT
+        tcs.player_id || '_' || tcs.team_id as percentile_key,
+        {', '.join(f"tcs.{field}" for field in STAT_FIELDS)}
+    FROM player_team_career_stats tcs
+    WHERE tcs.games_played > 0{team_where.replace("pss.", "tcs.")}
+    """
+
+
+def _build_season_population_query(season_where: str, team_where: str) -> str:
+    """Build SQL returning (percentile_key, *STAT_FIELDS) for a season population.
+
+    Reads player_season_stats rows directly (games_played is stored on them),
+    joining players so the key uses the same team_id as the displayed row.
+    """
+    return f"""
+    SELECT
+        pss.player_id || '_' || p.team_id || '_' || pss.year as percentile_key,
+        pss.total_goals,
+        pss.total_assists,
+        pss.total_hockey_assists,
+        pss.total_blocks,
+        (pss.total_goals + pss.total_assists + pss.total_blocks -
+         pss.total_throwaways - pss.total_drops) as calculated_plus_minus,
+        pss.total_completions,
+        CASE
+            WHEN pss.total_throw_attempts >= 100
+            THEN pss.total_completions * 100.0 / pss.total_throw_attempts
+            ELSE NULL
+        END as completion_percentage,
+        pss.total_yards_thrown,
+        pss.total_yards_received,
+        pss.total_throwaways,
+        pss.total_stalls,
+        pss.total_drops,
+        pss.total_callahans,
+        pss.total_hucks_completed,
+        pss.total_hucks_attempted,
+        pss.total_hucks_received,
+        pss.total_pulls,
+        pss.total_o_points_played,
+        pss.total_d_points_played,
+        pss.total_seconds_played,
+        pss.total_o_opportunities,
+        pss.total_d_opportunities,
+        pss.total_o_opportunity_scores,
+        pss.games_played,
+        pss.total_o_opportunities as possessions,
+        (pss.total_goals + pss.total_assists) as score_total,
+        (pss.total_o_points_played + pss.total_d_points_played) as total_points_played,
+        (pss.total_yards_thrown + pss.total_yards_received) as total_yards,
+        pss.total_seconds_played / 60.0 as minutes_played,
+        CASE WHEN pss.total_hucks_attempted > 0
+            THEN pss.total_hucks_completed * 100.0 / pss.total_hucks_attempted
+            ELSE 0 END as huck_percentage,
+        CASE
+            WHEN pss.total_o_opportunities >= 100
+            THEN pss.total_o_opportunity_scores * 100.0 / pss.total_o_opportunities
+            ELSE NULL
+        END as offensive_efficiency,
+        CASE
+            WHEN (pss.total_throwaways + pss.total_stalls + pss.total_drops) > 0
+            THEN (pss.total_yards_thrown + pss.total_yards_received) * 1.0 /
+                 (pss.total_throwaways + pss.total_stalls + pss.total_drops)
+            ELSE NULL
+        END as yards_per_turn,
+        CASE
+            WHEN pss.total_completions > 0
+            THEN pss.total_yards_thrown * 1.0 / pss.total_completions
+            ELSE NULL
+        END as yards_per_completion,
+        CASE
+            WHEN pss.total_catches > 0
+            THEN pss.total_yards_received * 1.0 / pss.total_catches
+            ELSE NULL
+        END as yards_per_reception,
+        CASE
+            WHEN (pss.total_throwaways + pss.total_stalls + pss.total_drops) > 0
+            THEN pss.total_assists * 1.0 /
+                 (pss.total_throwaways + pss.total_stalls + pss.total_drops)
+            ELSE NULL
+        END as assists_per_turnover
+    FROM player_season_stats pss
+    JOIN players p ON pss.player_id = p.player_id AND pss.year = p.year
+    WHERE pss.games_played > 0{season_where}{team_where}
+    """
+
+
+def _build_career_percentiles_query(
+    percentile_expressions: list[str],
+    team_where: str,
+    per_mode: str = "total",
+    fields: list[str] | None = None,
+) -> str:
+    """Build SQL query for career mode percentiles."""
+    # The career views handle 0-turnover and below-threshold ratios specially
+    percentile_expressions = build_career_percentile_expressions(per_mode, fields)
+
+    return f"""
+    WITH population AS ({_build_career_population_query(team_where)}),
     global_stats AS (
         SELECT
-            full_name,
+            percentile_key,
             {','.join(percentile_expressions)}
-        FROM career_with_names
+        FROM population
     )
     SELECT *
     FROM global_stats
-    WHERE full_name IN ({names_str})
+    WHERE percentile_key = ANY(:keys)
     """
 
 
@@ -412,152 +467,21 @@ def _build_season_percentiles_query(
     percentile_expressions: list[str],
     season_where: str,
     team_where: str,
-    names_str: str,
     per_mode: str = "total",
 ) -> str:
     """Build SQL query for season-specific percentiles.
 
-    Groups by player_id to match the main query behavior, then joins to get full_name.
     Note: per_mode is used by percentile_expressions which are passed in pre-built.
     """
-    # Build filters for games_count CTE (replace pss. with pgs.)
-    games_season_where = season_where.replace("pss.", "pgs.")
-    games_team_where = team_where.replace("pss.", "pgs.")
-
     return f"""
-    WITH games_count AS (
-        SELECT
-            pgs.player_id,
-            pgs.year,
-            COUNT(DISTINCT pgs.game_id) as games_played
-        FROM player_game_stats pgs
-        WHERE (pgs.o_points_played > 0 OR pgs.d_points_played > 0
-               OR pgs.seconds_played > 0 OR pgs.goals > 0 OR pgs.assists > 0)
-              {games_season_where}{games_team_where}
-        GROUP BY pgs.player_id, pgs.year
-    ),
-    season_stats_by_player AS (
-        SELECT
-            pss.player_id,
-            pss.year,
-            pss.team_id,
-            SUM(pss.total_goals) as total_goals,
-            SUM(pss.total_assists) as total_assists,
-            SUM(pss.total_hockey_assists) as total_hockey_assists,
-            SUM(pss.total_blocks) as total_blocks,
-            (SUM(pss.total_goals) + SUM(pss.total_assists) + SUM(pss.total_blocks) -
-             SUM(pss.total_throwaways) - SUM(pss.total_drops)) as calculated_plus_minus,
-            SUM(pss.total_completions) as total_completions,
-            CASE
-                WHEN SUM(pss.total_throw_attempts) >= 100
-                THEN SUM(pss.total_completions) * 100.0 / SUM(pss.total_throw_attempts)
-                ELSE NULL
-            END as completion_percentage,
-            SUM(pss.total_yards_thrown) as total_yards_thrown,
-            SUM(pss.total_yards_received) as total_yards_received,
-            SUM(pss.total_throwaways) as total_throwaways,
-            SUM(pss.total_stalls) as total_stalls,
-            SUM(pss.total_drops) as total_drops,
-            SUM(pss.total_callahans) as total_callahans,
-            SUM(pss.total_hucks_completed) as total_hucks_completed,
-            SUM(pss.total_hucks_attempted) as total_hucks_attempted,
-            SUM(pss.total_hucks_received) as total_hucks_received,
-            SUM(pss.total_pulls) as total_pulls,
-            SUM(pss.total_o_points_played) as total_o_points_played,
-            SUM(pss.total_d_points_played) as total_d_points_played,
-            SUM(pss.total_seconds_played) as total_seconds_played,
-            SUM(pss.total_o_opportunities) as total_o_opportunities,
-            SUM(pss.total_d_opportunities) as total_d_opportunities,
-            SUM(pss.total_o_opportunity_scores) as total_o_opportunity_scores,
-            SUM(pss.total_o_opportunities) as possessions,
-            (SUM(pss.total_goals) + SUM(pss.total_assists)) as score_total,
-            (SUM(pss.total_o_points_played) + SUM(pss.total_d_points_played)) as total_points_played,
-            (SUM(pss.total_yards_thrown) + SUM(pss.total_yards_received)) as total_yards,
-            SUM(pss.total_seconds_played) / 60.0 as minutes_played,
-            CASE WHEN SUM(pss.total_hucks_attempted) > 0
-                THEN SUM(pss.total_hucks_completed) * 100.0 / SUM(pss.total_hucks_attempted)
-                ELSE 0 END as huck_percentage,
-            CASE
-                WHEN SUM(pss.total_o_opportunities) >= 100
-                THEN SUM(pss.total_o_opportunity_scores) * 100.0 / SUM(pss.total_o_opportunities)
-                ELSE NULL
-            END as offensive_efficiency,
-            CASE
-                WHEN (SUM(pss.total_throwaways) + SUM(pss.total_stalls) + SUM(pss.total_drops)) > 0
-                THEN (SUM(pss.total_yards_thrown) + SUM(pss.total_yards_received)) * 1.0 /
-                     (SUM(pss.total_throwaways) + SUM(pss.total_stalls) + SUM(pss.total_drops))
-                ELSE NULL
-            END as yards_per_turn,
-            CASE
-                WHEN SUM(pss.total_completions) > 0
-                THEN SUM(pss.total_yards_thrown) * 1.0 / SUM(pss.total_completions)
-                ELSE NULL
-            END as yards_per_completion,
-            CASE
-                WHEN SUM(pss.total_catches) > 0
-                THEN SUM(pss.total_yards_received) * 1.0 / SUM(pss.total_catches)
-                ELSE NULL
-            END as yards_per_reception,
-            CASE
-                WHEN (SUM(pss.total_throwaways) + SUM(pss.total_stalls) + SUM(pss.total_drops)) > 0
-                THEN SUM(pss.total_assists) * 1.0 /
-                     (SUM(pss.total_throwaways) + SUM(pss.total_stalls) + SUM(pss.total_drops))
-                ELSE NULL
-            END as assists_per_turnover
-        FROM player_season_stats pss
-        WHERE 1=1{season_where}{team_where}
-        GROUP BY pss.player_id, pss.year, pss.team_id
-    ),
-    season_stats AS (
-        SELECT
-            p.full_name,
-            ss.total_goals,
-            ss.total_assists,
-            ss.total_hockey_assists,
-            ss.total_blocks,
-            ss.calculated_plus_minus,
-            ss.total_completions,
-            ss.completion_percentage,
-            ss.total_yards_thrown,
-            ss.total_yards_received,
-            ss.total_throwaways,
-            ss.total_stalls,
-            ss.total_drops,
-            ss.total_callahans,
-            ss.total_hucks_completed,
-            ss.total_hucks_attempted,
-            ss.total_hucks_received,
-            ss.total_pulls,
-            ss.total_o_points_played,
-            ss.total_d_points_played,
-            ss.total_seconds_played,
-            ss.total_o_opportunities,
-            ss.total_d_opportunities,
-            ss.total_o_opportunity_scores,
-            COALESCE(gc.games_played, 0) as games_played,
-            ss.possessions,
-            ss.score_total,
-            ss.total_points_played,
-            ss.total_yards,
-            ss.minutes_played,
-            ss.huck_percentage,
-            ss.offensive_efficiency,
-            ss.yards_per_turn,
-            ss.yards_per_completion,
-            ss.yards_per_reception,
-            ss.assists_per_turnover
-        FROM season_stats_by_player ss
-        JOIN players p ON ss.player_id = p.player_id AND ss.year = p.year
-        LEFT JOIN games_count gc ON ss.player_id = gc.player_id AND ss.year = gc.year
-        WHERE COALESCE(gc.games_played, 0) > 0
-    ),
+    WITH population AS ({_build_season_population_query(season_where, team_where)}),
     global_stats AS (
         SELECT
-            full_name,
+            percentile_key,
             {','.join(percentile_expressions)}
-        FROM season_stats
+        FROM population
     )
     SELECT *
     FROM global_stats
-    WHERE full_name IN ({names_str})
+    WHERE percentile_key = ANY(:keys)
     """
@@ -0,0 +1,278 @@
+"""
+In-process percentile engine for player statistics.
+
+Percentiles are ranked against a population (every player matching a
+season/team selection). Instead of asking Postgres for 35 window sorts per
+request, the population's raw stat values are fetched once, kept as sorted
+NumPy arrays in a bounded LRU, and percentiles come from
+``np.searchsorted`` over those arrays. A page of players is then a row
+lookup into the ranked matrix.
+
+The lookup reproduces the SQL in percentile_calculator.py exactly:
+``ROUND(CUME_DIST() OVER (ORDER BY value NULLS FIRST) * 100)`` for regular
+stats, ``ROUND((1 - CUME_DIST() OVER (ORDER BY value)) * 100)`` for
+INVERT_STATS (where NULLs sort last), the per-game/per-possession value
+transforms, and the NULL percentiles returned for thresholded ratios.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
+
+import numpy as np
+
+from .percentile_calculator import (
+    INVERT_STATS,
+    NON_COUNTING_STATS,
+    STAT_FIELDS,
+    THRESHOLD_RATIO_STATS,
+    TURNOVER_RATIO_STATS,
+    selected_stat_fields,
+)
+
+_FIELD_INDEX = {field: i for i, field in enumerate(STAT_FIELDS)}
+_INVERT_MASK = np.array([f in INVERT_STATS for f in STAT_FIELDS])
+_COUNTING_MASK = np.array([f not in NON_COUNTING_STATS for f in STAT_FIELDS])
+_TURNOVER_COLUMNS = [
+    _FIELD_INDEX["total_throwaways"],
+    _FIELD_INDEX["total_stalls"],
+    _FIELD_INDEX["total_drops"],
+]
+
+
+def _round_percentile(values: np.ndarray) -> np.ndarray:
+    """
+    Round 0-100 percentiles the way ROUND(CAST(x AS NUMERIC), 0) does.
+
+    The float8 -> numeric cast keeps 15 significant digits, which removes
+    representation noise such as 14.499999999999998; rounding is then half
+    away from zero.
+    """
+    return np.floor(np.round(values, 9) + 0.5)
+
+
+class PercentilePopulation:
+    """Raw stat values for one population, ranked lazily per per_mode."""
+
+    def __init__(
+        self,
+        keys: Sequence[Hashable],
+        values: np.ndarray,
+        null_ratio_percentiles: bool = False,
+    ):
+        """
+        Args:
+            keys: Identifier for each population row
+            values: Float matrix of shape (rows, len(STAT_FIELDS)), NaN for NULL
+            null_ratio_percentiles: Return NULL percentiles for thresholded
+                ratios (the career view query does, the aggregate queries don't)
+        """
+        self.keys = list(keys)
+        self.values = values
+        self.null_ratio_percentiles = null_ratio_percentiles
+        # Later rows win, matching how the SQL result dict was filled
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self._modes: dict[str, dict[int, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_rows(cls, rows, null_ratio_percentiles: bool = False):
+        """
+        Build a population from query rows of (key, *STAT_FIELDS).
+
+        Args:
+            rows: Iterable of row tuples
+            null_ratio_percentiles: See __init__
+
+        Returns:
+            PercentilePopulation
+        """
+        rows = list(rows)
+        keys = [row[0] for row in rows]
+        values = np.array(
+            [
+                [
+                    np.nan if v is None else float(v)
+                    for v in row[1 : len(STAT_FIELDS) + 1]
+                ]
+                for row in rows
+            ],
+            dtype=np.float64,
+        ).reshape(len(rows), len(STAT_FIELDS))
+        return cls(keys, values, null_ratio_percentiles)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _mode_values(self, per_mode: str) -> np.ndarray:
+        """Apply the per-game / per-possession transform to counting stats."""
+        if per_mode not in ("game", "possession"):
+            return self.values
+
+        if per_mode == "game":
+            denominator = self.values[:, _FIELD_INDEX["games_played"]]
+            scale = 1.0
+        else:
+            denominator = self.values[:, _FIELD_INDEX["possessions"]]
+            scale = 100.0
+
+        transformed = self.values.copy()
+        positive = denominator > 0
+        counting = transformed[:, _COUNTING_MASK]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            divided = counting / denominator[:, None] * scale
+        transformed[:, _COUNTING_MASK] = np.where(positive[:, None], divided, 0.0)
+        return transformed
+
+    def _prepare(self, per_mode: str, columns: Sequence[int]) -> np.ndarray:
+        """
+        Rank every population row for a mode (NaN marks a NULL percentile).
+
+        Columns are ranked on first use, so a fields projection only pays for
+        the stats it returns.
+        """
+        ranked = self._modes.setdefault(per_mode, {})
+        missing = [j for j in columns if j not in ranked]
+        if missing:
+            with self._lock:
+                missing = [j for j in missing if j not in ranked]
+                if missing:
+                    ranked.update(self._rank_columns(per_mode, missing))
+        return np.column_stack([ranked[j] for j in columns])
+
+    def _rank_columns(self, per_mode: str, columns: list[int]) -> dict[int, np.ndarray]:
+        """Compute the percentile columns for a mode."""
+        ranking = self._mode_values(per_mode)
+        no_turnovers = self.values[:, _TURNOVER_COLUMNS].sum(axis=1) == 0
+        total = len(self.keys)
+
+        ranked = {}
+        for j in columns:
+            column = ranking[:, j]
+            null_mask = np.zeros(total, dtype=bool)
+            if self.null_ratio_percentiles:
+                if STAT_FIELDS[j] in TURNOVER_RATIO_STATS:
+                    column = np.where(no_turnovers, np.nan, column)
+                    null_mask = no_turnovers
+                elif STAT_FIELDS[j] in THRESHOLD_RATIO_STATS:
+                    null_mask = np.isnan(self.values[:, j])
+
+            is_null = np.isnan(column)
+            sorted_values = np.sort(column[~is_null])
+            null_count = total - len(sorted_values)
+            at_or_below = np.searchsorted(
+                sorted_values, np.where(is_null, 0.0, column), side="right"
+            )
+            if _INVERT_MASK[j]:
+                # ORDER BY value ASC puts NULLs last, so a NULL ranks at the top
+                cume_dist = np.where(is_null, total, at_or_below) / total
+                percentiles = (1 - cume_dist) * 100
+            else:
+                cume_dist = (
+                    np.where(is_null, null_count, null_count + at_or_below) / total
+                )
+                percentiles = cume_dist * 100
+
+            prepared = _round_percentile(percentiles)
+            prepared[null_mask] = np.nan
+            ranked[j] = prepared
+        return ranked
+
+    def percentiles_for(
+        self,
+        keys: Sequence[Hashable],
+        per_mode: str = "total",
+        fields: Sequence[str] | None = None,
+    ) -> dict:
+        """
+        Look up percentiles for the given population keys.
+
+        Args:
+            keys: Identifiers to look up (unknown keys are skipped)
+            per_mode: "total", "game" or "possession"
+            fields: Stats to rank (None = all of STAT_FIELDS)
+
+        Returns:
+            Dict mapping key to {stat: percentile or None}
+        """
+        rows = [self.index[key] for key in dict.fromkeys(keys) if key in self.index]
+        if not rows:
+            return {}
+
+        names = selected_stat_fields(fields)
+        if not names:
+            return {self.keys[row]: {} for row in rows}
+        page = self._prepare(per_mode, [_FIELD_INDEX[f] for f in names])[rows].tolist()
+        return {
+            self.keys[row]: {
+                field: None if value != value else int(value)
+                for field, value in zip(names, values, strict=True)
+            }
+            for row, values in zip(rows, page, strict=True)
+        }
+
+
+class PercentileEngine:
+    """Bounded LRU of percentile populations with a TTL."""
+
+    def __init__(self, max_populations: int = 32, ttl: int = 3600):
+        """
+        Args:
+            max_populations: Number of populations kept in memory
+            ttl: Seconds before a population is reloaded
+        """
+        self._populations: OrderedDict[Hashable, tuple[PercentilePopulation, float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.RLock()
+        self.max_populations = max_populations
+        self.ttl = ttl
+
+    def get_population(
+        self, key: Hashable, loader: Callable[[], PercentilePopulation]
+    ) -> PercentilePopulation:
+        """
+        Return the cached population for key, loading it on a miss.
+
+        Args:
+            key: Population identifier (e.g. seasons and teams)
+            loader: Callable that builds the population
+
+        Returns:
+            PercentilePopulation
+        """
+        with self._lock:
+            entry = self._populations.get(key)
+            if entry is not None and time.time() < entry[1]:
+                self._populations.move_to_end(key)
+                return entry[0]
+
+        population = loader()
+
+        with self._lock:
+            self._populations[key] = (population, time.time() + self.ttl)
+            self._populations.move_to_end(key)
+            while len(self._populations) > self.max_populations:
+                self._populations.popitem(last=False)
+        return population
+
+    def clear(self) -> None:
+        """Drop every cached population."""
+        with self._lock:
+            self._populations.clear()
+
+    def __len__(self) -> int:
+        return len(self._populations)
+
+
+# Global engine instance
+_engine_instance: PercentileEngine | None = None
+
+
+def get_percentile_engine() -> PercentileEngine:
+    """Get or create the global percentile engine."""
+    global _engine_instance
+    if _engine_instance is None:
+        _engine_instance = PercentileEngine()
+    return _engine_instance
@@ -4,19 +4,36 @@ Player statistics API route handler.
 
 import json
 
+from api.responses import FastJSONRoute
+from config import config
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy import text
-from utils.query import convert_to_per_game_stats, convert_to_per_possession_stats
+from utils.query import (
+    convert_to_per_game_stats,
+    convert_to_per_possession_stats,
+    parse_fields,
+    project_fields,
+)
 
 from data.cache import cache_key_for_endpoint, get_cache
 
+from .columns import IDENTITY_COLUMNS
+from .export import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    EXPORT_WRITERS,
+    export_columns,
+    iter_player_chunks,
+)
 from .percentile_calculator import calculate_global_percentiles
-from .query_builder import PlayerStatsQueryBuilder
+from .query_builder import PlayerStatsQueryBuilder, row_to_player_dict
+from .season_rollup import get_season_rollup_store, query_career_rollup
 
 
 def create_player_stats_route(stats_system):
     """Create the player statistics endpoint."""
-    router = APIRouter()
+    router = APIRouter(route_class=FastJSONRoute)
 
     @router.get("/api/players/stats")
     async def get_player_stats(
@@ -29,6 +46,7 @@ def create_player_stats_route(stats_system):
         per: str = "total",
         custom_filters: str | None = None,
         include_percentiles: bool = False,
+        fields: str | None = None,
     ):
         """Get paginated player statistics with filtering and sorting"""
         try:
@@ -38,6 +56,9 @@ def create_player_stats_route(stats_system):
             # Parse custom filters
             filters_list = _parse_custom_filters(custom_filters)
 
+            # Parse the comma-separated stats projection (None = every stat)
+            field_list = parse_fields(fields)
+
             # Check cache first
             cache = get_cache()
             sorted_seasons = sorted(seasons)
@@ -53,6 +74,7 @@ def create_player_stats_route(stats_system):
                 per=per,
                 custom_filters=custom_filters,
                 include_percentiles=include_percentiles,
+                fields=",".join(field_list) if field_list else None,
             )
 
             cached_result = cache.get(cache_key)
@@ -73,20 +95,45 @@ def create_player_stats_route(stats_system):
                 order=order,
                 page=page,
                 per_page=per_page,
+                fields=field_list,
             )
 
-            main_query = query_builder.build_main_query()
-            count_query = query_builder.build_count_query()
-
             # Execute queries
             with stats_system.db.engine.connect() as conn:
-                # Get total count
-                count_result = conn.execute(text(count_query)).fetchone()
-                total = count_result[0] if count_result else 0
+                # Season-range career totals come from the prefix-sum rollups
+                rollup_result = None
+                if config.ENABLE_CACHE and query_builder.supports_season_rollup():
+                    rollup_result = query_career_rollup(
+                        get_season_rollup_store(conn), query_builder
+                    )
 
-                # Get players
-                result = conn.execute(text(main_query))
-                players = [_row_to_player_dict(row) for row in result]
+                if rollup_result is not None:
+                    total, rows = rollup_result
+                else:
+                    # Get total count
+                    count_query = query_builder.build_count_query()
+                    count_result = conn.execute(text(count_query)).fetchone()
+                    total = count_result[0] if count_result else 0
+
+                    # Get players
+                    rows = conn.execute(text(query_builder.build_main_query()))
+                players = [row_to_player_dict(row) for row in rows]
+
+                # Calculate global percentiles only if requested (lazy loading).
+                # Populations are cached by the percentile engine, so only the
+                # current page's rows are looked up and returned.
+                percentiles = {}
+                if include_percentiles and players:
+                    percentiles = calculate_global_percentiles(
+                        conn,
+                        players,
+                        seasons=seasons if not is_career_mode else None,
+                        teams=teams if teams[0] != "all" else None,
+                        per_mode=per,
+                        # The engine keeps populations in process across requests
+                        use_engine=config.ENABLE_CACHE,
+                        fields=field_list,
+                    )
 
             # Convert to per-game stats if requested
             if per == "game":
@@ -94,35 +141,8 @@ def create_player_stats_route(stats_system):
             elif per == "possession":
                 players = convert_to_per_possession_stats(players)
 
-            # Calculate global percentiles only if requested (lazy loading)
-            percentiles = {}
-            if include_percentiles and players:
-                # Check percentile-specific cache (longer TTL, shared across pages)
-                percentile_cache_key = cache_key_for_endpoint(
-                    "percentiles",
-                    season=",".join(str(s) for s in sorted_seasons),
-                    team=",".join(sorted_teams),
-                    per=per,
-                )
-                cached_percentiles = cache.get(percentile_cache_key)
-
-                if cached_percentiles is not None:
-                    # Filter cached percentiles to only include current page players
-                    percentiles = _filter_percentiles_for_players(
-                        cached_percentiles, players
-                    )
-                else:
-                    with stats_system.db.engine.connect() as conn:
-                        all_percentiles = calculate_global_percentiles(
-                            conn,
-                            players,
-                            seasons=seasons if not is_career_mode else None,
-                            teams=teams if teams[0] != "all" else None,
-                            per_mode=per,
-                        )
-                    # Cache all percentiles with longer TTL (1 hour)
-                    cache.set(percentile_cache_key, all_percentiles, ttl=3600)
-                    percentiles = all_percentiles
+            # Drop unrequested stats (and the denominators they were converted by)
+            players = project_fields(players, field_list, always=IDENTITY_COLUMNS)
 
             total_pages = (total + per_page - 1) // per_page
 
@@ -144,6 +164,69 @@ def create_player_stats_route(stats_system):
             print(f"Error in get_player_stats: {e}")
             raise HTTPException(status_code=500, detail=str(e)) from e
 
+    @router.get("/api/players/stats/export")
+    async def export_player_stats(
+        season: str = "career",
+        team: str = "all",
+        sort: str = "calculated_plus_minus",
+        order: str = "desc",
+        per: str = "total",
+        custom_filters: str | None = None,
+        include_percentiles: bool = False,
+        format: str = "csv",
+    ):
+        """Stream every player matching the stats filters as CSV, NDJSON or Parquet"""
+        if format not in EXPORT_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported export format: {format}. Use one of {', '.join(EXPORT_FORMATS)}",
+            )
+
+        try:
+            seasons, teams, is_career_mode = _parse_filters(season, team)
+            query_builder = PlayerStatsQueryBuilder(
+                seasons=seasons,
+                teams=teams,
+                is_career_mode=is_career_mode,
+                filters_list=_parse_custom_filters(custom_filters),
+                per_game_mode=per == "game",
+                per_possession_mode=per == "possession",
+                sort=sort,
+                order=order,
+                page=1,
+                per_page=EXPORT_CHUNK_SIZE,
+            )
+        except Exception as e:
+            print(f"Error in export_player_stats: {e}")
+            raise HTTPException(status_code=500, detail=str(e)) from e
+
+        columns = export_columns(include_percentiles)
+        write = EXPORT_WRITERS[format]
+
+        def stream():
+            # Headers are already sent once streaming starts, so errors can
+            # only be logged and the response cut short
+            try:
+                with stats_system.db.engine.connect() as conn:
+                    chunks = iter_player_chunks(
+                        conn,
+                        query_builder,
+                        per_mode=per,
+                        include_percentiles=include_percentiles,
+                    )
+                    yield from write(chunks, columns)
+            except Exception as e:
+                print(f"Error streaming player stats export: {e}")
+                raise
+
+        return StreamingResponse(
+            stream(),
+            media_type=EXPORT_FORMATS[format],
+            headers={
+                "Content-Disposition": f'attachment; filename="player_stats.{format}"'
+            },
+        )
+
     return router
 
 
@@ -187,83 +270,3 @@ def _parse_custom_filters(custom_filters: str | None) -> list:
         return json.loads(custom_filters)
     except json.JSONDecodeError:
         return []
-
-
-def _row_to_player_dict(row) -> dict:
-    """Convert a database row to a player dictionary."""
-    return {
-        "full_name": row[0],
-        "first_name": row[1],
-        "last_name": row[2],
-        "team_id": row[3],
-        "year": row[4],
-        "total_goals": row[5] or 0,
-        "total_assists": row[6] or 0,
-        "total_hockey_assists": row[7] or 0,
-        "total_blocks": row[8] or 0,
-        "calculated_plus_minus": row[9] or 0,
-        "total_completions": row[10] or 0,
-        "total_throw_attempts": row[11] or 0,
-        "completion_percentage": row[12] or 0,
-        "total_yards_thrown": row[13] or 0,
-        "total_yards_received": row[14] or 0,
-        "total_throwaways": row[15] or 0,
-        "total_stalls": row[16] or 0,
-        "total_drops": row[17] or 0,
-        "total_callahans": row[18] or 0,
-        "total_hucks_completed": row[19] or 0,
-        "total_hucks_attempted": row[20] or 0,
-        "total_hucks_received": row[21] or 0,
-        "total_pulls": row[22] or 0,
-        "total_o_points_played": row[23] or 0,
-        "total_d_points_played": row[24] or 0,
-        "total_seconds_played": row[25] or 0,
-        "total_o_opportunities": row[26] or 0,
-        "total_d_opportunities": row[27] or 0,
-        "total_o_opportunity_scores": row[28] or 0,
-        "team_name": row[29],
-        "team_full_name": row[30],
-        "games_played": row[31] or 0,
-        "possessions": row[32] or 0,
-        "score_total": row[33] or 0,
-        "total_points_played": row[34] or 0,
-        "total_yards": row[35] or 0,
-        "minutes_played": row[36] or 0,
-        "huck_percentage": row[37] or 0,
-        "offensive_efficiency": row[38] if row[38] is not None else None,
-        "yards_per_turn": row[39] if row[39] is not None else None,
-        "yards_per_completion": row[40] if row[40] is not None else None,
-        "yards_per_reception": row[41] if row[41] is not None else None,
-        "assists_per_turnover": row[42] if row[42] is not None else None,
-    }
-
-
-def _filter_percentiles_for_players(all_percentiles: dict, players: list[dict]) -> dict:
-    """
-    Filter cached percentiles to only include players on the current page.
-
-    Args:
-        all_percentiles: Full percentile data keyed by player identifier
-        players: List of player dicts for current page
-
-    Returns:
-        Filtered percentiles dict containing only current page players
-    """
-    # If percentiles are already filtered or structured differently, return as-is
-    if not all_percentiles:
-        return {}
-
-    # Get player identifiers from current page
-    player_keys = set()
-    for player in players:
-        # Use full_name + team_id as identifier (matches percentile calculator)
-        key = f"{player.get('full_name', '')}_{player.get('team_id', '')}"
-        player_keys.add(key)
-
-    # Filter percentiles to only include current page players
-    filtered = {}
-    for key, value in all_percentiles.items():
-        if key in player_keys:
-            filtered[key] = value
-
-    return filtered if filtered else all_percentiles
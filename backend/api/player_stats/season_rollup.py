@@ -0,0 +1,555 @@
+"""
+Prefix-sum season rollups for player statistics.
+
+Career rows summed over a range of seasons (e.g. per-possession career stats,
+which only use 2014 onward) used to re-aggregate player_season_stats in SQL on
+every request. Instead, the season rows are loaded once into cumulative
+per-player arrays ordered by year: the totals for a contiguous range of
+seasons are the difference of two prefix sums. Derived ratios are then
+computed from those sums with the same thresholds and ROUND() semantics as
+query_builder.py.
+"""
+
+import threading
+import time
+from collections.abc import Hashable, Iterable, Sequence
+
+import numpy as np
+from sqlalchemy import text
+from utils.query import is_rate_stat
+
+# player_season_stats columns that are summed into career totals
+ROLLUP_FIELDS = [
+    "games_played",
+    "total_goals",
+    "total_assists",
+    "total_hockey_assists",
+    "total_blocks",
+    "total_completions",
+    "total_throw_attempts",
+    "total_yards_thrown",
+    "total_yards_received",
+    "total_throwaways",
+    "total_stalls",
+    "total_drops",
+    "total_callahans",
+    "total_hucks_completed",
+    "total_hucks_attempted",
+    "total_hucks_received",
+    "total_catches",
+    "total_pulls",
+    "total_o_points_played",
+    "total_d_points_played",
+    "total_seconds_played",
+    "total_o_opportunities",
+    "total_d_opportunities",
+    "total_o_opportunity_scores",
+]
+
+# Possession data before 2014 is unreliable (see PlayerStatsQueryBuilder)
+POSSESSION_START_YEAR = 2014
+
+# Columns the career CTEs expose to custom filters and sorting
+_CAREER_COLUMNS = [
+    "games_played",
+    "total_goals",
+    "total_assists",
+    "total_hockey_assists",
+    "total_blocks",
+    "calculated_plus_minus",
+    "total_completions",
+    "total_throw_attempts",
+    "completion_percentage",
+    "total_yards_thrown",
+    "total_yards_received",
+    "total_throwaways",
+    "total_stalls",
+    "total_drops",
+    "total_callahans",
+    "total_hucks_completed",
+    "total_hucks_attempted",
+    "total_hucks_received",
+    "total_pulls",
+    "total_o_points_played",
+    "total_d_points_played",
+    "total_seconds_played",
+    "total_o_opportunities",
+    "total_d_opportunities",
+    "total_o_opportunity_scores",
+    "score_total",
+    "total_points_played",
+    "total_yards",
+    "minutes_played",
+    "huck_percentage",
+    "offensive_efficiency",
+    "yards_per_turn",
+    "yards_per_completion",
+    "yards_per_reception",
+    "assists_per_turnover",
+]
+
+_VALID_OPERATORS = {
+    ">": np.greater,
+    "<": np.less,
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+    "=": np.equal,
+}
+
+
+class SeasonRollup:
+    """Cumulative per-group season totals over a sorted year axis."""
+
+    def __init__(self, keys: Sequence[Hashable], years: Sequence[int], cumulative):
+        """
+        Args:
+            keys: Group identifier for each row (player_id, or (player_id, team_id))
+            years: Sorted season years of the year axis
+            cumulative: Int array of shape (len(years) + 1, groups, len(ROLLUP_FIELDS));
+                cumulative[i] holds every group's totals over the first i seasons
+        """
+        self.keys = list(keys)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.cumulative = cumulative
+        self.index = {key: i for i, key in enumerate(self.keys)}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]):
+        """
+        Build a rollup from rows of (key, year, *ROLLUP_FIELDS).
+
+        Rows sharing a key and year are added together; NULLs count as 0.
+
+        Args:
+            rows: Iterable of row tuples
+
+        Returns:
+            SeasonRollup
+        """
+        rows = list(rows)
+        keys = list(dict.fromkeys(row[0] for row in rows))
+        years = sorted({int(row[1]) for row in rows})
+        key_index = {key: i for i, key in enumerate(keys)}
+        year_index = {year: i for i, year in enumerate(years)}
+
+        values = np.zeros((len(years), len(keys), len(ROLLUP_FIELDS)), dtype=np.int64)
+        if rows:
+            group_ids = np.fromiter((key_index[row[0]] for row in rows), np.int64)
+            year_ids = np.fromiter((year_index[int(row[1])] for row in rows), np.int64)
+            stats = np.array(
+                [[v or 0 for v in row[2 : len(ROLLUP_FIELDS) + 2]] for row in rows],
+                dtype=np.int64,
+            )
+            np.add.at(values, (year_ids, group_ids), stats)
+
+        # Year-major layout keeps each prefix a contiguous (groups, fields) block
+        cumulative = np.zeros(
+            (len(years) + 1, len(keys), len(ROLLUP_FIELDS)), dtype=np.int64
+        )
+        np.cumsum(values, axis=0, out=cumulative[1:])
+        return cls(keys, years, cumulative)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def range_totals(
+        self, start_year: int | None = None, end_year: int | None = None
+    ) -> np.ndarray:
+        """
+        Sum each group's stats over an inclusive range of seasons.
+
+        Args:
+            start_year: First season (None = earliest)
+            end_year: Last season (None = latest)
+
+        Returns:
+            Int array of shape (groups, len(ROLLUP_FIELDS))
+        """
+        start = (
+            0 if start_year is None else np.searchsorted(self.years, start_year, "left")
+        )
+        stop = (
+            len(self.years)
+            if end_year is None
+            else np.searchsorted(self.years, end_year, "right")
+        )
+        if stop <= start:
+            return np.zeros((len(self.keys), len(ROLLUP_FIELDS)), dtype=np.int64)
+        return self.cumulative[stop] - self.cumulative[start]
+
+
+def _round_numeric(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    Round non-negative values the way ROUND(numeric, digits) does.
+
+    Ratios of season totals never land within 1e-9 of a .5 boundary unless
+    they are exactly on it, so snapping first removes float noise and the
+    rounding is then half away from zero.
+    """
+    scale = 10.0**digits
+    return np.floor(np.round(values * scale, 9) + 0.5) / scale
+
+
+def _ratio(numerator, denominator, digits: int, valid) -> np.ndarray:
+    """numerator * 1.0 / denominator rounded, NaN (NULL) where not valid."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = _round_numeric(numerator / denominator, digits)
+    return np.where(valid, result, np.nan)
+
+
+def derived_stats(
+    totals: np.ndarray, yards_per_turn_fallback: bool = False
+) -> dict[str, np.ndarray]:
+    """
+    Compute the career columns from summed season totals.
+
+    Mirrors the career CTEs in query_builder.py. NULL results are NaN.
+
+    Args:
+        totals: Array of shape (groups, len(ROLLUP_FIELDS)) from SeasonRollup
+        yards_per_turn_fallback: Use total yards as yards_per_turn for players
+            without turnovers (the team career query does, full career doesn't)
+
+    Returns:
+        Dict mapping column name to a per-group array
+    """
+    columns = {field: totals[:, i] for i, field in enumerate(ROLLUP_FIELDS)}
+    goals = columns["total_goals"]
+    assists = columns["total_assists"]
+    completions = columns["total_completions"]
+    attempts = columns["total_throw_attempts"]
+    yards = columns["total_yards_thrown"] + columns["total_yards_received"]
+    turnovers = (
+        columns["total_throwaways"] + columns["total_stalls"] + columns["total_drops"]
+    )
+    hucks_attempted = columns["total_hucks_attempted"]
+    o_opportunities = columns["total_o_opportunities"]
+
+    columns["calculated_plus_minus"] = (
+        goals
+        + assists
+        + columns["total_blocks"]
+        - columns["total_throwaways"]
+        - columns["total_drops"]
+    )
+    columns["possessions"] = o_opportunities
+    columns["score_total"] = goals + assists
+    columns["total_points_played"] = (
+        columns["total_o_points_played"] + columns["total_d_points_played"]
+    )
+    columns["total_yards"] = yards
+    columns["minutes_played"] = _round_numeric(
+        columns["total_seconds_played"] / 60.0, 0
+    )
+    columns["completion_percentage"] = _ratio(
+        completions * 100, attempts, 1, attempts >= 100
+    )
+    columns["huck_percentage"] = np.nan_to_num(
+        _ratio(
+            columns["total_hucks_completed"] * 100,
+            hucks_attempted,
+            1,
+            hucks_attempted > 0,
+        )
+    )
+    columns["offensive_efficiency"] = _ratio(
+        columns["total_o_opportunity_scores"] * 100,
+        o_opportunities,
+        1,
+        o_opportunities >= 100,
+    )
+    yards_per_turn = _ratio(yards, turnovers, 1, turnovers > 0)
+    if yards_per_turn_fallback:
+        yards_per_turn = np.where(
+            (turnovers == 0) & (yards > 0), yards.astype(np.float64), yards_per_turn
+        )
+    columns["yards_per_turn"] = yards_per_turn
+    columns["yards_per_completion"] = _ratio(
+        columns["total_yards_thrown"], completions, 1, completions > 0
+    )
+    columns["yards_per_reception"] = _ratio(
+        columns["total_yards_received"],
+        columns["total_catches"],
+        1,
+        columns["total_catches"] > 0,
+    )
+    columns["assists_per_turnover"] = _ratio(assists, turnovers, 2, turnovers > 0)
+    return columns
+
+
+class SeasonRollupStore:
+    """Season rollups plus the name and team lookups career rows are joined with."""
+
+    def __init__(
+        self,
+        players: SeasonRollup,
+        player_teams: SeasonRollup,
+        player_info: dict,
+        player_team_names: dict,
+        team_info: dict,
+    ):
+        """
+        Args:
+            players: Rollup keyed by player_id
+            player_teams: Rollup keyed by (player_id, team_id)
+            player_info: player_id -> (full_name, first_name, last_name,
+                most_recent_team_id, team_name, team_full_name)
+            player_team_names: (player_id, team_id) -> (full_name, first_name, last_name)
+            team_info: team_id -> (name, full_name)
+        """
+        self.players = players
+        self.player_teams = player_teams
+        self.player_info = player_info
+        self.player_team_names = player_team_names
+        self.team_info = team_info
+
+    @classmethod
+    def load(cls, conn):
+        """
+        Load every player_season_stats row and the lookup tables.
+
+        Args:
+            conn: Database connection
+
+        Returns:
+            SeasonRollupStore
+        """
+        season_rows = conn.execute(text(f"""
+                SELECT player_id, team_id, year, {', '.join(ROLLUP_FIELDS)}
+                FROM player_season_stats
+                """)).fetchall()
+        players = SeasonRollup.from_rows((row[0], *row[2:]) for row in season_rows)
+        player_teams = SeasonRollup.from_rows(
+            ((row[0], row[1]), *row[2:]) for row in season_rows
+        )
+
+        player_info = {row[0]: tuple(row[1:]) for row in conn.execute(text("""
+                    SELECT DISTINCT ON (p.player_id)
+                        p.player_id,
+                        p.full_name,
+                        p.first_name,
+                        p.last_name,
+                        p.team_id,
+                        t.name,
+                        t.full_name
+                    FROM players p
+                    LEFT JOIN teams t ON p.team_id = t.team_id AND p.year = t.year
+                    ORDER BY p.player_id, p.year DESC
+                    """))}
+        player_team_names = {
+            (row[0], row[1]): tuple(row[2:]) for row in conn.execute(text("""
+                    SELECT DISTINCT ON (pss.player_id, pss.team_id)
+                        pss.player_id,
+                        pss.team_id,
+                        p.full_name,
+                        p.first_name,
+                        p.last_name
+                    FROM player_season_stats pss
+                    JOIN players p ON pss.player_id = p.player_id AND pss.year = p.year
+                    ORDER BY pss.player_id, pss.team_id, pss.year DESC
+                    """))
+        }
+        team_info = {row[0]: tuple(row[1:]) for row in conn.execute(text("""
+                    SELECT DISTINCT ON (t.team_id)
+                        t.team_id,
+                        t.name,
+                        t.full_name
+                    FROM teams t
+                    ORDER BY t.team_id, t.year DESC
+                    """))}
+        return cls(players, player_teams, player_info, player_team_names, team_info)
+
+
+def _column_values(columns: dict, field: str, per_possession: bool) -> np.ndarray:
+    """Value a column is filtered/sorted by, per 100 possessions for counting stats."""
+    values = columns[field].astype(np.float64)
+    if not is_rate_stat(field, per_possession=per_possession):
+        return values
+    possessions = columns["total_o_opportunities"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(possessions > 0, values * 100 / possessions, 0.0)
+
+
+def _python_value(value):
+    """Convert a NumPy scalar to a plain Python value (NaN is NULL)."""
+    value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def query_career_rollup(store: SeasonRollupStore, builder) -> tuple[int, list] | None:
+    """
+    Answer a per-possession career query from the season rollups.
+
+    Applies the same WHERE conditions, custom filters, ORDER BY ... NULLS LAST
+    and pagination as PlayerStatsQueryBuilder, and returns rows in the main
+    query's column layout.
+
+    Args:
+        store: Loaded SeasonRollupStore
+        builder: PlayerStatsQueryBuilder for the request
+
+    Returns:
+        Tuple of (total matching rows, page rows), or None when the request
+        uses a column the rollup can't serve (the SQL path handles those)
+    """
+    team_mode = builder.teams[0] != "all"
+    available = set(_CAREER_COLUMNS)
+    if team_mode:
+        available.add("possessions")
+
+    sort_field = (
+        "total_o_opportunities" if builder.sort == "possessions" else builder.sort
+    )
+    if sort_field not in available or builder.page < 1:
+        return None
+
+    filters = []
+    for f in builder.filters_list:
+        field = f.get("field", "")
+        operator = f.get("operator", "")
+        if operator not in _VALID_OPERATORS:
+            continue
+        if not field or not field.replace("_", "").isalnum():
+            continue
+        try:
+            value = float(f.get("value", 0))
+        except (ValueError, TypeError):
+            continue
+        if field not in available:
+            return None
+        filters.append((field, _VALID_OPERATORS[operator], value))
+
+    if team_mode:
+        rollup = store.player_teams
+        teams = set(builder.teams)
+        member = np.array(
+            [
+                key[1] in teams
+                and key in store.player_team_names
+                and key[1] in store.team_info
+                for key in rollup.keys
+            ],
+            dtype=bool,
+        )
+    else:
+        rollup = store.players
+        member = np.array([key in store.player_info for key in rollup.keys], dtype=bool)
+
+    start_year = POSSESSION_START_YEAR if builder.per_possession_mode else None
+    columns = derived_stats(
+        rollup.range_totals(start_year), yards_per_turn_fallback=team_mode
+    )
+
+    mask = member & (columns["games_played"] > 0)
+    if builder.possession_threshold > 0:
+        mask &= columns["total_o_opportunities"] >= builder.possession_threshold
+    if builder.throw_attempts_threshold > 0:
+        mask &= columns["total_throw_attempts"] >= builder.throw_attempts_threshold
+    for field, compare, value in filters:
+        with np.errstate(invalid="ignore"):
+            mask &= compare(
+                _column_values(columns, field, builder.per_possession_mode), value
+            )
+
+    rows = np.flatnonzero(mask)
+    sort_values = _column_values(columns, sort_field, builder.per_possession_mode)[rows]
+    is_null = np.isnan(sort_values)
+    direction = -1.0 if builder.order.lower() == "desc" else 1.0
+    # NULLS LAST, then by value; ties keep group order
+    order = np.lexsort((np.where(is_null, 0.0, sort_values * direction), is_null))
+    offset = (builder.page - 1) * builder.per_page
+    page_rows = rows[order][offset : offset + builder.per_page]
+
+    page = []
+    for i in page_rows.tolist():
+        values = {name: _python_value(column[i]) for name, column in columns.items()}
+        key = rollup.keys[i]
+        if team_mode:
+            player_id, team_id = key
+            full_name, first_name, last_name = store.player_team_names[key]
+            team_name, team_full_name = store.team_info[team_id]
+        else:
+            player_id = key
+            (
+                full_name,
+                first_name,
+                last_name,
+                team_id,
+                team_name,
+                team_full_name,
+            ) = store.player_info[key]
+        page.append(
+            (
+                full_name,
+                first_name,
+                last_name,
+                team_id,
+                None,
+                values["total_goals"],
+                values["total_assists"],
+                values["total_hockey_assists"],
+                values["total_blocks"],
+                values["calculated_plus_minus"],
+                values["total_completions"],
+                values["total_throw_attempts"],
+                values["completion_percentage"],
+                values["total_yards_thrown"],
+                values["total_yards_received"],
+                values["total_throwaways"],
+                values["total_stalls"],
+                values["total_drops"],
+                values["total_callahans"],
+                values["total_hucks_completed"],
+                values["total_hucks_attempted"],
+                values["total_hucks_received"],
+                values["total_pulls"],
+                values["total_o_points_played"],
+                values["total_d_points_played"],
+                values["total_seconds_played"],
+                values["total_o_opportunities"],
+                values["total_d_opportunities"],
+                values["total_o_opportunity_scores"],
+                team_name,
+                team_full_name,
+                values["games_played"],
+                values["possessions"],
+                values["score_total"],
+                values["total_points_played"],
+                values["total_yards"],
+                int(values["minutes_played"]),
+                # CASE ... ELSE 0 is a whole number when there are no huck attempts
+                values["huck_percentage"] if values["total_hucks_attempted"] else 0,
+                values["offensive_efficiency"],
+                values["yards_per_turn"],
+                values["yards_per_completion"],
+                values["yards_per_reception"],
+                values["assists_per_turnover"],
+                player_id,
+            )
+        )
+    return len(rows), page
+
+
+# Global rollup store, reloaded after the TTL like the percentile populations
+_store_instance: SeasonRollupStore | None = None
+_store_expires_at = 0.0
+_store_lock = threading.Lock()
+
+
+def get_season_rollup_store(conn, ttl: int = 3600) -> SeasonRollupStore:
+    """Get the global season rollup store, loading it on first use or expiry."""
+    global _store_instance, _store_expires_at
+    with _store_lock:
+        if _store_instance is None or time.time() >= _store_expires_at:
+            _store_instance = SeasonRollupStore.load(conn)
+            _store_expires_at = time.time() + ttl
+        return _store_instance
+
+
+def clear_season_rollup_store() -> None:
+    """Drop the loaded season rollups."""
+    global _store_instance
+    with _store_lock:
+        _store_instance = None
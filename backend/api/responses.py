@@ -0,0 +1,85 @@
+"""
+Fast JSON responses for the API routes.
+
+FastAPI runs every return value through jsonable_encoder before rendering it
+with the stdlib json module, which walks the whole payload twice in Python.
+FastJSONRoute hands plain return values straight to FastJSONResponse, which
+renders them with orjson in one pass. Routes with a response_model, or that
+take a Response parameter, keep FastAPI's validation path.
+"""
+
+import functools
+import inspect
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, request_response
+from starlette.responses import Response
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Encode the types orjson does not handle natively, as jsonable_encoder would."""
+    if isinstance(value, Decimal):
+        # Postgres NUMERIC: whole numbers stay integers
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return jsonable_encoder(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes; NaN and infinity become null."""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    APIRoute that returns plain endpoint results as a FastJSONResponse.
+
+    The endpoint call is wrapped so its result is already a Response when
+    FastAPI's request handler sees it, which skips jsonable_encoder.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, endpoint, **kwargs)
+        if self.response_model is not None or self.dependant.response_param_name:
+            return
+
+        call = self.dependant.call
+        status_code = self.status_code or 200
+
+        if inspect.iscoroutinefunction(call):
+
+            @functools.wraps(call)
+            async def wrapped(**values):
+                result = await call(**values)
+                if isinstance(result, Response):
+                    return result
+                return FastJSONResponse(result, status_code=status_code)
+
+        else:
+
+            @functools.wraps(call)
+            def wrapped(**values):
+                result = call(**values)
+                if isinstance(result, Response):
+                    return result
+                return FastJSONResponse(result, status_code=status_code)
+
+        self.dependant.call = wrapped
+        self.app = request_response(self.get_route_handler())
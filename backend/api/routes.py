@@ -2,6 +2,9 @@
 API routes for sports statistics endpoints.
 """
 
+from api.pass_event_facets import clear_pass_event_facets
+from api.player_stats import clear_season_rollup_store, get_percentile_engine
+from api.responses import FastJSONRoute
 from auth import get_current_user
 from config import config
 from fastapi import APIRouter, Depends, HTTPException
@@ -15,13 +18,14 @@ from models.api import (
 from models.user import UpdateUserPreferences
 from services.subscription_service import get_subscription_service
 from services.user_profile_service import get_user_profile_service
+from utils.query import parse_fields
 
 from data.cache import cache_key_for_endpoint, get_cache
 
 
 def create_basic_routes(stats_system):
     """Create basic API routes."""
-    router = APIRouter()
+    router = APIRouter(route_class=FastJSONRoute)
 
     @router.get("/health")
     async def health_check():
@@ -331,6 +335,9 @@ def create_basic_routes(stats_system):
 
         cache = get_cache()
         cache.clear()
+        get_percentile_engine().clear()
+        clear_season_rollup_store()
+        clear_pass_event_facets()
         return {"message": "Cache cleared successfully"}
 
     @router.get("/api/games/recent")
@@ -380,9 +387,12 @@ def create_basic_routes(stats_system):
         perspective: str = "team",
         sort: str = "wins",
         order: str = "desc",
+        fields: str | None = None,
     ):
         """Get comprehensive team statistics with all UFA-style columns"""
         try:
+            field_list = parse_fields(fields)
+
             # Check cache first
             cache = get_cache()
             cache_key = cache_key_for_endpoint(
@@ -392,6 +402,7 @@ def create_basic_routes(stats_system):
                 perspective=perspective,
                 sort=sort,
                 order=order,
+                fields=",".join(field_list) if field_list else None,
             )
 
             cached_result = cache.get(cache_key)
@@ -399,7 +410,7 @@ def create_basic_routes(stats_system):
                 return cached_result
 
             teams = stats_system.get_comprehensive_team_stats(
-                season, view, perspective, sort, order
+                season, view, perspective, sort, order, field_list
             )
 
             result = {
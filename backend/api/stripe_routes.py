@@ -2,6 +2,7 @@
 Stripe payment and subscription API routes.
 """
 
+from api.responses import FastJSONRoute
 from auth import get_current_user
 from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from middleware.rate_limit import auth_limit, no_limit, public_limit
@@ -31,7 +32,7 @@ from utils.validators import (
 
 def create_stripe_routes(stats_system):
     """Create and configure Stripe-related routes."""
-    router = APIRouter(prefix="/api/stripe", tags=["stripe"])
+    router = APIRouter(prefix="/api/stripe", tags=["stripe"], route_class=FastJSONRoute)
 
     stripe_service = get_stripe_service()
 
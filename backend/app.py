@@ -8,6 +8,7 @@ from api.game import create_game_routes
 from api.game_box_score import create_box_score_routes
 from api.pass_events import create_pass_events_routes
 from api.player_stats import create_player_stats_route
+from api.responses import FastJSONResponse
 
 # Import route modules
 from api.routes import create_basic_routes
@@ -18,6 +19,7 @@ from core.chat_system import get_stats_system
 # Import CORS, trusted host, and static files configuration
 from cors_config import DevStaticFiles, configure_cors, configure_trusted_host
 from fastapi import FastAPI
+from middleware.compression import configure_compression
 from middleware.logging_middleware import configure_request_logging
 from middleware.rate_limit import configure_rate_limiting
 
@@ -31,9 +33,17 @@ from utils.startup_validation import run_startup_validation
 run_startup_validation()
 
 # Initialize FastAPI app
-app = FastAPI(title="Sports Statistics Chat System", root_path="")
+app = FastAPI(
+    title="Sports Statistics Chat System",
+    root_path="",
+    default_response_class=FastJSONResponse,
+)
 
 # Configure middleware (order matters!)
+# 0. Compression (added first so it sits next to the routes and sees whole
+#    response bodies before the other middleware re-stream them)
+configure_compression(app)
+
 # 1. Security headers (first to ensure all responses have security headers)
 configure_security_headers(app, enable_hsts=True)
 
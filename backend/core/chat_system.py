@@ -196,10 +196,11 @@ class StatsChatSystem:
         perspective: str = "team",
         sort: str = "wins",
         order: str = "desc",
+        fields: list[str] | None = None,
     ) -> list[dict[str, Any]]:
         """Get comprehensive team statistics - delegated to TeamStatsService."""
         return self.team_stats.get_comprehensive_team_stats(
-            season, view, perspective, sort, order
+            season, view, perspective, sort, order, fields
         )
 
     def close(self):
@@ -134,6 +134,7 @@ CREATE TABLE IF NOT EXISTS player_season_stats (
     calculated_plus_minus INTEGER GENERATED ALWAYS AS 
         (total_goals + total_assists + total_blocks - total_throwaways - total_drops) STORED,
     completion_percentage DECIMAL(5,2),
+    games_played INTEGER DEFAULT 0,
     UNIQUE(player_id, team_id, year)
 );
 
@@ -191,6 +192,14 @@ CREATE TABLE IF NOT EXISTS game_events (
     pull_ms INTEGER,  -- Pull hangtime in milliseconds
     line_players TEXT,  -- JSON array of player IDs on the line
     pass_type VARCHAR(10),  -- Pass classification: dish, swing, dump, huck, gainer
+    -- Pass geometry to the receiver (or turnover) location
+    vertical_yards DOUBLE PRECISION GENERATED ALWAYS AS
+        (COALESCE(receiver_y, turnover_y) - thrower_y) STORED,
+    horizontal_yards DOUBLE PRECISION GENERATED ALWAYS AS
+        (ABS(COALESCE(receiver_x, turnover_x) - thrower_x)) STORED,
+    distance DOUBLE PRECISION GENERATED ALWAYS AS
+        (SQRT(POWER(COALESCE(receiver_y, turnover_y) - thrower_y, 2) +
+              POWER(COALESCE(receiver_x, turnover_x) - thrower_x, 2))) STORED,
     UNIQUE(game_id, event_index, team)
 );
 
@@ -199,6 +208,144 @@ CREATE TABLE IF NOT EXISTS game_events (
 CREATE INDEX IF NOT EXISTS idx_game_events_game_team ON game_events(game_id, team);
 CREATE INDEX IF NOT EXISTS idx_game_events_type ON game_events(event_type);
 
+-- Pass heatmap cells at the default grid, rebuilt per season at import
+CREATE TABLE IF NOT EXISTS pass_heatmap_cells (
+    year INTEGER NOT NULL,
+    team_id VARCHAR(50) NOT NULL,  -- Offensive team
+    thrower_id VARCHAR(50),
+    pass_type VARCHAR(10),  -- NULL for unclassified passes
+    point VARCHAR(11) NOT NULL,  -- 'origin' or 'destination'
+    cell INTEGER NOT NULL,  -- row * bins_x + column on the default grid
+    attempts INTEGER NOT NULL,
+    completions INTEGER NOT NULL,
+    total_gain DOUBLE PRECISION NOT NULL,  -- Sum of vertical yards
+    gain_count INTEGER NOT NULL  -- Passes with known vertical yards
+);
+
+CREATE INDEX IF NOT EXISTS idx_pass_heatmap_cells_year_team ON pass_heatmap_cells(year, team_id, point);
+CREATE INDEX IF NOT EXISTS idx_pass_heatmap_cells_thrower ON pass_heatmap_cells(thrower_id, year);
+
+-- Play-by-play of Final games as gzip-compressed JSON, per schema version;
+-- events_version fingerprints the game events it was built from
+CREATE TABLE IF NOT EXISTS game_play_by_play (
+    game_id VARCHAR(100) NOT NULL,
+    schema_version INTEGER NOT NULL,
+    events_version VARCHAR(50) NOT NULL,
+    points BYTEA NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (game_id, schema_version)
+);
+
+-- Box scores of Final games as gzip-compressed JSON, per schema version;
+-- source_version fingerprints the game events and player stats it was built from
+CREATE TABLE IF NOT EXISTS game_box_scores (
+    game_id VARCHAR(100) NOT NULL,
+    schema_version INTEGER NOT NULL,
+    source_version VARCHAR(100) NOT NULL,
+    box_score BYTEA NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (game_id, schema_version)
+);
+
+-- One row per team per game: player_game_stats sums and team lines, plus
+-- possession and redzone stats from game_events (NULL without events)
+CREATE TABLE IF NOT EXISTS team_game_stats (
+    game_id VARCHAR(100) NOT NULL,
+    team_id VARCHAR(50) NOT NULL,
+    opponent_id VARCHAR(50) NOT NULL,
+    year INTEGER NOT NULL,
+    is_home BOOLEAN NOT NULL,
+    goals INTEGER NOT NULL DEFAULT 0,
+    assists INTEGER NOT NULL DEFAULT 0,
+    blocks INTEGER NOT NULL DEFAULT 0,
+    completions INTEGER NOT NULL DEFAULT 0,
+    throw_attempts INTEGER NOT NULL DEFAULT 0,
+    throwaways INTEGER NOT NULL DEFAULT 0,
+    stalls INTEGER NOT NULL DEFAULT 0,
+    drops INTEGER NOT NULL DEFAULT 0,
+    hucks_completed INTEGER NOT NULL DEFAULT 0,
+    hucks_attempted INTEGER NOT NULL DEFAULT 0,
+    yards_thrown INTEGER NOT NULL DEFAULT 0,
+    yards_received INTEGER NOT NULL DEFAULT 0,
+    o_opportunities INTEGER NOT NULL DEFAULT 0,
+    o_opportunity_scores INTEGER NOT NULL DEFAULT 0,
+    d_opportunities INTEGER NOT NULL DEFAULT 0,
+    d_opportunity_stops INTEGER NOT NULL DEFAULT 0,
+    o_points_played INTEGER NOT NULL DEFAULT 0,  -- Most O points any player played
+    o_points_scored INTEGER NOT NULL DEFAULT 0,
+    d_points_played INTEGER NOT NULL DEFAULT 0,
+    d_points_scored INTEGER NOT NULL DEFAULT 0,
+    o_line_points INTEGER,
+    o_line_scores INTEGER,
+    o_line_possessions INTEGER,
+    d_line_points INTEGER,
+    d_line_scores INTEGER,
+    d_line_possessions INTEGER,
+    redzone_possessions INTEGER,
+    redzone_goals INTEGER,
+    redzone_attempts INTEGER,
+    quarter_scores TEXT,  -- JSON array of the team's goals per quarter
+    goal_times TEXT,  -- JSON array of [quarter, event_time] per goal
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (game_id, team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_team_game_stats_year_team ON team_game_stats(year, team_id);
+
+-- Games team_game_stats was built from, with a checksum of the game, its
+-- events and its player_game_stats totals; imports rebuild changed games only
+CREATE TABLE IF NOT EXISTS team_game_stats_watermark (
+    game_id VARCHAR(100) PRIMARY KEY,
+    checksum VARCHAR(32) NOT NULL,
+    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Throw events with teams, player names, codes and geometry resolved at import
+CREATE TABLE IF NOT EXISTS pass_events (
+    id INTEGER PRIMARY KEY,  -- game_events.id
+    game_id VARCHAR(100) NOT NULL,
+    year INTEGER NOT NULL,
+    off_team_id VARCHAR(50) NOT NULL,
+    def_team_id VARCHAR(50) NOT NULL,
+    event_type SMALLINT NOT NULL,
+    result SMALLINT NOT NULL,  -- 0 completion, 1 goal, 2 turnover
+    pass_type SMALLINT,  -- 0 dish, 1 swing, 2 dump, 3 huck, 4 gainer; NULL unclassified
+    thrower_id VARCHAR(50),
+    receiver_id VARCHAR(50),
+    thrower_name VARCHAR(255),
+    receiver_name VARCHAR(255),
+    thrower_x REAL,
+    thrower_y REAL,
+    receiver_x REAL,
+    receiver_y REAL,
+    turnover_x REAL,
+    turnover_y REAL,
+    dest_x REAL,  -- Receiver location, or turnover location
+    dest_y REAL,
+    vertical_yards DOUBLE PRECISION,
+    horizontal_yards DOUBLE PRECISION,
+    distance DOUBLE PRECISION
+);
+
+CREATE INDEX IF NOT EXISTS idx_pass_events_year ON pass_events(year);
+CREATE INDEX IF NOT EXISTS idx_pass_events_off_team ON pass_events(off_team_id, year);
+CREATE INDEX IF NOT EXISTS idx_pass_events_def_team ON pass_events(def_team_id, year);
+CREATE INDEX IF NOT EXISTS idx_pass_events_thrower ON pass_events(thrower_id, year);
+CREATE INDEX IF NOT EXISTS idx_pass_events_receiver ON pass_events(receiver_id, year);
+CREATE INDEX IF NOT EXISTS idx_pass_events_game ON pass_events(game_id);
+CREATE INDEX IF NOT EXISTS idx_pass_events_distance ON pass_events(distance);
+
+-- Throwers and receivers of pass events per (season, game, offensive team)
+CREATE TABLE IF NOT EXISTS pass_event_participants (
+    year INTEGER NOT NULL,
+    game_id VARCHAR(100) NOT NULL,
+    team_id VARCHAR(50) NOT NULL,  -- Offensive team
+    player_id VARCHAR(50) NOT NULL,
+    PRIMARY KEY (year, game_id, team_id, player_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pass_event_participants_player ON pass_event_participants(player_id, year);
+
 -- Views for common queries (UFA API compatible)
 CREATE VIEW IF NOT EXISTS current_season_leaders AS
 SELECT 
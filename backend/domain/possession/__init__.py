@@ -11,8 +11,23 @@ from .models import (
     PossessionStats,
     RedzonePossession,
     RedzoneStats,
+    ScoringStats,
+)
+from .processors import (
+    EVENT_TYPE_MASK,
+    RECEIVER_IN_REDZONE,
+    THROWER_IN_REDZONE,
+    PossessionEventProcessor,
+    RedzoneEventProcessor,
+    ScoringEventProcessor,
+    encode_events,
+    process_event_arrays,
+    process_event_codes,
+    process_game_events,
+    process_team_events,
+    scan_team_events,
+    score_event_arrays,
 )
-from .processors import PossessionEventProcessor, RedzoneEventProcessor
 
 __all__ = [
     # Calculators
@@ -23,10 +38,22 @@ __all__ = [
     # Processors
     "PossessionEventProcessor",
     "RedzoneEventProcessor",
+    "ScoringEventProcessor",
+    "process_team_events",
+    "scan_team_events",
+    "process_event_arrays",
+    "process_event_codes",
+    "process_game_events",
+    "score_event_arrays",
+    "encode_events",
+    "EVENT_TYPE_MASK",
+    "RECEIVER_IN_REDZONE",
+    "THROWER_IN_REDZONE",
     # Models
     "Point",
     "RedzonePossession",
     "PossessionStats",
     "RedzoneStats",
+    "ScoringStats",
     "EventProcessorState",
 ]
@@ -9,6 +9,7 @@ from utils.stats import calculate_percentage
 
 from ..calculators.possession_calculator import PossessionCalculator
 from ..calculators.redzone_calculator import RedzoneCalculator
+from ..processors.event_processor import process_team_events
 
 
 class TeamStatsAggregator:
@@ -30,7 +31,7 @@ class TeamStatsAggregator:
     ) -> dict[str, Any]:
         """
         Calculate both possession and redzone statistics in a single operation.
-        Optimized to minimize database queries.
+        Fetches the team's events once and runs both processors in one pass.
 
         Args:
             game_id: Game identifier
@@ -40,14 +41,31 @@ class TeamStatsAggregator:
         Returns:
             Dictionary containing both possession and redzone statistics
         """
-        possession_stats = self.possession_calc.calculate_for_game(
-            game_id, team_id, is_home_team
-        )
-        redzone_stats = self.redzone_calc.calculate_for_team(
-            game_id, team_id, is_home_team
-        )
+        team_type = "home" if is_home_team else "away"
+        # The redzone fetch has every column the possession processor reads
+        events = self.redzone_calc._fetch_events(game_id, team_type)
+        return self._combined_from_events(events, team_type)
 
-        return {"possession": possession_stats, "redzone": redzone_stats}
+    @staticmethod
+    def _combined_from_events(
+        events: list[dict[str, Any]], team_type: str
+    ) -> dict[str, Any]:
+        """Possession and redzone stats of one team's events, as the calculators return them."""
+        if not events:
+            return {
+                "possession": None,
+                "redzone": {
+                    "redzone_possessions": 0,
+                    "redzone_goals": 0,
+                    "redzone_attempts": 0,
+                },
+            }
+
+        possession_stats, redzone_stats = process_team_events(events, team_type)
+        return {
+            "possession": possession_stats.to_dict(),
+            "redzone": redzone_stats.to_dict(),
+        }
 
     @staticmethod
     def calculate_team_percentages(
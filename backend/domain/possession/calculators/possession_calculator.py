@@ -6,6 +6,7 @@ Calculates O-line and D-line conversion rates and hold percentages.
 from typing import Any
 
 from ..processors.event_processor import PossessionEventProcessor
+from ..processors.vectorized import process_game_events
 
 
 class PossessionCalculator:
@@ -90,33 +91,15 @@ class PossessionCalculator:
 
         all_events = self.db.execute_query(query, params)
 
-        # Group events by game and team
-        games_by_team = {}
-        for event in all_events:
-            home_team = event["home_team_id"]
-            away_team = event["away_team_id"]
-            game_id = event["game_id"]
-
-            # Initialize team structures if needed
-            for team_id in [home_team, away_team]:
-                if team_id not in games_by_team:
-                    games_by_team[team_id] = {}
-                if game_id not in games_by_team[team_id]:
-                    games_by_team[team_id][game_id] = {
-                        "is_home": team_id == home_team,
-                        "events": [],
-                    }
-
-            # Add event to appropriate team (only if it's their team type)
-            if event["team"] == "home" and home_team in team_ids:
-                games_by_team[home_team][game_id]["events"].append(event)
-            elif event["team"] == "away" and away_team in team_ids:
-                games_by_team[away_team][game_id]["events"].append(event)
-
-        # Process each team's games
-        results = {}
-        for team_id in team_ids:
-            team_stats = {
+        # Each team's events of each game through the vectorized engine
+        team_games = process_game_events(all_events)
+        games = {
+            event["game_id"]: (event["home_team_id"], event["away_team_id"])
+            for event in all_events
+        }
+
+        results = {
+            team_id: {
                 "o_line_points": 0,
                 "o_line_scores": 0,
                 "o_line_possessions": 0,
@@ -124,22 +107,19 @@ class PossessionCalculator:
                 "d_line_scores": 0,
                 "d_line_possessions": 0,
             }
-
-            if team_id in games_by_team:
-                for game_data in games_by_team[team_id].values():
-                    team_type = "home" if game_data["is_home"] else "away"
-                    processor = PossessionEventProcessor(team_type)
-                    game_stats = processor.process_events(game_data["events"])
-
-                    # Aggregate stats
-                    team_stats["o_line_points"] += game_stats.o_line_points
-                    team_stats["o_line_scores"] += game_stats.o_line_scores
-                    team_stats["o_line_possessions"] += game_stats.o_line_possessions
-                    team_stats["d_line_points"] += game_stats.d_line_points
-                    team_stats["d_line_scores"] += game_stats.d_line_scores
-                    team_stats["d_line_possessions"] += game_stats.d_line_possessions
-
-            results[team_id] = team_stats
+            for team_id in team_ids
+        }
+        for (game_id, team_type), game_stats in team_games.items():
+            home_team, away_team = games[game_id]
+            team_id = home_team if team_type == "home" else away_team
+            if team_id in results:
+                team_stats = results[team_id]
+                team_stats["o_line_points"] += game_stats["o_line_points"]
+                team_stats["o_line_scores"] += game_stats["o_line_scores"]
+                team_stats["o_line_possessions"] += game_stats["o_line_possessions"]
+                team_stats["d_line_points"] += game_stats["d_line_points"]
+                team_stats["d_line_scores"] += game_stats["d_line_scores"]
+                team_stats["d_line_possessions"] += game_stats["d_line_possessions"]
 
         return results
 
@@ -8,6 +8,7 @@ from .point import (
     PossessionStats,
     RedzonePossession,
     RedzoneStats,
+    ScoringStats,
 )
 
 __all__ = [
@@ -15,5 +16,6 @@ __all__ = [
     "RedzonePossession",
     "PossessionStats",
     "RedzoneStats",
+    "ScoringStats",
     "EventProcessorState",
 ]
@@ -93,6 +93,29 @@ class RedzoneStats:
         }
 
 
+@dataclass
+class ScoringStats:
+    """
+    Goals per quarter and the scoring timeline of a game.
+
+    Quarter 5 is overtime. A quarter is listed once it ends, or while it is
+    in progress once somebody has scored in it.
+    """
+
+    home_quarter_scores: list[int] = field(default_factory=list)
+    away_quarter_scores: list[int] = field(default_factory=list)
+    goals: list[dict] = field(default_factory=list)  # quarter, event_time, team
+
+    def quarters(self) -> list[dict]:
+        """Each quarter's goals by both teams."""
+        return [
+            {"quarter": quarter, "home_score": home, "away_score": away}
+            for quarter, (home, away) in enumerate(
+                zip(self.home_quarter_scores, self.away_quarter_scores, strict=True), 1
+            )
+        ]
+
+
 @dataclass
 class EventProcessorState:
     """
@@ -115,6 +138,14 @@ class EventProcessorState:
     in_possession: bool = False
     point_num: int = 0
 
+    # Scoring tracking
+    quarter: int = 1
+    quarter_goals: dict[str, int] = field(
+        default_factory=lambda: {"home": 0, "away": 0}
+    )
+    quarter_scores: list[dict[str, int]] = field(default_factory=list)
+    goals: list[dict] = field(default_factory=list)
+
     def finalize_current_point(self) -> None:
         """Save current point if it had action."""
         if self.current_point and self.point_had_action:
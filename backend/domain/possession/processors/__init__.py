@@ -2,6 +2,36 @@
 Event processors for possession tracking.
 """
 
-from .event_processor import PossessionEventProcessor, RedzoneEventProcessor
+from .event_processor import (
+    PossessionEventProcessor,
+    RedzoneEventProcessor,
+    ScoringEventProcessor,
+    process_team_events,
+    scan_team_events,
+)
+from .vectorized import (
+    EVENT_TYPE_MASK,
+    RECEIVER_IN_REDZONE,
+    THROWER_IN_REDZONE,
+    encode_events,
+    process_event_arrays,
+    process_event_codes,
+    process_game_events,
+    score_event_arrays,
+)
 
-__all__ = ["PossessionEventProcessor", "RedzoneEventProcessor"]
+__all__ = [
+    "PossessionEventProcessor",
+    "RedzoneEventProcessor",
+    "ScoringEventProcessor",
+    "process_team_events",
+    "scan_team_events",
+    "process_event_arrays",
+    "process_event_codes",
+    "process_game_events",
+    "score_event_arrays",
+    "encode_events",
+    "EVENT_TYPE_MASK",
+    "RECEIVER_IN_REDZONE",
+    "THROWER_IN_REDZONE",
+]
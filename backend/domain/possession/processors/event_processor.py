@@ -11,8 +11,13 @@ from ..models.point import (
     PossessionStats,
     RedzonePossession,
     RedzoneStats,
+    ScoringStats,
 )
 
+# END_FIRST_QUARTER, HALFTIME, END_THIRD_QUARTER, END_REGULATION, END_FIRST_OT,
+# END_SECOND_OT
+QUARTER_END_EVENTS = [28, 29, 30, 31, 32, 33]
+
 
 class PossessionEventProcessor:
     """Processes game events to track possession statistics."""
@@ -383,3 +388,135 @@ class RedzoneEventProcessor:
         )
 
         return stats
+
+
+class ScoringEventProcessor:
+    """Processes game events to track goals per quarter."""
+
+    def __init__(self, team_type: str):
+        """
+        Initialize the processor.
+
+        Args:
+            team_type: 'home' or 'away', the team recording events that
+                have no team field
+        """
+        self.team_type = team_type
+
+    def process_events(self, events: list[dict[str, Any]]) -> ScoringStats:
+        """
+        Process a list of events to calculate quarter scores.
+
+        Both teams record every goal and quarter end, so one team's events
+        give both teams' scores.
+
+        Args:
+            events: List of game events, with event_time
+
+        Returns:
+            ScoringStats object with calculated statistics
+        """
+        state = EventProcessorState()
+
+        for event in events:
+            self._process_single_event(event, state)
+
+        return self._calculate_stats(state)
+
+    def _process_single_event(
+        self, event: dict[str, Any], state: EventProcessorState
+    ) -> None:
+        """Process a single event for scoring."""
+        event_type = event["event_type"]
+        recording_team = event.get("team") or self.team_type
+
+        if event_type in [19, 23]:  # Goal or callahan by the recording team
+            self._handle_goal(event, recording_team, state)
+        elif event_type in [15, 12]:  # Goal or callahan by the opponent
+            opponent = "away" if recording_team == "home" else "home"
+            self._handle_goal(event, opponent, state)
+        elif event_type in QUARTER_END_EVENTS:
+            state.quarter_scores.append(state.quarter_goals)
+            state.quarter_goals = {"home": 0, "away": 0}
+            state.quarter += 1
+
+    def _handle_goal(
+        self, event: dict[str, Any], scoring_team: str, state: EventProcessorState
+    ) -> None:
+        """Credit a goal to the scoring team in the current quarter."""
+        state.quarter_goals[scoring_team] += 1
+        state.goals.append(
+            {
+                "quarter": state.quarter,
+                "event_time": event.get("event_time"),
+                "team": scoring_team,
+            }
+        )
+
+    def _calculate_stats(self, state: EventProcessorState) -> ScoringStats:
+        """Calculate statistics from the ended quarters and the current one."""
+        quarters = list(state.quarter_scores)
+        if any(state.quarter_goals.values()):
+            quarters.append(state.quarter_goals)
+
+        return ScoringStats(
+            home_quarter_scores=[quarter["home"] for quarter in quarters],
+            away_quarter_scores=[quarter["away"] for quarter in quarters],
+            goals=state.goals,
+        )
+
+
+def scan_team_events(
+    events: list[dict[str, Any]], team_type: str
+) -> tuple[PossessionStats, RedzoneStats, ScoringStats]:
+    """
+    Process a team's events for possession, redzone and scoring stats in one pass.
+
+    The processors keep disjoint fields of EventProcessorState, so all of
+    them advance on one state, event by event.
+
+    Args:
+        events: Game events of this team, with receiver_y, thrower_y and
+            event_time
+        team_type: 'home' or 'away'
+
+    Returns:
+        PossessionStats, RedzoneStats and ScoringStats, as each processor's
+        process_events() returns them
+    """
+    possession = PossessionEventProcessor(team_type)
+    redzone = RedzoneEventProcessor(team_type)
+    scoring = ScoringEventProcessor(team_type)
+    state = EventProcessorState()
+
+    for event in events:
+        possession._process_single_event(event, state)
+        redzone._process_single_event(event, state)
+        scoring._process_single_event(event, state)
+
+    state.finalize_current_point()
+    state.finalize_current_redzone_possession()
+
+    return (
+        possession._calculate_stats_from_points(state.points),
+        redzone._calculate_stats_from_possessions(state.redzone_possessions),
+        scoring._calculate_stats(state),
+    )
+
+
+def process_team_events(
+    events: list[dict[str, Any]], team_type: str
+) -> tuple[PossessionStats, RedzoneStats]:
+    """
+    Process a team's events for possession and redzone stats in one pass.
+
+    Args:
+        events: Game events of this team, with receiver_y and thrower_y
+        team_type: 'home' or 'away'
+
+    Returns:
+        PossessionStats and RedzoneStats, as each processor's
+        process_events() returns them
+    """
+    possession, redzone, _ = scan_team_events(events, team_type)
+    return possession, redzone
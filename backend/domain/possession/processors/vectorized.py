@@ -0,0 +1,467 @@
+"""
+Vectorized possession, redzone and scoring engine.
+
+PossessionEventProcessor, RedzoneEventProcessor and ScoringEventProcessor walk
+one team's events at a time, one Python dict and method call per event. This
+engine applies the same rules to a whole batch of teams' events held as NumPy
+columns. Each (game, team) is a segment of consecutive events. Every flag the
+processors carry from event to event (in a point, team on the disc, pass made
+since gaining it, ...) is the value the last event that set it gave it, so it
+is carried forward with a running maximum of setter positions. Points,
+possessions and quarters are then runs of events within a segment, counted
+with bincount.
+
+Events come in as event codes: the event type with a flag for each of its
+receiver_y and thrower_y in the redzone, which is all the engine reads of
+them. The database computes them (see EVENT_CODE_SQL in
+services.team_game_stats), so a batch is fetched as integer columns.
+
+It is plain NumPy, with a fixed number of passes over the batch.
+"""
+
+from operator import methodcaller
+
+import numpy as np
+
+from ..models.point import ScoringStats
+
+# Event kinds, as the processors group event types
+OTHER = 0
+D_START = 1  # 1: team pulls
+O_START = 2  # 2: team receives
+TEAM_GOAL = 3  # 19 goal, 23 callahan
+OPPONENT_GOAL = 4  # 15 goal, 12 callahan by the opponent
+PASS = 5  # 18
+GAIN = 6  # 11 block, 13 opponent throwaway, 14 stall on the opponent
+LOSS = 7  # 20 drop, 22 throwaway, 24 stall
+
+_EVENT_KINDS = np.zeros(256, dtype=np.int8)
+for _event_types, _kind in [
+    ((1,), D_START),
+    ((2,), O_START),
+    ((19, 23), TEAM_GOAL),
+    ((15, 12), OPPONENT_GOAL),
+    ((18,), PASS),
+    ((11, 13, 14), GAIN),
+    ((20, 22, 24), LOSS),
+]:
+    _EVENT_KINDS[list(_event_types)] = _kind
+
+# Event code flags, above the event type's 8 bits
+RECEIVER_IN_REDZONE = 256
+THROWER_IN_REDZONE = 512
+EVENT_TYPE_MASK = 255
+
+# Quarter ends: the possession rule only applies at 28-31, the scoring covers
+# the overtime ends too
+POSSESSION_QUARTER_ENDS = [28, 29, 30, 31]
+SCORING_QUARTER_ENDS = [28, 29, 30, 31, 32, 33]
+
+
+def _segment_starts(segment: np.ndarray) -> np.ndarray:
+    """Positions of the first event of each segment."""
+    return np.flatnonzero(np.r_[True, segment[1:] != segment[:-1]])
+
+
+def _carry(
+    sets: np.ndarray,
+    values: np.ndarray | bool,
+    starts: np.ndarray,
+    positions: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    A processor state flag before and after each event.
+
+    Each segment starts with the flag False; events where `sets` is True set
+    it to their `values`, and the flag keeps the last value set. `positions`
+    is np.arange() of the number of events.
+    """
+    setter = sets.copy()
+    setter[starts] = True
+    value = sets & values
+    after = value[np.maximum.accumulate(positions * setter)]
+    before = np.empty_like(after)
+    before[1:] = after[:-1]
+    before[starts] = False
+    return before, after
+
+
+def _positions(events: int) -> np.ndarray:
+    """np.arange(events), int32 while that holds it (faster to accumulate)."""
+    return np.arange(events, dtype=np.int32 if events < 2**31 else np.int64)
+
+
+def _in_redzone(y: np.ndarray) -> np.ndarray:
+    """80 <= y <= 100; NaN (NULL) is outside."""
+    return (y >= 80) & (y <= 100)
+
+
+def encode_events(
+    event_type: np.ndarray, receiver_y: np.ndarray, thrower_y: np.ndarray
+) -> np.ndarray:
+    """
+    Event codes of a batch of events, as EVENT_CODE_SQL computes them.
+
+    Event types outside 0-255, none of which the engine reads, are coded 0.
+    """
+    event_type = np.asarray(event_type, dtype=np.int64)
+    return (
+        np.where((event_type >= 0) & (event_type <= EVENT_TYPE_MASK), event_type, 0)
+        | np.where(_in_redzone(receiver_y), RECEIVER_IN_REDZONE, 0)
+        | np.where(_in_redzone(thrower_y), THROWER_IN_REDZONE, 0)
+    )
+
+
+def process_event_arrays(
+    segment: np.ndarray,
+    event_type: np.ndarray,
+    receiver_y: np.ndarray,
+    thrower_y: np.ndarray,
+    segments: int,
+) -> dict[str, np.ndarray]:
+    """
+    Possession and redzone stats of every segment of a batch of events.
+
+    Args:
+        segment: Segment (one team's events in one game) of each event,
+            nondecreasing, with each segment's events in processing order
+        event_type: Event type of each event
+        receiver_y: receiver_y of each event, NaN for NULL
+        thrower_y: thrower_y of each event, NaN for NULL
+        segments: Number of segments
+
+    Returns:
+        Per segment arrays, named as PossessionStats.to_dict() and
+        RedzoneStats.to_dict() keys, with what process_team_events() gives
+        for the segment's events (zeros for segments without events)
+    """
+    return process_event_codes(
+        segment, encode_events(event_type, receiver_y, thrower_y), segments
+    )
+
+
+def process_event_codes(
+    segment: np.ndarray, code: np.ndarray, segments: int
+) -> dict[str, np.ndarray]:
+    """
+    process_event_arrays() of a batch of events given as event codes.
+
+    Args:
+        segment: Segment of each event, as for process_event_arrays()
+        code: Event code of each event (see encode_events())
+        segments: Number of segments
+    """
+    counts = {
+        column: np.zeros(segments, dtype=np.int64)
+        for column in (
+            "o_line_points",
+            "o_line_scores",
+            "o_line_possessions",
+            "d_line_points",
+            "d_line_scores",
+            "d_line_possessions",
+            "redzone_possessions",
+            "redzone_goals",
+            "redzone_attempts",
+        )
+    }
+    if len(code) == 0:
+        counts["d_line_conversions"] = counts["d_line_possessions"]
+        return counts
+
+    event_type = code & EVENT_TYPE_MASK
+    kinds = _EVENT_KINDS[event_type]
+    starts = _segment_starts(segment)
+    positions = _positions(len(code))
+    counts.update(
+        _possession_counts(segment, event_type, kinds, starts, positions, segments)
+    )
+    counts.update(_redzone_counts(segment, code, kinds, starts, positions, segments))
+    counts["d_line_conversions"] = counts["d_line_possessions"]
+    return counts
+
+
+def process_game_events(events: list[dict]) -> dict[tuple[str, str], dict[str, int]]:
+    """
+    Possession and redzone stats of each team's events in a batch of games.
+
+    Args:
+        events: Event dicts with game_id, team, event_type and, for the
+            redzone stats, receiver_y and thrower_y, grouped by game and in
+            processing order within it (both teams' events interleaved)
+
+    Returns:
+        process_event_arrays() counts keyed by (game_id, team type), for each
+        team with events
+    """
+    events = [event for event in events if event["team"] in ("home", "away")]
+    if not events:
+        return {}
+
+    def column(key: str, dtype) -> np.ndarray:
+        # One C-level pass per column; .get() gives the NULLs of absent keys
+        return np.array(list(map(methodcaller("get", key), events)), dtype=dtype)
+
+    game = column("game_id", object)
+    home = column("team", object) == "home"
+    # Each game's away events, then its home events, each in their order
+    new_game = np.r_[True, game[1:] != game[:-1]]
+    order = np.argsort((np.cumsum(new_game) - 1) * 2 + home, kind="stable")
+    game, home = game[order], home[order]
+    new_segment = np.r_[True, (game[1:] != game[:-1]) | (home[1:] != home[:-1])]
+    segment = np.cumsum(new_segment) - 1
+
+    code = encode_events(
+        column("event_type", np.int64),
+        column("receiver_y", np.float64),
+        column("thrower_y", np.float64),
+    )
+    counts = process_event_codes(segment, code[order], int(segment[-1]) + 1)
+    keys = zip(
+        game[new_segment].tolist(),
+        np.where(home[new_segment], "home", "away").tolist(),
+        strict=True,
+    )
+    return {
+        key: {name: int(values[i]) for name, values in counts.items()}
+        for i, key in enumerate(keys)
+    }
+
+
+def _possession_counts(
+    segment: np.ndarray,
+    event_type: np.ndarray,
+    kinds: np.ndarray,
+    starts: np.ndarray,
+    positions: np.ndarray,
+    segments: int,
+) -> dict[str, np.ndarray]:
+    """PossessionEventProcessor counts of every segment."""
+    o_start = kinds == O_START
+    is_gain = kinds == GAIN
+    is_loss = kinds == LOSS
+    # A start event opens a point; the segment's events before one are ignored
+    is_start = (kinds == D_START) | o_start
+    _, in_point = _carry(is_start, True, starts, positions)
+
+    # current_possession is the team's from receiving the pull or gaining the
+    # disc, the opponent's from pulling or losing it
+    had_disc, has_disc = _carry(
+        is_start | is_gain | is_loss, o_start | is_gain, starts, positions
+    )
+    gain = is_gain & ~had_disc
+    loss = is_loss & had_disc
+    team_pass = (kinds == PASS) & had_disc
+    # pass_made_since_gain: cleared by gaining the disc, set by a start, a
+    # goal, a pass or losing the disc
+    _, pass_made = _carry(
+        is_start | (kinds == TEAM_GOAL) | team_pass | loss | gain,
+        ~gain,
+        starts,
+        positions,
+    )
+    # point_had_team_pass: cleared by a start, set by a pass
+    _, point_had_team_pass = _carry(is_start | team_pass, ~is_start, starts, positions)
+
+    point = np.cumsum(is_start, dtype=positions.dtype) - 1
+    start_positions = np.flatnonzero(is_start)
+    points = len(start_positions)
+    point_segment = segment[start_positions]
+    o_point = o_start[start_positions]
+
+    # Points without a goal, pass or turnover are dropped
+    action = in_point & (kinds >= TEAM_GOAL)
+    had_action = np.bincount(point[action], minlength=points) > 0
+
+    # The point's last goal decides who scored it
+    goals = np.flatnonzero(in_point & ((kinds == TEAM_GOAL) | (kinds == OPPONENT_GOAL)))
+    goal_points = point[goals]
+    last = np.diff(goal_points, append=-1) != 0
+    team_scored = np.zeros(points, dtype=bool)
+    team_scored[goal_points[last]] = kinds[goals[last]] == TEAM_GOAL
+
+    # The team gains the disc: one more possession
+    gain &= in_point
+    # A quarter ends with the team on the disc and no pass since gaining it,
+    # nor during the point: one possession less, while it has any
+    uncounted = (
+        in_point
+        & np.isin(event_type, POSSESSION_QUARTER_ENDS)
+        & has_disc
+        & ~pass_made
+        & ~point_had_team_pass
+    )
+    initial = o_point.astype(np.int64)
+    gains = np.bincount(point[gain], minlength=points)
+    removed = np.bincount(point[uncounted], minlength=points)
+
+    # Each removal only applies while the count is positive: the count
+    # without that floor, at each removal, dips below zero by the number of
+    # removals that were skipped
+    removals = np.flatnonzero(uncounted)
+    removal_points = point[removals]
+    gains_so_far = np.cumsum(gain, dtype=positions.dtype)
+    removed_so_far = np.cumsum(uncounted, dtype=positions.dtype)
+    unfloored = (
+        initial[removal_points]
+        + gains_so_far[removals]
+        - gains_so_far[start_positions][removal_points]
+        - removed_so_far[removals]
+        + removed_so_far[start_positions][removal_points]
+    )
+    dip = np.zeros(points, dtype=np.int64)
+    np.minimum.at(dip, removal_points, unfloored)
+    team_possessions = initial + gains - removed - dip
+
+    o_line = had_action & o_point
+    d_line = had_action & ~o_point
+    return {
+        "o_line_points": np.bincount(point_segment[o_line], minlength=segments),
+        "o_line_scores": np.bincount(
+            point_segment[o_line & team_scored], minlength=segments
+        ),
+        "o_line_possessions": np.bincount(
+            point_segment[o_line],
+            weights=team_possessions[o_line],
+            minlength=segments,
+        ).astype(np.int64),
+        "d_line_points": np.bincount(point_segment[d_line], minlength=segments),
+        "d_line_scores": np.bincount(
+            point_segment[d_line & team_scored], minlength=segments
+        ),
+        "d_line_possessions": np.bincount(
+            point_segment[d_line],
+            weights=team_possessions[d_line],
+            minlength=segments,
+        ).astype(np.int64),
+    }
+
+
+def _redzone_counts(
+    segment: np.ndarray,
+    code: np.ndarray,
+    kinds: np.ndarray,
+    starts: np.ndarray,
+    positions: np.ndarray,
+    segments: int,
+) -> dict[str, np.ndarray]:
+    """RedzoneEventProcessor counts of every segment."""
+    goal = (kinds == TEAM_GOAL) | (kinds == OPPONENT_GOAL)
+    is_pass = kinds == PASS
+    is_loss = kinds == LOSS
+    gained = (kinds == O_START) | is_pass | (kinds == GAIN)
+    # in_possession: set by receiving the pull, a pass or gaining the disc,
+    # cleared by pulling, a goal or losing the disc
+    in_possession, _ = _carry(
+        gained | (kinds == D_START) | goal | is_loss, gained, starts, positions
+    )
+
+    # Receiving a pull always opens a possession; a pass or turnover opens one
+    # unless the team is already on one. Every possession opened is counted.
+    opened = (kinds == O_START) | (gained & ~in_possession)
+    possession = np.cumsum(opened, dtype=positions.dtype) - 1
+    possession_segment = segment[opened]
+    possessions = len(possession_segment)
+
+    # current_redzone_possession is closed by a goal, or by losing the disc
+    # while on it; a pull leaves it open
+    open_before, _ = _carry(
+        gained | goal | (is_loss & in_possession), gained, starts, positions
+    )
+    # A pass received in the redzone, or a goal (type 19) thrown from it
+    thrown_goal = 19 | THROWER_IN_REDZONE
+    reached_at = (is_pass & (code & RECEIVER_IN_REDZONE).astype(bool)) | (
+        ((code & (EVENT_TYPE_MASK | THROWER_IN_REDZONE)) == thrown_goal) & open_before
+    )
+    scored_at = (kinds == TEAM_GOAL) & open_before
+    reached = np.zeros(possessions, dtype=bool)
+    reached[possession[reached_at]] = True
+    scored = np.zeros(possessions, dtype=bool)
+    scored[possession[scored_at]] = True
+
+    return {
+        "redzone_possessions": np.bincount(possession_segment, minlength=segments),
+        "redzone_attempts": np.bincount(
+            possession_segment[reached], minlength=segments
+        ),
+        "redzone_goals": np.bincount(
+            possession_segment[reached & scored], minlength=segments
+        ),
+    }
+
+
+def score_event_arrays(
+    segment: np.ndarray,
+    event_type: np.ndarray,
+    event_time: np.ndarray,
+    home: np.ndarray,
+    missing_time: int | None = None,
+) -> list[ScoringStats]:
+    """
+    Quarter scores of every segment of a batch of events.
+
+    Args:
+        segment: Segment of each event, as for process_event_arrays()
+        event_type: Event type of each event
+        event_time: event_time of each event (an object array keeps NULLs)
+        home: Whether each segment is the home team's events
+        missing_time: The event_time standing for NULL in an integer array
+
+    Returns:
+        ScoringEventProcessor.process_events() of each segment's events
+    """
+    segments = len(home)
+    if len(event_type) == 0:
+        return [ScoringStats() for _ in range(segments)]
+
+    starts = _segment_starts(segment)
+    quarter_end = np.isin(event_type, SCORING_QUARTER_ENDS)
+    ended = np.cumsum(quarter_end) - quarter_end
+    first_start = np.zeros(segments, dtype=np.int64)
+    first_start[segment[starts]] = starts
+    quarter = ended - ended[first_start][segment] + 1
+    closed = np.bincount(segment[quarter_end], minlength=segments)
+
+    kinds = _EVENT_KINDS[np.clip(event_type, 0, 255)]
+    goals = np.flatnonzero((kinds == TEAM_GOAL) | (kinds == OPPONENT_GOAL))
+    goal_segment = segment[goals]
+    goal_quarter = quarter[goals]
+    # The side credited: the recording team for its goals, else its opponent
+    goal_home = home[goal_segment] == (kinds[goals] == TEAM_GOAL)
+
+    width = int(closed.max()) + 1
+    cells = goal_segment * width + goal_quarter - 1
+    home_goals = np.bincount(cells[goal_home], minlength=segments * width).reshape(
+        segments, width
+    )
+    away_goals = np.bincount(cells[~goal_home], minlength=segments * width).reshape(
+        segments, width
+    )
+    # The quarter in progress is listed once somebody has scored in it
+    in_progress = (home_goals + away_goals)[np.arange(segments), closed] > 0
+    listed = closed + in_progress
+
+    goal_times = event_time[goals].astype(object)
+    if missing_time is not None:
+        goal_times[event_time[goals] == missing_time] = None
+    timeline = [
+        {"quarter": goal_q, "event_time": time, "team": team}
+        for goal_q, time, team in zip(
+            goal_quarter.tolist(),
+            goal_times.tolist(),
+            np.where(goal_home, "home", "away").tolist(),
+            strict=True,
+        )
+    ]
+    # Goals are in segment order: each segment's are a slice
+    bounds = np.searchsorted(goal_segment, np.arange(segments + 1)).tolist()
+    timelines = [timeline[bounds[s] : bounds[s + 1]] for s in range(segments)]
+
+    return [
+        ScoringStats(
+            home_quarter_scores=home_goals[s, : listed[s]].tolist(),
+            away_quarter_scores=away_goals[s, : listed[s]].tolist(),
+            goals=timelines[s],
+        )
+        for s in range(segments)
+    ]
@@ -2,6 +2,7 @@
 Middleware package for production hardening.
 """
 
+from .compression import CompressionMiddleware, configure_compression
 from .logging_middleware import (
     AuthFailureLoggingMiddleware,
     QuotaLimitLoggingMiddleware,
@@ -20,6 +21,8 @@ from .rate_limit import (
 from .security import SecurityHeadersMiddleware, configure_security_headers
 
 __all__ = [
+    "CompressionMiddleware",
+    "configure_compression",
     "SecurityHeadersMiddleware",
     "configure_security_headers",
     "RequestLoggingMiddleware",
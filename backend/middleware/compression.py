@@ -0,0 +1,201 @@
+"""
+Response compression middleware.
+Negotiates brotli or gzip from Accept-Encoding and compresses JSON and text
+bodies above a size threshold, caching recently compressed bodies.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/vnd.apache.arrow.stream",
+    "text/",
+)
+
+
+def _compress_gzip(body: bytes, level: int) -> bytes:
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _compress_br(body: bytes, level: int) -> bytes:
+    return brotli.compress(body, quality=level)
+
+
+def negotiate_encoding(accept_encoding: str, available: tuple[str, ...]) -> str | None:
+    """
+    Pick the content coding to use for a request.
+
+    Args:
+        accept_encoding: Accept-Encoding request header
+        available: Supported codings in order of preference
+
+    Returns:
+        The preferred acceptable coding, or None for identity
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressedBodyCache:
+    """
+    Bounded LRU cache of compressed bodies keyed by coding and body digest.
+
+    Bounded by entry count and by the total size of the compressed bodies it
+    holds. Bodies that compress to more than max_entry_bytes (large exports)
+    are not cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 16 * 1024 * 1024,
+        max_entry_bytes: int = 1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.size = 0
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compress(self, coding: str, body: bytes, compress) -> bytes:
+        key = (coding, hashlib.blake2b(body, digest_size=16).digest())
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+
+        compressed = compress(body)
+        if len(compressed) > self.max_entry_bytes:
+            return compressed
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = compressed
+                self.size += len(compressed)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+        return compressed
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses complete response bodies.
+
+    Only responses sent as a single body message are compressed; streamed
+    responses (exports, static files) pass through unchanged, as do
+    responses that already carry a Content-Encoding.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        cache_entries: int = 256,
+        cache_bytes: int = 16 * 1024 * 1024,
+    ):
+        """
+        Initialize compression middleware.
+
+        Args:
+            app: ASGI application
+            minimum_size: Smallest body, in bytes, worth compressing
+            gzip_level: gzip compression level (1-9)
+            brotli_quality: brotli quality (0-11)
+            cache_entries: Compressed bodies kept for repeated responses
+            cache_bytes: Total size of the compressed bodies kept
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressors = {
+            "br": lambda body: _compress_br(body, brotli_quality),
+            "gzip": lambda body: _compress_gzip(body, gzip_level),
+        }
+        self.cache = CompressedBodyCache(cache_entries, cache_bytes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        coding = negotiate_encoding(accept_encoding, tuple(self.compressors))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = self.cache.get_or_compress(
+                coding, body, self.compressors[coding]
+            )
+            headers["Content-Encoding"] = coding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def configure_compression(app, minimum_size: int = 1024):
+    """
+    Configure response compression for the application.
+
+    Args:
+        app: FastAPI application instance
+        minimum_size: Smallest body, in bytes, worth compressing
+    """
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
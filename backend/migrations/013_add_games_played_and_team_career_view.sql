@@ -0,0 +1,163 @@
+-- Migration: Store games_played on player_season_stats and add player_team_career_stats
+-- Player stats queries used to rebuild a games_count CTE with COUNT(DISTINCT pgs.game_id)
+-- over all of player_game_stats on every request, and team-career mode re-aggregated
+-- player_season_stats per request. Both are now computed once at import time.
+
+-- games_played per (player, team, year), using the same "actually played" predicate
+ALTER TABLE player_season_stats ADD COLUMN IF NOT EXISTS games_played INTEGER DEFAULT 0;
+
+UPDATE player_season_stats pss
+SET games_played = gc.games_played
+FROM (
+    SELECT
+        pgs.player_id,
+        pgs.team_id,
+        pgs.year,
+        COUNT(DISTINCT pgs.game_id) as games_played
+    FROM player_game_stats pgs
+    WHERE pgs.o_points_played > 0 OR pgs.d_points_played > 0
+       OR pgs.seconds_played > 0 OR pgs.goals > 0 OR pgs.assists > 0
+    GROUP BY pgs.player_id, pgs.team_id, pgs.year
+) gc
+WHERE pss.player_id = gc.player_id
+  AND pss.team_id = gc.team_id
+  AND pss.year = gc.year;
+
+CREATE INDEX IF NOT EXISTS idx_player_season_stats_year_games
+ON player_season_stats(year, games_played);
+
+-- Career totals per (player, team), the team-filtered counterpart of player_career_stats
+DROP MATERIALIZED VIEW IF EXISTS player_team_career_stats;
+
+CREATE MATERIALIZED VIEW player_team_career_stats AS
+WITH team_aggregates AS (
+    SELECT
+        pss.player_id,
+        pss.team_id,
+        MAX(pss.year) as most_recent_year,
+        SUM(pss.games_played) as games_played,
+        SUM(pss.total_goals) as total_goals,
+        SUM(pss.total_assists) as total_assists,
+        SUM(pss.total_hockey_assists) as total_hockey_assists,
+        SUM(pss.total_blocks) as total_blocks,
+        SUM(pss.total_completions) as total_completions,
+        SUM(pss.total_throw_attempts) as total_throw_attempts,
+        SUM(pss.total_yards_thrown) as total_yards_thrown,
+        SUM(pss.total_yards_received) as total_yards_received,
+        SUM(pss.total_throwaways) as total_throwaways,
+        SUM(pss.total_stalls) as total_stalls,
+        SUM(pss.total_drops) as total_drops,
+        SUM(pss.total_callahans) as total_callahans,
+        SUM(pss.total_hucks_completed) as total_hucks_completed,
+        SUM(pss.total_hucks_attempted) as total_hucks_attempted,
+        SUM(pss.total_hucks_received) as total_hucks_received,
+        SUM(pss.total_catches) as total_catches,
+        SUM(pss.total_pulls) as total_pulls,
+        SUM(pss.total_o_points_played) as total_o_points_played,
+        SUM(pss.total_d_points_played) as total_d_points_played,
+        SUM(pss.total_seconds_played) as total_seconds_played,
+        SUM(pss.total_o_opportunities) as total_o_opportunities,
+        SUM(pss.total_d_opportunities) as total_d_opportunities,
+        SUM(pss.total_o_opportunity_scores) as total_o_opportunity_scores
+    FROM player_season_stats pss
+    GROUP BY pss.player_id, pss.team_id
+),
+player_names AS (
+    SELECT DISTINCT ON (pss.player_id, pss.team_id)
+        pss.player_id,
+        pss.team_id,
+        p.full_name,
+        p.first_name,
+        p.last_name
+    FROM player_season_stats pss
+    JOIN players p ON pss.player_id = p.player_id AND pss.year = p.year
+    ORDER BY pss.player_id, pss.team_id, pss.year DESC
+)
+SELECT
+    ta.player_id,
+    ta.team_id,
+    ta.most_recent_year,
+    pn.full_name,
+    pn.first_name,
+    pn.last_name,
+    ta.games_played,
+    ta.total_goals,
+    ta.total_assists,
+    ta.total_hockey_assists,
+    ta.total_blocks,
+    (ta.total_goals + ta.total_assists + ta.total_blocks - ta.total_throwaways - ta.total_drops) as calculated_plus_minus,
+    ta.total_completions,
+    ta.total_throw_attempts,
+    CASE
+        WHEN ta.total_throw_attempts >= 100
+        THEN ROUND(ta.total_completions * 100.0 / ta.total_throw_attempts, 1)
+        ELSE NULL
+    END as completion_percentage,
+    ta.total_yards_thrown,
+    ta.total_yards_received,
+    ta.total_throwaways,
+    ta.total_stalls,
+    ta.total_drops,
+    ta.total_callahans,
+    ta.total_hucks_completed,
+    ta.total_hucks_attempted,
+    ta.total_hucks_received,
+    ta.total_catches,
+    ta.total_pulls,
+    ta.total_o_points_played,
+    ta.total_d_points_played,
+    ta.total_seconds_played,
+    ta.total_o_opportunities,
+    ta.total_d_opportunities,
+    ta.total_o_opportunity_scores,
+    ta.total_o_opportunities as possessions,
+    (ta.total_goals + ta.total_assists) as score_total,
+    (ta.total_o_points_played + ta.total_d_points_played) as total_points_played,
+    (ta.total_yards_thrown + ta.total_yards_received) as total_yards,
+    ROUND(ta.total_seconds_played / 60.0, 0) as minutes_played,
+    CASE WHEN ta.total_hucks_attempted > 0
+        THEN ROUND(ta.total_hucks_completed * 100.0 / ta.total_hucks_attempted, 1)
+        ELSE 0
+    END as huck_percentage,
+    CASE
+        WHEN ta.total_o_opportunities >= 100
+        THEN ROUND(ta.total_o_opportunity_scores * 100.0 / ta.total_o_opportunities, 1)
+        ELSE NULL
+    END as offensive_efficiency,
+    CASE
+        WHEN (ta.total_throwaways + ta.total_stalls + ta.total_drops) > 0
+        THEN ROUND((ta.total_yards_thrown + ta.total_yards_received) * 1.0 / (ta.total_throwaways + ta.total_stalls + ta.total_drops), 1)
+        WHEN (ta.total_yards_thrown + ta.total_yards_received) > 0
+        THEN (ta.total_yards_thrown + ta.total_yards_received) * 1.0
+        ELSE NULL
+    END as yards_per_turn,
+    CASE
+        WHEN ta.total_completions > 0
+        THEN ROUND(ta.total_yards_thrown * 1.0 / ta.total_completions, 1)
+        ELSE NULL
+    END as yards_per_completion,
+    CASE
+        WHEN ta.total_catches > 0
+        THEN ROUND(ta.total_yards_received * 1.0 / ta.total_catches, 1)
+        ELSE NULL
+    END as yards_per_reception,
+    CASE
+        WHEN (ta.total_throwaways + ta.total_stalls + ta.total_drops) > 0
+        THEN ROUND(ta.total_assists * 1.0 / (ta.total_throwaways + ta.total_stalls + ta.total_drops), 2)
+        ELSE NULL
+    END as assists_per_turnover
+FROM team_aggregates ta
+JOIN player_names pn ON ta.player_id = pn.player_id AND ta.team_id = pn.team_id;
+
+-- Unique indexes are required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_team_career_stats_player_team
+ON player_team_career_stats(player_id, team_id);
+CREATE INDEX IF NOT EXISTS idx_team_career_stats_team
+ON player_team_career_stats(team_id, games_played);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_career_stats_player_unique
+ON player_career_stats(player_id);
+
+-- Both views are refreshed after each import (see scripts/ufa/data_manager.py):
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY player_career_stats;
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY player_team_career_stats;
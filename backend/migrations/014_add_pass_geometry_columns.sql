@@ -0,0 +1,24 @@
+-- Migration: Store pass geometry on game_events as generated columns
+-- /api/pass-events computed vertical yards, horizontal yards and distance per row in
+-- Python after fetching, so distance filters ran after the fetch (and after LIMIT).
+-- The destination is the receiver location, or the turnover location for turnovers.
+-- Note: adding STORED generated columns rewrites game_events once.
+
+ALTER TABLE game_events ADD COLUMN IF NOT EXISTS vertical_yards DOUBLE PRECISION
+    GENERATED ALWAYS AS (COALESCE(receiver_y, turnover_y) - thrower_y) STORED;
+
+ALTER TABLE game_events ADD COLUMN IF NOT EXISTS horizontal_yards DOUBLE PRECISION
+    GENERATED ALWAYS AS (ABS(COALESCE(receiver_x, turnover_x) - thrower_x)) STORED;
+
+ALTER TABLE game_events ADD COLUMN IF NOT EXISTS distance DOUBLE PRECISION
+    GENERATED ALWAYS AS (
+        SQRT(
+            POWER(COALESCE(receiver_y, turnover_y) - thrower_y, 2) +
+            POWER(COALESCE(receiver_x, turnover_x) - thrower_x, 2)
+        )
+    ) STORED;
+
+-- Distance range filters on pass events
+CREATE INDEX IF NOT EXISTS idx_game_events_pass_distance
+ON game_events(distance)
+WHERE event_type IN (18, 19, 20, 22);
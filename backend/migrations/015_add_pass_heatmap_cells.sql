@@ -0,0 +1,26 @@
+-- Migration: Precomputed pass heatmap cells
+-- Season, team and player pass maps were drawn by downloading every pass from
+-- /api/pass-events. pass_heatmap_cells holds per-cell pass counts at the default
+-- heatmap grid for each (season, offensive team, thrower, pass type), for both pass
+-- origins and destinations, so /api/pass-events/heatmap sums a few rows instead.
+-- Rows are rebuilt per season by the UFA import; to fill them for existing data run:
+--   uv run python scripts/ufa_data_manager.py refresh-heatmaps
+
+CREATE TABLE IF NOT EXISTS pass_heatmap_cells (
+    year INTEGER NOT NULL,
+    team_id VARCHAR(50) NOT NULL,  -- Offensive team
+    thrower_id VARCHAR(50),
+    pass_type VARCHAR(10),  -- NULL for unclassified passes
+    point VARCHAR(11) NOT NULL,  -- 'origin' or 'destination'
+    cell INTEGER NOT NULL,  -- row * bins_x + column on the default grid
+    attempts INTEGER NOT NULL,
+    completions INTEGER NOT NULL,
+    total_gain DOUBLE PRECISION NOT NULL,  -- Sum of vertical yards
+    gain_count INTEGER NOT NULL  -- Passes with known vertical yards
+);
+
+CREATE INDEX IF NOT EXISTS idx_pass_heatmap_cells_year_team
+ON pass_heatmap_cells(year, team_id, point);
+
+CREATE INDEX IF NOT EXISTS idx_pass_heatmap_cells_thrower
+ON pass_heatmap_cells(thrower_id, year);
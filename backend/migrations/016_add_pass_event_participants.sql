@@ -0,0 +1,38 @@
+-- Migration: Pass event participants facet table
+-- /api/pass-events/filters found the players with pass events by joining players to
+-- all of game_events on (thrower_id OR receiver_id) with DISTINCT, on every dropdown
+-- change. pass_event_participants keeps one row per (season, game, offensive team,
+-- player) for throwers and receivers of pass events; the events importer adds each
+-- game's rows after importing its events.
+
+CREATE TABLE IF NOT EXISTS pass_event_participants (
+    year INTEGER NOT NULL,
+    game_id VARCHAR(100) NOT NULL,
+    team_id VARCHAR(50) NOT NULL,  -- Offensive team
+    player_id VARCHAR(50) NOT NULL,
+    PRIMARY KEY (year, game_id, team_id, player_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pass_event_participants_player
+ON pass_event_participants(player_id, year);
+
+-- Backfill from existing events
+INSERT INTO pass_event_participants (year, game_id, team_id, player_id)
+SELECT
+    g.year,
+    ge.game_id,
+    CASE WHEN ge.team = 'home' THEN g.home_team_id ELSE g.away_team_id END,
+    ge.thrower_id
+FROM game_events ge
+JOIN games g ON ge.game_id = g.game_id
+WHERE ge.event_type IN (18, 19, 20, 22) AND ge.thrower_id IS NOT NULL
+UNION
+SELECT
+    g.year,
+    ge.game_id,
+    CASE WHEN ge.team = 'home' THEN g.home_team_id ELSE g.away_team_id END,
+    ge.receiver_id
+FROM game_events ge
+JOIN games g ON ge.game_id = g.game_id
+WHERE ge.event_type IN (18, 19, 20, 22) AND ge.receiver_id IS NOT NULL
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,78 @@
+-- Migration: Denormalized pass events fact table
+-- /api/pass-events joined game_events to games and twice to players (on year) per
+-- request, and worked out offense and defense from ge.team and the home/away ids.
+-- pass_events holds only throw events (18 pass, 19 goal, 20 drop, 22 throwaway) with
+-- those resolved at import: offensive/defensive team ids, year, player names,
+-- integer-coded pass type and result, destination and geometry.
+-- The events importer adds each game's rows after importing its events.
+
+CREATE TABLE IF NOT EXISTS pass_events (
+    id INTEGER PRIMARY KEY,  -- game_events.id
+    game_id VARCHAR(100) NOT NULL,
+    year INTEGER NOT NULL,
+    off_team_id VARCHAR(50) NOT NULL,
+    def_team_id VARCHAR(50) NOT NULL,
+    event_type SMALLINT NOT NULL,
+    result SMALLINT NOT NULL,  -- 0 completion, 1 goal, 2 turnover
+    pass_type SMALLINT,  -- 0 dish, 1 swing, 2 dump, 3 huck, 4 gainer; NULL unclassified
+    thrower_id VARCHAR(50),
+    receiver_id VARCHAR(50),
+    thrower_name VARCHAR(255),
+    receiver_name VARCHAR(255),
+    thrower_x REAL,
+    thrower_y REAL,
+    receiver_x REAL,
+    receiver_y REAL,
+    turnover_x REAL,
+    turnover_y REAL,
+    dest_x REAL,  -- Receiver location, or turnover location
+    dest_y REAL,
+    vertical_yards DOUBLE PRECISION,
+    horizontal_yards DOUBLE PRECISION,
+    distance DOUBLE PRECISION
+);
+
+-- Filter patterns of /api/pass-events: season, team, player and game
+CREATE INDEX IF NOT EXISTS idx_pass_events_year ON pass_events(year);
+CREATE INDEX IF NOT EXISTS idx_pass_events_off_team ON pass_events(off_team_id, year);
+CREATE INDEX IF NOT EXISTS idx_pass_events_def_team ON pass_events(def_team_id, year);
+CREATE INDEX IF NOT EXISTS idx_pass_events_thrower ON pass_events(thrower_id, year);
+CREATE INDEX IF NOT EXISTS idx_pass_events_receiver ON pass_events(receiver_id, year);
+CREATE INDEX IF NOT EXISTS idx_pass_events_game ON pass_events(game_id);
+CREATE INDEX IF NOT EXISTS idx_pass_events_distance ON pass_events(distance);
+
+-- Backfill from existing events
+INSERT INTO pass_events
+SELECT
+    ge.id,
+    ge.game_id,
+    g.year,
+    CASE WHEN ge.team = 'home' THEN g.home_team_id ELSE g.away_team_id END,
+    CASE WHEN ge.team = 'home' THEN g.away_team_id ELSE g.home_team_id END,
+    ge.event_type,
+    CASE ge.event_type WHEN 18 THEN 0 WHEN 19 THEN 1 ELSE 2 END,
+    CASE ge.pass_type
+        WHEN 'dish' THEN 0 WHEN 'swing' THEN 1 WHEN 'dump' THEN 2
+        WHEN 'huck' THEN 3 WHEN 'gainer' THEN 4
+    END,
+    ge.thrower_id,
+    ge.receiver_id,
+    (SELECT p.full_name FROM players p
+     WHERE p.player_id = ge.thrower_id AND p.year = g.year LIMIT 1),
+    (SELECT p.full_name FROM players p
+     WHERE p.player_id = ge.receiver_id AND p.year = g.year LIMIT 1),
+    ge.thrower_x,
+    ge.thrower_y,
+    ge.receiver_x,
+    ge.receiver_y,
+    ge.turnover_x,
+    ge.turnover_y,
+    COALESCE(ge.receiver_x, ge.turnover_x),
+    COALESCE(ge.receiver_y, ge.turnover_y),
+    ge.vertical_yards,
+    ge.horizontal_yards,
+    ge.distance
+FROM game_events ge
+JOIN games g ON ge.game_id = g.game_id
+WHERE ge.event_type IN (18, 19, 20, 22)
+ON CONFLICT (id) DO NOTHING;
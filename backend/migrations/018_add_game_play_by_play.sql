@@ -0,0 +1,16 @@
+-- Migration: Stored play-by-play for Final games
+-- /api/games/{id}/play-by-play rebuilt both team perspectives from every game event
+-- on each request. Final games keep their output here as gzip-compressed JSON,
+-- generated after import and keyed by game and play-by-play schema version.
+-- events_version fingerprints the game's events and the players of its season
+-- (counts and last ids), as the points carry player names. A stored artifact
+-- with a different fingerprint is stale and is regenerated on request.
+
+CREATE TABLE IF NOT EXISTS game_play_by_play (
+    game_id VARCHAR(100) NOT NULL,
+    schema_version INTEGER NOT NULL,
+    events_version VARCHAR(50) NOT NULL,
+    points BYTEA NOT NULL,  -- gzip-compressed JSON list of points
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (game_id, schema_version)
+);
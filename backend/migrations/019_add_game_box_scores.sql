@@ -0,0 +1,15 @@
+-- Migration: Stored box scores for Final games
+-- /api/games/{id}/box-score and the get_game_details tool rebuilt player lines
+-- and team stats from player_game_stats and game_events on each request. Final
+-- games keep their full box score here as gzip-compressed JSON, keyed by game
+-- and box score schema version and rebuilt by the importer. source_version
+-- fingerprints the game's events and player stats (counts and last ids).
+
+CREATE TABLE IF NOT EXISTS game_box_scores (
+    game_id VARCHAR(100) NOT NULL,
+    schema_version INTEGER NOT NULL,
+    source_version VARCHAR(100) NOT NULL,
+    box_score BYTEA NOT NULL,  -- gzip-compressed JSON box score
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (game_id, schema_version)
+);
@@ -0,0 +1,53 @@
+-- Migration: Team-by-game fact table
+-- The box score, the game details endpoint, the LLM game tools and the
+-- possession scripts each summed player_game_stats by (game_id, team_id) and
+-- re-ran the possession and redzone processors over game_events on the fly.
+-- team_game_stats holds one row per team per game, built by the importer,
+-- so per-game team stats are a primary key lookup and season team stats are a
+-- GROUP BY over it. Possession and redzone columns are NULL for games without
+-- events. For those games, the *_points_played/scored columns give the team's
+-- lines from player_game_stats (the most points any player played).
+
+CREATE TABLE IF NOT EXISTS team_game_stats (
+    game_id VARCHAR(100) NOT NULL,
+    team_id VARCHAR(50) NOT NULL,
+    opponent_id VARCHAR(50) NOT NULL,
+    year INTEGER NOT NULL,
+    is_home BOOLEAN NOT NULL,
+    -- Sums of the team's player_game_stats
+    goals INTEGER NOT NULL DEFAULT 0,
+    assists INTEGER NOT NULL DEFAULT 0,
+    blocks INTEGER NOT NULL DEFAULT 0,
+    completions INTEGER NOT NULL DEFAULT 0,
+    throw_attempts INTEGER NOT NULL DEFAULT 0,
+    throwaways INTEGER NOT NULL DEFAULT 0,
+    stalls INTEGER NOT NULL DEFAULT 0,
+    drops INTEGER NOT NULL DEFAULT 0,
+    hucks_completed INTEGER NOT NULL DEFAULT 0,
+    hucks_attempted INTEGER NOT NULL DEFAULT 0,
+    yards_thrown INTEGER NOT NULL DEFAULT 0,
+    yards_received INTEGER NOT NULL DEFAULT 0,
+    o_opportunities INTEGER NOT NULL DEFAULT 0,
+    o_opportunity_scores INTEGER NOT NULL DEFAULT 0,
+    d_opportunities INTEGER NOT NULL DEFAULT 0,
+    d_opportunity_stops INTEGER NOT NULL DEFAULT 0,
+    -- Team lines from player_game_stats
+    o_points_played INTEGER NOT NULL DEFAULT 0,
+    o_points_scored INTEGER NOT NULL DEFAULT 0,
+    d_points_played INTEGER NOT NULL DEFAULT 0,
+    d_points_scored INTEGER NOT NULL DEFAULT 0,
+    -- Possession and redzone stats from game_events
+    o_line_points INTEGER,
+    o_line_scores INTEGER,
+    o_line_possessions INTEGER,
+    d_line_points INTEGER,
+    d_line_scores INTEGER,
+    d_line_possessions INTEGER,
+    redzone_possessions INTEGER,
+    redzone_goals INTEGER,
+    redzone_attempts INTEGER,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (game_id, team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_team_game_stats_year_team ON team_game_stats(year, team_id);
@@ -0,0 +1,10 @@
+-- Migration: Quarter scores in team_game_stats
+-- Box scores showed quarter scores spread evenly over the final score. The
+-- importer now counts each team's goals per quarter in the same event scan
+-- that builds the possession and redzone columns, and stores them with the
+-- team's row. Both columns are JSON arrays, NULL for games without events:
+-- quarter_scores has the team's goals in each quarter (the fifth and later
+-- entries are overtime) and goal_times a [quarter, event_time] pair per goal.
+
+ALTER TABLE team_game_stats ADD COLUMN quarter_scores TEXT;
+ALTER TABLE team_game_stats ADD COLUMN goal_times TEXT;
@@ -0,0 +1,14 @@
+-- Migration: Watermark of the games team_game_stats was built from
+-- Every import rebuilt the team_game_stats rows of all the seasons it
+-- imported, and team_season_stats possession stats were only brought up to
+-- date by re-running populate_possession_stats.py over whole seasons. This
+-- table records each built game with a checksum of what its rows were built
+-- from (the game, its events and its player_game_stats totals). Imports now
+-- rebuild only games that are new or whose checksum changed, and recompute
+-- the season possession stats of those games' teams.
+
+CREATE TABLE IF NOT EXISTS team_game_stats_watermark (
+    game_id VARCHAR(100) PRIMARY KEY,
+    checksum VARCHAR(32) NOT NULL,
+    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
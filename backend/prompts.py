@@ -324,6 +324,12 @@ Database Schema (UFA API Compatible):
   - Playing Time: o_points_played, o_points_scored, d_points_played, d_points_scored
   - **EXAMPLE**: For player yards in a game → yards_thrown + yards_received (NOT total_yards_thrown + total_yards_received)
 - **team_season_stats**: team_id (UFA string), year (integer), wins, losses, ties, standing
+- **pass_events**: One row per throw (completions, goals, drops, throwaways), already joined to games and players
+  - game_id, year, off_team_id (throwing team), def_team_id, thrower_id, receiver_id, thrower_name, receiver_name
+  - result: 0 completion, 1 goal, 2 turnover; event_type: 18 pass, 19 goal, 20 drop, 22 throwaway
+  - pass_type: 0 dish, 1 swing, 2 dump, 3 huck, 4 gainer, NULL when unclassified
+  - Geometry (yards): thrower_x, thrower_y, dest_x, dest_y (receiver or turnover location), vertical_yards, horizontal_yards, distance
+  - **EXAMPLE**: Longest completed throws in 2025 → SELECT thrower_name, receiver_name, distance FROM pass_events WHERE year = 2025 AND result < 2 ORDER BY distance DESC
 
 SQL Query Guidelines:
 
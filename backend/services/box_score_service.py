@@ -4,6 +4,38 @@ Box score service for calculating team statistics.
 
 from typing import Any
 
+from .team_game_stats import POSSESSION_COLUMNS, fetch_game_team_stats
+
+
+def calculate_game_team_stats(
+    stats_system,
+    game_id: str,
+    home_team_id: str,
+    away_team_id: str,
+    rows: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Calculate team statistics of both teams of a game.
+
+    Both teams' stats come from one team_game_stats lookup.
+
+    Args:
+        stats_system: The stats system instance
+        game_id: Game identifier
+        home_team_id: Home team identifier
+        away_team_id: Away team identifier
+        rows: fetch_game_team_stats() of the game, if the caller has it
+
+    Returns:
+        calculate_team_stats() of the home and away teams, keyed "home" and "away"
+    """
+    if rows is None:
+        rows = fetch_game_team_stats(stats_system.db, game_id)
+    return {
+        "home": _build_team_stats(rows.get(home_team_id, {})),
+        "away": _build_team_stats(rows.get(away_team_id, {})),
+    }
+
 
 def calculate_team_stats(
     stats_system, game_id: str, team_id: str, is_home: bool
@@ -20,56 +52,47 @@ def calculate_team_stats(
     Returns:
         Dictionary containing all team statistics
     """
-    from data.possession import calculate_team_stats_combined
-
-    # Get team aggregate stats from player_game_stats
-    team_stats_query = """
-    SELECT
-        SUM(completions) as total_completions,
-        SUM(throw_attempts) as total_attempts,
-        SUM(hucks_completed) as total_hucks_completed,
-        SUM(hucks_attempted) as total_hucks_attempted,
-        SUM(blocks) as total_blocks,
-        SUM(throwaways) as total_throwaways,
-        SUM(stalls) as total_stalls,
-        SUM(drops) as total_drops
-    FROM player_game_stats
-    WHERE game_id = :game_id AND team_id = :team_id
-    """
+    row = fetch_game_team_stats(stats_system.db, game_id).get(team_id)
+    if row is None:
+        return {}
+    return _build_team_stats(row)
 
-    team_stats_result = stats_system.db.execute_query(
-        team_stats_query, {"game_id": game_id, "team_id": team_id}
-    )
 
-    if not team_stats_result:
-        return {}
+def _build_team_stats(row: dict[str, Any]) -> dict[str, Any]:
+    """
+    Build a team's box score stats.
 
-    team_stats = team_stats_result[0]
+    Args:
+        row: The team's team_game_stats row (empty when the game has no
+            row for the team)
 
+    Returns:
+        Dictionary containing all team statistics
+    """
     # Calculate basic percentages
-    completions = team_stats["total_completions"] or 0
-    attempts = team_stats["total_attempts"] or 0
+    completions = row.get("completions") or 0
+    attempts = row.get("throw_attempts") or 0
     completion_pct = round((completions / attempts * 100), 1) if attempts > 0 else 0
 
-    hucks_completed = team_stats["total_hucks_completed"] or 0
-    hucks_attempted = team_stats["total_hucks_attempted"] or 0
+    hucks_completed = row.get("hucks_completed") or 0
+    hucks_attempted = row.get("hucks_attempted") or 0
     huck_pct = (
         round((hucks_completed / hucks_attempted * 100), 1)
         if hucks_attempted > 0
         else 0
     )
 
-    blocks = team_stats["total_blocks"] or 0
-    turnovers = (team_stats["total_throwaways"] or 0) + (
-        team_stats["total_stalls"] or 0
-    )
+    blocks = row.get("blocks") or 0
+    turnovers = (row.get("throwaways") or 0) + (row.get("stalls") or 0)
 
-    # Calculate possession and redzone stats from game_events in a single query
-    combined_stats = calculate_team_stats_combined(
-        stats_system.db, game_id, team_id, is_home
-    )
-    possession_stats = combined_stats.get("possession")
-    redzone_stats = combined_stats.get("redzone")
+    # Possession stats are NULL for games without events; redzone stats are zero
+    possession_stats = None
+    if row.get("o_line_points") is not None:
+        possession_stats = {column: row[column] for column in POSSESSION_COLUMNS}
+    redzone_stats = {
+        "redzone_goals": row.get("redzone_goals") or 0,
+        "redzone_attempts": row.get("redzone_attempts") or 0,
+    }
 
     # Build result dictionary
     result = {
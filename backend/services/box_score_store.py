@@ -0,0 +1,353 @@
+"""
+Stored box scores for Final games.
+
+/api/games/{game_id}/box-score and the get_game_details tool used to rebuild
+player lines and team stats from player_game_stats and game_events on every
+cache miss. Final games keep their full box score in game_box_scores as
+gzip-compressed JSON, keyed by game_id and BOX_SCORE_SCHEMA_VERSION, so
+serving one is a single primary key lookup. Each box score records the
+fingerprint of the events and player stats it was built from, and the
+importer rebuilds the ones whose fingerprint changed.
+"""
+
+import gzip
+from decimal import Decimal
+from typing import Any
+
+import orjson
+
+from .box_score_service import calculate_game_team_stats
+from .quarter_score_service import build_game_scoring
+from .team_game_stats import fetch_game_team_stats
+
+# Bump when the box score changes shape; older box scores are ignored
+BOX_SCORE_SCHEMA_VERSION = 2
+
+
+def source_version(db, game_id: str) -> str:
+    """Fingerprint of a game's events and player stats: their counts and last ids."""
+    [row] = db.execute_query(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM game_events WHERE game_id = :game_id) as events,
+            (SELECT MAX(id) FROM game_events WHERE game_id = :game_id) as last_event,
+            (SELECT COUNT(*) FROM player_game_stats WHERE game_id = :game_id) as stats,
+            (SELECT MAX(id) FROM player_game_stats WHERE game_id = :game_id) as last_stat
+        """,
+        {"game_id": game_id},
+    )
+    return f"{row['events']}:{row['last_event']}/{row['stats']}:{row['last_stat']}"
+
+
+def _encode_decimal(value: Any) -> int | float:
+    """Postgres NUMERIC as the API responses encode it: whole numbers stay integers."""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def encode_box_score(box_score: dict[str, Any]) -> bytes:
+    return gzip.compress(orjson.dumps(box_score, default=_encode_decimal), mtime=0)
+
+
+def decode_box_score(data: bytes) -> dict[str, Any]:
+    return orjson.loads(gzip.decompress(bytes(data)))
+
+
+def build_box_score(stats_system, game_id: str) -> dict[str, Any] | None:
+    """
+    Build the box score of a game from its player stats and events.
+
+    Args:
+        stats_system: Object with a db attribute
+        game_id: Game ID
+
+    Returns:
+        Game info with each team's player lines and team stats, or None if
+        the game does not exist
+    """
+    # Get game information
+    game_query = """
+    SELECT
+        g.game_id,
+        g.home_team_id,
+        g.away_team_id,
+        g.home_score,
+        g.away_score,
+        g.status,
+        g.start_timestamp,
+        g.location,
+        g.year,
+        g.week,
+        ht.full_name as home_team_name,
+        ht.city as home_team_city,
+        ht.name as home_team_short_name,
+        ht.abbrev as home_team_abbrev,
+        ht.logo_url as home_team_logo_url,
+        at.full_name as away_team_name,
+        at.city as away_team_city,
+        at.name as away_team_short_name,
+        at.abbrev as away_team_abbrev,
+        at.logo_url as away_team_logo_url
+    FROM games g
+    LEFT JOIN teams ht ON g.home_team_id = ht.team_id AND g.year = ht.year
+    LEFT JOIN teams at ON g.away_team_id = at.team_id AND g.year = at.year
+    WHERE g.game_id = :game_id
+    """
+
+    game_info = stats_system.db.execute_query(game_query, {"game_id": game_id})
+    if not game_info:
+        return None
+
+    game = game_info[0]
+
+    # Team stats and quarter scoring of both teams from one team_game_stats lookup
+    team_rows = fetch_game_team_stats(stats_system.db, game_id)
+    scoring = build_game_scoring(
+        team_rows.get(game["home_team_id"], {}),
+        team_rows.get(game["away_team_id"], {}),
+    )
+
+    # Get all player statistics for both teams
+    player_stats_query = """
+    SELECT
+        p.full_name,
+        p.jersey_number,
+        pgs.player_id,
+        pgs.team_id,
+        pgs.o_points_played,
+        pgs.d_points_played,
+        (pgs.o_points_played + pgs.d_points_played) as points_played,
+        pgs.assists,
+        pgs.goals,
+        pgs.blocks,
+        pgs.completions,
+        pgs.throw_attempts,
+        CASE
+            WHEN pgs.throw_attempts > 0
+            THEN ROUND((pgs.completions * 100.0 / pgs.throw_attempts), 1)
+            ELSE 0
+        END as completion_percentage,
+        pgs.throwaways,
+        pgs.stalls,
+        pgs.drops,
+        pgs.callahans,
+        pgs.hockey_assists,
+        pgs.yards_thrown,
+        pgs.yards_received,
+        (pgs.yards_thrown + pgs.yards_received) as total_yards,
+        pgs.catches,
+        pgs.hucks_completed,
+        pgs.hucks_attempted,
+        pgs.hucks_received,
+        CASE
+            WHEN pgs.hucks_attempted > 0
+            THEN ROUND((pgs.hucks_completed * 100.0 / pgs.hucks_attempted), 1)
+            ELSE 0
+        END as huck_percentage,
+        CASE
+            WHEN (pgs.throwaways + pgs.stalls + pgs.drops) > 0
+            THEN ROUND((pgs.yards_thrown + pgs.yards_received) * 1.0 / (pgs.throwaways + pgs.stalls + pgs.drops), 1)
+            ELSE NULL
+        END as yards_per_turn,
+        (pgs.goals + pgs.assists + pgs.blocks - pgs.throwaways - pgs.drops - pgs.stalls) as plus_minus
+    FROM player_game_stats pgs
+    JOIN players p ON pgs.player_id = p.player_id AND pgs.year = p.year
+    WHERE pgs.game_id = :game_id
+    AND (pgs.o_points_played > 0 OR pgs.d_points_played > 0)
+    ORDER BY pgs.team_id, (pgs.goals + pgs.assists) DESC, plus_minus DESC
+    """
+
+    all_players = stats_system.db.execute_query(
+        player_stats_query, {"game_id": game_id}
+    )
+
+    # Separate players by team
+    home_players = []
+    away_players = []
+
+    for player in all_players:
+        is_home_team = player["team_id"] == game["home_team_id"]
+        team_abbrev = (
+            game["home_team_abbrev"] if is_home_team else game["away_team_abbrev"]
+        )
+
+        player_data = {
+            "name": player["full_name"],
+            "jersey_number": player["jersey_number"] or "",
+            "team_abbrev": team_abbrev or "",
+            "points_played": player["points_played"],
+            "o_points_played": player["o_points_played"],
+            "d_points_played": player["d_points_played"],
+            "assists": player["assists"],
+            "goals": player["goals"],
+            "blocks": player["blocks"],
+            "plus_minus": player["plus_minus"],
+            "yards_received": player["yards_received"],
+            "yards_thrown": player["yards_thrown"],
+            "total_yards": player["total_yards"],
+            "completions": player["completions"],
+            "completion_percentage": player["completion_percentage"],
+            "hockey_assists": player["hockey_assists"],
+            "hucks_completed": player["hucks_completed"],
+            "hucks_received": player["hucks_received"],
+            "huck_percentage": player["huck_percentage"],
+            "turnovers": player["throwaways"],
+            "yards_per_turn": player["yards_per_turn"],
+            "stalls": player["stalls"],
+            "callahans": player["callahans"],
+            "drops": player["drops"],
+        }
+
+        if is_home_team:
+            home_players.append(player_data)
+        elif player["team_id"] == game["away_team_id"]:
+            away_players.append(player_data)
+
+    team_stats = calculate_game_team_stats(
+        stats_system, game_id, game["home_team_id"], game["away_team_id"], team_rows
+    )
+    home_team_stats = team_stats["home"]
+    away_team_stats = team_stats["away"]
+
+    return {
+        "game_id": game["game_id"],
+        "status": game["status"],
+        "start_timestamp": game["start_timestamp"],
+        "location": game["location"],
+        "year": game["year"],
+        "week": game["week"],
+        "home_team": {
+            "team_id": game["home_team_id"],
+            "name": game["home_team_short_name"],
+            "full_name": game["home_team_name"],
+            "city": game["home_team_city"],
+            "abbrev": game["home_team_abbrev"],
+            "final_score": game["home_score"],
+            "quarter_scores": scoring["home"],
+            "players": home_players,
+            "stats": home_team_stats,
+            "logo_url": game.get("home_team_logo_url"),
+        },
+        "away_team": {
+            "team_id": game["away_team_id"],
+            "name": game["away_team_short_name"],
+            "full_name": game["away_team_name"],
+            "city": game["away_team_city"],
+            "abbrev": game["away_team_abbrev"],
+            "final_score": game["away_score"],
+            "quarter_scores": scoring["away"],
+            "players": away_players,
+            "stats": away_team_stats,
+            "logo_url": game.get("away_team_logo_url"),
+        },
+        "scoring_timeline": scoring["timeline"],
+    }
+
+
+def load_box_score(db, game_id: str) -> dict[str, Any] | None:
+    """
+    Load a stored box score.
+
+    Args:
+        db: Database instance
+        game_id: Game ID
+
+    Returns:
+        The stored box score, or None if there is none for this schema version
+    """
+    rows = db.execute_query(
+        """
+        SELECT box_score
+        FROM game_box_scores
+        WHERE game_id = :game_id AND schema_version = :schema_version
+        """,
+        {"game_id": game_id, "schema_version": BOX_SCORE_SCHEMA_VERSION},
+    )
+    return decode_box_score(rows[0]["box_score"]) if rows else None
+
+
+def store_box_score(db, game_id: str, version: str, box_score: dict[str, Any]) -> None:
+    """
+    Store (or replace) the box score of a game.
+
+    Args:
+        db: Database instance
+        game_id: Game ID
+        version: source_version() the box score was built from
+        box_score: Result of build_box_score()
+    """
+    db.execute_query(
+        """
+        INSERT INTO game_box_scores (game_id, schema_version, source_version, box_score)
+        VALUES (:game_id, :schema_version, :source_version, :box_score)
+        ON CONFLICT (game_id, schema_version) DO UPDATE SET
+            source_version = excluded.source_version,
+            box_score = excluded.box_score,
+            created_at = CURRENT_TIMESTAMP
+        """,
+        {
+            "game_id": game_id,
+            "schema_version": BOX_SCORE_SCHEMA_VERSION,
+            "source_version": version,
+            "box_score": encode_box_score(box_score),
+        },
+    )
+
+
+def get_box_score(stats_system, game_id: str) -> dict[str, Any] | None:
+    """
+    Box score of a game, from its stored copy when there is one.
+
+    Final games missing a stored box score are built and stored; other games
+    are built on every call.
+
+    Args:
+        stats_system: Object with a db attribute
+        game_id: Game ID
+
+    Returns:
+        The box score, or None if the game does not exist
+    """
+    db = stats_system.db
+    box_score = load_box_score(db, game_id)
+    if box_score is not None:
+        return box_score
+
+    # Fingerprint first, so changes during the build make the copy stale
+    version = source_version(db, game_id)
+    box_score = build_box_score(stats_system, game_id)
+    if box_score is not None and box_score["status"] == "Final":
+        store_box_score(db, game_id, version, box_score)
+    return box_score
+
+
+def refresh_box_scores(stats_system, game_ids: list[str]) -> int:
+    """
+    Build the missing or stale box scores of Final games.
+
+    Args:
+        stats_system: Object with a db attribute
+        game_ids: Final games to check
+
+    Returns:
+        Number of box scores written
+    """
+    written = 0
+    for game_id in game_ids:
+        version = source_version(stats_system.db, game_id)
+        stored = stats_system.db.execute_query(
+            """
+            SELECT source_version
+            FROM game_box_scores
+            WHERE game_id = :game_id AND schema_version = :schema_version
+            """,
+            {"game_id": game_id, "schema_version": BOX_SCORE_SCHEMA_VERSION},
+        )
+        if stored and stored[0]["source_version"] == version:
+            continue
+        box_score = build_box_score(stats_system, game_id)
+        if box_score is not None:
+            store_box_score(stats_system.db, game_id, version, box_score)
+            written += 1
+    return written
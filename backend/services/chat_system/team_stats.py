@@ -4,6 +4,118 @@ Comprehensive team statistics service.
 
 from typing import Any
 
+# Stat columns of the team stats queries as (alias, kind, source columns).
+# Kinds:
+#   sum       - the column (summed for career)
+#   coalesce  - the column with NULL as 0 (summed for career)
+#   ratio     - first column over second as a percentage, 0 without attempts
+#   games     - games played in seasons from a year on (summed for career)
+#   weighted  - the column (games-weighted average for career, since the
+#               2014-2019 seasons don't have accurate raw possession counts)
+TEAM_STAT_COLUMNS = [
+    ("games_played", "sum", ("games_played",)),
+    ("wins", "sum", ("wins",)),
+    ("losses", "sum", ("losses",)),
+    ("scores", "sum", ("scores",)),
+    ("scores_against", "sum", ("scores_against",)),
+    ("completions", "sum", ("completions",)),
+    ("turnovers", "sum", ("turnovers",)),
+    ("completion_percentage", "ratio", ("completions", "throw_attempts")),
+    ("hucks_completed", "sum", ("hucks_completed",)),
+    ("hucks_attempted", "coalesce", ("hucks_attempted",)),
+    ("games_with_huck_stats", "games", (2021,)),
+    ("huck_percentage", "ratio", ("hucks_completed", "hucks_attempted")),
+    ("blocks", "sum", ("blocks",)),
+    ("o_line_scores", "coalesce", ("o_line_scores",)),
+    ("d_line_scores", "coalesce", ("d_line_scores",)),
+    ("games_with_possession_stats", "games", (2014,)),
+    ("hold_percentage", "weighted", ("hold_percentage",)),
+    ("o_line_conversion", "weighted", ("o_line_conversion",)),
+    ("break_percentage", "weighted", ("break_percentage",)),
+    ("d_line_conversion", "weighted", ("d_line_conversion",)),
+    ("red_zone_conversion", "weighted", ("red_zone_conversion",)),
+]
+
+# team_season_stats columns with an opp_ counterpart for the opponent view
+OPPONENT_COLUMNS = {
+    "completions",
+    "turnovers",
+    "throw_attempts",
+    "hucks_completed",
+    "hucks_attempted",
+    "blocks",
+    "o_line_scores",
+    "d_line_scores",
+    "hold_percentage",
+    "o_line_conversion",
+    "break_percentage",
+    "d_line_conversion",
+    "red_zone_conversion",
+}
+
+# Returned with every projection so rows stay identifiable
+TEAM_IDENTITY_COLUMNS = ("team_id", "name", "full_name")
+
+# Denominators of the per-game view, always computed
+_PER_GAME_COLUMNS = {
+    "games_played",
+    "games_with_possession_stats",
+    "games_with_huck_stats",
+}
+
+
+def _team_column_sql(kind: str, sources: tuple, career: bool) -> str:
+    """Build the SQL expression for one TEAM_STAT_COLUMNS entry."""
+
+    def total(expression: str) -> str:
+        return f"SUM({expression})" if career else expression
+
+    if kind == "sum":
+        return total(f"tss.{sources[0]}")
+    if kind == "coalesce":
+        return total(f"COALESCE(tss.{sources[0]}, 0)")
+    if kind == "games":
+        return total(
+            f"CASE WHEN tss.year >= {sources[0]} THEN tss.games_played ELSE 0 END"
+        )
+    if kind == "ratio":
+        made, attempts = (total(f"tss.{column}") for column in sources)
+        return (
+            f"CASE WHEN {attempts} > 0 "
+            f"THEN ROUND((CAST({made} AS NUMERIC) / {attempts}) * 100, 2) ELSE 0 END"
+        )
+    # weighted
+    column = f"tss.{sources[0]}"
+    if not career:
+        return column
+    games = f"SUM(CASE WHEN {column} > 0 THEN tss.games_played ELSE 0 END)"
+    return (
+        f"CASE WHEN {games} > 0 THEN ROUND("
+        f"SUM(CASE WHEN {column} > 0 THEN {column} * tss.games_played ELSE 0 END) / "
+        f"{games}, 2) ELSE 0 END"
+    )
+
+
+def _render_team_columns(
+    is_opponent_view: bool, career: bool, fields: list[str] | None = None
+) -> str:
+    """Render the stat columns of a team stats query, pruned to fields if given."""
+    items = []
+    for alias, kind, sources in TEAM_STAT_COLUMNS:
+        if fields and alias not in fields and alias not in _PER_GAME_COLUMNS:
+            continue
+        if is_opponent_view:
+            sources = tuple(
+                f"opp_{column}" if column in OPPONENT_COLUMNS else column
+                for column in sources
+            )
+        expression = _team_column_sql(kind, sources, career)
+        if expression == f"tss.{alias}":
+            items.append(expression)
+        else:
+            items.append(f"{expression} as {alias}")
+    return ",\n                ".join(items)
+
 
 class TeamStatsService:
     """Service for comprehensive team statistics queries."""
@@ -24,6 +136,7 @@ class TeamStatsService:
         perspective: str = "team",
         sort: str = "wins",
         order: str = "desc",
+        fields: list[str] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Get comprehensive team statistics with all UFA-style columns.
@@ -35,6 +148,8 @@ class TeamStatsService:
             perspective: 'team' for team stats or 'opponent' for opponent stats
             sort: Column to sort by (handled client-side now)
             order: 'asc' or 'desc' (handled client-side now)
+            fields: Stat columns to return (None = all); team_id, name and
+                full_name are always included
 
         Returns:
             List of team statistics dictionaries
@@ -45,10 +160,10 @@ class TeamStatsService:
 
         # Build query based on season and perspective
         if season == "career":
-            query = self._build_career_stats_query(is_opponent_view)
+            query = self._build_career_stats_query(is_opponent_view, fields)
             params = {}
         else:
-            query = self._build_season_stats_query(is_opponent_view)
+            query = self._build_season_stats_query(is_opponent_view, fields)
             params = {"season": season_param}
 
         teams = self.db.execute_query(query, params)
@@ -57,238 +172,62 @@ class TeamStatsService:
         if view == "per-game":
             teams = self._apply_per_game_calculations(teams)
 
+        if fields:
+            keep = [*TEAM_IDENTITY_COLUMNS, *fields]
+            teams = [
+                {name: team[name] for name in keep if name in team} for team in teams
+            ]
+
         # Note: Sorting is now handled client-side for instant performance
         # The 'sort' and 'order' parameters are ignored here but kept for API compatibility
 
         return teams
 
-    def _build_career_stats_query(self, is_opponent_view: bool) -> str:
+    def _build_career_stats_query(
+        self, is_opponent_view: bool, fields: list[str] | None = None
+    ) -> str:
         """
         Build SQL query for career (aggregated) team stats.
 
         Args:
             is_opponent_view: Whether to show opponent stats
+            fields: Columns to compute (None = all)
 
         Returns:
             SQL query string
         """
-        if is_opponent_view:
-            return """
+        columns = _render_team_columns(is_opponent_view, career=True, fields=fields)
+        return f"""
             SELECT
                 tss.team_id,
                 MIN(t.name) as name,
                 MIN(t.full_name) as full_name,
-                SUM(tss.games_played) as games_played,
-                SUM(tss.wins) as wins,
-                SUM(tss.losses) as losses,
-                SUM(tss.scores) as scores,
-                SUM(tss.scores_against) as scores_against,
-                SUM(tss.opp_completions) as completions,
-                SUM(tss.opp_turnovers) as turnovers,
-                CASE WHEN SUM(tss.opp_throw_attempts) > 0
-                    THEN ROUND((CAST(SUM(tss.opp_completions) AS NUMERIC) / SUM(tss.opp_throw_attempts)) * 100, 2)
-                    ELSE 0
-                END as completion_percentage,
-                SUM(tss.opp_hucks_completed) as hucks_completed,
-                SUM(COALESCE(tss.opp_hucks_attempted, 0)) as hucks_attempted,
-                SUM(CASE WHEN tss.year >= 2021 THEN tss.games_played ELSE 0 END) as games_with_huck_stats,
-                CASE WHEN SUM(tss.opp_hucks_attempted) > 0
-                    THEN ROUND((CAST(SUM(tss.opp_hucks_completed) AS NUMERIC) / SUM(tss.opp_hucks_attempted)) * 100, 2)
-                    ELSE 0
-                END as huck_percentage,
-                SUM(tss.opp_blocks) as blocks,
-                SUM(COALESCE(tss.opp_o_line_scores, 0)) as o_line_scores,
-                SUM(COALESCE(tss.opp_d_line_scores, 0)) as d_line_scores,
-                SUM(CASE WHEN tss.year >= 2014 THEN tss.games_played ELSE 0 END) as games_with_possession_stats,
-                -- Use games-weighted average for opponent possession stats (2014-2019 don't have accurate raw counts)
-                CASE WHEN SUM(CASE WHEN tss.opp_hold_percentage > 0 THEN tss.games_played ELSE 0 END) > 0
-                    THEN ROUND(
-                        SUM(CASE WHEN tss.opp_hold_percentage > 0 THEN tss.opp_hold_percentage * tss.games_played ELSE 0 END) /
-                        SUM(CASE WHEN tss.opp_hold_percentage > 0 THEN tss.games_played ELSE 0 END)
-                    , 2)
-                    ELSE 0
-                END as hold_percentage,
-                CASE WHEN SUM(CASE WHEN tss.opp_o_line_conversion > 0 THEN tss.games_played ELSE 0 END) > 0
-                    THEN ROUND(
-                        SUM(CASE WHEN tss.opp_o_line_conversion > 0 THEN tss.opp_o_line_conversion * tss.games_played ELSE 0 END) /
-                        SUM(CASE WHEN tss.opp_o_line_conversion > 0 THEN tss.games_played ELSE 0 END)
-                    , 2)
-                    ELSE 0
-                END as o_line_conversion,
-                CASE WHEN SUM(CASE WHEN tss.opp_break_percentage > 0 THEN tss.games_played ELSE 0 END) > 0
-                    THEN ROUND(
-                        SUM(CASE WHEN tss.opp_break_percentage > 0 THEN tss.opp_break_percentage * tss.games_played ELSE 0 END) /
-                        SUM(CASE WHEN tss.opp_break_percentage > 0 THEN tss.games_played ELSE 0 END)
-                    , 2)
-                    ELSE 0
-                END as break_percentage,
-                CASE WHEN SUM(CASE WHEN tss.opp_d_line_conversion > 0 THEN tss.games_played ELSE 0 END) > 0
-                    THEN ROUND(
-                        SUM(CASE WHEN tss.opp_d_line_conversion > 0 THEN tss.opp_d_line_conversion * tss.games_played ELSE 0 END) /
-                        SUM(CASE WHEN tss.opp_d_line_conversion > 0 THEN tss.games_played ELSE 0 END)
-                    , 2)
-                    ELSE 0
-                END as d_line_conversion,
-                CASE WHEN SUM(CASE WHEN tss.opp_red_zone_conversion > 0 THEN tss.games_played ELSE 0 END) > 0
-                    THEN ROUND(
-                        SUM(CASE WHEN tss.opp_red_zone_conversion > 0 THEN tss.opp_red_zone_conversion * tss.games_played ELSE 0 END) /
-                        SUM(CASE WHEN tss.opp_red_zone_conversion > 0 THEN tss.games_played ELSE 0 END)
-                    , 2)
-                    ELSE 0
-                END as red_zone_conversion
-            FROM team_season_stats tss
-            JOIN teams t ON tss.team_id = t.team_id AND tss.year = t.year
-            GROUP BY tss.team_id
-            """
-        else:
-            return """
-            SELECT
-                tss.team_id,
-                MIN(t.name) as name,
-                MIN(t.full_name) as full_name,
-                SUM(tss.games_played) as games_played,
-                SUM(tss.wins) as wins,
-                SUM(tss.losses) as losses,
-                SUM(tss.scores) as scores,
-                SUM(tss.scores_against) as scores_against,
-                SUM(tss.completions) as completions,
-                SUM(tss.turnovers) as turnovers,
-                CASE WHEN SUM(tss.throw_attempts) > 0
-                    THEN ROUND((CAST(SUM(tss.completions) AS NUMERIC) / SUM(tss.throw_attempts)) * 100, 2)
-                    ELSE 0
-                END as completion_percentage,
-                SUM(tss.hucks_completed) as hucks_completed,
-                SUM(COALESCE(tss.hucks_attempted, 0)) as hucks_attempted,
-                SUM(CASE WHEN tss.year >= 2021 THEN tss.games_played ELSE 0 END) as games_with_huck_stats,
-                CASE WHEN SUM(tss.hucks_attempted) > 0
-                    THEN ROUND((CAST(SUM(tss.hucks_completed) AS NUMERIC) / SUM(tss.hucks_attempted)) * 100, 2)
-                    ELSE 0
-                END as huck_percentage,
-                SUM(tss.blocks) as blocks,
-                SUM(COALESCE(tss.o_line_scores, 0)) as o_line_scores,
-                SUM(COALESCE(tss.d_line_scores, 0)) as d_line_scores,
-                SUM(CASE WHEN tss.year >= 2014 THEN tss.games_played ELSE 0 END) as games_with_possession_stats,
-                -- Use games-weighted average for possession stats (2014-2019 don't have accurate raw counts)
-                CASE WHEN SUM(CASE WHEN tss.hold_percentage > 0 THEN tss.games_played ELSE 0 END) > 0
-                    THEN ROUND(
-                        SUM(CASE WHEN tss.hold_percentage > 0 THEN tss.hold_percentage * tss.games_played ELSE 0 END) /
-                        SUM(CASE WHEN tss.hold_percentage > 0 THEN tss.games_played ELSE 0 END)
-                    , 2)
-                    ELSE 0
-                END as hold_percentage,
-                CASE WHEN SUM(CASE WHEN tss.o_line_conversion > 0 THEN tss.games_played ELSE 0 END) > 0
-                    THEN ROUND(
-                        SUM(CASE WHEN tss.o_line_conversion > 0 THEN tss.o_line_conversion * tss.games_played ELSE 0 END) /
-                        SUM(CASE WHEN tss.o_line_conversion > 0 THEN tss.games_played ELSE 0 END)
-                    , 2)
-                    ELSE 0
-                END as o_line_conversion,
-                CASE WHEN SUM(CASE WHEN tss.break_percentage > 0 THEN tss.games_played ELSE 0 END) > 0
-                    THEN ROUND(
-                        SUM(CASE WHEN tss.break_percentage > 0 THEN tss.break_percentage * tss.games_played ELSE 0 END) /
-                        SUM(CASE WHEN tss.break_percentage > 0 THEN tss.games_played ELSE 0 END)
-                    , 2)
-                    ELSE 0
-                END as break_percentage,
-                CASE WHEN SUM(CASE WHEN tss.d_line_conversion > 0 THEN tss.games_played ELSE 0 END) > 0
-                    THEN ROUND(
-                        SUM(CASE WHEN tss.d_line_conversion > 0 THEN tss.d_line_conversion * tss.games_played ELSE 0 END) /
-                        SUM(CASE WHEN tss.d_line_conversion > 0 THEN tss.games_played ELSE 0 END)
-                    , 2)
-                    ELSE 0
-                END as d_line_conversion,
-                CASE WHEN SUM(CASE WHEN tss.red_zone_conversion > 0 THEN tss.games_played ELSE 0 END) > 0
-                    THEN ROUND(
-                        SUM(CASE WHEN tss.red_zone_conversion > 0 THEN tss.red_zone_conversion * tss.games_played ELSE 0 END) /
-                        SUM(CASE WHEN tss.red_zone_conversion > 0 THEN tss.games_played ELSE 0 END)
-                    , 2)
-                    ELSE 0
-                END as red_zone_conversion
+                {columns}
             FROM team_season_stats tss
             JOIN teams t ON tss.team_id = t.team_id AND tss.year = t.year
             GROUP BY tss.team_id
             """
 
-    def _build_season_stats_query(self, is_opponent_view: bool) -> str:
+    def _build_season_stats_query(
+        self, is_opponent_view: bool, fields: list[str] | None = None
+    ) -> str:
         """
         Build SQL query for single season team stats.
 
         Args:
             is_opponent_view: Whether to show opponent stats
+            fields: Columns to compute (None = all)
 
         Returns:
             SQL query string
         """
-        if is_opponent_view:
-            return """
-            SELECT
-                tss.team_id,
-                t.name,
-                t.full_name,
-                tss.games_played,
-                tss.wins,
-                tss.losses,
-                tss.scores,
-                tss.scores_against,
-                tss.opp_completions as completions,
-                tss.opp_turnovers as turnovers,
-                CASE WHEN tss.opp_throw_attempts > 0
-                    THEN ROUND((CAST(tss.opp_completions AS NUMERIC) / tss.opp_throw_attempts) * 100, 2)
-                    ELSE 0
-                END as completion_percentage,
-                tss.opp_hucks_completed as hucks_completed,
-                COALESCE(tss.opp_hucks_attempted, 0) as hucks_attempted,
-                CASE WHEN tss.year >= 2021 THEN tss.games_played ELSE 0 END as games_with_huck_stats,
-                CASE WHEN tss.opp_hucks_attempted > 0
-                    THEN ROUND((CAST(tss.opp_hucks_completed AS NUMERIC) / tss.opp_hucks_attempted) * 100, 2)
-                    ELSE 0
-                END as huck_percentage,
-                tss.opp_blocks as blocks,
-                COALESCE(tss.opp_o_line_scores, 0) as o_line_scores,
-                COALESCE(tss.opp_d_line_scores, 0) as d_line_scores,
-                CASE WHEN tss.year >= 2014 THEN tss.games_played ELSE 0 END as games_with_possession_stats,
-                tss.opp_hold_percentage as hold_percentage,
-                tss.opp_o_line_conversion as o_line_conversion,
-                tss.opp_break_percentage as break_percentage,
-                tss.opp_d_line_conversion as d_line_conversion,
-                tss.opp_red_zone_conversion as red_zone_conversion
-            FROM team_season_stats tss
-            JOIN teams t ON tss.team_id = t.team_id AND tss.year = t.year
-            WHERE tss.year = :season
-            """
-        else:
-            return """
+        columns = _render_team_columns(is_opponent_view, career=False, fields=fields)
+        return f"""
             SELECT
                 tss.team_id,
                 t.name,
                 t.full_name,
-                tss.games_played,
-                tss.wins,
-                tss.losses,
-                tss.scores,
-                tss.scores_against,
-                tss.completions,
-                tss.turnovers,
-                CASE WHEN tss.throw_attempts > 0
-                    THEN ROUND((CAST(tss.completions AS NUMERIC) / tss.throw_attempts) * 100, 2)
-                    ELSE 0
-                END as completion_percentage,
-                tss.hucks_completed,
-                COALESCE(tss.hucks_attempted, 0) as hucks_attempted,
-                CASE WHEN tss.year >= 2021 THEN tss.games_played ELSE 0 END as games_with_huck_stats,
-                CASE WHEN tss.hucks_attempted > 0
-                    THEN ROUND((CAST(tss.hucks_completed AS NUMERIC) / tss.hucks_attempted) * 100, 2)
-                    ELSE 0
-                END as huck_percentage,
-                tss.blocks,
-                COALESCE(tss.o_line_scores, 0) as o_line_scores,
-                COALESCE(tss.d_line_scores, 0) as d_line_scores,
-                CASE WHEN tss.year >= 2014 THEN tss.games_played ELSE 0 END as games_with_possession_stats,
-                tss.hold_percentage,
-                tss.o_line_conversion,
-                tss.break_percentage,
-                tss.d_line_conversion,
-                tss.red_zone_conversion
+                {columns}
             FROM team_season_stats tss
             JOIN teams t ON tss.team_id = t.team_id AND tss.year = t.year
             WHERE tss.year = :season
@@ -306,44 +245,26 @@ class TeamStatsService:
         Returns:
             Teams with per-game statistics
         """
+        # (denominator, columns) - possession columns are 2014+ only and huck
+        # columns 2021+ only, so they divide by the games that recorded them
+        groups = [
+            ("games_played", ("scores", "scores_against", "completions", "turnovers")),
+            (
+                "games_with_possession_stats",
+                ("blocks", "o_line_scores", "d_line_scores"),
+            ),
+            ("games_with_huck_stats", ("hucks_completed", "hucks_attempted")),
+        ]
         for team in teams:
             if team["games_played"] > 0:
-                games = team["games_played"]
-                # Divide totals by games played
-                team["scores"] = round(team["scores"] / games, 2)
-                team["scores_against"] = round(team["scores_against"] / games, 2)
-                team["completions"] = round(team["completions"] / games, 2)
-                team["turnovers"] = round(team["turnovers"] / games, 2)
-
-                # Use games_with_possession_stats for possession columns (2014+ only)
-                possession_games = team.get("games_with_possession_stats", 0)
-                if possession_games > 0:
-                    team["blocks"] = round(team["blocks"] / possession_games, 2)
-                    team["o_line_scores"] = round(
-                        team["o_line_scores"] / possession_games, 2
-                    )
-                    team["d_line_scores"] = round(
-                        team["d_line_scores"] / possession_games, 2
-                    )
-                else:
-                    # No possession stats available for this team
-                    team["blocks"] = None
-                    team["o_line_scores"] = None
-                    team["d_line_scores"] = None
-
-                # Use games_with_huck_stats for huck columns (2021+ only)
-                huck_games = team.get("games_with_huck_stats", 0)
-                if huck_games > 0:
-                    team["hucks_completed"] = round(
-                        team["hucks_completed"] / huck_games, 2
-                    )
-                    team["hucks_attempted"] = round(
-                        team["hucks_attempted"] / huck_games, 2
-                    )
-                else:
-                    # No huck stats available for this team
-                    team["hucks_completed"] = None
-                    team["hucks_attempted"] = None
+                for denominator, columns in groups:
+                    games = team.get(denominator, 0)
+                    # A projection may have left some columns out
+                    for column in (c for c in columns if c in team):
+                        # None when this team has no games with these stats
+                        team[column] = (
+                            round(team[column] / games, 2) if games > 0 else None
+                        )
 
                 # Note: Percentages stay the same in per-game view
 
@@ -4,13 +4,15 @@ Play-by-play service modules.
 Refactored from a single 577-line file into focused service modules:
 - event_handlers.py: Process different event types (pulls, passes, goals, turnovers) (329 lines)
 - point_builder.py: Manage point state and construction (255 lines)
-- player_enrichment.py: Fetch and enrich player data (134 lines)
+- player_enrichment.py: Fetch player data
+- event_records.py: Compact event records with lines parsed and player ids interned once
 
 Total: 739 lines across 3 service modules (was 577 lines in 1 monolithic file)
 All modules under 330 lines with clear separation of concerns.
 """
 
 from .event_handlers import EventHandlers
+from .event_records import PlayEvent, build_event_records, parse_lines
 from .player_enrichment import PlayerEnrichment
 from .point_builder import PointBuilder
 
@@ -18,4 +20,7 @@ __all__ = [
     "EventHandlers",
     "PointBuilder",
     "PlayerEnrichment",
+    "PlayEvent",
+    "build_event_records",
+    "parse_lines",
 ]
@@ -0,0 +1,147 @@
+"""
+Compact event records for play-by-play processing.
+"""
+
+from operator import itemgetter
+from typing import Any, NamedTuple
+
+import orjson
+
+# Columns of the play-by-play events query used by the builder
+EVENT_FIELDS = (
+    "event_index",
+    "team",
+    "event_type",
+    "event_time",
+    "thrower_id",
+    "receiver_id",
+    "defender_id",
+    "puller_id",
+    "thrower_x",
+    "thrower_y",
+    "receiver_x",
+    "receiver_y",
+    "turnover_x",
+    "turnover_y",
+    "pull_x",
+    "pull_y",
+    "pull_ms",
+)
+
+_event_fields = itemgetter(*EVENT_FIELDS)
+_player_ids = itemgetter("thrower_id", "receiver_id", "defender_id", "puller_id")
+
+
+class PlayEvent(NamedTuple):
+    """
+    One game event, with its line parsed and player last names resolved.
+
+    Event handlers read it like the event row dict it replaces.
+    """
+
+    event_index: int
+    team: str
+    event_type: int
+    event_time: int | None
+    thrower_id: str | None
+    receiver_id: str | None
+    defender_id: str | None
+    puller_id: str | None
+    thrower_x: float | None
+    thrower_y: float | None
+    receiver_x: float | None
+    receiver_y: float | None
+    turnover_x: float | None
+    turnover_y: float | None
+    pull_x: float | None
+    pull_y: float | None
+    pull_ms: int | None
+    line: tuple  # Player IDs of the event's line, empty when it has none
+    thrower_last: str | None
+    receiver_last: str | None
+    defender_last: str | None
+    puller_last: str | None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+
+def parse_lines(rows: list[dict]) -> tuple[list[tuple], set]:
+    """
+    Parse the line of every event row, each distinct line once.
+
+    Player IDs in lines are interned, so all events on a line share one
+    tuple and every occurrence of a player is the same object.
+
+    Args:
+        rows: Rows of the events query
+
+    Returns:
+        The line per row, and the IDs of every player the rows reference
+    """
+    ids: dict = {}
+    parsed_lines: dict[str, tuple] = {}
+    lines = []
+    player_ids = set()
+    for row in rows:
+        player_ids.update(_player_ids(row))
+        raw_line = row.get("line_players")
+        if not raw_line:
+            lines.append(())
+            continue
+        line = parsed_lines.get(raw_line)
+        if line is None:
+            try:
+                parsed = orjson.loads(raw_line)
+            except (orjson.JSONDecodeError, TypeError) as e:
+                print(f"Error parsing line players: {e}")
+                parsed = None
+            line = tuple(ids.setdefault(pid, pid) for pid in parsed or ())
+            parsed_lines[raw_line] = line
+        lines.append(line)
+    player_ids.update(ids)
+    return lines, {player_id for player_id in player_ids if player_id}
+
+
+def build_event_records(
+    rows: list[dict], lines: list[tuple], player_lookup: dict[str, dict[str, str]]
+) -> list[PlayEvent]:
+    """
+    Convert event rows to records with their player last names.
+
+    Args:
+        rows: Rows of the events query
+        lines: Result of parse_lines() for the rows
+        player_lookup: Dictionary mapping player_id to full_name and last_name
+
+    Returns:
+        One record per row
+    """
+    last_names = {
+        player_id: player["last_name"] for player_id, player in player_lookup.items()
+    }
+    last_name = last_names.get
+    new = tuple.__new__
+    records = []
+    for row, line in zip(rows, lines, strict=True):
+        # Falsy ids are never in the lookup, so they resolve to None as well
+        thrower, receiver, defender, puller = _player_ids(row)
+        records.append(
+            new(
+                PlayEvent,
+                _event_fields(row)
+                + (
+                    line,
+                    last_name(thrower),
+                    last_name(receiver),
+                    last_name(defender),
+                    last_name(puller),
+                ),
+            )
+        )
+    return records
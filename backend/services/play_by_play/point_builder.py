@@ -2,7 +2,6 @@
 Point builder for managing point state and construction.
 """
 
-import json
 from typing import Any
 
 
@@ -23,7 +22,7 @@ class PointBuilder:
         Create a new point from a pull event.
 
         Args:
-            event: Pull event data
+            event: Pull event record
             team: Team ('home' or 'away')
             player_lookup: Player lookup dictionary
 
@@ -60,7 +59,7 @@ class PointBuilder:
                 receiving_team = "away"
 
         # Get line players
-        line_players = self._get_line_players(event, player_lookup)
+        line_players = self._get_line_players(event.line, player_lookup)
 
         return {
             "point_number": self.point_number,
@@ -80,32 +79,23 @@ class PointBuilder:
         }
 
     def _get_line_players(
-        self, event: dict, player_lookup: dict[str, dict[str, str]]
+        self, line: tuple, player_lookup: dict[str, dict[str, str]]
     ) -> list[str]:
         """
-        Extract line players from event data.
+        Get the last names of a line's players.
 
         Args:
-            event: Event data with line_players field
+            line: Player IDs of the event's line, as parsed by build_event_records()
             player_lookup: Player lookup dictionary
 
         Returns:
             List of player last names
         """
-        line_players = []
-        if event.get("line_players"):
-            try:
-                player_ids = json.loads(event["line_players"])
-                if player_ids and len(player_ids) > 0:
-                    line_players = [
-                        player_lookup[pid]["last_name"]
-                        for pid in player_ids
-                        if pid in player_lookup and player_lookup[pid].get("last_name")
-                    ]
-            except Exception as e:
-                print(f"Error parsing line players: {e}")
-
-        return line_players
+        return [
+            player_lookup[pid]["last_name"]
+            for pid in line
+            if pid in player_lookup and player_lookup[pid].get("last_name")
+        ]
 
     def update_score_for_goal(self, team: str, current_point: dict | None) -> None:
         """
@@ -0,0 +1,206 @@
+"""
+Play-by-play for many games at once.
+
+calculate_play_by_play() runs a game lookup, an event fetch and a player
+lookup per game. The batch path serves the Final games of a chunk from their
+game_play_by_play artifacts, checked against events_versions() in one query
+for the chunk, and builds only the missing, stale or in-progress games, with
+one query for the games, one for all of their events and one player lookup
+per season. Final games it builds are stored for the next request. Games come
+back as NDJSON lines ({"game_id": ..., "points": [...]}) in request order.
+"""
+
+from collections.abc import Iterator
+from itertools import groupby
+from operator import itemgetter
+from typing import Any
+
+import orjson
+
+from .play_by_play import PlayerEnrichment, build_event_records, parse_lines
+from .play_by_play_service import build_play_by_play
+from .play_by_play_store import (
+    events_versions,
+    load_stored_points,
+    store_play_by_play_batch,
+)
+
+# Games fetched per set of queries; bounds memory and the time to first game
+BATCH_CHUNK_GAMES = 50
+
+# Most games one batch request may ask for
+MAX_BATCH_GAMES = 500
+
+
+def _in_clause(prefix: str, values: list) -> tuple[str, dict[str, Any]]:
+    """Placeholders and params for an IN list, as PlayerEnrichment builds them."""
+    placeholders = ", ".join(f":{prefix}{i}" for i in range(len(values)))
+    return placeholders, {f"{prefix}{i}": value for i, value in enumerate(values)}
+
+
+def select_batch_games(db, team_id: str | None = None, season: int | None = None):
+    """
+    Game IDs of a team and/or season, oldest first.
+
+    Args:
+        db: Database instance
+        team_id: Team playing home or away
+        season: Game year
+
+    Returns:
+        List of game IDs
+    """
+    query = "SELECT g.game_id FROM games g WHERE 1=1"
+    params = {}
+    if team_id:
+        query += " AND (g.home_team_id = :team_id OR g.away_team_id = :team_id)"
+        params["team_id"] = team_id
+    if season:
+        query += " AND g.year = :season"
+        params["season"] = season
+    query += " ORDER BY g.start_timestamp, g.game_id LIMIT :limit"
+    params["limit"] = MAX_BATCH_GAMES
+    return [row["game_id"] for row in db.execute_query(query, params)]
+
+
+def fetch_batch_inputs(db, game_ids: list[str]) -> list[tuple]:
+    """
+    Events and player names of a chunk of games, in set-based queries.
+
+    Args:
+        db: Database instance
+        game_ids: Games to fetch
+
+    Returns:
+        (game_id, events, lines, player_lookup) per game in game_ids order,
+        with no events for games calculate_play_by_play() would skip
+    """
+    placeholders, params = _in_clause("g", game_ids)
+
+    # Same joins as calculate_play_by_play(), so the same games are skipped
+    games = db.execute_query(
+        f"""
+        SELECT g.game_id, g.year
+        FROM games g
+        JOIN teams ht ON g.home_team_id = ht.team_id AND g.year = ht.year
+        JOIN teams at ON g.away_team_id = at.team_id AND g.year = at.year
+        WHERE g.game_id IN ({placeholders})
+        """,
+        params,
+    )
+    years = {game["game_id"]: game["year"] for game in games}
+
+    events = db.execute_query(
+        f"""
+        SELECT
+            e.game_id,
+            e.event_index, e.team, e.event_type, e.event_time,
+            e.thrower_id, e.receiver_id, e.defender_id, e.puller_id,
+            e.thrower_x, e.thrower_y, e.receiver_x, e.receiver_y,
+            e.turnover_x, e.turnover_y, e.pull_x, e.pull_y,
+            e.pull_ms, e.line_players
+        FROM game_events e
+        WHERE e.game_id IN ({placeholders})
+        ORDER BY e.game_id, e.team, e.event_index
+        """,
+        params,
+    )
+
+    # Parse each game's lines, collecting the players of each season
+    parsed = {}
+    season_players = {}
+    for game_id, rows in groupby(events, key=itemgetter("game_id")):
+        if game_id not in years:
+            continue
+        rows = list(rows)
+        lines, player_ids = parse_lines(rows)
+        parsed[game_id] = (rows, lines, player_ids)
+        season_players.setdefault(years[game_id], set()).update(player_ids)
+
+    lookups = {
+        year: PlayerEnrichment.fetch_players(db, player_ids, year)
+        for year, player_ids in season_players.items()
+    }
+
+    inputs = []
+    for game_id in game_ids:
+        if game_id not in parsed:
+            inputs.append((game_id, [], [], {}))
+            continue
+        rows, lines, player_ids = parsed[game_id]
+        # Only this game's players, as its own lookup would return
+        lookup = lookups[years[game_id]]
+        player_lookup = {pid: lookup[pid] for pid in player_ids if pid in lookup}
+        inputs.append((game_id, rows, lines, player_lookup))
+    return inputs
+
+
+def build_game_points(game: tuple) -> list[dict[str, Any]]:
+    """
+    Build one game's play-by-play.
+
+    Args:
+        game: A fetch_batch_inputs() entry
+
+    Returns:
+        List of points, as calculate_play_by_play() returns them
+    """
+    _, rows, lines, player_lookup = game
+    if not rows:
+        return []
+    records = build_event_records(rows, lines, player_lookup)
+    return build_play_by_play(records, player_lookup)
+
+
+def _game_line(game_id: str, points_json: bytes) -> bytes:
+    """{"game_id", "points"} as an NDJSON line, around already encoded points."""
+    return b'{"game_id":' + orjson.dumps(game_id) + b',"points":' + points_json + b"}\n"
+
+
+def _final_games(db, game_ids: list[str]) -> list[str]:
+    """The Final games among game_ids."""
+    placeholders, params = _in_clause("g", game_ids)
+    rows = db.execute_query(
+        f"""
+        SELECT game_id FROM games
+        WHERE game_id IN ({placeholders}) AND status = 'Final'
+        """,
+        params,
+    )
+    return [row["game_id"] for row in rows]
+
+
+def iter_play_by_play(stats_system, game_ids: list[str]) -> Iterator[bytes]:
+    """
+    Stream the play-by-play of many games.
+
+    Args:
+        stats_system: Object with a db attribute
+        game_ids: Games to build, in response order
+
+    Yields:
+        One NDJSON line per game
+    """
+    db = stats_system.db
+    for start in range(0, len(game_ids), BATCH_CHUNK_GAMES):
+        chunk = game_ids[start : start + BATCH_CHUNK_GAMES]
+        versions = events_versions(db, _final_games(db, chunk))
+        stored = load_stored_points(db, versions)
+
+        built = {}
+        artifacts = []
+        missing = [game_id for game_id in chunk if game_id not in stored]
+        if missing:
+            for game in fetch_batch_inputs(db, missing):
+                game_id = game[0]
+                points = build_game_points(game)
+                if points and game_id in versions:
+                    artifacts.append((game_id, versions[game_id], points))
+                built[game_id] = orjson.dumps(points)
+        store_play_by_play_batch(db, artifacts)
+
+        for game_id in chunk:
+            points_json = stored.get(game_id)
+            if points_json is None:
+                points_json = built[game_id]
+            yield _game_line(game_id, points_json)
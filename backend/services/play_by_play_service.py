@@ -8,34 +8,32 @@ See backend/services/play_by_play/ for the new modular structure:
 - event_handlers.py: Process different event types (329 lines)
 - point_builder.py: Manage point state and construction (255 lines)
 - player_enrichment.py: Fetch and enrich player data (134 lines)
-
-Total: 739 lines across 3 focused service modules (was 577 lines in 1 monolithic file)
+- event_records.py: Compact event records with lines parsed once
 """
 
-import json
+from collections.abc import Iterable
+from itertools import groupby
+from operator import attrgetter
 from typing import Any
 
-from .play_by_play import EventHandlers, PlayerEnrichment, PointBuilder
-
-
-def parse_line_players(line_players_json: str | None) -> list[str]:
-    """Parse line_players JSON string to list of player IDs."""
-    if not line_players_json:
-        return []
-    try:
-        return json.loads(line_players_json)
-    except (json.JSONDecodeError, TypeError):
-        return []
+from .play_by_play import (
+    EventHandlers,
+    PlayerEnrichment,
+    PlayEvent,
+    PointBuilder,
+    build_event_records,
+    parse_lines,
+)
 
 
 def process_team_events(
-    events: list[dict], team: str, player_lookup: dict[str, dict[str, str]]
+    events: Iterable[PlayEvent], team: str, player_lookup: dict[str, dict[str, str]]
 ) -> list[dict[str, Any]]:
     """
     Process events for a single team to build their play-by-play perspective.
 
     Args:
-        events: List of events for this team
+        events: Event records for this team, in event order
         team: 'home' or 'away'
         player_lookup: Dictionary mapping player_id to dict with full_name and last_name
 
@@ -50,19 +48,19 @@ def process_team_events(
         0  # Track turnover count to determine current O/D state
     )
     timeout_line_type = None  # Line type at time of timeout (may differ from starting)
-    current_line: list[str] = []  # Track current players on the field
+    current_line: tuple = ()  # Track current players on the field
 
     # Initialize point builder and event handlers
     point_builder = PointBuilder()
     handlers = EventHandlers()
 
     for event in events:
-        # Update current line if this event has line_players
-        previous_line = current_line.copy()
-        event_line = parse_line_players(event.get("line_players"))
-        if event_line:
-            current_line = event_line
-        event_type = event["event_type"]
+        # Update current line if this event has line_players; lines are
+        # immutable, so the previous one is kept without copying
+        previous_line = current_line
+        if event.line:
+            current_line = event.line
+        event_type = event.event_type
 
         # Timeout events - add event and mark subsequent events as "out of timeout"
         if event_type in [3, 4, 5, 6]:  # All timeout types
@@ -114,8 +112,8 @@ def process_team_events(
         elif event_type in [1, 2]:  # START_D_POINT or START_O_POINT
             # Save previous point if exists
             if current_point:
-                if event["event_time"] is not None:
-                    absolute_time = point_builder.quarter_offset + event["event_time"]
+                if event.event_time is not None:
+                    absolute_time = point_builder.quarter_offset + event.event_time
                     point_builder.finalize_point(current_point, absolute_time)
 
                 current_point["events"] = current_point_events
@@ -228,6 +226,30 @@ def process_team_events(
     return points
 
 
+def build_play_by_play(
+    records: list[PlayEvent], player_lookup: dict[str, dict[str, str]]
+) -> list[dict[str, Any]]:
+    """
+    Build both teams' play-by-play in one pass over the event records.
+
+    Args:
+        records: Event records of a game
+        player_lookup: Dictionary mapping player_id to dict with full_name and last_name
+
+    Returns:
+        Home team points followed by away team points
+    """
+    # Stable, so each team's events keep their order; already sorted when
+    # they come from the events query
+    by_team = {
+        team: process_team_events(team_events, team, player_lookup)
+        for team, team_events in groupby(
+            sorted(records, key=attrgetter("team")), key=attrgetter("team")
+        )
+    }
+    return by_team.get("home", []) + by_team.get("away", [])
+
+
 def calculate_play_by_play(stats_system, game_id: str) -> list[dict[str, Any]]:
     """
     Calculate play-by-play data from game events.
@@ -268,22 +290,13 @@ def calculate_play_by_play(stats_system, game_id: str) -> list[dict[str, Any]]:
     if not events:
         return []
 
-    # Collect all unique player IDs and fetch player data
-    all_player_ids = PlayerEnrichment.collect_player_ids(events)
+    # Parse lines once while collecting all unique player IDs, then fetch
+    # player data and resolve last names
+    lines, all_player_ids = parse_lines(events)
     player_lookup = PlayerEnrichment.fetch_players(
         stats_system.db, all_player_ids, game_year
     )
+    records = build_event_records(events, lines, player_lookup)
 
-    # Enrich events with player names from lookup
-    PlayerEnrichment.enrich_events(events, player_lookup)
-
-    # Separate events by team
-    home_events = [e for e in events if e["team"] == "home"]
-    away_events = [e for e in events if e["team"] == "away"]
-
-    # Process each team's events separately
-    home_points = process_team_events(home_events, "home", player_lookup)
-    away_points = process_team_events(away_events, "away", player_lookup)
-
-    # Combine and return both perspectives
-    return home_points + away_points
+    # Process each team's events, returning both perspectives
+    return build_play_by_play(records, player_lookup)
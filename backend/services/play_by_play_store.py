@@ -0,0 +1,243 @@
+"""
+Stored play-by-play for Final games.
+
+Final games never change, so their play-by-play is built once (after import,
+or on the first request) and kept in game_play_by_play as gzip-compressed
+JSON keyed by game_id and PLAY_BY_PLAY_SCHEMA_VERSION. Each artifact records
+the fingerprint of the events and players it was built from and is rebuilt
+when the game's events change or its season's players are re-imported, since
+the points carry player names. In-progress games use calculate_play_by_play()
+directly.
+"""
+
+import gzip
+from typing import Any
+
+import orjson
+
+from .play_by_play_service import calculate_play_by_play
+
+# Bump when the play-by-play output changes shape; older artifacts are ignored
+PLAY_BY_PLAY_SCHEMA_VERSION = 1
+
+# Artifacts are written on the request path; level 6 is about twice as fast
+# as gzip's default 9 for a few percent more bytes
+GZIP_LEVEL = 6
+
+
+def events_versions(db, game_ids: list[str]) -> dict[str, str]:
+    """
+    Fingerprints of games' events and their seasons' players: counts and last ids.
+
+    Args:
+        db: Database instance
+        game_ids: Games to fingerprint
+
+    Returns:
+        Dict of game_id to fingerprint, for the games that exist
+    """
+    if not game_ids:
+        return {}
+    placeholders = ", ".join(f":g{i}" for i in range(len(game_ids)))
+    params = {f"g{i}": game_id for i, game_id in enumerate(game_ids)}
+    rows = db.execute_query(
+        f"""
+        SELECT
+            g.game_id,
+            COALESCE(ev.events, 0) as events,
+            ev.last_event,
+            COALESCE(ps.players, 0) as players,
+            ps.last_player
+        FROM games g
+        LEFT JOIN (
+            SELECT game_id, COUNT(*) as events, MAX(id) as last_event
+            FROM game_events
+            WHERE game_id IN ({placeholders})
+            GROUP BY game_id
+        ) ev ON ev.game_id = g.game_id
+        LEFT JOIN (
+            SELECT year, COUNT(*) as players, MAX(id) as last_player
+            FROM players
+            WHERE year IN (SELECT year FROM games WHERE game_id IN ({placeholders}))
+            GROUP BY year
+        ) ps ON ps.year = g.year
+        WHERE g.game_id IN ({placeholders})
+        """,
+        params,
+    )
+    return {
+        row["game_id"]: (
+            f"{row['events']}:{row['last_event']}/{row['players']}:{row['last_player']}"
+        )
+        for row in rows
+    }
+
+
+def events_version(db, game_id: str) -> str:
+    """Fingerprint of a game's events and its season's players (see events_versions())."""
+    return events_versions(db, [game_id]).get(game_id, "")
+
+
+def encode_points(points: list[dict[str, Any]]) -> bytes:
+    return gzip.compress(orjson.dumps(points), compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def decode_points(data: bytes) -> list[dict[str, Any]]:
+    return orjson.loads(gzip.decompress(bytes(data)))
+
+
+def load_play_by_play(db, game_id: str, version: str) -> list[dict[str, Any]] | None:
+    """
+    Load a stored play-by-play.
+
+    Args:
+        db: Database instance
+        game_id: Game ID
+        version: Current events_version() of the game
+
+    Returns:
+        The stored points, or None if missing or built from other events
+    """
+    rows = db.execute_query(
+        """
+        SELECT events_version, points
+        FROM game_play_by_play
+        WHERE game_id = :game_id AND schema_version = :schema_version
+        """,
+        {"game_id": game_id, "schema_version": PLAY_BY_PLAY_SCHEMA_VERSION},
+    )
+    if not rows or rows[0]["events_version"] != version:
+        return None
+    return decode_points(rows[0]["points"])
+
+
+def load_stored_points(db, versions: dict[str, str]) -> dict[str, bytes]:
+    """
+    Load the stored play-by-play of many games as JSON, in one query.
+
+    Args:
+        db: Database instance
+        versions: Current events_versions() of the games
+
+    Returns:
+        Dict of game_id to the JSON list of points, for the games whose
+        artifact was built from their current events and players
+    """
+    if not versions:
+        return {}
+    game_ids = list(versions)
+    placeholders = ", ".join(f":g{i}" for i in range(len(game_ids)))
+    params = {f"g{i}": game_id for i, game_id in enumerate(game_ids)}
+    rows = db.execute_query(
+        f"""
+        SELECT game_id, events_version, points
+        FROM game_play_by_play
+        WHERE game_id IN ({placeholders}) AND schema_version = :schema_version
+        """,
+        params | {"schema_version": PLAY_BY_PLAY_SCHEMA_VERSION},
+    )
+    return {
+        row["game_id"]: gzip.decompress(bytes(row["points"]))
+        for row in rows
+        if row["events_version"] == versions[row["game_id"]]
+    }
+
+
+def store_play_by_play(
+    db, game_id: str, version: str, points: list[dict[str, Any]]
+) -> None:
+    """
+    Store (or replace) the play-by-play of a game.
+
+    Args:
+        db: Database instance
+        game_id: Game ID
+        version: events_version() the points were built from
+        points: Result of calculate_play_by_play()
+    """
+    store_play_by_play_batch(db, [(game_id, version, points)])
+
+
+def store_play_by_play_batch(
+    db, artifacts: list[tuple[str, str, list[dict[str, Any]]]]
+) -> None:
+    """
+    Store (or replace) the play-by-play of many games in one statement.
+
+    Args:
+        db: Database instance
+        artifacts: (game_id, events_version, points) per game
+    """
+    if not artifacts:
+        return
+    db.execute_query(
+        """
+        INSERT INTO game_play_by_play (game_id, schema_version, events_version, points)
+        VALUES (:game_id, :schema_version, :events_version, :points)
+        ON CONFLICT (game_id, schema_version) DO UPDATE SET
+            events_version = excluded.events_version,
+            points = excluded.points,
+            created_at = CURRENT_TIMESTAMP
+        """,
+        [
+            {
+                "game_id": game_id,
+                "schema_version": PLAY_BY_PLAY_SCHEMA_VERSION,
+                "events_version": version,
+                "points": encode_points(points),
+            }
+            for game_id, version, points in artifacts
+        ],
+    )
+
+
+def get_final_play_by_play(stats_system, game_id: str) -> list[dict[str, Any]]:
+    """
+    Play-by-play of a Final game, from its stored artifact when current.
+
+    Args:
+        stats_system: Object with a db attribute
+        game_id: Game ID
+
+    Returns:
+        List of points, as calculate_play_by_play() returns them
+    """
+    db = stats_system.db
+    version = events_version(db, game_id)
+    points = load_play_by_play(db, game_id, version)
+    if points is None:
+        points = calculate_play_by_play(stats_system, game_id)
+        if points:
+            store_play_by_play(db, game_id, version, points)
+    return points
+
+
+def refresh_play_by_play(stats_system, game_ids: list[str]) -> int:
+    """
+    Build the missing or stale play-by-play artifacts of Final games.
+
+    Args:
+        stats_system: Object with a db attribute
+        game_ids: Final games to check
+
+    Returns:
+        Number of artifacts written
+    """
+    written = 0
+    for game_id in game_ids:
+        version = events_version(stats_system.db, game_id)
+        stored = stats_system.db.execute_query(
+            """
+            SELECT events_version
+            FROM game_play_by_play
+            WHERE game_id = :game_id AND schema_version = :schema_version
+            """,
+            {"game_id": game_id, "schema_version": PLAY_BY_PLAY_SCHEMA_VERSION},
+        )
+        if stored and stored[0]["events_version"] == version:
+            continue
+        points = calculate_play_by_play(stats_system, game_id)
+        if points:
+            store_play_by_play(stats_system.db, game_id, version, points)
+            written += 1
+    return written
@@ -2,73 +2,79 @@
 Quarter score service for calculating quarterly game progression.
 """
 
+from typing import Any
 
-def calculate_quarter_scores(stats_system, game_id: str) -> dict[str, list[int]]:
-    """
-    Calculate quarter-by-quarter scores from game events.
-    Returns individual scores for each quarter.
-    """
-    # For MVP, return simulated quarter scores based on final score
-    # In production, this would parse game_events table for actual quarterly progression
 
-    game_query = """
-    SELECT home_score, away_score
-    FROM games
-    WHERE game_id = :game_id
+def calculate_quarter_scores(stats_system, game_id: str) -> list[dict[str, Any]]:
     """
+    Calculate quarter-by-quarter scores from game events.
 
-    result = stats_system.db.execute_query(game_query, {"game_id": game_id})
-    if not result:
-        return {"home": [], "away": []}
-
-    game = result[0]
-    home_final = game["home_score"] or 0
-    away_final = game["away_score"] or 0
+    Box scores read the quarter scores stored in team_game_stats, which the
+    importer derives in the same event scan as the possession stats; this
+    reads them straight from a game's events.
 
-    # Simulate individual quarter scoring
-    # This is a placeholder - real implementation would use game_events
-    home_quarters = []
-    away_quarters = []
+    Args:
+        stats_system: The stats system instance
+        game_id: Game identifier
 
-    if home_final > 0:
-        # Distribute scores across quarters to sum to final score
-        # Create a reasonable distribution of individual quarter scores
-        base_home = home_final // 4
-        remainder_home = home_final % 4
+    Returns:
+        Each quarter's goals by both teams (quarter 5 is overtime), as
+        {"quarter", "home_score", "away_score"} dicts
+    """
+    from domain.possession import ScoringEventProcessor
 
-        # Start with base score for each quarter
-        home_quarters = [base_home, base_home, base_home, base_home]
+    # Both teams record every goal and quarter end, so read one team's events
+    events_query = """
+    SELECT event_index, event_type, event_time, team
+    FROM game_events
+    WHERE game_id = :game_id
+      AND team = (SELECT MAX(team) FROM game_events WHERE game_id = :game_id)
+    ORDER BY event_index
+    """
 
-        # Distribute remainder across quarters for variation
-        for i in range(remainder_home):
-            home_quarters[i % 4] += 1
+    events = stats_system.db.execute_query(events_query, {"game_id": game_id})
+    return ScoringEventProcessor("home").process_events(events).quarters()
 
-        # Add some variation to make it more realistic
-        if home_final >= 8:
-            # Slightly adjust distribution for more realistic game flow
-            home_quarters[0] = max(1, home_quarters[0] - 1)
-            home_quarters[2] += 1
-    else:
-        home_quarters = [0, 0, 0, 0]
 
-    if away_final > 0:
-        # Distribute scores across quarters to sum to final score
-        base_away = away_final // 4
-        remainder_away = away_final % 4
+def build_game_scoring(
+    home_row: dict[str, Any], away_row: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Quarter scores and scoring timeline of a game from its team_game_stats rows.
 
-        # Start with base score for each quarter
-        away_quarters = [base_away, base_away, base_away, base_away]
+    Args:
+        home_row: The home team's team_game_stats row (empty if it has none)
+        away_row: The away team's team_game_stats row (empty if it has none)
 
-        # Distribute remainder across quarters for variation
-        for i in range(remainder_away):
-            away_quarters[(i + 1) % 4] += 1  # Different distribution pattern
+    Returns:
+        Each team's goals per quarter, keyed "home" and "away" (empty lists
+        for games without events), and under "timeline" every goal in game
+        order with its quarter, event_time, scoring team and the score after it
+    """
+    goals = [
+        (quarter, event_time, team)
+        for team, row in (("home", home_row), ("away", away_row))
+        for quarter, event_time in row.get("goal_times") or []
+    ]
+    # event_time counts up within a quarter; goals without one go last
+    goals.sort(key=lambda goal: (goal[0], goal[1] is None, goal[1] or 0))
 
-        # Add some variation to make it more realistic
-        if away_final >= 8:
-            # Slightly adjust distribution for more realistic game flow
-            away_quarters[1] = max(1, away_quarters[1] - 1)
-            away_quarters[3] += 1
-    else:
-        away_quarters = [0, 0, 0, 0]
+    score = {"home": 0, "away": 0}
+    timeline = []
+    for quarter, event_time, team in goals:
+        score[team] += 1
+        timeline.append(
+            {
+                "quarter": quarter,
+                "event_time": event_time,
+                "team": team,
+                "home_score": score["home"],
+                "away_score": score["away"],
+            }
+        )
 
-    return {"home": home_quarters, "away": away_quarters}
+    return {
+        "home": home_row.get("quarter_scores") or [],
+        "away": away_row.get("quarter_scores") or [],
+        "timeline": timeline,
+    }
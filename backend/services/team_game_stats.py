@@ -0,0 +1,748 @@
+"""
+Team-by-game fact table.
+
+team_game_stats holds one row per team per game: the team's player_game_stats
+sums and lines, and its possession, redzone and quarter scoring stats from
+game_events. The importer builds the rows of the games it imports, so the box
+score, the game details endpoint and the possession scripts read a game's team
+stats with one lookup, and season team stats with a GROUP BY, instead of
+re-aggregating player stats and re-running the possession processors.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from itertools import chain
+from typing import Any
+
+import numpy as np
+import orjson
+from domain.possession import (
+    EVENT_TYPE_MASK,
+    RECEIVER_IN_REDZONE,
+    THROWER_IN_REDZONE,
+    encode_events,
+    process_event_codes,
+    score_event_arrays,
+)
+from sqlalchemy import text
+
+from .play_by_play_batch import _in_clause
+
+# Games built per set of queries
+TEAM_GAME_CHUNK_GAMES = 200
+
+# Sums of each team's player_game_stats
+SUMMED_COLUMNS = (
+    "goals",
+    "assists",
+    "blocks",
+    "completions",
+    "throw_attempts",
+    "throwaways",
+    "stalls",
+    "drops",
+    "hucks_completed",
+    "hucks_attempted",
+    "yards_thrown",
+    "yards_received",
+    "o_opportunities",
+    "o_opportunity_scores",
+    "d_opportunities",
+    "d_opportunity_stops",
+)
+
+# Team lines: the most points any of the team's players played or scored
+LINE_COLUMNS = (
+    "o_points_played",
+    "o_points_scored",
+    "d_points_played",
+    "d_points_scored",
+)
+
+POSSESSION_COLUMNS = (
+    "o_line_points",
+    "o_line_scores",
+    "o_line_possessions",
+    "d_line_points",
+    "d_line_scores",
+    "d_line_possessions",
+)
+
+REDZONE_COLUMNS = ("redzone_possessions", "redzone_goals", "redzone_attempts")
+
+# The team's goals per quarter and [quarter, event_time] of each goal, stored as JSON
+SCORING_COLUMNS = ("quarter_scores", "goal_times")
+
+TEAM_GAME_COLUMNS = (
+    ("game_id", "team_id", "opponent_id", "year", "is_home")
+    + SUMMED_COLUMNS
+    + LINE_COLUMNS
+    + POSSESSION_COLUMNS
+    + REDZONE_COLUMNS
+    + SCORING_COLUMNS
+)
+
+# event_time is in seconds: never this
+NO_EVENT_TIME = -(2**31)
+
+# The event code of a game_events row e (see domain.possession.encode_events())
+EVENT_CODE_SQL = f"""
+    CASE WHEN e.event_type BETWEEN 0 AND {EVENT_TYPE_MASK} THEN e.event_type ELSE 0 END
+    + CASE WHEN e.receiver_y BETWEEN 80 AND 100 THEN {RECEIVER_IN_REDZONE} ELSE 0 END
+    + CASE WHEN e.thrower_y BETWEEN 80 AND 100 THEN {THROWER_IN_REDZONE} ELSE 0 END
+"""
+
+# What the engine reads of a home or away event, as integers: its segment
+# (2 * the game's position, + 1 for home), event code and event_time
+EVENT_COLUMNS_SQL = f"""
+    2 * p.position + CASE WHEN e.team = 'home' THEN 1 ELSE 0 END,
+    {EVENT_CODE_SQL},
+    COALESCE(e.event_time, {NO_EVENT_TIME})
+"""
+
+
+def scan_game_events(db, game_ids: list[str]) -> tuple[dict, dict]:
+    """
+    Possession and redzone stats of each team's events in a set of games, and
+    the quarter scoring of each game.
+
+    The events are fetched as EVENT_COLUMNS_SQL integers and read off the
+    cursor into one array, so no Python object is kept per event.
+
+    Args:
+        db: Database instance
+        game_ids: Games to scan
+
+    Returns:
+        What scan_event_columns() gives for the games' events
+    """
+    placeholders, params = _in_clause("g", game_ids)
+    positions = ", ".join(f"(:g{i}, {i})" for i in range(len(game_ids)))
+    # Each team's events in processing order, as the possession calculators sort them
+    with db.engine.connect() as conn:
+        result = conn.execute(
+            text(f"""
+                WITH game_positions (game_id, position) AS (VALUES {positions})
+                SELECT {EVENT_COLUMNS_SQL}
+                FROM game_events e
+                JOIN game_positions p ON p.game_id = e.game_id
+                WHERE e.game_id IN ({placeholders}) AND e.team IN ('home', 'away')
+                ORDER BY p.position, e.team, e.event_index,
+                    CASE
+                        WHEN e.event_type IN (19, 15) THEN 0
+                        WHEN e.event_type = 1 THEN 1
+                        ELSE 2
+                    END
+                """),
+            params,
+        )
+        segment, code, event_time = event_columns(result)
+    return scan_event_columns(game_ids, segment, code, event_time)
+
+
+def event_columns(rows: Iterable[tuple]) -> tuple[np.ndarray, ...]:
+    """(segment, event code, event_time) arrays of EVENT_COLUMNS_SQL rows."""
+    values = np.fromiter(chain.from_iterable(rows), dtype=np.int64)
+    return tuple(np.ascontiguousarray(values[i::3]) for i in range(3))
+
+
+def scan_event_columns(
+    game_ids: list[str],
+    segment: np.ndarray,
+    code: np.ndarray,
+    event_time: np.ndarray,
+) -> tuple[dict, dict]:
+    """
+    Possession and redzone stats of each team's events, and the quarter
+    scoring of each game, from EVENT_COLUMNS_SQL columns.
+
+    The columns run through the vectorized engine in one batch, which gives
+    what scan_team_events() gives for each team's events. Both teams record
+    every goal, so a game is scored from the home team's events, or the away
+    team's when home has none.
+
+    Args:
+        game_ids: The games segments are numbered by
+        segment: Segment of each event, nondecreasing, each segment's events
+            in processing order
+        code: Event code of each event
+        event_time: event_time of each event, NO_EVENT_TIME for NULL
+
+    Returns:
+        (possession, redzone) keyed by (game_id, team type) for each team
+        with events, as PossessionStats.to_dict() and RedzoneStats.to_dict()
+        style dicts, and ScoringStats keyed by game_id for each game with
+        events
+    """
+    if len(segment) == 0:
+        return {}, {}
+
+    segments = 2 * len(game_ids)
+    stats = process_event_codes(segment, code, segments)
+    has_events = np.bincount(segment, minlength=segments) > 0
+    teams = np.flatnonzero(has_events).tolist()
+
+    possession = zip(
+        *(stats[c][teams].tolist() for c in POSSESSION_COLUMNS), strict=True
+    )
+    redzone = zip(*(stats[c][teams].tolist() for c in REDZONE_COLUMNS), strict=True)
+    team_stats = {
+        (game_ids[s // 2], "home" if s % 2 else "away"): (
+            dict(zip(POSSESSION_COLUMNS, p, strict=True)),
+            dict(zip(REDZONE_COLUMNS, r, strict=True)),
+        )
+        for s, p, r in zip(teams, possession, redzone, strict=True)
+    }
+
+    # Each game's scoring segment: home's when it has events, else away's
+    by_home = has_events[1::2]
+    scored = segment % 2 == by_home[segment // 2]
+    scoring = score_event_arrays(
+        segment[scored] // 2,
+        code[scored] & EVENT_TYPE_MASK,
+        event_time[scored],
+        by_home,
+        missing_time=NO_EVENT_TIME,
+    )
+    played = has_events[0::2] | by_home
+    game_scoring = {game_ids[g]: scoring[g] for g in np.flatnonzero(played).tolist()}
+    return team_stats, game_scoring
+
+
+def scan_event_rows(events: list[tuple]) -> tuple[dict, dict]:
+    """
+    scan_event_columns() of event rows.
+
+    Args:
+        events: (game_id, team, event_type, event_time, receiver_y, thrower_y)
+            rows, each team's events in processing order
+
+    Returns:
+        What scan_event_columns() gives for the rows' games, in the order
+        they come
+    """
+    game_ids, columns = encode_event_rows(events)
+    return scan_event_columns(game_ids, *columns)
+
+
+def encode_event_rows(events: list[tuple]) -> tuple[list[str], tuple]:
+    """
+    The game ids and EVENT_COLUMNS_SQL columns of event rows.
+
+    Args:
+        events: Event rows, as for scan_event_rows()
+
+    Returns:
+        The rows' games in order, and their home and away events' (segment,
+        event code, event_time) arrays
+    """
+    events = [event for event in events if event[1] in ("home", "away")]
+    game_ids = list(dict.fromkeys(event[0] for event in events))
+    position = {game_id: i for i, game_id in enumerate(game_ids)}
+    segment = np.array(
+        [2 * position[event[0]] + (event[1] == "home") for event in events],
+        dtype=np.int64,
+    )
+    event_type = np.array([event[2] for event in events], dtype=np.int64)
+    event_time = np.array(
+        [NO_EVENT_TIME if event[3] is None else event[3] for event in events],
+        dtype=np.int64,
+    )
+    receiver_y, thrower_y = (
+        np.array([event[i] for event in events], dtype=np.float64) for i in (4, 5)
+    )
+    # Each game's away events, then its home events, each in their order
+    order = np.argsort(segment, kind="stable")
+    code = encode_events(event_type, receiver_y, thrower_y)
+    return game_ids, (segment[order], code[order], event_time[order])
+
+
+def build_team_game_stats(db, game_ids: list[str]) -> list[dict[str, Any]]:
+    """
+    Build the team_game_stats rows of a set of games.
+
+    Args:
+        db: Database instance
+        game_ids: Games to build
+
+    Returns:
+        Two rows per game found (home first), with TEAM_GAME_COLUMNS keys
+    """
+    placeholders, params = _in_clause("g", game_ids)
+    games = db.execute_query(
+        f"""
+        SELECT game_id, year, home_team_id, away_team_id
+        FROM games
+        WHERE game_id IN ({placeholders})
+        """,
+        params,
+    )
+    sums = ", ".join(f"SUM({c}) as {c}" for c in SUMMED_COLUMNS)
+    lines = ", ".join(f"MAX({c}) as {c}" for c in LINE_COLUMNS)
+    totals = {
+        (row["game_id"], row["team_id"]): row
+        for row in db.execute_query(
+            f"""
+            SELECT game_id, team_id, {sums}, {lines}
+            FROM player_game_stats
+            WHERE game_id IN ({placeholders})
+            GROUP BY game_id, team_id
+            """,
+            params,
+        )
+    }
+    scans, game_scoring = scan_game_events(db, game_ids)
+
+    order = {game_id: i for i, game_id in enumerate(game_ids)}
+    rows = []
+    for game in sorted(games, key=lambda game: order[game["game_id"]]):
+        game_id = game["game_id"]
+        scoring = game_scoring.get(game_id)
+
+        sides = [
+            ("home", game["home_team_id"], game["away_team_id"]),
+            ("away", game["away_team_id"], game["home_team_id"]),
+        ]
+        for team_type, team_id, opponent_id in sides:
+            row = {
+                "game_id": game_id,
+                "team_id": team_id,
+                "opponent_id": opponent_id,
+                "year": game["year"],
+                "is_home": team_type == "home",
+            }
+            team_totals = totals.get((game_id, team_id), {})
+            for column in SUMMED_COLUMNS + LINE_COLUMNS:
+                row[column] = int(team_totals.get(column) or 0)
+
+            possession, redzone = scans.get((game_id, team_type), ({}, {}))
+            for column in POSSESSION_COLUMNS:
+                row[column] = possession.get(column)
+            for column in REDZONE_COLUMNS:
+                row[column] = redzone.get(column)
+
+            if scoring is not None:
+                row["quarter_scores"] = getattr(scoring, f"{team_type}_quarter_scores")
+                row["goal_times"] = [
+                    [goal["quarter"], goal["event_time"]]
+                    for goal in scoring.goals
+                    if goal["team"] == team_type
+                ]
+            else:
+                row["quarter_scores"] = row["goal_times"] = None
+            rows.append(row)
+    return rows
+
+
+def _encode_scoring(row: dict[str, Any]) -> dict[str, Any]:
+    """A built row with its scoring columns as stored (JSON text)."""
+    return row | {
+        column: None if row[column] is None else orjson.dumps(row[column]).decode()
+        for column in SCORING_COLUMNS
+    }
+
+
+def _decode_scoring(row: dict[str, Any]) -> dict[str, Any]:
+    """A stored row with its scoring columns as built."""
+    return row | {
+        column: None if row[column] is None else orjson.loads(row[column])
+        for column in SCORING_COLUMNS
+    }
+
+
+def game_checksums(db, game_ids: list[str]) -> dict[str, str]:
+    """
+    Signature of what each game's team_game_stats rows are built from.
+
+    Covers the game's teams, year and game_type, the count and last id of
+    its events (the importer only adds events, as events_version() relies
+    on) and its player_game_stats totals. Only aggregates are read.
+
+    Args:
+        db: Database instance
+        game_ids: Games to check
+
+    Returns:
+        Hex digest keyed by game_id, for each game found
+    """
+    placeholders, params = _in_clause("g", game_ids)
+    sums = ", ".join(f"SUM({c})" for c in SUMMED_COLUMNS)
+    lines = ", ".join(f"MAX({c})" for c in LINE_COLUMNS)
+    with db.engine.connect() as conn:
+        games = conn.execute(
+            text(f"""
+                SELECT game_id, year, home_team_id, away_team_id, game_type
+                FROM games
+                WHERE game_id IN ({placeholders})
+                """),
+            params,
+        ).fetchall()
+        events = conn.execute(
+            text(f"""
+                SELECT game_id, COUNT(*), MAX(id)
+                FROM game_events
+                WHERE game_id IN ({placeholders})
+                GROUP BY game_id
+                """),
+            params,
+        ).fetchall()
+        totals = conn.execute(
+            text(f"""
+                SELECT game_id, team_id, {sums}, {lines}
+                FROM player_game_stats
+                WHERE game_id IN ({placeholders})
+                GROUP BY game_id, team_id
+                ORDER BY game_id, team_id
+                """),
+            params,
+        ).fetchall()
+
+    hashes = {row[0]: hashlib.blake2b(digest_size=16) for row in games}
+    for rows in (games, events, totals):
+        for row in rows:
+            if row[0] in hashes:
+                hashes[row[0]].update(repr(tuple(row[1:])).encode())
+    return {game_id: digest.hexdigest() for game_id, digest in hashes.items()}
+
+
+def _write_team_game_stats(
+    conn,
+    game_ids: list[str],
+    rows: list[dict[str, Any]],
+    checksums: dict[str, str] | None,
+) -> None:
+    """Replace the rows and watermark of a set of games on a connection."""
+    insert = text(
+        f"INSERT INTO team_game_stats ({', '.join(TEAM_GAME_COLUMNS)}) "
+        f"VALUES ({', '.join(':' + c for c in TEAM_GAME_COLUMNS)})"
+    )
+    for i in range(0, len(game_ids), TEAM_GAME_CHUNK_GAMES):
+        placeholders, params = _in_clause("g", game_ids[i : i + TEAM_GAME_CHUNK_GAMES])
+        for table in ("team_game_stats", "team_game_stats_watermark"):
+            conn.execute(
+                text(f"DELETE FROM {table} WHERE game_id IN ({placeholders})"),
+                params,
+            )
+    if rows:
+        conn.execute(insert, [_encode_scoring(row) for row in rows])
+    if checksums:
+        conn.execute(
+            text(
+                "INSERT INTO team_game_stats_watermark (game_id, checksum) "
+                "VALUES (:game_id, :checksum)"
+            ),
+            [
+                {"game_id": game_id, "checksum": checksums[game_id]}
+                for game_id in game_ids
+                if game_id in checksums
+            ],
+        )
+
+
+def store_team_game_stats(
+    db,
+    game_ids: list[str],
+    rows: list[dict[str, Any]],
+    checksums: dict[str, str] | None = None,
+) -> int:
+    """
+    Replace the team_game_stats rows of a set of games, in one transaction.
+
+    Args:
+        db: Database instance
+        game_ids: Games whose rows are replaced
+        rows: build_team_game_stats() rows of those games
+        checksums: game_checksums() of what the rows were built from. Games
+            without one lose their watermark, so the next
+            refresh_changed_team_game_stats() rebuilds them.
+
+    Returns:
+        Number of rows written
+    """
+    with db.engine.begin() as conn:
+        _write_team_game_stats(conn, game_ids, rows, checksums)
+    return len(rows)
+
+
+def refresh_team_game_stats(db, game_ids: list[str]) -> int:
+    """
+    Rebuild the team_game_stats rows of a set of games.
+
+    Args:
+        db: Database instance
+        game_ids: Games whose player stats or events were imported
+
+    Returns:
+        Number of rows written
+    """
+    written = 0
+    for i in range(0, len(game_ids), TEAM_GAME_CHUNK_GAMES):
+        chunk = game_ids[i : i + TEAM_GAME_CHUNK_GAMES]
+        checksums = game_checksums(db, chunk)
+        written += store_team_game_stats(
+            db, chunk, build_team_game_stats(db, chunk), checksums
+        )
+    return written
+
+
+def refresh_changed_team_game_stats(db, game_ids: list[str]) -> int:
+    """
+    Rebuild the team_game_stats rows of the games that are new or changed
+    since they were last built, and update season possession stats to match.
+
+    A game is rebuilt when it has no watermark or its game_checksums() differs
+    from the stored one. The team_season_stats possession stats of both its
+    old and new teams are then recomputed from their team_game_stats rows,
+    in the same transaction, when the season's stats come from game_events.
+
+    Args:
+        db: Database instance
+        game_ids: Games that may have been imported or changed
+
+    Returns:
+        Number of rows written
+    """
+    written = 0
+    for i in range(0, len(game_ids), TEAM_GAME_CHUNK_GAMES):
+        checksums = game_checksums(db, game_ids[i : i + TEAM_GAME_CHUNK_GAMES])
+        if not checksums:
+            continue
+        placeholders, params = _in_clause("g", list(checksums))
+        stored = db.execute_query(
+            f"""
+            SELECT game_id, checksum
+            FROM team_game_stats_watermark
+            WHERE game_id IN ({placeholders})
+            """,
+            params,
+        )
+        stored = {row["game_id"]: row["checksum"] for row in stored}
+        changed = [g for g, checksum in checksums.items() if stored.get(g) != checksum]
+        if not changed:
+            continue
+
+        placeholders, params = _in_clause("g", changed)
+        old_rows = db.execute_query(
+            f"""
+            SELECT team_id, year
+            FROM team_game_stats
+            WHERE game_id IN ({placeholders})
+            """,
+            params,
+        )
+        rows = build_team_game_stats(db, changed)
+        teams = {(row["team_id"], row["year"]) for row in old_rows + rows}
+        years = sorted({year for _, year in teams})
+        with db.engine.begin() as conn:
+            events_before = _event_seasons(conn, years)
+            _write_team_game_stats(conn, changed, rows, checksums)
+            # A season whose coverage crosses the threshold changes source, so
+            # its stats are left to populate_possession_stats.py
+            seasons = events_before & _event_seasons(conn, years)
+            _update_season_possession_stats(
+                conn, {(team_id, year) for team_id, year in teams if year in seasons}
+            )
+        written += len(rows)
+    return written
+
+
+def fetch_game_team_stats(db, game_id: str) -> dict[str, dict[str, Any]]:
+    """
+    Team stats of both teams of a game.
+
+    Games the importer has not built yet are built here, without storing them.
+
+    Args:
+        db: Database instance
+        game_id: Game ID
+
+    Returns:
+        team_game_stats row of each team, keyed by team_id
+    """
+    rows = db.execute_query(
+        f"""
+        SELECT {', '.join(TEAM_GAME_COLUMNS)}
+        FROM team_game_stats
+        WHERE game_id = :game_id
+        """,
+        {"game_id": game_id},
+    )
+    if rows:
+        rows = [_decode_scoring(row) for row in rows]
+    else:
+        rows = build_team_game_stats(db, [game_id])
+    return {row["team_id"]: row for row in rows}
+
+
+# Games left out of season team stats, as the possession scripts always have
+EXHIBITION_GAME_TYPES = ("all-star", "showcase", "preseason")
+
+
+def fetch_season_team_stats(db, year: int) -> list[dict[str, Any]]:
+    """
+    Season sums of team_game_stats per team, with their opponents' sums.
+
+    Args:
+        db: Database instance
+        year: Season
+
+    Returns:
+        One row per team: team_id, games, games_with_events (games with
+        possession stats), the sum of every stat column and, prefixed opp_,
+        the sum of each column over the team's opponents in those games
+    """
+    return db.execute_query(*_season_team_stats_query(year))
+
+
+def _season_team_stats_query(
+    year: int, team_ids: list[str] | None = None
+) -> tuple[str, dict[str, Any]]:
+    """fetch_season_team_stats() query and params, optionally for some teams."""
+    stat_columns = SUMMED_COLUMNS + LINE_COLUMNS + POSSESSION_COLUMNS + REDZONE_COLUMNS
+    sums = ",\n            ".join(
+        f"SUM(t.{c}) as {c}, SUM(o.{c}) as opp_{c}" for c in stat_columns
+    )
+    placeholders, params = _in_clause("type", list(EXHIBITION_GAME_TYPES))
+    team_filter = ""
+    if team_ids is not None:
+        team_placeholders, team_params = _in_clause("team", team_ids)
+        team_filter = f"AND t.team_id IN ({team_placeholders})"
+        params |= team_params
+    query = f"""
+        SELECT
+            t.team_id,
+            COUNT(*) as games,
+            COUNT(t.o_line_points) as games_with_events,
+            {sums}
+        FROM team_game_stats t
+        JOIN team_game_stats o ON o.game_id = t.game_id AND o.team_id = t.opponent_id
+        JOIN games g ON g.game_id = t.game_id
+        WHERE t.year = :year AND g.game_type NOT IN ({placeholders})
+            {team_filter}
+        GROUP BY t.team_id
+        """
+    return query, params | {"year": year}
+
+
+# team_season_stats possession counts: season sums of these team_game_stats columns
+SEASON_POSSESSION_FIELDS = POSSESSION_COLUMNS + ("redzone_goals", "redzone_attempts")
+
+# team_season_stats percentage columns and the (made, total) counts they divide
+SEASON_PERCENTAGES = {
+    "hold_percentage": ("o_line_scores", "o_line_points"),
+    "o_line_conversion": ("o_line_scores", "o_line_possessions"),
+    "break_percentage": ("d_line_scores", "d_line_points"),
+    "d_line_conversion": ("d_line_scores", "d_line_possessions"),
+    "red_zone_conversion": ("redzone_goals", "redzone_attempts"),
+}
+
+# A season's possession stats come from game_events when at least this
+# percentage of its games have events, else from player_game_stats team lines
+EVENTS_COVERAGE_PCT = 80
+
+
+def season_percentage(made: int, total: int) -> float:
+    """made / total as a percentage, rounded to 2 places; 0.0 without a total."""
+    return round((made / total) * 100, 2) if total > 0 else 0.0
+
+
+def _event_seasons(conn, years: list[int]) -> set[int]:
+    """
+    Seasons among years whose possession stats come from game_events, or
+    that have no games yet (they sum to zero either way).
+    """
+    if not years:
+        return set()
+    year_placeholders, params = _in_clause("y", years)
+    type_placeholders, type_params = _in_clause("type", list(EXHIBITION_GAME_TYPES))
+    coverage = conn.execute(
+        text(f"""
+            SELECT t.year, COUNT(*), COUNT(t.o_line_points)
+            FROM team_game_stats t
+            JOIN games g ON g.game_id = t.game_id
+            WHERE t.year IN ({year_placeholders})
+              AND g.game_type NOT IN ({type_placeholders})
+            GROUP BY t.year
+            """),
+        params | type_params,
+    )
+    return set(years) - {
+        year
+        for year, games, with_events in coverage
+        if with_events * 100 < games * EVENTS_COVERAGE_PCT
+    }
+
+
+def _update_season_possession_stats(conn, teams: set[tuple[str, int]]) -> None:
+    """
+    Recompute the team_season_stats possession stats of a set of (team_id,
+    year) from team_game_stats, as fetch_season_team_stats() sums them.
+
+    Each team's counts and opp_ counts are set to the sums over its counted
+    games (zero without any), and its percentages to those of the sums.
+    """
+    columns = [
+        prefix + field for prefix in ("", "opp_") for field in SEASON_POSSESSION_FIELDS
+    ]
+    percentage_columns = {
+        prefix + column: (prefix + made, prefix + total)
+        for prefix in ("", "opp_")
+        for column, (made, total) in SEASON_PERCENTAGES.items()
+    }
+    updates = []
+    for year in sorted({year for _, year in teams}):
+        team_ids = sorted(team_id for team_id, team_year in teams if team_year == year)
+        query, params = _season_team_stats_query(year, team_ids)
+        sums = {
+            row["team_id"]: row for row in conn.execute(text(query), params).mappings()
+        }
+        for team_id in team_ids:
+            row = sums.get(team_id, {})
+            counts = {column: int(row.get(column) or 0) for column in columns}
+            updates.append(
+                {"team_id": team_id, "year": year}
+                | counts
+                | {
+                    column: season_percentage(counts[made], counts[total])
+                    for column, (made, total) in percentage_columns.items()
+                }
+            )
+    if not updates:
+        return
+
+    conn.execute(
+        text(f"""
+            UPDATE team_season_stats
+            SET {', '.join(f"{c} = :{c}" for c in columns + list(percentage_columns))},
+                updated_at = CURRENT_TIMESTAMP
+            WHERE team_id = :team_id AND year = :year
+            """),
+        updates,
+    )
+
+
+def refresh_missing_team_game_stats(db) -> int:
+    """
+    Build the team_game_stats rows of games that have none yet, or whose rows
+    have possession stats but were built before quarter scores were stored.
+
+    Args:
+        db: Database instance
+
+    Returns:
+        Number of rows written
+    """
+    missing = db.execute_query("""
+        SELECT g.game_id
+        FROM games g
+        WHERE NOT EXISTS (
+            SELECT 1 FROM team_game_stats t WHERE t.game_id = g.game_id
+        )
+        OR EXISTS (
+            SELECT 1 FROM team_game_stats t
+            WHERE t.game_id = g.game_id
+              AND t.o_line_points IS NOT NULL
+              AND t.quarter_scores IS NULL
+        )
+        """)
+    return refresh_team_game_stats(db, [row["game_id"] for row in missing])
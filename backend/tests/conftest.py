@@ -9,14 +9,17 @@ import shutil
 # Add backend to path so we can import modules
 import sys
 import tempfile
+from pathlib import Path
 from typing import Any
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from api.player_stats.query_builder import PlayerStatsQueryBuilder
 from config import Config
 from core.ai_generator import AIGenerator
 from core.session_manager import Message, SessionManager
@@ -289,6 +292,101 @@ def mock_api_responses():
     }
 
 
+# ===== SQLITE STATS FIXTURES =====
+
+MIGRATIONS = Path(__file__).parents[1] / "migrations"
+
+PLAYER_STAT_COLUMNS = (
+    "o_points_played d_points_played o_points_scored d_points_scored assists "
+    "goals blocks completions throw_attempts throwaways stalls drops callahans "
+    "hockey_assists yards_thrown yards_received catches hucks_completed "
+    "hucks_attempted hucks_received o_opportunities o_opportunity_scores "
+    "d_opportunities d_opportunity_stops"
+).split()
+
+
+@pytest.fixture
+def stats_system(tmp_path):
+    """
+    Stats system over an empty SQLite database with the game tables and the
+    stored per-game artifacts. Test modules override it to add their rows.
+    """
+    db = SQLDatabase(f"sqlite:///{tmp_path / 'stats.db'}")
+    with db.engine.begin() as conn:
+        for migration in [
+            "018_add_game_play_by_play.sql",
+            "019_add_game_box_scores.sql",
+            "020_add_team_game_stats.sql",
+            "021_add_team_game_quarter_scores.sql",
+            "022_add_team_game_stats_watermark.sql",
+        ]:
+            for statement in (MIGRATIONS / migration).read_text().split(";")[:-1]:
+                conn.execute(text(statement))
+        conn.execute(text("""
+                CREATE TABLE games (
+                    game_id, year, week, home_team_id, away_team_id, home_score,
+                    away_score, status, start_timestamp, location, game_type
+                )
+                """))
+        conn.execute(text("""
+                CREATE TABLE teams (
+                    team_id, year, city, name, full_name, abbrev, logo_url, standing
+                )
+                """))
+        conn.execute(text("""
+                CREATE TABLE players (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, player_id, team_id,
+                    year, first_name, last_name, full_name, jersey_number
+                )
+                """))
+        conn.execute(text(f"""
+                CREATE TABLE player_game_stats (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, game_id, player_id,
+                    team_id, year,
+                    {", ".join(f"{c} INTEGER DEFAULT 0" for c in PLAYER_STAT_COLUMNS)}
+                )
+                """))
+        conn.execute(text("""
+                CREATE TABLE game_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    game_id TEXT, event_index INTEGER, team TEXT,
+                    event_type INTEGER, event_time INTEGER,
+                    thrower_id TEXT, receiver_id TEXT, defender_id TEXT,
+                    puller_id TEXT, thrower_x REAL, thrower_y REAL,
+                    receiver_x REAL, receiver_y REAL, turnover_x REAL,
+                    turnover_y REAL, pull_x REAL, pull_y REAL, pull_ms INTEGER,
+                    line_players TEXT
+                )
+                """))
+    system = MagicMock()
+    system.db = db
+    return system
+
+
+@pytest.fixture
+def insert_events():
+    """
+    Insert game_events rows: each event holds the values of columns, numbered
+    with event_index from start. Events are in game g1 unless columns has game_id.
+    """
+
+    def insert(conn, columns, events, start=0):
+        rows = [
+            {"game_id": "g1", "event_index": index} | dict(zip(columns, event, strict=True))
+            for index, event in enumerate(events, start)
+        ]
+        names = list(rows[0])
+        conn.execute(
+            text(
+                f"INSERT INTO game_events ({', '.join(names)}) "
+                f"VALUES ({', '.join(':' + name for name in names)})"
+            ),
+            rows,
+        )
+
+    return insert
+
+
 # ===== UTILITY FIXTURES =====
 
 
@@ -300,6 +398,29 @@ def temp_directory():
     shutil.rmtree(temp_dir)
 
 
+@pytest.fixture
+def player_stats_builder():
+    """Factory for player stats query builders; keyword overrides replace the defaults"""
+
+    def build(**overrides) -> PlayerStatsQueryBuilder:
+        options = {
+            "seasons": ["2024"],
+            "teams": ["all"],
+            "is_career_mode": False,
+            "filters_list": [],
+            "per_game_mode": False,
+            "per_possession_mode": False,
+            "sort": "total_goals",
+            "order": "desc",
+            "page": 1,
+            "per_page": 20,
+        }
+        options.update(overrides)
+        return PlayerStatsQueryBuilder(**options)
+
+    return build
+
+
 @pytest.fixture
 def current_season():
     """Current season for testing"""
@@ -44,7 +44,7 @@ class TestQuarterScoreService:
             {
                 "event_index": 4,
                 "event_type": 15,
-                "team": "away",
+                "team": "home",
                 "event_time": 120,
             },  # Away goal
             {
@@ -75,7 +75,7 @@ class TestQuarterScoreService:
             {
                 "event_index": 9,
                 "event_type": 15,
-                "team": "away",
+                "team": "home",
                 "event_time": 150,
             },  # Away goal
             {
@@ -94,19 +94,19 @@ class TestQuarterScoreService:
             {
                 "event_index": 12,
                 "event_type": 15,
-                "team": "away",
+                "team": "home",
                 "event_time": 40,
             },  # Away goal
             {
                 "event_index": 13,
                 "event_type": 15,
-                "team": "away",
+                "team": "home",
                 "event_time": 100,
             },  # Away goal
             {
                 "event_index": 14,
                 "event_type": 15,
-                "team": "away",
+                "team": "home",
                 "event_time": 200,
             },  # Away goal
             {
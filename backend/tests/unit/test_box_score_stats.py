@@ -0,0 +1,340 @@
+"""
+Test computing both teams' box score stats from one event scan, and the
+team_game_stats fact table they are read from.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from domain.possession import (
+    PossessionCalculator,
+    PossessionEventProcessor,
+    RedzoneCalculator,
+    RedzoneEventProcessor,
+    process_team_events,
+    scan_team_events,
+)
+from services import team_game_stats
+from services.box_score_service import calculate_game_team_stats
+from services.quarter_score_service import calculate_quarter_scores
+from services.team_game_stats import (
+    SEASON_PERCENTAGES,
+    SEASON_POSSESSION_FIELDS,
+    build_team_game_stats,
+    fetch_game_team_stats,
+    fetch_season_team_stats,
+    refresh_changed_team_game_stats,
+    refresh_team_game_stats,
+    season_percentage,
+    store_team_game_stats,
+)
+
+EVENT_TYPES = [1, 2, 11, 12, 13, 14, 15, 18, 18, 18, 18, 19, 20, 22, 23, 24, 28, 29]
+
+
+def _random_events(rng: random.Random, count: int) -> list[dict]:
+    return [
+        {
+            "event_index": index,
+            "event_type": rng.choice(EVENT_TYPES),
+            "receiver_y": rng.choice([None, rng.uniform(0, 120)]),
+            "thrower_y": rng.choice([None, rng.uniform(0, 120)]),
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def stats_system(stats_system, insert_events):
+    rng = random.Random(3)
+    with stats_system.db.engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO games (game_id, year, home_team_id, away_team_id, "
+                "game_type) VALUES ('g1', 2024, 'atl', 'bos', 'regular')"
+            )
+        )
+        for team in ("home", "away"):
+            insert_events(
+                conn,
+                ("team", "event_type", "receiver_y", "thrower_y"),
+                [
+                    (team, event["event_type"], event["receiver_y"], event["thrower_y"])
+                    for event in _random_events(rng, 200)
+                ],
+            )
+        conn.execute(
+            text(
+                "INSERT INTO player_game_stats (game_id, team_id, completions, "
+                "throw_attempts, hucks_completed, hucks_attempted, blocks, "
+                "throwaways, stalls, drops) VALUES "
+                "('g1', :team, :completions, :attempts, 2, 4, 1, 2, 1, 0)"
+            ),
+            [
+                {"team": "atl", "completions": 20, "attempts": 25},
+                {"team": "atl", "completions": 10, "attempts": 15},
+                {"team": "bos", "completions": 9, "attempts": 10},
+            ],
+        )
+    return stats_system
+
+
+class TestSingleEventScan:
+    """Possession and redzone stats from one pass over a game's events"""
+
+    def test_one_pass_matches_separate_processors(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            events = _random_events(rng, 150)
+            possession, redzone = process_team_events(events, "home")
+            assert possession == PossessionEventProcessor("home").process_events(events)
+            assert redzone == RedzoneEventProcessor("home").process_events(events)
+
+    def test_scan_counts_goals_per_quarter(self):
+        # The away team's events: its goals and callahans, then the home team's
+        events = [
+            {"event_type": event_type, "event_time": event_time}
+            for event_type, event_time in [
+                (2, 0),
+                (19, 40),
+                (28, 720),
+                (1, 0),
+                (15, 30),
+                (12, 95),
+                (29, 720),
+                (30, 720),
+                (19, 500),
+                (31, 720),
+                (23, 60),
+            ]
+        ]
+        _, _, scoring = scan_team_events(events, "away")
+
+        # Overtime is in progress with a goal, so it is listed
+        assert scoring.home_quarter_scores == [0, 2, 0, 0, 0]
+        assert scoring.away_quarter_scores == [1, 0, 0, 1, 1]
+        assert scoring.quarters()[1] == {
+            "quarter": 2,
+            "home_score": 2,
+            "away_score": 0,
+        }
+        assert scoring.goals[1:3] == [
+            {"quarter": 2, "event_time": 30, "team": "home"},
+            {"quarter": 2, "event_time": 95, "team": "home"},
+        ]
+
+    def test_game_team_stats(self, stats_system):
+        db = stats_system.db
+        result = calculate_game_team_stats(stats_system, "g1", "atl", "bos")
+
+        home, away = result["home"], result["away"]
+        assert home["completions"] == {"percentage": 75.0, "made": 30, "attempted": 40}
+        assert home["blocks"] == 2
+        assert home["turnovers"] == 6
+        assert away["completions"]["made"] == 9
+
+        for team_type, is_home in [("home", True), ("away", False)]:
+            possession = PossessionCalculator(db).calculate_for_game(
+                "g1", None, is_home
+            )
+            redzone = RedzoneCalculator(db).calculate_for_team("g1", None, is_home)
+            stats = result[team_type]
+            assert stats["hold"]["made"] == possession["o_line_scores"]
+            assert stats["hold"]["total"] == possession["o_line_points"]
+            assert stats["d_line_conversion"]["total"] == (
+                possession["d_line_possessions"]
+            )
+            assert stats["redzone_conversion"]["made"] == redzone["redzone_goals"]
+            assert stats["redzone_conversion"]["total"] == redzone["redzone_attempts"]
+
+    def test_team_without_events_or_player_stats(self, stats_system):
+        result = calculate_game_team_stats(stats_system, "missing", "atl", "bos")
+
+        assert result["home"]["completions"]["attempted"] == 0
+        assert "hold" not in result["home"]
+        assert result["away"]["redzone_conversion"]["total"] == 0
+
+
+class TestTeamGameStats:
+    """Stored team-by-game rows"""
+
+    def test_stored_rows_match_build(self, stats_system, monkeypatch):
+        live = calculate_game_team_stats(stats_system, "g1", "atl", "bos")
+        assert refresh_team_game_stats(stats_system.db, ["g1", "missing"]) == 2
+
+        # Served from the stored rows without rebuilding
+        monkeypatch.setattr(team_game_stats, "build_team_game_stats", None)
+        assert calculate_game_team_stats(stats_system, "g1", "atl", "bos") == live
+
+    def test_season_team_stats(self, stats_system):
+        refresh_team_game_stats(stats_system.db, ["g1"])
+
+        teams = {
+            row["team_id"]: row
+            for row in fetch_season_team_stats(stats_system.db, 2024)
+        }
+        assert teams["atl"]["games"] == 1
+        assert teams["atl"]["games_with_events"] == 1
+        assert teams["atl"]["completions"] == 30
+        assert teams["atl"]["opp_completions"] == 9
+        assert teams["bos"]["opp_o_line_points"] == teams["atl"]["o_line_points"]
+
+    def test_stored_quarter_scores(self, stats_system):
+        refresh_team_game_stats(stats_system.db, ["g1"])
+
+        rows = fetch_game_team_stats(stats_system.db, "g1")
+        quarters = calculate_quarter_scores(stats_system, "g1")
+        assert rows["atl"]["quarter_scores"] == [q["home_score"] for q in quarters]
+        assert rows["bos"]["quarter_scores"] == [q["away_score"] for q in quarters]
+        assert len(rows["bos"]["goal_times"]) == sum(rows["bos"]["quarter_scores"])
+
+    def test_store_replaces_games_rows(self, stats_system):
+        db = stats_system.db
+        refresh_team_game_stats(db, ["g1"])
+        rows = build_team_game_stats(db, ["g1"])
+
+        assert store_team_game_stats(db, ["g1"], rows[:1]) == 1
+        assert list(fetch_game_team_stats(db, "g1")) == ["atl"]
+        assert store_team_game_stats(db, ["g1"], []) == 0
+        assert db.execute_query("SELECT COUNT(*) as n FROM team_game_stats") == [
+            {"n": 0}
+        ]
+
+
+class TestIncrementalTeamGameStats:
+    """Rebuilding only new or changed games, and their teams' season stats"""
+
+    @pytest.fixture
+    def db(self, stats_system):
+        db = stats_system.db
+        columns = [
+            prefix + column
+            for prefix in ("", "opp_")
+            for column in SEASON_POSSESSION_FIELDS + tuple(SEASON_PERCENTAGES)
+        ]
+        with db.engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"CREATE TABLE team_season_stats (team_id, year, "
+                    f"{', '.join(columns)}, updated_at)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO team_season_stats (team_id, year) "
+                    "VALUES ('atl', 2024), ('bos', 2024)"
+                )
+            )
+        return db
+
+    def _assert_season_matches_games(self, db):
+        stored = {
+            row["team_id"]: row
+            for row in db.execute_query("SELECT * FROM team_season_stats")
+        }
+        for row in fetch_season_team_stats(db, 2024):
+            team = stored[row["team_id"]]
+            for prefix in ("", "opp_"):
+                for field in SEASON_POSSESSION_FIELDS:
+                    assert team[prefix + field] == row[prefix + field]
+                for column, (made, total) in SEASON_PERCENTAGES.items():
+                    assert team[prefix + column] == season_percentage(
+                        row[prefix + made], row[prefix + total]
+                    )
+
+    def test_rebuilds_new_and_changed_games_only(self, db):
+        assert refresh_changed_team_game_stats(db, ["g1", "missing"]) == 2
+        assert refresh_changed_team_game_stats(db, ["g1"]) == 0
+
+        # The importer only adds events
+        with db.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO game_events (game_id, event_index, team, "
+                    "event_type) VALUES ('g1', 500, 'home', 19)"
+                )
+            )
+        assert refresh_changed_team_game_stats(db, ["g1"]) == 2
+        assert refresh_changed_team_game_stats(db, ["g1"]) == 0
+
+        with db.engine.begin() as conn:
+            conn.execute(text("UPDATE player_game_stats SET blocks = 3"))
+        assert refresh_changed_team_game_stats(db, ["g1"]) == 2
+
+    def test_full_refresh_records_watermark(self, db):
+        refresh_team_game_stats(db, ["g1"])
+        assert refresh_changed_team_game_stats(db, ["g1"]) == 0
+
+        # Rows stored without checksums are rebuilt next time
+        store_team_game_stats(db, ["g1"], build_team_game_stats(db, ["g1"]))
+        assert refresh_changed_team_game_stats(db, ["g1"]) == 2
+
+    def test_season_stats_follow_changed_games(self, db):
+        refresh_changed_team_game_stats(db, ["g1"])
+        self._assert_season_matches_games(db)
+
+        with db.engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM game_events WHERE team = 'home' AND id % 3 = 0")
+            )
+            conn.execute(text("UPDATE game_events SET event_type = 19 WHERE id = 7"))
+        assert refresh_changed_team_game_stats(db, ["g1"]) == 2
+        self._assert_season_matches_games(db)
+
+    def test_season_stats_recomputed_after_rows_are_recreated(self, db):
+        refresh_changed_team_game_stats(db, ["g1"])
+        # Season stats recalculation recreates the rows without possession stats
+        with db.engine.begin() as conn:
+            conn.execute(text("DELETE FROM team_season_stats"))
+            conn.execute(
+                text(
+                    "INSERT INTO team_season_stats (team_id, year) "
+                    "VALUES ('atl', 2024), ('bos', 2024)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO games (game_id, year, home_team_id, away_team_id, "
+                    "game_type) VALUES ('g2', 2024, 'bos', 'atl', 'regular')"
+                )
+            )
+            for table in ("game_events", "player_game_stats"):
+                columns = [
+                    column
+                    for column in conn.execute(
+                        text(f"SELECT * FROM {table} LIMIT 0")
+                    ).keys()
+                    if column not in ("id", "game_id")
+                ]
+                conn.execute(
+                    text(
+                        f"INSERT INTO {table} (game_id, {', '.join(columns)}) "
+                        f"SELECT 'g2', {', '.join(columns)} FROM {table}"
+                    )
+                )
+
+        assert refresh_changed_team_game_stats(db, ["g1", "g2"]) == 2
+        self._assert_season_matches_games(db)
+        assert [row["games"] for row in fetch_season_team_stats(db, 2024)] == [2, 2]
+
+    def test_game_type_change_rebuilds_and_recounts(self, db):
+        refresh_changed_team_game_stats(db, ["g1"])
+        assert fetch_season_team_stats(db, 2024)
+
+        with db.engine.begin() as conn:
+            conn.execute(text("UPDATE games SET game_type = 'all-star'"))
+        assert refresh_changed_team_game_stats(db, ["g1"]) == 2
+
+        assert fetch_season_team_stats(db, 2024) == []
+        for row in db.execute_query("SELECT * FROM team_season_stats"):
+            for prefix in ("", "opp_"):
+                for field in SEASON_POSSESSION_FIELDS:
+                    assert row[prefix + field] == 0
+                for column in SEASON_PERCENTAGES:
+                    assert row[prefix + column] == 0.0
@@ -0,0 +1,129 @@
+"""
+Test the stored box scores of Final games.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from services import box_score_store
+from services.box_score_store import (
+    build_box_score,
+    get_box_score,
+    refresh_box_scores,
+    source_version,
+)
+from utils.game import get_game_details
+
+# player, team, goals, assists, blocks, throwaways
+PLAYER_LINES = [
+    ("h1", "atl", 2, 1, 1, 0),
+    ("h2", "atl", 1, 2, 1, 1),
+    ("a1", "bos", 1, 0, 2, 2),
+]
+
+EVENT_COLUMNS = ("team", "event_type", "receiver_y")
+EVENTS = [
+    ("home", 1, None),
+    ("home", 18, 90.0),
+    ("home", 19, 105.0),
+    ("away", 2, None),
+    ("away", 15, None),
+    ("away", 1, None),
+    ("away", 19, 102.0),
+    ("home", 15, None),
+]
+
+
+@pytest.fixture
+def stats_system(stats_system, insert_events):
+    with stats_system.db.engine.begin() as conn:
+        conn.execute(text("""
+                INSERT INTO games (
+                    game_id, year, week, home_team_id, away_team_id, home_score,
+                    away_score, status, start_timestamp, location
+                ) VALUES
+                ('g1', 2024, 1, 'atl', 'bos', 2, 1, 'Final', '2024-05-01', 'ATL')
+                """))
+        conn.execute(
+            text(
+                "INSERT INTO teams VALUES (:team, 2024, :team, :team, :team, "
+                ":team, NULL, 1)"
+            ),
+            [{"team": "atl"}, {"team": "bos"}],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO players (player_id, year, full_name, jersey_number) "
+                "VALUES (:id, 2024, :name, '7')"
+            ),
+            [{"id": line[0], "name": f"Player {line[0]}"} for line in PLAYER_LINES],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO player_game_stats (game_id, player_id, team_id, year, "
+                "o_points_played, d_points_played, goals, assists, blocks, "
+                "throwaways, completions, throw_attempts) VALUES ('g1', :player, "
+                ":team, 2024, 3, 2, :goals, :assists, :blocks, :throwaways, 8, 10)"
+            ),
+            [
+                {
+                    "player": player,
+                    "team": team,
+                    "goals": goals,
+                    "assists": assists,
+                    "blocks": blocks,
+                    "throwaways": throwaways,
+                }
+                for player, team, goals, assists, blocks, throwaways in PLAYER_LINES
+            ],
+        )
+        insert_events(conn, EVENT_COLUMNS, EVENTS)
+    return stats_system
+
+
+class TestBoxScoreStore:
+    """Stored box scores"""
+
+    def test_stored_box_score_matches_build(self, stats_system, monkeypatch):
+        built = build_box_score(stats_system, "g1")
+        assert built["home_team"]["stats"]["completions"]["made"] == 16
+        # One goal each in the first quarter, which is still in progress
+        assert built["home_team"]["quarter_scores"] == [1]
+        assert built["away_team"]["quarter_scores"] == [1]
+        assert [goal["team"] for goal in built["scoring_timeline"]] == ["home", "away"]
+        assert get_box_score(stats_system, "g1") == built
+
+        # Served from the stored copy without rebuilding
+        monkeypatch.setattr(box_score_store, "build_box_score", None)
+        assert get_box_score(stats_system, "g1") == built
+
+    def test_refresh_writes_missing_and_stale_only(self, stats_system, insert_events):
+        assert refresh_box_scores(stats_system, ["g1", "missing"]) == 1
+        assert refresh_box_scores(stats_system, ["g1"]) == 0
+
+        version = source_version(stats_system.db, "g1")
+        with stats_system.db.engine.begin() as conn:
+            insert_events(conn, EVENT_COLUMNS, [("home", 24, None)], len(EVENTS))
+        assert source_version(stats_system.db, "g1") != version
+        assert refresh_box_scores(stats_system, ["g1"]) == 1
+
+    def test_game_details_from_box_score(self, stats_system):
+        details = get_game_details(stats_system.db, game_id="g1")
+
+        leaders = details["individual_leaders"]
+        assert leaders["goals"]["home"]["full_name"] == "Player h1"
+        assert leaders["assists"]["home"]["value"] == 2
+        # Ties are joined, in name order
+        assert leaders["blocks"]["home"]["full_name"] == "Player h1; Player h2"
+        assert leaders["goals"]["away"]["team_name"] == "bos"
+
+        home = details["team_statistics"]["home"]
+        assert home["total_completions"] == 16
+        assert home["completion_percentage_display"] == "80.0% (16/20)"
+        assert "hold_percentage" in home
+        assert "redzone_percentage_display" in home
@@ -0,0 +1,234 @@
+"""
+Test orjson responses and negotiated response compression.
+"""
+
+import gzip
+import json
+import os
+import sys
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from fastapi import APIRouter, FastAPI, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from api.responses import FastJSONResponse, FastJSONRoute, dumps
+from middleware.compression import (
+    CompressedBodyCache,
+    CompressionMiddleware,
+    negotiate_encoding,
+)
+
+
+class TestDumps:
+    """orjson output matches what jsonable_encoder + json would send"""
+
+    def test_matches_jsonable_encoder(self):
+        payload = {
+            "total": Decimal("12"),
+            "rate": Decimal("0.25"),
+            "start": datetime(2024, 5, 4, 19, 30, tzinfo=UTC),
+            "day": date(2024, 5, 4),
+            "elapsed": timedelta(minutes=2),
+            "teams": ("hustle", "empire"),
+            "players": [{"name": "A", "goals": 3, "pct": None}],
+        }
+
+        assert json.loads(dumps(payload)) == json.loads(
+            json.dumps(jsonable_encoder(payload))
+        )
+
+    def test_numpy_and_non_string_keys(self):
+        payload = {1: np.array([1.5, 2.0]), "n": np.int64(4), "x": float("nan")}
+        assert json.loads(dumps(payload)) == {"1": [1.5, 2.0], "n": 4, "x": None}
+
+    def test_falls_back_to_jsonable_encoder(self):
+        class Point(BaseModel):
+            x: int
+
+        assert json.loads(dumps({"p": Point(x=1), "s": {2}})) == {
+            "p": {"x": 1},
+            "s": [2],
+        }
+
+
+class Item(BaseModel):
+    name: str
+
+
+def _app() -> FastAPI:
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.get("/async")
+    async def async_endpoint():
+        return {"total": Decimal("3.5")}
+
+    @router.get("/sync", status_code=201)
+    def sync_endpoint():
+        return [Decimal("2")]
+
+    @router.get("/response")
+    async def response_endpoint():
+        return Response("plain", media_type="text/plain")
+
+    @router.get("/model", response_model=Item)
+    async def model_endpoint():
+        return {"name": "x", "extra": 1}
+
+    @router.get("/param")
+    async def param_endpoint(response: Response):
+        response.headers["X-Test"] = "1"
+        return {"ok": True}
+
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.include_router(router)
+    return app
+
+
+class TestFastJSONRoute:
+    """Plain results skip jsonable_encoder; validated routes keep it"""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(_app())
+
+    def test_skips_serialize_response(self, client):
+        with patch("fastapi.routing.serialize_response") as serialize:
+            async_response = client.get("/async")
+            sync_response = client.get("/sync")
+
+        serialize.assert_not_called()
+        assert async_response.json() == {"total": 3.5}
+        assert sync_response.status_code == 201
+        assert sync_response.json() == [2]
+
+    def test_returned_response_passes_through(self, client):
+        assert client.get("/response").text == "plain"
+
+    def test_response_model_still_validates(self, client):
+        assert client.get("/model").json() == {"name": "x"}
+
+    def test_response_parameter_keeps_headers(self, client):
+        response = client.get("/param")
+        assert response.headers["x-test"] == "1"
+        assert response.json() == {"ok": True}
+
+
+def _compressed_app(**options) -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/large")
+    async def large():
+        return {"events": [{"x": i, "y": i * 2} for i in range(500)]}
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(
+            iter([b"a" * 2000, b"b" * 2000]), media_type="text/plain"
+        )
+
+    app.add_middleware(CompressionMiddleware, **options)
+    return app
+
+
+class TestNegotiateEncoding:
+    """Accept-Encoding q-values pick the coding"""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("gzip, deflate, br", "br"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("gzip;q=0, br;q=0", None),
+            ("*", "br"),
+            ("identity", None),
+            ("", None),
+        ],
+    )
+    def test_negotiate(self, header, expected):
+        assert negotiate_encoding(header, ("br", "gzip")) == expected
+
+
+class TestCompressionMiddleware:
+    """Bodies above the threshold are compressed with the negotiated coding"""
+
+    def test_gzip(self):
+        client = TestClient(_compressed_app())
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert len(response.json()["events"]) == 500
+        assert int(response.headers["content-length"]) < len(
+            dumps({"events": [{"x": i, "y": i * 2} for i in range(500)]})
+        )
+
+    def test_brotli(self):
+        client = TestClient(_compressed_app())
+        response = client.get("/large", headers={"Accept-Encoding": "br"})
+
+        assert response.headers["content-encoding"] == "br"
+        assert len(response.json()["events"]) == 500
+
+    def test_skips_small_streamed_and_identity(self):
+        client = TestClient(_compressed_app())
+
+        assert (
+            "content-encoding"
+            not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+        )
+        streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in streamed.headers
+        assert len(streamed.text) == 4000
+        assert (
+            "content-encoding"
+            not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+        )
+
+    def test_prefers_brotli_over_gzip(self):
+        client = TestClient(_compressed_app())
+        response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+        assert response.headers["content-encoding"] == "br"
+
+    def test_caches_compressed_bodies(self):
+        cache = CompressedBodyCache(max_entries=2)
+        calls = []
+
+        def compress(body):
+            calls.append(body)
+            return gzip.compress(body)
+
+        first = cache.get_or_compress("gzip", b"x" * 100, compress)
+        second = cache.get_or_compress("gzip", b"x" * 100, compress)
+        cache.get_or_compress("gzip", b"y", compress)
+        cache.get_or_compress("gzip", b"z", compress)
+        cache.get_or_compress("gzip", b"x" * 100, compress)
+
+        assert first is second
+        assert len(calls) == 4
+
+    def test_cache_is_bounded_by_bytes(self):
+        cache = CompressedBodyCache(max_bytes=250, max_entry_bytes=120)
+
+        def compress(body):
+            return body
+
+        for body in (b"a" * 100, b"b" * 100, b"c" * 100):
+            cache.get_or_compress("gzip", body, compress)
+        cache.get_or_compress("gzip", b"d" * 200, compress)
+
+        # The oldest body was evicted for the third; the fourth was too large
+        assert cache.size == 200
+        assert len(cache._entries) == 2
@@ -0,0 +1,342 @@
+"""
+Test fields projections on the player, team and box score stats endpoints.
+"""
+
+import os
+import random
+import sqlite3
+import sys
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from api.game_box_score import _project_box_score
+from api.player_stats.columns import PLAYER_COLUMNS
+from api.player_stats.percentile_calculator import STAT_FIELDS
+from api.player_stats.percentile_engine import PercentilePopulation
+from api.player_stats.route import create_player_stats_route
+from data.cache import CacheManager
+from services.chat_system.team_stats import TeamStatsService
+from utils.query import parse_fields, project_fields
+
+
+def _season_database() -> sqlite3.Connection:
+    """In-memory player_season_stats, players and teams with random rows."""
+    rng = random.Random(11)
+    stat_columns = [
+        c
+        for c in PLAYER_COLUMNS
+        if c.startswith("total_") or c in ("games_played", "calculated_plus_minus")
+    ] + ["total_catches"]
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE player_season_stats (player_id TEXT, team_id TEXT, year INTEGER, "
+        f"{', '.join(f'{c} INTEGER' for c in stat_columns)})"
+    )
+    conn.execute(
+        "CREATE TABLE players (player_id TEXT, year INTEGER, team_id TEXT, "
+        "full_name TEXT, first_name TEXT, last_name TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE teams (team_id TEXT, year INTEGER, name TEXT, full_name TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO teams VALUES ('hustle', 2024, 'Hustle', 'Atlanta Hustle')"
+    )
+    for p in range(50):
+        conn.execute(
+            "INSERT INTO players VALUES (?, 2024, 'hustle', ?, 'P', ?)",
+            (f"p{p}", f"P {p}", str(p)),
+        )
+        conn.execute(
+            f"INSERT INTO player_season_stats VALUES ({', '.join('?' * (len(stat_columns) + 3))})",
+            (f"p{p}", "hustle", 2024, *[rng.randint(0, 150) for _ in stat_columns]),
+        )
+    return conn
+
+
+class TestParseFields:
+    """The fields parameter is a comma-separated list"""
+
+    def test_parses_and_dedupes(self):
+        assert parse_fields(" total_goals, ,total_assists,total_goals") == [
+            "total_goals",
+            "total_assists",
+        ]
+
+    def test_empty_means_all_fields(self):
+        assert parse_fields(None) is None
+        assert parse_fields(" , ") is None
+
+    def test_project_fields_keeps_identity(self):
+        records = [{"player_id": "p1", "total_goals": 3, "total_assists": 4}]
+        assert project_fields(records, ["total_goals", "nope"], ("player_id",)) == [
+            {"player_id": "p1", "total_goals": 3}
+        ]
+        assert project_fields(records, None) is records
+
+
+class TestPlayerStatsProjection:
+    """Unrequested columns select NULL and their aggregates are skipped"""
+
+    def test_keeps_row_layout(self, player_stats_builder):
+        query = player_stats_builder(fields=["total_assists"]).build_main_query()
+
+        assert "pss.total_assists" in query
+        assert "NULL as total_blocks" in query
+        assert "NULL as yards_per_turn" in query
+        # The sort key and per-mode denominators are always computed
+        assert "pss.total_goals," in query
+        assert "pss.games_played" in query
+
+    def test_keeps_filter_and_threshold_columns(self, player_stats_builder):
+        builder = player_stats_builder(
+            fields=["total_assists"],
+            sort="completion_percentage",
+            filters_list=[{"field": "total_blocks", "operator": ">", "value": 2}],
+        )
+
+        assert {
+            "total_blocks",
+            "completion_percentage",
+            "total_throw_attempts",
+        } <= builder.selected_columns
+
+    def test_career_cte_skips_aggregates(self, player_stats_builder):
+        query = player_stats_builder(
+            seasons=["career"],
+            is_career_mode=True,
+            per_possession_mode=True,
+            fields=["yards_per_turn"],
+        ).build_main_query()
+        cte = query[: query.index("player_info AS")]
+
+        assert "as yards_per_turn" in cte
+        assert "total_hucks_received" not in cte
+        assert "NULL as total_hucks_received" in query
+
+    def test_team_career_cte_skips_aggregates(self, player_stats_builder):
+        query = player_stats_builder(
+            seasons=["career"],
+            is_career_mode=True,
+            teams=["hustle"],
+            per_possession_mode=True,
+            fields=["total_blocks"],
+        ).build_main_query()
+        cte = query[: query.index("player_names AS")]
+
+        assert "SUM(pss.total_blocks) as total_blocks" in cte
+        assert "MAX(pss.year) as most_recent_year" in cte
+        assert "total_pulls" not in cte
+
+    def test_projected_season_query_matches_full_query(self, player_stats_builder):
+        conn = _season_database()
+        fields = ["total_assists", "yards_per_turn", "huck_percentage"]
+        full = conn.execute(player_stats_builder().build_main_query()).fetchall()
+        projected = conn.execute(
+            player_stats_builder(fields=fields).build_main_query()
+        ).fetchall()
+
+        assert len(full) == len(projected) == 20
+        for full_row, projected_row in zip(full, projected, strict=True):
+            for i, column in enumerate(PLAYER_COLUMNS):
+                if column in fields or column in ("player_id", "total_goals"):
+                    assert projected_row[i] == full_row[i]
+            assert projected_row[PLAYER_COLUMNS.index("total_pulls")] is None
+
+
+class TestPercentileProjection:
+    """Only requested stats are ranked"""
+
+    def test_ranks_requested_columns_only(self):
+        rng = np.random.default_rng(4)
+        values = rng.integers(0, 50, size=(30, len(STAT_FIELDS))).astype(float)
+        population = PercentilePopulation([f"k{i}" for i in range(30)], values)
+        full = PercentilePopulation(
+            [f"k{i}" for i in range(30)], values
+        ).percentiles_for(["k3", "k9"])
+
+        projected = population.percentiles_for(
+            ["k3", "k9"], fields=["total_goals", "score_total", "full_name"]
+        )
+
+        assert projected == {
+            key: {f: full[key][f] for f in ["total_goals", "score_total"]}
+            for key in ["k3", "k9"]
+        }
+        assert len(population._modes["total"]) == 2
+
+
+def _row(i: int) -> tuple:
+    row = [Decimal(i + 10)] * len(PLAYER_COLUMNS)
+    row[0:5] = [f"Player {i}", "Player", str(i), "hustle", 2024]
+    row[29:31] = ["Hustle", "Atlanta Hustle"]
+    row[-1] = f"p{i}"
+    return tuple(row)
+
+
+class TestPlayerStatsRouteProjection:
+    """GET /api/players/stats?fields=..."""
+
+    @pytest.fixture
+    def client(self):
+        stats_system = MagicMock()
+        conn = stats_system.db.engine.connect.return_value.__enter__.return_value
+        conn.execute.return_value.fetchone.return_value = (2,)
+        conn.execute.return_value.__iter__.side_effect = lambda: iter(
+            [_row(1), _row(2)]
+        )
+        app = FastAPI()
+        app.include_router(create_player_stats_route(stats_system))
+        with patch("api.player_stats.route.get_cache", return_value=CacheManager()):
+            yield TestClient(app), conn
+
+    def test_returns_requested_fields(self, client):
+        client, conn = client
+        response = client.get(
+            "/api/players/stats",
+            params={"season": "2024", "fields": "total_goals,score_total"},
+        )
+
+        player = response.json()["players"][0]
+        assert set(player) == {
+            "player_id",
+            "full_name",
+            "first_name",
+            "last_name",
+            "team_id",
+            "team_name",
+            "team_full_name",
+            "year",
+            "total_goals",
+            "score_total",
+        }
+        query = str(conn.execute.call_args.args[0])
+        assert "NULL as total_blocks" in query
+
+    def test_cache_key_includes_fields(self, client):
+        client, _ = client
+        params = {"season": "2024", "fields": "total_goals"}
+        first = client.get("/api/players/stats", params=params).json()
+        second = client.get(
+            "/api/players/stats", params={**params, "fields": "total_assists"}
+        ).json()
+
+        assert "total_goals" in first["players"][0]
+        assert "total_assists" in second["players"][0]
+        assert "total_goals" not in second["players"][0]
+
+
+def _team_database() -> sqlite3.Connection:
+    rng = random.Random(2)
+    stats = [
+        "completions",
+        "turnovers",
+        "throw_attempts",
+        "hucks_completed",
+        "hucks_attempted",
+        "blocks",
+        "o_line_scores",
+        "d_line_scores",
+        "hold_percentage",
+        "o_line_conversion",
+        "break_percentage",
+        "d_line_conversion",
+        "red_zone_conversion",
+    ]
+    columns = [
+        "team_id",
+        "year",
+        "games_played",
+        "wins",
+        "losses",
+        "scores",
+        "scores_against",
+        *stats,
+        *(f"opp_{s}" for s in stats),
+    ]
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE team_season_stats ({', '.join(columns)})")
+    conn.execute("CREATE TABLE teams (team_id, year, name, full_name)")
+    for team in range(6):
+        for year in range(2012, 2026):
+            conn.execute(
+                f"INSERT INTO team_season_stats VALUES ({', '.join('?' * len(columns))})",
+                (
+                    f"t{team}",
+                    year,
+                    *[rng.randint(1, 20) for _ in range(5)],
+                    *[rng.choice([0, rng.randint(1, 400)]) for _ in stats * 2],
+                ),
+            )
+            conn.execute(
+                "INSERT INTO teams VALUES (?, ?, ?, ?)",
+                (f"t{team}", year, f"T{team}", f"Team {team}"),
+            )
+    return conn
+
+
+class TestTeamStatsProjection:
+    """TeamStatsService prunes its SELECT list to the requested fields"""
+
+    def _service(self):
+        conn = _team_database()
+        conn.row_factory = sqlite3.Row
+        db = MagicMock()
+        db.execute_query.side_effect = lambda query, params: [
+            dict(row)
+            for row in conn.execute(query.replace(":season", str(params.get("season"))))
+        ]
+        return TeamStatsService(db), db
+
+    @pytest.mark.parametrize("season", ["2023", "career"])
+    @pytest.mark.parametrize("perspective", ["team", "opponent"])
+    @pytest.mark.parametrize("view", ["total", "per-game"])
+    def test_matches_full_stats(self, season, perspective, view):
+        service, db = self._service()
+        fields = ["wins", "blocks", "hold_percentage", "hucks_attempted"]
+        full = service.get_comprehensive_team_stats(season, view, perspective)
+        projected = service.get_comprehensive_team_stats(
+            season, view, perspective, fields=fields
+        )
+
+        query = db.execute_query.call_args.args[0]
+        assert "turnovers" not in query
+        assert projected == [
+            {k: team[k] for k in ["team_id", "name", "full_name", *fields]}
+            for team in full
+        ]
+
+
+class TestBoxScoreProjection:
+    """Box score player rows are projected without touching the cached result"""
+
+    def test_projects_players(self):
+        result = {
+            "game_id": "g1",
+            "home_team": {
+                "players": [
+                    {
+                        "name": "A",
+                        "jersey_number": "1",
+                        "team_abbrev": "ATL",
+                        "goals": 2,
+                    }
+                ]
+            },
+            "away_team": {"players": []},
+        }
+
+        projected = _project_box_score(result, ["assists"])
+
+        assert projected["home_team"]["players"] == [
+            {"name": "A", "jersey_number": "1", "team_abbrev": "ATL"}
+        ]
+        assert result["home_team"]["players"][0]["goals"] == 2
+        assert _project_box_score(result, None) is result
@@ -0,0 +1,471 @@
+"""
+Test pass events filtering, stats, the columnar (Arrow IPC) format, heatmaps
+and filter options.
+"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../.."))
+
+from api.pass_event_facets import PassEventFacets, clear_pass_event_facets
+from api.pass_events import ARROW_STREAM, create_pass_events_routes
+from config import config
+from data.cache import get_cache
+from data.database import SQLDatabase
+
+from scripts.ufa.importers.events_importer import (
+    PASS_EVENT_PARTICIPANTS_DELETE,
+    PASS_EVENT_PARTICIPANTS_INSERT,
+    PASS_EVENTS_INSERT,
+    EventsImporter,
+)
+
+pa = pytest.importorskip("pyarrow")
+
+GAME_EVENTS = """
+CREATE TABLE game_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id TEXT, team TEXT, event_type INTEGER, pass_type TEXT,
+    thrower_id TEXT, receiver_id TEXT,
+    thrower_x REAL, thrower_y REAL, receiver_x REAL, receiver_y REAL,
+    turnover_x REAL, turnover_y REAL,
+    vertical_yards REAL GENERATED ALWAYS AS
+        (COALESCE(receiver_y, turnover_y) - thrower_y) STORED,
+    horizontal_yards REAL GENERATED ALWAYS AS
+        (ABS(COALESCE(receiver_x, turnover_x) - thrower_x)) STORED,
+    distance REAL GENERATED ALWAYS AS
+        (SQRT(POWER(COALESCE(receiver_y, turnover_y) - thrower_y, 2) +
+              POWER(COALESCE(receiver_x, turnover_x) - thrower_x, 2))) STORED
+)
+"""
+
+PASS_EVENTS = """
+CREATE TABLE pass_events (
+    id INTEGER PRIMARY KEY, game_id TEXT, year INTEGER,
+    off_team_id TEXT, def_team_id TEXT, event_type INTEGER, result INTEGER,
+    pass_type INTEGER, thrower_id TEXT, receiver_id TEXT,
+    thrower_name TEXT, receiver_name TEXT,
+    thrower_x REAL, thrower_y REAL, receiver_x REAL, receiver_y REAL,
+    turnover_x REAL, turnover_y REAL, dest_x REAL, dest_y REAL,
+    vertical_yards REAL, horizontal_yards REAL, distance REAL
+)
+"""
+
+PASS_HEATMAP_CELLS = """
+CREATE TABLE pass_heatmap_cells (
+    year INTEGER, team_id TEXT, thrower_id TEXT, pass_type TEXT, point TEXT,
+    cell INTEGER, attempts INTEGER, completions INTEGER, total_gain REAL,
+    gain_count INTEGER
+)
+"""
+
+PASS_EVENT_PARTICIPANTS = """
+CREATE TABLE pass_event_participants (
+    year INTEGER, game_id TEXT, team_id TEXT, player_id TEXT,
+    PRIMARY KEY (year, game_id, team_id, player_id)
+)
+"""
+
+# event_type, pass_type, thrower, receiver, thrower x/y, receiver x/y, turnover x/y
+EVENTS = [
+    (18, "huck", "p1", "p2", 0.0, 20.0, 5.0, 70.0, None, None),
+    (19, "dish", "p2", "p3", 5.0, 70.0, 6.0, 72.0, None, None),
+    (22, "swing", "p3", None, 6.0, 72.0, None, None, -15.0, 72.0),
+    (20, None, "p1", "p3", 0.0, 40.0, None, None, 2.0, 44.0),
+    (1, None, "p1", None, 0.0, 40.0, None, None, None, None),
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = SQLDatabase(f"sqlite:///{tmp_path / 'stats.db'}")
+    with db.engine.begin() as conn:
+        conn.execute(text(GAME_EVENTS))
+        conn.execute(text(PASS_EVENTS))
+        conn.execute(text(PASS_HEATMAP_CELLS))
+        conn.execute(text(PASS_EVENT_PARTICIPANTS))
+        conn.execute(
+            text(
+                "CREATE TABLE games (game_id, year, home_team_id, away_team_id, "
+                "week, home_score, away_score, start_timestamp)"
+            )
+        )
+        conn.execute(text("CREATE TABLE teams (team_id, year, full_name, abbrev)"))
+        conn.execute(text("CREATE TABLE players (player_id, year, full_name)"))
+        conn.execute(
+            text(
+                "INSERT INTO games VALUES "
+                "('g1', 2024, 'atl', 'bos', 'week-1', 21, 19, '2024-06-01'), "
+                "('g0', 2023, 'bos', 'atl', 'week-9', 15, 17, '2023-07-01')"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO teams VALUES "
+                "('atl', 2024, 'Atlanta Hustle', 'ATL'), "
+                "('bos', 2024, 'Boston Glory', 'BOS'), "
+                "('atl', 2023, 'Atlanta Hustle', 'ATL'), "
+                "('bos', 2023, 'Boston Glory', 'BOS')"
+            )
+        )
+        for player_id, name in [("p1", "Ann"), ("p2", "Bea"), ("p3", "Cat")]:
+            conn.execute(
+                text("INSERT INTO players VALUES (:id, 2024, :name)"),
+                {"id": player_id, "name": name},
+            )
+        for event in EVENTS:
+            conn.execute(
+                text(
+                    "INSERT INTO game_events (game_id, team, event_type, pass_type, "
+                    "thrower_id, receiver_id, thrower_x, thrower_y, receiver_x, "
+                    "receiver_y, turnover_x, turnover_y) VALUES ('g1', 'home', "
+                    ":e0, :e1, :e2, :e3, :e4, :e5, :e6, :e7, :e8, :e9)"
+                ),
+                {f"e{i}": value for i, value in enumerate(event)},
+            )
+        conn.execute(text(PASS_EVENTS_INSERT), {"game_id": "g1"})
+        conn.execute(text(PASS_EVENT_PARTICIPANTS_INSERT), {"game_id": "g1"})
+    return db
+
+
+@pytest.fixture
+def client(db):
+    clear_pass_event_facets()
+    get_cache().clear()
+    stats_system = MagicMock()
+    stats_system.db = db
+    app = FastAPI()
+    app.include_router(create_pass_events_routes(stats_system))
+    return TestClient(app)
+
+
+def _read(response) -> pa.Table:
+    assert response.headers["content-type"] == ARROW_STREAM
+    return pa.ipc.open_stream(response.content).read_all()
+
+
+class TestColumnarPassEvents:
+    """GET /api/pass-events?format=columnar"""
+
+    def test_typed_columns(self, client):
+        table = _read(client.get("/api/pass-events", params={"format": "columnar"}))
+
+        assert table.schema.field("thrower_x").type == pa.float32()
+        assert table.schema.field("result").type == pa.dictionary(
+            pa.uint8(), pa.string()
+        )
+        assert table.schema.field("thrower_id").type == pa.dictionary(
+            pa.int32(), pa.string()
+        )
+        assert table.column("dest_x").to_pylist() == [5.0, 6.0, -15.0, 2.0]
+        assert table.column("result").to_pylist() == [
+            "completion",
+            "goal",
+            "turnover",
+            "turnover",
+        ]
+        assert table.column("pass_type").to_pylist() == ["huck", "dish", "swing", None]
+        assert table.column("receiver_id").to_pylist() == ["p2", "p3", None, "p3"]
+
+    def test_one_player_name_table(self, client):
+        table = _read(client.get("/api/pass-events", params={"format": "columnar"}))
+        players = table.column("thrower_id").chunk(0).dictionary.to_pylist()
+        names = json.loads(table.schema.metadata[b"player_names"])
+
+        assert dict(zip(players, names, strict=True)) == {
+            "p1": "Ann",
+            "p2": "Bea",
+            "p3": "Cat",
+        }
+
+    def test_matches_json_response(self, client):
+        params = {"distance_min": 10}
+        expected = client.get("/api/pass-events", params=params).json()
+        table = _read(
+            client.get("/api/pass-events", params={**params, "format": "columnar"})
+        )
+
+        assert table.num_rows == expected["total"] == 2
+        assert json.loads(table.schema.metadata[b"stats"]) == expected["stats"]
+        assert table.column("thrower_y").to_pylist() == [
+            e["thrower_y"] for e in expected["events"]
+        ]
+
+    def test_rejects_unknown_format(self, client):
+        response = client.get("/api/pass-events", params={"format": "xml"})
+        assert response.status_code == 400
+
+    def test_query_error_is_500(self, client, db):
+        db.execute_query("DROP TABLE pass_events")
+
+        for params in ({}, {"format": "columnar"}):
+            response = client.get("/api/pass-events", params=params)
+            assert response.status_code == 500
+
+
+class TestPassEventsQuery:
+    """Distance filters and the stats block run in SQL"""
+
+    def test_pass_events_resolved_at_import(self, db):
+        db.execute_query(PASS_EVENTS_INSERT, {"game_id": "g1"})
+        rows = db.execute_query(
+            "SELECT off_team_id, def_team_id, result, pass_type, thrower_name, "
+            "dest_x, dest_y FROM pass_events ORDER BY id"
+        )
+
+        # Throws only, once each, with teams, codes, names and destination
+        assert [tuple(row.values()) for row in rows] == [
+            ("atl", "bos", 0, 3, "Ann", 5.0, 70.0),
+            ("atl", "bos", 1, 0, "Bea", 6.0, 72.0),
+            ("atl", "bos", 2, 1, "Cat", -15.0, 72.0),
+            ("atl", "bos", 2, None, "Ann", 2.0, 44.0),
+        ]
+
+    def test_reimport_refreshes_teams_and_names(self, db):
+        db.execute_query("UPDATE players SET full_name = 'Anna' WHERE player_id = 'p1'")
+        db.execute_query("UPDATE games SET home_team_id = 'nyc' WHERE game_id = 'g1'")
+        for statement in (
+            PASS_EVENTS_INSERT,
+            PASS_EVENT_PARTICIPANTS_DELETE,
+            PASS_EVENT_PARTICIPANTS_INSERT,
+        ):
+            db.execute_query(statement, {"game_id": "g1"})
+
+        rows = db.execute_query(
+            "SELECT DISTINCT off_team_id, thrower_name FROM pass_events "
+            "ORDER BY thrower_name"
+        )
+        assert [tuple(row.values()) for row in rows] == [
+            ("nyc", "Anna"),
+            ("nyc", "Bea"),
+            ("nyc", "Cat"),
+        ]
+        assert db.execute_query(
+            "SELECT DISTINCT team_id FROM pass_event_participants"
+        ) == [{"team_id": "nyc"}]
+
+    def test_team_and_pass_type_filters(self, client):
+        offense = client.get(
+            "/api/pass-events", params={"off_team_id": "atl", "pass_types": "huck,dish"}
+        ).json()
+        defense = client.get("/api/pass-events", params={"def_team_id": "atl"}).json()
+
+        assert [e["pass_type"] for e in offense["events"]] == ["huck", "dish"]
+        assert offense["events"][0]["receiver_name"] == "Bea"
+        assert defense["total"] == 0
+
+    def test_stats_from_aggregate_query(self, client):
+        data = client.get("/api/pass-events").json()
+
+        assert data["total"] == 4
+        assert data["events"][0]["distance"] == 50.2
+        assert data["events"][2]["horizontal_yards"] == 21.0
+        stats = data["stats"]
+        assert (stats["total_throws"], stats["completions"], stats["goals"]) == (
+            4,
+            2,
+            1,
+        )
+        assert stats["turnovers"] == 2
+        assert stats["total_yards"] == 56
+        assert stats["avg_yards_per_completion"] == 26.0
+        assert stats["by_type"]["huck"] == {"count": 1, "pct": 25.0}
+        assert stats["by_type"]["gainer"] == {"count": 0, "pct": 0.0}
+
+    def test_limit_applies_after_distance_filter(self, client):
+        data = client.get(
+            "/api/pass-events", params={"distance_min": 10, "limit": 2}
+        ).json()
+
+        assert [e["result"] for e in data["events"]] == ["completion", "turnover"]
+        assert data["stats"]["total_throws"] == 2
+        assert data["stats"]["total_yards"] == 50
+
+    def test_empty_result(self, client):
+        data = client.get("/api/pass-events", params={"distance_min": 500}).json()
+
+        assert data["total"] == 0
+        assert data["stats"]["completions_pct"] == 0
+        assert data["stats"]["by_type"]["dish"] == {"count": 0, "pct": 0}
+
+
+class TestPassHeatmap:
+    """GET /api/pass-events/heatmap"""
+
+    def test_bins_passes_on_the_fly(self, client):
+        data = client.get(
+            "/api/pass-events/heatmap", params={"bins_x": 2, "bins_y": 2}
+        ).json()
+
+        assert data["source"] == "events"
+        assert data["total"] == 4
+        assert data["grid"]["x_range"] == [-26.65, 26.65]
+        own_half, far_half = data["cells"]
+        assert (own_half["x"], own_half["y"]) == (1, 0)
+        assert (far_half["x"], far_half["y"]) == (1, 1)
+        assert own_half["count"] == 2
+        assert own_half["turnovers"] == 1
+        assert own_half["completion_pct"] == 50.0
+        assert own_half["avg_gain"] == 27.0
+        # The unclassified drop counts in the cell but not by type
+        assert own_half["by_type"] == {
+            "huck": {
+                "count": 1,
+                "completions": 1,
+                "turnovers": 0,
+                "completion_pct": 100.0,
+                "avg_gain": 50.0,
+            }
+        }
+        assert set(far_half["by_type"]) == {"dish", "swing"}
+
+    @pytest.mark.parametrize("point", ["origin", "destination"])
+    def test_precomputed_cells_match_live_binning(self, db, client, point):
+        assert EventsImporter(db).refresh_pass_heatmap_cells([2024]) > 0
+
+        precomputed = client.get(
+            "/api/pass-events/heatmap",
+            params={"season": 2024, "off_team_id": "atl", "point": point},
+        ).json()
+        live = client.get(
+            "/api/pass-events/heatmap", params={"game_id": "g1", "point": point}
+        ).json()
+
+        assert precomputed["source"] == "precomputed"
+        assert live["source"] == "events"
+        assert precomputed["cells"] == live["cells"]
+        assert precomputed["total"] == 4
+
+    def test_refresh_replaces_season_cells(self, db):
+        importer = EventsImporter(db)
+        first = importer.refresh_pass_heatmap_cells([2024])
+
+        assert importer.refresh_pass_heatmap_cells([2024]) == first
+        [row] = db.execute_query("SELECT COUNT(*) as n FROM pass_heatmap_cells")
+        assert row["n"] == first
+
+    def test_rejects_unknown_point(self, client):
+        response = client.get("/api/pass-events/heatmap", params={"point": "middle"})
+        assert response.status_code == 400
+
+
+class TestPassNetwork:
+    """GET /api/pass-events/network"""
+
+    def test_edges_and_node_totals(self, client):
+        data = client.get(
+            "/api/pass-events/network", params={"team_id": "atl", "season": 2024}
+        ).json()
+
+        assert data["total"] == 4
+        assert [(e["thrower_id"], e["receiver_id"]) for e in data["edges"]] == [
+            ("p1", "p2"),
+            ("p1", "p3"),
+            ("p2", "p3"),
+        ]
+        assert data["edges"][0]["yards"] == 50.0
+        assert data["edges"][1]["completion_pct"] == 0
+        assert data["edges"][2]["goals"] == 1
+
+        nodes = {n["player_id"]: n for n in data["nodes"]}
+        assert data["nodes"][0]["player_id"] == "p3"
+        assert (nodes["p1"]["throws"], nodes["p1"]["completion_pct"]) == (2, 50.0)
+        assert nodes["p2"]["assists"] == 1
+        # The throwaway counts towards its thrower only
+        assert (nodes["p3"]["throws"], nodes["p3"]["turnovers"]) == (1, 1)
+        assert (nodes["p3"]["targets"], nodes["p3"]["receptions"]) == (2, 1)
+        assert (nodes["p3"]["goals"], nodes["p3"]["drops"]) == (1, 1)
+        assert nodes["p3"]["name"] == "Cat"
+
+    def test_cached_per_team_and_season(self, db, client):
+        params = {"team_id": "atl", "season": 2024}
+        first = client.get("/api/pass-events/network", params=params).json()
+        db.execute_query("DELETE FROM pass_events")
+
+        assert client.get("/api/pass-events/network", params=params).json() == first
+        other = client.get("/api/pass-events/network", params={"team_id": "bos"})
+        assert other.json()["edges"] == []
+
+
+class TestPassEventFilters:
+    """GET /api/pass-events/filters from the facet index or scoped queries"""
+
+    @pytest.fixture(
+        autouse=True, params=[True, False], ids=["facet_index", "scoped_queries"]
+    )
+    def enable_cache(self, request, monkeypatch):
+        monkeypatch.setattr(config, "ENABLE_CACHE", request.param)
+        return request.param
+
+    def test_all_seasons(self, client):
+        data = client.get("/api/pass-events/filters").json()
+
+        assert data["seasons"] == [2024, 2023]
+        assert [t["team_id"] for t in data["teams"]] == ["atl", "bos"]
+        assert data["players"] == [
+            {"player_id": "p1", "name": "Ann"},
+            {"player_id": "p2", "name": "Bea"},
+            {"player_id": "p3", "name": "Cat"},
+        ]
+        assert [g["game_id"] for g in data["games"]] == ["g1", "g0"]
+        assert data["games"][0]["label"] == "BOS @ ATL (19-21)"
+
+    def test_cascading_filters(self, client):
+        other_season = client.get(
+            "/api/pass-events/filters", params={"season": 2023}
+        ).json()
+        defense = client.get(
+            "/api/pass-events/filters", params={"team_id": "bos"}
+        ).json()
+        game = client.get("/api/pass-events/filters", params={"game_id": "g1"}).json()
+
+        assert other_season["players"] == []
+        assert [g["game_id"] for g in other_season["games"]] == ["g0"]
+        # Players are listed under the team with possession
+        assert defense["players"] == []
+        assert len(game["players"]) == 3
+        assert [t["abbrev"] for t in game["teams"]] == ["ATL", "BOS"]
+
+    def test_game_without_teams(self, client):
+        data = client.get("/api/pass-events/filters", params={"game_id": "x"}).json()
+
+        assert data["teams"] == []
+        assert data["players"] == []
+
+    def test_participants_insert_is_idempotent(self, db):
+        db.execute_query(PASS_EVENT_PARTICIPANTS_INSERT, {"game_id": "g1"})
+        rows = db.execute_query(
+            "SELECT team_id, player_id FROM pass_event_participants ORDER BY player_id"
+        )
+
+        assert rows == [
+            {"team_id": "atl", "player_id": "p1"},
+            {"team_id": "atl", "player_id": "p2"},
+            {"team_id": "atl", "player_id": "p3"},
+        ]
+
+
+class TestPassEventFiltersWithoutCache:
+    """GET /api/pass-events/filters without caching"""
+
+    def test_scoped_queries_per_request(self, client, db, monkeypatch):
+        monkeypatch.setattr(config, "ENABLE_CACHE", False)
+
+        def load(conn):
+            raise AssertionError("facet index loaded")
+
+        monkeypatch.setattr(PassEventFacets, "load", load)
+        assert len(client.get("/api/pass-events/filters").json()["players"]) == 3
+
+        db.execute_query("DELETE FROM pass_event_participants")
+
+        assert client.get("/api/pass-events/filters").json()["players"] == []
@@ -0,0 +1,296 @@
+"""
+Test the in-process percentile engine against the SQL percentile expressions.
+"""
+
+import os
+import random
+import sqlite3
+import sys
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from api.player_stats.percentile_calculator import (
+    INVERT_STATS,
+    STAT_FIELDS,
+    build_career_percentile_expressions,
+    build_percentile_expressions,
+    calculate_global_percentiles,
+    percentile_key,
+)
+from api.player_stats.percentile_engine import (
+    PercentileEngine,
+    PercentilePopulation,
+    _round_percentile,
+    get_percentile_engine,
+)
+
+RATIO_FIELDS = [
+    "completion_percentage",
+    "offensive_efficiency",
+    "yards_per_turn",
+    "yards_per_completion",
+    "yards_per_reception",
+    "assists_per_turnover",
+]
+
+
+def _make_rows(count: int = 37, seed: int = 7) -> list[tuple]:
+    """Synthetic population with ties, NULL ratios and zero-turnover players.
+
+    An odd, prime row count keeps CUME_DIST() * 100 away from .5 boundaries,
+    where SQLite and Postgres round float noise differently.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        values = {}
+        for field in STAT_FIELDS:
+            if field in RATIO_FIELDS:
+                values[field] = (
+                    None
+                    if rng.random() < 0.25
+                    else rng.choice([12.5, 40.0, 55.25, 70.0, 88.8])
+                )
+            else:
+                values[field] = rng.randint(0, 6)
+        values["games_played"] = rng.randint(1, 12)
+        if i % 5 == 0:
+            values["possessions"] = 0
+        if i % 6 == 0:
+            values["total_throwaways"] = 0
+            values["total_stalls"] = 0
+            values["total_drops"] = 0
+        rows.append((f"Player {i}", *[values[f] for f in STAT_FIELDS]))
+    return rows
+
+
+def _sql_percentiles(rows: list[tuple], expressions: list[str]) -> dict:
+    """Run the SQL percentile expressions over the rows in SQLite."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        f"CREATE TABLE population (full_name TEXT, {', '.join(f'{f} REAL' for f in STAT_FIELDS)})"
+    )
+    conn.executemany(
+        f"INSERT INTO population VALUES ({', '.join('?' * (len(STAT_FIELDS) + 1))})",
+        rows,
+    )
+    # SQLite casts whole numbers to INTEGER for NUMERIC, which would turn the
+    # per-game division into integer division
+    expressions = [e.replace("AS NUMERIC) /", "AS REAL) /") for e in expressions]
+    result = conn.execute(
+        f"SELECT full_name, {', '.join(expressions)} FROM population"
+    ).fetchall()
+    conn.close()
+    return {
+        row[0]: {
+            field: None if row[i + 1] is None else int(row[i + 1])
+            for i, field in enumerate(STAT_FIELDS)
+        }
+        for row in result
+    }
+
+
+class TestPercentileParity:
+    """Engine percentiles must equal the SQL CUME_DIST() percentiles"""
+
+    @pytest.mark.parametrize("per_mode", ["total", "game", "possession"])
+    def test_matches_aggregate_expressions(self, per_mode):
+        rows = _make_rows()
+        expected = _sql_percentiles(rows, build_percentile_expressions(per_mode))
+
+        population = PercentilePopulation.from_rows(rows)
+        actual = population.percentiles_for([r[0] for r in rows], per_mode)
+
+        assert actual == expected
+
+    @pytest.mark.parametrize("per_mode", ["total", "game", "possession"])
+    def test_matches_career_view_expressions(self, per_mode):
+        rows = _make_rows(seed=11)
+        expected = _sql_percentiles(rows, build_career_percentile_expressions(per_mode))
+
+        population = PercentilePopulation.from_rows(rows, null_ratio_percentiles=True)
+        actual = population.percentiles_for([r[0] for r in rows], per_mode)
+
+        assert actual == expected
+
+    def test_career_ratio_percentiles_are_null_without_turnovers(self):
+        rows = _make_rows(seed=3)
+        population = PercentilePopulation.from_rows(rows, null_ratio_percentiles=True)
+
+        result = population.percentiles_for(["Player 0"])
+
+        assert result["Player 0"]["yards_per_turn"] is None
+        assert result["Player 0"]["assists_per_turnover"] is None
+
+    def test_inverted_stats_rank_lowest_value_highest(self):
+        rows = _make_rows()
+        population = PercentilePopulation.from_rows(rows)
+        result = population.percentiles_for([r[0] for r in rows])
+
+        for field in INVERT_STATS:
+            j = STAT_FIELDS.index(field) + 1
+            best = min(rows, key=lambda r: r[j])[0]
+            worst = max(rows, key=lambda r: r[j])[0]
+            assert result[best][field] > result[worst][field]
+            assert result[worst][field] == 0
+
+
+class TestPercentilePopulation:
+    """Test population lookups"""
+
+    def test_unknown_keys_are_skipped(self):
+        population = PercentilePopulation.from_rows(_make_rows())
+        assert population.percentiles_for(["Nobody"]) == {}
+
+    def test_only_requested_keys_are_returned(self):
+        population = PercentilePopulation.from_rows(_make_rows())
+        result = population.percentiles_for(["Player 1", "Player 2"])
+        assert set(result) == {"Player 1", "Player 2"}
+
+    def test_round_matches_numeric_cast(self):
+        # 29/200 * 100 is 14.499999999999998 in float8 but 14.5 as NUMERIC
+        values = np.array([29 / 200 * 100, 12.5, 0.4, 100.0])
+        assert _round_percentile(values).tolist() == [15.0, 13.0, 0.0, 100.0]
+
+
+class TestPercentileEngine:
+    """Test the population LRU"""
+
+    def test_population_is_loaded_once(self):
+        engine = PercentileEngine(max_populations=2)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return PercentilePopulation.from_rows(_make_rows())
+
+        first = engine.get_population(("2024", "all"), loader)
+        second = engine.get_population(("2024", "all"), loader)
+
+        assert first is second
+        assert len(calls) == 1
+
+    def test_least_recently_used_population_is_evicted(self):
+        engine = PercentileEngine(max_populations=2)
+        rows = _make_rows()
+
+        def loader():
+            return PercentilePopulation.from_rows(rows)
+
+        engine.get_population("a", loader)
+        engine.get_population("b", loader)
+        engine.get_population("a", loader)
+        engine.get_population("c", loader)
+
+        assert len(engine) == 2
+        assert "b" not in engine._populations
+        assert "a" in engine._populations
+
+
+class TestCalculateGlobalPercentiles:
+    """Test player_id keyed percentile lookups"""
+
+    def setup_method(self):
+        get_percentile_engine().clear()
+
+    def teardown_method(self):
+        get_percentile_engine().clear()
+
+    def test_percentile_key(self):
+        assert (
+            percentile_key({"player_id": "abc", "team_id": "x", "year": None})
+            == "abc_x"
+        )
+        assert (
+            percentile_key({"player_id": "abc", "team_id": "x", "year": 2024})
+            == "abc_x_2024"
+        )
+
+    def test_returns_only_page_players_keyed_by_id(self):
+        rows = [(f"p{i}_hustle_2024", *r[1:]) for i, r in enumerate(_make_rows())]
+        conn = Mock()
+        conn.execute.return_value = rows
+        players = [
+            {"player_id": "p1", "team_id": "hustle", "year": 2024},
+            {"player_id": "p2", "team_id": "hustle", "year": 2024},
+        ]
+
+        result = calculate_global_percentiles(conn, players, seasons=["2024"])
+
+        assert set(result) == {"p1_hustle_2024", "p2_hustle_2024"}
+        assert set(result["p1_hustle_2024"]) == set(STAT_FIELDS)
+
+    def test_team_career_rows_are_keyed_per_team(self):
+        rows = [
+            ("p1_hustle", *_make_rows()[0][1:]),
+            ("p1_empire", *_make_rows()[1][1:]),
+        ]
+        conn = Mock()
+        conn.execute.return_value = rows
+        players = [
+            {"player_id": "p1", "team_id": "hustle", "year": None},
+            {"player_id": "p1", "team_id": "empire", "year": None},
+        ]
+
+        result = calculate_global_percentiles(conn, players, teams=["hustle", "empire"])
+
+        assert set(result) == {"p1_hustle", "p1_empire"}
+        assert "player_team_career_stats" in str(conn.execute.call_args[0][0])
+
+    def test_filters_are_bound_array_parameters(self):
+        conn = Mock()
+        conn.execute.return_value = []
+        players = [{"player_id": "p1", "team_id": "hustle", "year": 2023}]
+
+        calculate_global_percentiles(
+            conn, players, seasons=["2024", "2023"], teams=["hustle", "empire"]
+        )
+
+        statement, params = conn.execute.call_args[0]
+        assert params == {"seasons": [2023, 2024], "teams": ["empire", "hustle"]}
+        assert "ANY(:seasons)" in str(statement)
+        assert "hustle" not in str(statement)
+
+    def test_population_is_shared_across_pages(self):
+        rows = [(f"p{i}_t", *r[1:]) for i, r in enumerate(_make_rows())]
+        conn = Mock()
+        conn.execute.return_value = rows
+
+        page_1 = calculate_global_percentiles(
+            conn, [{"player_id": "p1", "team_id": "t", "year": None}]
+        )
+        page_2 = calculate_global_percentiles(
+            conn, [{"player_id": "p2", "team_id": "t", "year": None}]
+        )
+
+        assert conn.execute.call_count == 1
+        assert set(page_1) == {"p1_t"}
+        assert set(page_2) == {"p2_t"}
+
+    def test_cache_clear_drops_populations(self):
+        from api.routes import create_basic_routes
+        from auth import get_current_user
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        conn = Mock()
+        conn.execute.return_value = [
+            (f"p{i}_t", *r[1:]) for i, r in enumerate(_make_rows())
+        ]
+        calculate_global_percentiles(
+            conn, [{"player_id": "p1", "team_id": "t", "year": None}]
+        )
+        assert len(get_percentile_engine()) == 1
+
+        app = FastAPI()
+        router, _ = create_basic_routes(Mock())
+        app.include_router(router)
+        app.dependency_overrides[get_current_user] = lambda: {"id": "admin"}
+        response = TestClient(app).post("/api/cache/clear")
+
+        assert response.status_code == 200
+        assert len(get_percentile_engine()) == 0
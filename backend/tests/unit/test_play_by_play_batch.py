@@ -0,0 +1,169 @@
+"""
+Test building play-by-play for many games at once.
+"""
+
+import os
+import sys
+
+import orjson
+import pytest
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from services import play_by_play_batch
+from services.play_by_play_batch import iter_play_by_play, select_batch_games
+from services.play_by_play_service import calculate_play_by_play
+from services.play_by_play_store import get_final_play_by_play
+
+EVENT_COLUMNS = (
+    "game_id",
+    "team",
+    "event_type",
+    "event_time",
+    "thrower_id",
+    "receiver_id",
+    "line_players",
+)
+EVENTS = [
+    ("g1", "home", 1, 0, None, None, '["h1", "h2"]'),
+    ("g1", "home", 15, 40, None, None, None),
+    ("g1", "away", 2, 0, None, None, '["a1", "a2"]'),
+    ("g1", "away", 18, 10, "a1", "a2", None),
+    ("g1", "away", 19, 40, "a2", "a1", None),
+    ("g2", "home", 2, 0, None, None, '["h1", "h2"]'),
+    ("g2", "home", 18, 5, "h2", "h1", None),
+    ("g2", "home", 19, 30, "h1", "h2", None),
+    ("g2", "away", 1, 0, None, None, '["a2", "a3"]'),
+    ("g2", "away", 15, 30, None, None, None),
+]
+
+
+@pytest.fixture
+def stats_system(stats_system, insert_events):
+    with stats_system.db.engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO games (game_id, year, home_team_id, away_team_id, "
+                "status, start_timestamp) "
+                "VALUES (:id, :year, 'atl', :away, :status, :start)"
+            ),
+            [
+                {
+                    "id": "g1",
+                    "year": 2024,
+                    "away": "bos",
+                    "status": "Final",
+                    "start": "2024-05-01",
+                },
+                {
+                    "id": "g2",
+                    "year": 2023,
+                    "away": "bos",
+                    "status": "In Progress",
+                    "start": "2023-05-01",
+                },
+                {
+                    "id": "g3",
+                    "year": 2024,
+                    "away": "chi",
+                    "status": "Final",
+                    "start": "2024-06-01",
+                },
+            ],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO teams (team_id, year, city, name) "
+                "VALUES (:team, :year, :team, :team)"
+            ),
+            [
+                {"team": team, "year": year}
+                for team in ["atl", "bos", "chi"]
+                for year in [2023, 2024]
+            ],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO players (player_id, year, full_name, last_name) "
+                "VALUES (:id, :year, :name, :last)"
+            ),
+            [
+                {
+                    "id": player_id,
+                    "year": year,
+                    "name": f"Player {player_id} {year}",
+                    "last": f"{player_id}-{year}",
+                }
+                for player_id in ["h1", "h2", "a1", "a2", "a3"]
+                for year in [2023, 2024]
+            ],
+        )
+        insert_events(conn, EVENT_COLUMNS, EVENTS)
+    return stats_system
+
+
+def _games(lines) -> list[dict]:
+    return [orjson.loads(line) for line in lines]
+
+
+@pytest.fixture
+def fetched(monkeypatch) -> list[str]:
+    """Games the batch path builds from their events."""
+    fetched = []
+    fetch_batch_inputs = play_by_play_batch.fetch_batch_inputs
+
+    def record(db, game_ids):
+        fetched.extend(game_ids)
+        return fetch_batch_inputs(db, game_ids)
+
+    monkeypatch.setattr(play_by_play_batch, "fetch_batch_inputs", record)
+    return fetched
+
+
+class TestBatchPlayByPlay:
+    """Multi-game play-by-play"""
+
+    def test_matches_per_game_build(self, stats_system, monkeypatch):
+        # Chunks of two, so games span several sets of queries
+        monkeypatch.setattr(play_by_play_batch, "BATCH_CHUNK_GAMES", 2)
+        game_ids = ["g2", "missing", "g1", "g3"]
+
+        games = _games(iter_play_by_play(stats_system, game_ids))
+
+        assert [game["game_id"] for game in games] == game_ids
+        for game in games:
+            assert game["points"] == calculate_play_by_play(
+                stats_system, game["game_id"]
+            )
+        # Each game's players are looked up in its own season
+        assert games[0]["points"][0]["players"] == ["h1-2023", "h2-2023"]
+        assert games[2]["points"][0]["players"] == ["h1-2024", "h2-2024"]
+
+    def test_final_games_served_from_stored_artifacts(self, stats_system, fetched):
+        game_ids = ["g1", "g2", "g3"]
+        first = list(iter_play_by_play(stats_system, game_ids))
+        assert fetched == game_ids
+
+        fetched.clear()
+        assert list(iter_play_by_play(stats_system, game_ids)) == first
+        # g1 is stored; g2 is in progress and g3 has no points to store
+        assert fetched == ["g2", "g3"]
+        assert get_final_play_by_play(stats_system, "g1") == _games(first)[0]["points"]
+
+    def test_stale_artifacts_rebuilt(self, stats_system, insert_events, fetched):
+        list(iter_play_by_play(stats_system, ["g1"]))
+        with stats_system.db.engine.begin() as conn:
+            insert_events(conn, EVENT_COLUMNS, [EVENTS[1]], start=100)
+
+        fetched.clear()
+        [game] = _games(iter_play_by_play(stats_system, ["g1"]))
+
+        assert fetched == ["g1"]
+        assert game["points"] == calculate_play_by_play(stats_system, "g1")
+
+    def test_select_batch_games(self, stats_system):
+        db = stats_system.db
+        assert select_batch_games(db, team_id="bos") == ["g2", "g1"]
+        assert select_batch_games(db, season=2024) == ["g1", "g3"]
+        assert select_batch_games(db, team_id="chi", season=2024) == ["g3"]
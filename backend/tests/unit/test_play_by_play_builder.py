@@ -0,0 +1,287 @@
+"""
+Test the play-by-play builder against the per-event dict pipeline it replaced.
+
+The reference below is the previous implementation: it enriches every event
+dict with player names and re-parses the line JSON of every event. Both
+paths must serialize to the same bytes.
+"""
+
+import json
+import os
+import random
+import sys
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../.."))
+
+from api.responses import dumps
+from services.play_by_play import (
+    EventHandlers,
+    PointBuilder,
+    build_event_records,
+    parse_lines,
+)
+from services.play_by_play_service import build_play_by_play
+
+from scripts.benchmark_play_by_play import ROSTER, make_game
+
+
+def _parse_line_players(line_players_json: str | None) -> list[str]:
+    if not line_players_json:
+        return []
+    try:
+        return json.loads(line_players_json)
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
+def _collect_player_ids(events: list[dict]) -> set[str]:
+    player_ids = set()
+    for event in events:
+        for key in ("thrower_id", "receiver_id", "defender_id", "puller_id"):
+            if event.get(key):
+                player_ids.add(event[key])
+        player_ids.update(_parse_line_players(event.get("line_players")))
+    return player_ids
+
+
+def _enrich_events(events: list[dict], player_lookup: dict) -> None:
+    for event in events:
+        for role in ("thrower", "receiver", "defender", "puller"):
+            player = player_lookup.get(event.get(f"{role}_id") or "")
+            event[f"{role}_name"] = player["full_name"] if player else None
+            event[f"{role}_last"] = player["last_name"] if player else None
+
+
+class _DictPointBuilder(PointBuilder):
+    """Parses the line JSON of the pull event, as the point builder used to."""
+
+    def create_point(self, event, team, player_lookup):
+        # create_point() hands event.line to _get_line_players()
+        event = _AttrDict(event, line=event.get("line_players"))
+        return super().create_point(event, team, player_lookup)
+
+    def _get_line_players(self, line_players, player_lookup):
+        line = []
+        if line_players:
+            try:
+                player_ids = json.loads(line_players)
+                if player_ids and len(player_ids) > 0:
+                    line = [
+                        player_lookup[pid]["last_name"]
+                        for pid in player_ids
+                        if pid in player_lookup and player_lookup[pid].get("last_name")
+                    ]
+            except Exception as e:
+                print(f"Error parsing line players: {e}")
+        return line
+
+
+class _AttrDict(dict):
+    __getattr__ = dict.__getitem__
+
+
+def _process_team_events(
+    events: list[dict], team: str, player_lookup: dict
+) -> list[dict[str, Any]]:
+    """The team loop as it was, over enriched event dicts (own-event branches merged)."""
+    points = []
+    current_point = None
+    current_point_events = []
+    timeout_in_current_point = False
+    turnovers_in_current_point = 0
+    timeout_line_type = None
+    current_line: list[str] = []
+
+    point_builder = _DictPointBuilder()
+    handlers = EventHandlers()
+
+    for event in events:
+        previous_line = current_line.copy()
+        event_line = _parse_line_players(event.get("line_players"))
+        if event_line:
+            current_line = event_line
+        event_type = event["event_type"]
+
+        if event_type in [3, 4, 5, 6]:
+            timeout_in_current_point = True
+            starting_line_type = (
+                current_point["line_type"] if current_point else "O-Line"
+            )
+            if turnovers_in_current_point % 2 == 0:
+                timeout_line_type = starting_line_type
+            else:
+                timeout_line_type = (
+                    "D-Line" if starting_line_type == "O-Line" else "O-Line"
+                )
+            current_point_events.append(
+                handlers.handle_timeout_event(
+                    previous_line, current_line, player_lookup
+                )
+            )
+            continue
+
+        if event_type == 25:
+            current_point_events.append(
+                handlers.handle_injury_event(previous_line, current_line, player_lookup)
+            )
+            continue
+
+        if event_type in [28, 29, 30, 31]:
+            if current_point:
+                quarter_end_time = point_builder.get_quarter_end_time(event_type)
+                if quarter_end_time is not None:
+                    point_builder.finalize_point(current_point, quarter_end_time)
+                current_point["events"] = current_point_events
+                points.append(current_point)
+                current_point = None
+                current_point_events = []
+            point_builder.update_quarter(event_type)
+            continue
+
+        elif event_type in [1, 2]:
+            if current_point:
+                if event["event_time"] is not None:
+                    absolute_time = point_builder.quarter_offset + event["event_time"]
+                    point_builder.finalize_point(current_point, absolute_time)
+                current_point["events"] = current_point_events
+                points.append(current_point)
+
+            current_point = point_builder.create_point(event, team, player_lookup)
+            timeout_in_current_point = False
+            turnovers_in_current_point = 0
+            timeout_line_type = None
+            current_point_events = []
+
+            if current_point["pulling_team"] == team:
+                pull_event = handlers.handle_pull_event(event, team, current_point)
+                if pull_event:
+                    current_point_events.append(pull_event)
+
+        elif event_type in [7, 8]:
+            detailed_pull = handlers.handle_pull_event(event, team, current_point)
+            if detailed_pull:
+                if current_point_events and current_point_events[-1]["type"] == "pull":
+                    current_point_events[-1] = detailed_pull
+                else:
+                    current_point_events.append(detailed_pull)
+
+        elif event_type in [18, 19, 20, 22, 24]:
+            if event_type == 19:
+                point_builder.update_score_for_goal(team, current_point)
+            if event_type in [20, 22, 24]:
+                turnovers_in_current_point += 1
+            handler = {
+                18: handlers.handle_pass_event,
+                19: handlers.handle_goal_event,
+                20: handlers.handle_drop_event,
+                22: handlers.handle_throwaway_event,
+                24: handlers.handle_stall_event,
+            }[event_type]
+            own_event = handler(event)
+            if own_event:
+                own_event["out_of_timeout"] = timeout_in_current_point
+                if timeout_in_current_point:
+                    own_event["timeout_line_type"] = timeout_line_type
+                current_point_events.append(own_event)
+
+        elif event_type == 15:
+            point_builder.update_score_for_opponent_goal(team, current_point)
+            current_point_events.append(handlers.handle_opponent_score_event())
+
+        elif event_type == 11:
+            turnovers_in_current_point += 1
+            block_event = handlers.handle_block_event(event)
+            if block_event:
+                current_point_events.append(block_event)
+
+        elif event_type == 12:
+            turnovers_in_current_point += 1
+            current_point_events.append(handlers.handle_opponent_block_event(event))
+
+        elif event_type in [13, 14]:
+            turnovers_in_current_point += 1
+            turnover_type = "Throwaway" if event_type == 13 else "Stall"
+            current_point_events.append(
+                handlers.handle_opponent_turnover_event(event, turnover_type)
+            )
+
+    if current_point:
+        current_point["events"] = current_point_events
+        point_builder.finalize_point(current_point)
+        points.append(current_point)
+
+    PointBuilder.format_point_times(points)
+    return points
+
+
+def _reference_play_by_play(rows: list[dict], players: list[dict]) -> list[dict]:
+    events = [dict(row) for row in rows]
+    player_ids = _collect_player_ids(events)
+    player_lookup = _lookup(players, player_ids)
+    _enrich_events(events, player_lookup)
+    home = [e for e in events if e["team"] == "home"]
+    away = [e for e in events if e["team"] == "away"]
+    return _process_team_events(home, "home", player_lookup) + _process_team_events(
+        away, "away", player_lookup
+    )
+
+
+def _play_by_play(rows: list[dict], players: list[dict]) -> list[dict]:
+    lines, player_ids = parse_lines(rows)
+    player_lookup = _lookup(players, player_ids)
+    return build_play_by_play(
+        build_event_records(rows, lines, player_lookup), player_lookup
+    )
+
+
+def _lookup(players: list[dict], player_ids: set[str]) -> dict:
+    """What PlayerEnrichment.fetch_players() returns for the ids."""
+    return {
+        p["player_id"]: {"full_name": p["full_name"], "last_name": p["last_name"]}
+        for p in players
+        if p["player_id"] in player_ids
+    }
+
+
+def _players() -> list[dict]:
+    # One player per team has no row (not on the season roster)
+    return [
+        {
+            "player_id": f"{team}{n}",
+            "full_name": f"Player {team}{n}",
+            "last_name": f"P{team}{n}",
+        }
+        for team in ("home", "away")
+        for n in range(ROSTER - 1)
+    ]
+
+
+class TestPlayByPlayBuilder:
+    """Event records build the same play-by-play as the enriched dicts"""
+
+    def test_synthetic_games_are_byte_identical(self):
+        rng = random.Random(7)
+        players = _players()
+        for _ in range(5):
+            rows = make_game(rng)
+            assert dumps(_play_by_play(rows, players)) == dumps(
+                _reference_play_by_play(rows, players)
+            )
+
+    def test_malformed_lines_and_missing_fields(self):
+        rng = random.Random(8)
+        players = _players()
+        rows = make_game(rng)
+        for row in rows[::11]:
+            row["line_players"] = "not json"
+        for row in rows[5::13]:
+            row["line_players"] = "[]"
+        for row in rows[3::7]:
+            row["event_time"] = None
+            row["thrower_id"] = ""
+
+        expected = _reference_play_by_play(rows, players)
+        assert expected
+        assert dumps(_play_by_play(rows, players)) == dumps(expected)
@@ -0,0 +1,120 @@
+"""
+Test the stored play-by-play of Final games.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from services import play_by_play_store
+from services.play_by_play_service import calculate_play_by_play
+from services.play_by_play_store import (
+    events_version,
+    get_final_play_by_play,
+    refresh_play_by_play,
+)
+
+EVENT_COLUMNS = (
+    "team",
+    "event_type",
+    "event_time",
+    "thrower_id",
+    "receiver_id",
+    "line_players",
+)
+EVENTS = [
+    ("home", 1, 0, None, None, '["h1", "h2"]'),
+    ("home", 15, 40, None, None, None),
+    ("away", 2, 0, None, None, '["a1", "a2"]'),
+    ("away", 18, 10, "a1", "a2", None),
+    ("away", 19, 40, "a2", "a1", None),
+]
+
+
+def _insert_players(conn, name):
+    conn.execute(
+        text(
+            "INSERT INTO players (player_id, year, full_name, last_name) "
+            "VALUES (:id, 2024, :name, :last)"
+        ),
+        [
+            {
+                "id": player_id,
+                "name": f"{name} {player_id}",
+                "last": f"{player_id}-{name}",
+            }
+            for player_id in ["h1", "h2", "a1", "a2"]
+        ],
+    )
+
+
+@pytest.fixture
+def stats_system(stats_system, insert_events):
+    with stats_system.db.engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO games (game_id, year, home_team_id, away_team_id, "
+                "status) VALUES ('g1', 2024, 'atl', 'bos', 'Final')"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO teams (team_id, year, city, name) "
+                "VALUES (:team, 2024, :team, :team)"
+            ),
+            [{"team": "atl"}, {"team": "bos"}],
+        )
+        _insert_players(conn, "Player")
+        insert_events(conn, EVENT_COLUMNS, EVENTS)
+    return stats_system
+
+
+class TestPlayByPlayStore:
+    """Stored play-by-play artifacts"""
+
+    def test_stored_artifact_matches_live_build(self, stats_system, monkeypatch):
+        live = calculate_play_by_play(stats_system, "g1")
+        assert get_final_play_by_play(stats_system, "g1") == live
+
+        # Served from the artifact without rebuilding
+        monkeypatch.setattr(play_by_play_store, "calculate_play_by_play", None)
+        assert get_final_play_by_play(stats_system, "g1") == live
+
+    def test_rebuilt_when_events_change(self, stats_system, insert_events):
+        first = get_final_play_by_play(stats_system, "g1")
+        version = events_version(stats_system.db, "g1")
+        with stats_system.db.engine.begin() as conn:
+            insert_events(
+                conn, EVENT_COLUMNS, [("away", 24, 50, "a1", None, None)], len(EVENTS)
+            )
+
+        assert events_version(stats_system.db, "g1") != version
+        second = get_final_play_by_play(stats_system, "g1")
+        assert second != first
+        assert second == calculate_play_by_play(stats_system, "g1")
+
+    def test_refresh_writes_missing_and_stale_only(self, stats_system, insert_events):
+        assert refresh_play_by_play(stats_system, ["g1", "missing"]) == 1
+        assert refresh_play_by_play(stats_system, ["g1"]) == 0
+        with stats_system.db.engine.begin() as conn:
+            insert_events(
+                conn, EVENT_COLUMNS, [("away", 24, 50, "a1", None, None)], len(EVENTS)
+            )
+        assert refresh_play_by_play(stats_system, ["g1"]) == 1
+
+    def test_rebuilt_when_players_are_reimported(self, stats_system):
+        first = get_final_play_by_play(stats_system, "g1")
+        version = events_version(stats_system.db, "g1")
+        with stats_system.db.engine.begin() as conn:
+            conn.execute(text("DELETE FROM players"))
+            _insert_players(conn, "Renamed")
+
+        assert events_version(stats_system.db, "g1") != version
+        second = get_final_play_by_play(stats_system, "g1")
+        assert second != first
+        assert second == calculate_play_by_play(stats_system, "g1")
+        assert refresh_play_by_play(stats_system, ["g1"]) == 0
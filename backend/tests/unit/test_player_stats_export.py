@@ -0,0 +1,185 @@
+"""
+Test streaming player stats exports.
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from api.player_stats.export import (
+    PLAYER_COLUMNS,
+    export_columns,
+    iter_player_chunks,
+    write_csv,
+    write_ndjson,
+    write_parquet,
+)
+from api.player_stats.route import create_player_stats_route
+
+CAREER = {"seasons": ["career"], "is_career_mode": True}
+
+
+def _row(i: int) -> tuple:
+    """A row in the main query's 44-column layout."""
+    row = [Decimal(i + 10)] * 44
+    row[0:5] = [f"Player {i}", "Player", str(i), "hustle", None]
+    row[29:32] = ["Hustle", "Atlanta Hustle", 4]
+    row[43] = f"p{i}"
+    return tuple(row)
+
+
+def _mock_conn(chunks: list[list[tuple]]) -> MagicMock:
+    conn = MagicMock()
+    conn.execution_options.return_value.execute.return_value.partitions.return_value = (
+        iter(chunks)
+    )
+    return conn
+
+
+class TestIterPlayerChunks:
+    """Rows stream from a server-side cursor in chunks"""
+
+    def test_streams_unpaginated_query(self, player_stats_builder):
+        conn = _mock_conn([[_row(1), _row(2)], [_row(3)]])
+        chunks = list(
+            iter_player_chunks(conn, player_stats_builder(**CAREER), chunk_size=2)
+        )
+
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert conn.execution_options.call_args.kwargs == {
+            "stream_results": True,
+            "yield_per": 2,
+        }
+        query = str(conn.execution_options.return_value.execute.call_args.args[0])
+        assert "LIMIT" not in query
+        assert "ORDER BY" in query
+
+    def test_converts_per_game(self, player_stats_builder):
+        conn = _mock_conn([[_row(1)]])
+        [[player]] = iter_player_chunks(
+            conn, player_stats_builder(**CAREER, per_game_mode=True), per_mode="game"
+        )
+
+        assert player["total_goals"] == 2.8
+        assert player["games_played"] == 4
+
+    def test_attaches_percentiles_per_chunk(self, player_stats_builder):
+        conn = _mock_conn([[_row(1)], [_row(2)]])
+        with patch(
+            "api.player_stats.export.calculate_global_percentiles",
+            side_effect=lambda conn, players, **kwargs: {
+                f"{p['player_id']}_hustle": {"total_goals": 50} for p in players
+            },
+        ) as percentiles:
+            chunks = list(
+                iter_player_chunks(
+                    conn, player_stats_builder(**CAREER), include_percentiles=True
+                )
+            )
+
+        assert percentiles.call_count == 2
+        assert percentiles.call_args.kwargs["raise_errors"] is True
+        player = chunks[1][0]
+        assert player["total_goals_percentile"] == 50
+        assert player["total_assists_percentile"] is None
+
+    def test_percentile_errors_fail_the_export(self, player_stats_builder):
+        conn = _mock_conn([[_row(1)]])
+        conn.execute.side_effect = RuntimeError("percentiles failed")
+        with patch("api.player_stats.export.config.ENABLE_CACHE", False):
+            with pytest.raises(RuntimeError, match="percentiles failed"):
+                list(
+                    iter_player_chunks(
+                        conn, player_stats_builder(**CAREER), include_percentiles=True
+                    )
+                )
+
+
+class TestWriters:
+    """Chunks are encoded incrementally"""
+
+    def _chunks(self, player_stats_builder):
+        conn = _mock_conn([[_row(1), _row(2)], [_row(3)]])
+        return iter_player_chunks(conn, player_stats_builder(**CAREER))
+
+    def test_csv(self, player_stats_builder):
+        parts = list(write_csv(self._chunks(player_stats_builder), export_columns()))
+        rows = list(csv.reader(io.StringIO(b"".join(parts).decode())))
+
+        assert len(parts) == 2
+        assert rows[0] == PLAYER_COLUMNS
+        assert len(rows) == 4
+        assert rows[1][PLAYER_COLUMNS.index("year")] == ""
+        assert rows[3][PLAYER_COLUMNS.index("total_goals")] == "13"
+
+    def test_csv_without_rows_has_header(self):
+        rows = b"".join(write_csv(iter([]), export_columns())).decode()
+        assert rows.strip() == ",".join(PLAYER_COLUMNS)
+
+    def test_ndjson(self, player_stats_builder):
+        parts = list(write_ndjson(self._chunks(player_stats_builder), export_columns()))
+        players = [json.loads(line) for line in b"".join(parts).splitlines()]
+
+        assert len(parts) == 2
+        assert [p["player_id"] for p in players] == ["p1", "p2", "p3"]
+        assert players[0]["total_goals"] == 11
+
+    def test_parquet(self, player_stats_builder):
+        pq = pytest.importorskip("pyarrow.parquet")
+        columns = export_columns(include_percentiles=True)
+        table = pq.read_table(
+            io.BytesIO(
+                b"".join(write_parquet(self._chunks(player_stats_builder), columns))
+            )
+        )
+
+        assert table.num_rows == 3
+        assert table.column_names == columns
+        assert table.column("total_goals").to_pylist() == [11.0, 12.0, 13.0]
+        assert (
+            pq.ParquetFile(
+                io.BytesIO(
+                    b"".join(write_parquet(self._chunks(player_stats_builder), columns))
+                )
+            ).num_row_groups
+            == 2
+        )
+
+
+class TestExportRoute:
+    """GET /api/players/stats/export"""
+
+    @pytest.fixture
+    def client(self):
+        stats_system = MagicMock()
+        conn = stats_system.db.engine.connect.return_value.__enter__.return_value
+        conn.execution_options.return_value.execute.return_value.partitions.return_value = iter(
+            [[_row(1), _row(2)]]
+        )
+        app = FastAPI()
+        app.include_router(create_player_stats_route(stats_system))
+        return TestClient(app)
+
+    def test_streams_ndjson(self, client):
+        response = client.get(
+            "/api/players/stats/export", params={"format": "ndjson", "season": "2024"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "player_stats.ndjson" in response.headers["content-disposition"]
+        assert len(response.text.splitlines()) == 2
+
+    def test_rejects_unknown_format(self, client):
+        response = client.get("/api/players/stats/export", params={"format": "xlsx"})
+        assert response.status_code == 400
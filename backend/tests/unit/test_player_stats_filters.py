@@ -0,0 +1,243 @@
+"""
+Test custom filter compilation for player stats queries.
+"""
+
+import os
+import random
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from api.player_stats.filters import (
+    SEASON_STATS_ALIAS_MAPPING,
+    build_where_clause,
+)
+
+OPERATORS = [">", "<", ">=", "<=", "="]
+
+
+def _season_table() -> sqlite3.Connection:
+    """In-memory player_season_stats with random rows, including empty seasons."""
+    rng = random.Random(3)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""
+        CREATE TABLE player_season_stats (
+            player_id TEXT, team_id TEXT, year INTEGER, games_played INTEGER,
+            total_goals INTEGER, total_assists INTEGER, total_o_opportunities INTEGER
+        )
+        """)
+    rows = []
+    for p in range(400):
+        for year in (2023, 2024):
+            rows.append(
+                (
+                    f"p{p}",
+                    "hustle",
+                    year,
+                    rng.choice([0, 0, None, *range(1, 13)]),
+                    rng.randint(0, 40),
+                    rng.randint(0, 40),
+                    rng.choice([0, None, *range(1, 300)]),
+                )
+            )
+    conn.executemany(
+        "INSERT INTO player_season_stats VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+    )
+    return conn
+
+
+def _matching_ids(conn: sqlite3.Connection, condition: str) -> list:
+    return conn.execute(
+        f"SELECT rowid FROM player_season_stats pss WHERE {condition} ORDER BY rowid"
+    ).fetchall()
+
+
+class TestBuildWhereClause:
+    """Custom filters compiled into WHERE conditions"""
+
+    def test_season_filters(self):
+        condition = build_where_clause(
+            [
+                {"field": "total_goals", "operator": ">", "value": 20},
+                {"field": "games_played", "operator": ">=", "value": 5},
+                {"field": "score_total", "operator": ">", "value": 30},
+            ],
+            table_prefix="pss.",
+            alias_mapping=SEASON_STATS_ALIAS_MAPPING,
+        )
+
+        assert condition == (
+            "pss.total_goals > 20.0 AND pss.games_played >= 5.0 AND "
+            "((pss.total_goals + pss.total_assists)) > 30.0"
+        )
+
+    def test_invalid_filters_are_dropped(self):
+        filters = [
+            {"field": "total_goals; DROP TABLE players", "operator": ">", "value": 1},
+            {"field": "total_goals", "operator": "!=", "value": 1},
+            {"field": "total_goals", "operator": ">", "value": "many"},
+        ]
+        assert build_where_clause(filters) == ""
+
+    def test_rates_do_not_divide(self):
+        condition = build_where_clause(
+            [{"field": "total_goals", "operator": ">", "value": 2.5}],
+            per_possession=True,
+            table_prefix="cs.",
+        )
+
+        assert condition == (
+            "(cs.total_o_opportunities > 0 AND cs.total_goals * 100 > 2.5 * cs.total_o_opportunities)"
+        )
+
+    def test_ratio_stats_are_not_converted(self):
+        condition = build_where_clause(
+            [{"field": "completion_percentage", "operator": ">", "value": 90}],
+            per_game=True,
+        )
+        assert condition == "completion_percentage > 90.0"
+
+
+class TestRateConditionEquivalence:
+    """Multiplied rate predicates select the same rows as CASE division"""
+
+    @pytest.mark.parametrize("operator", OPERATORS)
+    @pytest.mark.parametrize("value", [-1, 0, 0.5, 2, 3.25])
+    def test_per_game_matches_case_division(self, operator, value):
+        conn = _season_table()
+        expected = _matching_ids(
+            conn,
+            "CASE WHEN COALESCE(pss.games_played, 0) > 0 "
+            "THEN CAST(pss.total_goals AS REAL) / pss.games_played ELSE 0 END "
+            f"{operator} {float(value)}",
+        )
+        condition = build_where_clause(
+            [{"field": "total_goals", "operator": operator, "value": value}],
+            per_game=True,
+            table_prefix="pss.",
+        )
+
+        assert _matching_ids(conn, condition) == expected
+
+    @pytest.mark.parametrize("operator", OPERATORS)
+    @pytest.mark.parametrize("value", [0, 12.5, 25])
+    def test_per_possession_matches_case_division(self, operator, value):
+        conn = _season_table()
+        expected = _matching_ids(
+            conn,
+            "CASE WHEN COALESCE(pss.total_o_opportunities, 0) > 0 "
+            "THEN CAST(pss.total_goals AS REAL) / pss.total_o_opportunities * 100 "
+            f"ELSE 0 END {operator} {float(value)}",
+        )
+        condition = build_where_clause(
+            [{"field": "total_goals", "operator": operator, "value": value}],
+            per_possession=True,
+            table_prefix="pss.",
+        )
+
+        assert _matching_ids(conn, condition) == expected
+
+    def test_derived_season_filter_is_per_game(self, player_stats_builder):
+        conn = _season_table()
+        builder = player_stats_builder(
+            filters_list=[{"field": "score_total", "operator": ">=", "value": 6}],
+            per_game_mode=True,
+        )
+        expected = _matching_ids(
+            conn,
+            "pss.games_played > 0 AND pss.year = 2024 AND "
+            "CAST(pss.total_goals + pss.total_assists AS REAL) / pss.games_played >= 6",
+        )
+
+        assert expected
+        assert _matching_ids(conn, builder._build_season_conditions()) == expected
+
+
+class TestFilterPlans:
+    """Plain stored-column filters are planned before aggregation and can use indexes"""
+
+    def test_stored_filter_is_an_index_search(self, player_stats_builder):
+        conn = _season_table()
+        conn.execute(
+            "CREATE INDEX idx_pss_year_goals ON player_season_stats(year, total_goals)"
+        )
+        builder = player_stats_builder(
+            filters_list=[{"field": "total_goals", "operator": ">", "value": 20}]
+        )
+
+        pushed = conn.execute(f"""
+            EXPLAIN QUERY PLAN
+            SELECT pss.player_id FROM player_season_stats pss
+            WHERE {builder._build_season_conditions()}
+            """).fetchall()
+        aggregated = conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT pss.player_id FROM player_season_stats pss
+            WHERE pss.year = 2024
+            GROUP BY pss.player_id
+            HAVING SUM(pss.total_goals) > 20.0
+            """).fetchall()
+        divided = conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT pss.player_id FROM player_season_stats pss
+            WHERE CASE WHEN pss.year = 2024 THEN pss.total_goals ELSE 0 END > 20.0
+            """).fetchall()
+
+        pushed_plan = " ".join(row[-1] for row in pushed)
+        assert "idx_pss_year_goals (year=? AND total_goals>?)" in pushed_plan
+        assert "total_goals>?" not in " ".join(row[-1] for row in aggregated)
+        assert "SCAN" in " ".join(row[-1] for row in divided)
+
+        rows = conn.execute(f"""
+            SELECT COUNT(*) FROM player_season_stats pss
+            WHERE {builder._build_season_conditions()}
+            """).fetchone()[0]
+        assert rows == conn.execute("""
+            SELECT COUNT(*) FROM player_season_stats
+            WHERE games_played > 0 AND year = 2024 AND total_goals > 20
+            """).fetchone()[0]
+
+    def test_rate_filter_is_not_an_index_search(self, player_stats_builder):
+        conn = _season_table()
+        conn.execute(
+            "CREATE INDEX idx_pss_year_goals ON player_season_stats(year, total_goals)"
+        )
+        builder = player_stats_builder(
+            filters_list=[{"field": "total_goals", "operator": ">", "value": 2}],
+            per_game_mode=True,
+        )
+
+        plan = conn.execute(f"""
+            EXPLAIN QUERY PLAN
+            SELECT pss.player_id FROM player_season_stats pss
+            WHERE {builder._build_season_conditions()}
+            """).fetchall()
+
+        # The year narrows the search; the rate is compared row by row
+        assert "total_goals>?" not in " ".join(row[-1] for row in plan)
+
+    def test_filtered_season_count_skips_main_query(self, player_stats_builder):
+        builder = player_stats_builder(
+            filters_list=[{"field": "total_goals", "operator": ">", "value": 20}]
+        )
+        query = builder.build_count_query()
+
+        assert "FROM player_season_stats pss" in query
+        assert "pss.total_goals > 20.0" in query
+        assert "ORDER BY" not in query
+        assert "JOIN" not in query
+
+    def test_possession_career_filters_follow_aggregation(self, player_stats_builder):
+        builder = player_stats_builder(
+            seasons=["career"],
+            is_career_mode=True,
+            per_possession_mode=True,
+            filters_list=[{"field": "total_goals", "operator": ">", "value": 5}],
+        )
+        query = builder.build_main_query()
+
+        where = query[query.index("FROM career_stats cs") :]
+        assert "cs.total_goals * 100 > 5.0 * cs.total_o_opportunities" in where
@@ -0,0 +1,90 @@
+"""
+Test player stats SQL generation.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+
+class TestStoredGamesPlayed:
+    """Queries read games_played stored at import time"""
+
+    def test_season_query_does_not_scan_game_stats(self, player_stats_builder):
+        builder = player_stats_builder()
+        query = builder.build_main_query()
+
+        assert "player_game_stats" not in query
+        assert "GROUP BY" not in query
+        assert "pss.games_played > 0" in query
+
+    def test_season_count_query_does_not_scan_game_stats(self, player_stats_builder):
+        query = player_stats_builder().build_count_query()
+
+        assert "player_game_stats" not in query
+        assert "pss.games_played > 0" in query
+
+    def test_season_games_played_filter_is_a_where_condition(
+        self, player_stats_builder
+    ):
+        builder = player_stats_builder(
+            filters_list=[{"field": "games_played", "operator": ">=", "value": 5}]
+        )
+        query = builder.build_main_query()
+
+        assert "pss.games_played >= 5.0" in query
+        assert "HAVING" not in query
+
+    def test_possession_career_query_sums_stored_games(self, player_stats_builder):
+        builder = player_stats_builder(
+            seasons=["career"], is_career_mode=True, per_possession_mode=True
+        )
+        query = builder.build_main_query()
+
+        assert "player_game_stats" not in query
+        assert "SUM(pss.games_played) as games_played" in query
+
+
+class TestTeamCareerQuery:
+    """Team career mode reads player_team_career_stats"""
+
+    def test_reads_team_career_view(self, player_stats_builder):
+        builder = player_stats_builder(
+            seasons=["career"], is_career_mode=True, teams=["hustle"]
+        )
+        query = builder.build_main_query()
+
+        assert "FROM player_team_career_stats tcs" in query
+        assert "tcs.team_id = 'hustle'" in query
+        assert "player_game_stats" not in query
+
+    def test_team_info_is_joined_per_team(self, player_stats_builder):
+        builder = player_stats_builder(
+            seasons=["career"], is_career_mode=True, teams=["hustle", "empire"]
+        )
+        query = builder.build_main_query()
+
+        assert "CROSS JOIN" not in query
+        assert "JOIN team_info ti ON tcs.team_id = ti.team_id" in query
+
+    def test_per_game_sort_uses_view_games_played(self, player_stats_builder):
+        builder = player_stats_builder(
+            seasons=["career"],
+            is_career_mode=True,
+            teams=["hustle"],
+            per_game_mode=True,
+        )
+        query = builder.build_main_query()
+
+        assert "CAST(tcs.total_goals AS NUMERIC) / tcs.games_played" in query
+        assert "gc." not in query
+
+    def test_count_query_reads_team_career_view(self, player_stats_builder):
+        builder = player_stats_builder(
+            seasons=["career"], is_career_mode=True, teams=["hustle"]
+        )
+        query = builder.build_count_query()
+
+        assert "player_team_career_stats" in query
+        assert "tcs.games_played > 0" in query
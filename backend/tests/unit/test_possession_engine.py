@@ -0,0 +1,241 @@
+"""
+Test the vectorized possession engine against the event processors.
+"""
+
+import os
+import random
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from data.database import SQLDatabase
+from domain.possession import (
+    PossessionCalculator,
+    PossessionEventProcessor,
+    RedzoneCalculator,
+    RedzoneEventProcessor,
+    ScoringStats,
+    process_event_arrays,
+    scan_team_events,
+    score_event_arrays,
+)
+from services.team_game_stats import (
+    POSSESSION_COLUMNS,
+    scan_event_rows,
+    scan_game_events,
+)
+
+EVENT_TYPES = [1, 2, 3, 8, 11, 12, 13, 14, 15, 18, 18, 18, 18, 19, 20, 22, 23, 24]
+QUARTER_ENDS = [28, 29, 30, 31, 32, 33]
+EVENT_COLUMNS = ("event_type", "event_time", "receiver_y", "thrower_y")
+
+
+def _random_events(rng: random.Random, team: str) -> list[dict]:
+    """One team's events in a game, possibly none."""
+    event_types = EVENT_TYPES + QUARTER_ENDS[: rng.randint(0, 6)]
+    return [
+        {
+            "team": team,
+            "event_type": rng.choice(event_types),
+            "event_time": rng.choice([None, rng.randint(0, 720)]),
+            "receiver_y": rng.choice([None, 0.0, 80.0, 100.0, rng.uniform(60, 120)]),
+            "thrower_y": rng.choice([None, rng.uniform(60, 120)]),
+        }
+        for _ in range(rng.randint(0, 120))
+    ]
+
+
+def _random_segments(rng: random.Random) -> list[tuple[str, list[dict]]]:
+    """A batch of (team type, events) segments."""
+    segments = []
+    for _ in range(rng.randint(1, 8)):
+        team = rng.choice(["home", "away"])
+        segments.append((team, _random_events(rng, team)))
+    return segments
+
+
+def _columns(segments: list[tuple[str, list[dict]]]) -> dict[str, np.ndarray]:
+    events = [event for _, team_events in segments for event in team_events]
+    event_time = np.empty(len(events), dtype=object)
+    event_time[:] = [event["event_time"] for event in events]
+    return {
+        "segment": np.array(
+            [i for i, (_, team_events) in enumerate(segments) for _ in team_events],
+            dtype=np.int64,
+        ),
+        "event_type": np.array([e["event_type"] for e in events], dtype=np.int64),
+        "event_time": event_time,
+        "receiver_y": np.array([e["receiver_y"] for e in events], dtype=np.float64),
+        "thrower_y": np.array([e["thrower_y"] for e in events], dtype=np.float64),
+    }
+
+
+class TestPossessionEngine:
+    """process_event_arrays() and score_event_arrays() per segment"""
+
+    def test_matches_scan_team_events(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            segments = _random_segments(rng)
+            columns = _columns(segments)
+            stats = process_event_arrays(
+                columns["segment"],
+                columns["event_type"],
+                columns["receiver_y"],
+                columns["thrower_y"],
+                len(segments),
+            )
+            scoring = score_event_arrays(
+                columns["segment"],
+                columns["event_type"],
+                columns["event_time"],
+                np.array([team == "home" for team, _ in segments]),
+            )
+            for i, (team, events) in enumerate(segments):
+                possession, redzone, expected_scoring = scan_team_events(events, team)
+                assert {column: int(values[i]) for column, values in stats.items()} == (
+                    possession.to_dict() | redzone.to_dict()
+                )
+                assert scoring[i] == expected_scoring
+
+    def test_empty_batch(self):
+        empty = np.array([], dtype=np.int64)
+        stats = process_event_arrays(
+            empty, empty, empty.astype(float), empty.astype(float), 2
+        )
+        assert all(values.tolist() == [0, 0] for values in stats.values())
+        scoring = score_event_arrays(
+            empty, empty, empty.astype(object), np.array([True, False])
+        )
+        assert scoring == [ScoringStats(), ScoringStats()]
+
+
+class TestScanEventRows:
+    """Rows of several games through the engine"""
+
+    def test_scores_each_game_from_home_events(self):
+        rng = random.Random(13)
+        rows = []
+        expected, expected_scoring = {}, {}
+        for game_id in ("g1", "g2", "g3"):
+            for team in ("away", "home") if game_id != "g3" else ("away",):
+                events = _random_events(rng, team)
+                rows += [
+                    (
+                        game_id,
+                        team,
+                        event["event_type"],
+                        event["event_time"],
+                        event["receiver_y"],
+                        event["thrower_y"],
+                    )
+                    for event in events
+                ]
+                possession, redzone, scoring = scan_team_events(events, team)
+                if events:
+                    expected[game_id, team] = (
+                        {c: getattr(possession, c) for c in POSSESSION_COLUMNS},
+                        redzone.to_dict(),
+                    )
+                    expected_scoring[game_id] = scoring
+
+        teams, game_scoring = scan_event_rows(rows)
+        assert teams == expected
+        assert game_scoring == expected_scoring
+
+    def test_no_events(self):
+        assert scan_event_rows([]) == ({}, {})
+
+    def test_fetched_columns_match_rows(self, tmp_path):
+        rng = random.Random(19)
+        db = SQLDatabase(f"sqlite:///{tmp_path / 'events.db'}")
+        rows, inserted = [], []
+        for game_id in ("g1", "g2", "g3"):
+            for team in ("away", "home"):
+                events = _random_events(rng, team)
+                rows += [
+                    (game_id, team) + tuple(event[c] for c in EVENT_COLUMNS)
+                    for event in events
+                ]
+                inserted += [
+                    event | {"game_id": game_id, "event_index": index}
+                    for index, event in enumerate(events)
+                ]
+        # Another team's events are left out
+        inserted.append(inserted[0] | {"team": "none", "event_index": -1})
+        rng.shuffle(inserted)
+        with db.engine.begin() as conn:
+            conn.execute(text("""
+                CREATE TABLE game_events (
+                    game_id TEXT, event_index INTEGER, team TEXT,
+                    event_type INTEGER, event_time INTEGER,
+                    receiver_y REAL, thrower_y REAL
+                )
+                """))
+            conn.execute(
+                text(
+                    "INSERT INTO game_events VALUES (:game_id, :event_index, :team, "
+                    ":event_type, :event_time, :receiver_y, :thrower_y)"
+                ),
+                inserted,
+            )
+
+        # Each team's events stay in the order the rows list them
+        teams, game_scoring = scan_game_events(db, ["g2", "g4", "g1", "g3"])
+        assert (teams, game_scoring) == scan_event_rows(rows)
+        assert teams
+
+
+class TestCalculateBatch:
+    """Season batches of the calculators, now run through the engine"""
+
+    def test_matches_processors_per_team_game(self):
+        rng = random.Random(17)
+        events, games = [], []
+        for n in range(6):
+            home_team, away_team = rng.sample(["atl", "bos", "chi", "dal"], 2)
+            game_id = f"g{n}"
+            games.append((game_id, home_team, away_team))
+            # Both teams' events of a game interleave
+            game_events = _random_events(rng, "home") + _random_events(rng, "away")
+            rng.shuffle(game_events)
+            events += [
+                event
+                | {
+                    "game_id": game_id,
+                    "home_team_id": home_team,
+                    "away_team_id": away_team,
+                    "event_index": index,
+                }
+                for index, event in enumerate(game_events)
+            ]
+        db = MagicMock()
+        db.execute_query.return_value = events
+        team_ids = ["atl", "bos", "chi"]
+
+        for calculator, processor in [
+            (PossessionCalculator, PossessionEventProcessor),
+            (RedzoneCalculator, RedzoneEventProcessor),
+        ]:
+            expected = {team_id: {} for team_id in team_ids}
+            for game_id, home_team, away_team in games:
+                for team_type, team_id in (("home", home_team), ("away", away_team)):
+                    if team_id not in expected:
+                        continue
+                    team_events = [
+                        event
+                        for event in events
+                        if event["game_id"] == game_id and event["team"] == team_type
+                    ]
+                    stats = processor(team_type).process_events(team_events).to_dict()
+                    for column, value in stats.items():
+                        if column != "d_line_conversions":
+                            expected[team_id][column] = (
+                                expected[team_id].get(column, 0) + value
+                            )
+
+            assert calculator(db).calculate_batch(team_ids) == expected
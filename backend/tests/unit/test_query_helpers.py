@@ -3,11 +3,21 @@ Test query helper functions.
 """
 
 import os
+import random
 import sys
+from decimal import Decimal
+
+import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from utils.query import convert_to_per_game_stats, get_sort_column
+from utils.query import (
+    PER_GAME_STATS,
+    PER_POSSESSION_STATS,
+    convert_to_per_game_stats,
+    convert_to_per_possession_stats,
+    get_sort_column,
+)
 
 
 class TestGetSortColumn:
@@ -231,3 +241,87 @@ class TestConvertToPerGameStats:
         assert result[0]["hockey_assists"] == 1.2
         assert result[0]["callahans"] == 0.2
         assert result[0]["drops"] == 0.3
+
+
+def _players(count: int, seed: int = 4) -> list[dict]:
+    """API-shaped player dicts, including NULL stats and Decimal totals."""
+    rng = random.Random(seed)
+    players = []
+    for _ in range(count):
+        player = {stat: rng.randint(-20, 900) for stat in PER_GAME_STATS}
+        player["full_name"] = "Test Player"
+        player["completion_percentage"] = 91.5
+        player["games_played"] = rng.choice([0, 1, 2, 4, 5, 8, 10, 16, 20])
+        player["total_o_opportunities"] = rng.choice([0, 8, 40, 200, 400, 1000])
+        player["total_hucks_received"] = None if rng.random() < 0.1 else 7
+        if rng.random() < 0.3:
+            player = {
+                k: Decimal(v) if isinstance(v, int) else v for k, v in player.items()
+            }
+        players.append(player)
+    return players
+
+
+def _reference(player: dict, stats: tuple, denominator, scale: int) -> dict:
+    """The per-player float(format(value, ".1f")) conversion."""
+    expected = dict(player)
+    if denominator > 0:
+        for stat in stats:
+            if player.get(stat) is not None:
+                value = player[stat] / denominator
+                value = value * scale if scale != 1 else value
+                expected[stat] = float(format(value, ".1f"))
+    return expected
+
+
+class TestBatchedRateConversion:
+    """Batched conversions round exactly like per-value format(".1f")"""
+
+    def test_per_game_matches_reference(self):
+        players = _players(400)
+        expected = [
+            _reference(p, PER_GAME_STATS, p["games_played"], 1) for p in players
+        ]
+        assert convert_to_per_game_stats(players) == expected
+
+    def test_per_possession_matches_reference(self):
+        players = _players(400, seed=8)
+        expected = [
+            _reference(
+                p,
+                PER_POSSESSION_STATS,
+                p["total_o_opportunities"] or p["possessions"],
+                100,
+            )
+            for p in players
+        ]
+        assert convert_to_per_possession_stats(players) == expected
+
+    def test_ties_round_like_format(self):
+        # 0.35 and 0.45 are not exact floats; Decimal totals tie exactly
+        players = [
+            {"games_played": 20, "total_goals": 7, "total_assists": 9},
+            {"games_played": 20, "total_goals": Decimal(7), "total_assists": 5},
+        ]
+        result = convert_to_per_game_stats(players)
+
+        assert result[0]["total_goals"] == float(format(7 / 20, ".1f")) == 0.3
+        assert result[0]["total_assists"] == 0.5
+        assert result[1]["total_goals"] == 0.4
+        assert result[1]["total_assists"] == 0.2
+
+
+class TestRateStatsShareSortDefinition:
+    """Sort expressions convert exactly the stats that are displayed as rates"""
+
+    @pytest.mark.parametrize("stat", ["total_goals", "total_pulls", "minutes_played"])
+    def test_per_game(self, stat):
+        column = get_sort_column(stat, is_career=True, per_game=True)
+        assert ("/ games_played" in column) == (stat in PER_GAME_STATS)
+
+    @pytest.mark.parametrize(
+        "stat", ["total_goals", "total_pulls", "total_o_points_played", "possessions"]
+    )
+    def test_per_possession(self, stat):
+        column = get_sort_column(stat, per_possession=True)
+        assert ("* 100" in column) == (stat in PER_POSSESSION_STATS)
@@ -0,0 +1,325 @@
+"""
+Test prefix-sum season rollups against SQL re-aggregation.
+"""
+
+import os
+import random
+import sqlite3
+import sys
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from api.player_stats.season_rollup import (
+    ROLLUP_FIELDS,
+    SeasonRollup,
+    SeasonRollupStore,
+    clear_season_rollup_store,
+    derived_stats,
+    get_season_rollup_store,
+    query_career_rollup,
+)
+
+YEARS = [y for y in range(2012, 2026) if y != 2020]
+CAREER_POSSESSION = {
+    "seasons": ["career"],
+    "is_career_mode": True,
+    "per_possession_mode": True,
+}
+
+
+def _make_season_rows(players: int = 60, seed: int = 5) -> list[tuple]:
+    """Synthetic player_season_stats rows (player_id, team_id, year, *ROLLUP_FIELDS)."""
+    rng = random.Random(seed)
+    rows = []
+    for p in range(players):
+        teams = rng.sample(["hustle", "empire", "glory", "flyers"], rng.randint(1, 2))
+        for year in rng.sample(YEARS, rng.randint(1, len(YEARS))):
+            stats = {field: rng.randint(0, 40) for field in ROLLUP_FIELDS}
+            stats["total_throw_attempts"] = rng.randint(0, 90)
+            stats["total_o_opportunities"] = rng.randint(0, 80)
+            stats["total_seconds_played"] = rng.randint(0, 9000)
+            if p % 7 == 0:
+                stats["total_throwaways"] = stats["total_stalls"] = 0
+                stats["total_drops"] = 0
+            if p % 11 == 0:
+                stats["games_played"] = 0
+            rows.append((f"p{p}", rng.choice(teams), year, *stats.values()))
+    return rows
+
+
+def _sql_totals(rows: list[tuple], years: list[int]) -> dict:
+    """Re-aggregate the rows in SQL for a season selection."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE player_season_stats (player_id TEXT, team_id TEXT, year INTEGER, "
+        f"{', '.join(f'{f} INTEGER' for f in ROLLUP_FIELDS)})"
+    )
+    conn.executemany(
+        f"INSERT INTO player_season_stats VALUES ({', '.join('?' * (len(ROLLUP_FIELDS) + 3))})",
+        rows,
+    )
+    result = conn.execute(f"""
+        SELECT player_id, {', '.join(f'SUM({f})' for f in ROLLUP_FIELDS)}
+        FROM player_season_stats
+        WHERE year IN ({', '.join(str(y) for y in years)})
+        GROUP BY player_id
+        """).fetchall()
+    conn.close()
+    return {row[0]: list(row[1:]) for row in result}
+
+
+def _numeric_round(numerator: int, denominator: int, digits: int) -> float:
+    """ROUND(numerator * 1.0 / denominator, digits) with NUMERIC semantics."""
+    quotient = Decimal(numerator) / Decimal(denominator)
+    return float(quotient.quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP))
+
+
+class TestSeasonRollupTotals:
+    """Prefix-sum totals must equal GROUP BY sums for any range of seasons"""
+
+    @pytest.mark.parametrize("start_year", [None, *YEARS, 2020])
+    def test_season_ranges_match_sql(self, start_year):
+        rows = _make_season_rows()
+        rollup = SeasonRollup.from_rows((r[0], *r[2:]) for r in rows)
+
+        for end_year in [None, 2016, 2021]:
+            years = [
+                y
+                for y in YEARS
+                if (start_year is None or y >= start_year)
+                and (end_year is None or y <= end_year)
+            ]
+            expected = _sql_totals(rows, years) if years else {}
+            totals = rollup.range_totals(start_year, end_year)
+            actual = {
+                key: totals[i].tolist()
+                for i, key in enumerate(rollup.keys)
+                if key in expected
+            }
+            assert actual == expected
+            # Players without a season in the range sum to zero
+            missing = [i for i, key in enumerate(rollup.keys) if key not in expected]
+            assert not totals[missing].any()
+
+    def test_range_past_the_last_season_is_empty(self):
+        rollup = SeasonRollup.from_rows(
+            (r[0], *r[2:]) for r in _make_season_rows(seed=9)
+        )
+
+        assert not rollup.range_totals(2030).any()
+        assert not rollup.range_totals(2016, 2014).any()
+
+
+class TestDerivedStats:
+    """Derived ratios must match the career CTE expressions"""
+
+    @pytest.mark.parametrize("fallback", [False, True])
+    def test_matches_numeric_rounding(self, fallback):
+        rollup = SeasonRollup.from_rows(
+            (r[0], *r[2:]) for r in _make_season_rows(seed=13)
+        )
+        totals = rollup.range_totals()
+        columns = derived_stats(totals, yards_per_turn_fallback=fallback)
+
+        for i in range(len(rollup)):
+            t = dict(zip(ROLLUP_FIELDS, totals[i].tolist(), strict=True))
+            yards = t["total_yards_thrown"] + t["total_yards_received"]
+            turnovers = t["total_throwaways"] + t["total_stalls"] + t["total_drops"]
+            expected = {
+                "completion_percentage": (
+                    _numeric_round(
+                        t["total_completions"] * 100, t["total_throw_attempts"], 1
+                    )
+                    if t["total_throw_attempts"] >= 100
+                    else None
+                ),
+                "offensive_efficiency": (
+                    _numeric_round(
+                        t["total_o_opportunity_scores"] * 100,
+                        t["total_o_opportunities"],
+                        1,
+                    )
+                    if t["total_o_opportunities"] >= 100
+                    else None
+                ),
+                "yards_per_turn": (
+                    _numeric_round(yards, turnovers, 1)
+                    if turnovers > 0
+                    else (float(yards) if fallback and yards > 0 else None)
+                ),
+                "assists_per_turnover": (
+                    _numeric_round(t["total_assists"], turnovers, 2)
+                    if turnovers > 0
+                    else None
+                ),
+                "minutes_played": float(
+                    _numeric_round(t["total_seconds_played"], 60, 0)
+                ),
+            }
+            actual = {
+                field: None if np.isnan(columns[field][i]) else columns[field][i]
+                for field in expected
+            }
+            assert actual == expected
+
+    def test_huck_percentage_is_zero_without_attempts(self):
+        columns = derived_stats(np.zeros((1, len(ROLLUP_FIELDS)), dtype=np.int64))
+        assert columns["huck_percentage"][0] == 0
+
+    def test_round_half_away_from_zero(self):
+        # 29 / 200 is 0.14499999999999999 as a float but 0.145 as NUMERIC
+        totals = np.zeros((1, len(ROLLUP_FIELDS)), dtype=np.int64)
+        totals[0, ROLLUP_FIELDS.index("total_assists")] = 29
+        totals[0, ROLLUP_FIELDS.index("total_throwaways")] = 200
+        columns = derived_stats(totals)
+        assert columns["assists_per_turnover"][0] == 0.15
+
+
+def _store(rows: list[tuple]) -> SeasonRollupStore:
+    players = sorted({r[0] for r in rows})
+    return SeasonRollupStore(
+        players=SeasonRollup.from_rows((r[0], *r[2:]) for r in rows),
+        player_teams=SeasonRollup.from_rows(((r[0], r[1]), *r[2:]) for r in rows),
+        player_info={
+            p: (f"Name {p}", "Name", p, "hustle", "Hustle", "Atlanta Hustle")
+            for p in players
+        },
+        player_team_names={(r[0], r[1]): (f"Name {r[0]}", "Name", r[0]) for r in rows},
+        team_info={t: (t.title(), t.title()) for t in {r[1] for r in rows}},
+    )
+
+
+class TestQueryCareerRollup:
+    """Test answering per-possession career pages from the rollups"""
+
+    def test_applies_possession_threshold_and_games_played(self, player_stats_builder):
+        rows = _make_season_rows()
+        store = _store(rows)
+        total, page = query_career_rollup(
+            store, player_stats_builder(**CAREER_POSSESSION, per_page=1000)
+        )
+
+        totals = store.players.range_totals(2014)
+        games = totals[:, ROLLUP_FIELDS.index("games_played")]
+        possessions = totals[:, ROLLUP_FIELDS.index("total_o_opportunities")]
+        assert total == int(((games > 0) & (possessions >= 100)).sum())
+        assert len(page) == total
+        assert all(row[31] > 0 and row[26] >= 100 and len(row) == 44 for row in page)
+
+    def test_sorts_counting_stats_per_possession(self, player_stats_builder):
+        store = _store(_make_season_rows())
+        _, page = query_career_rollup(
+            store, player_stats_builder(**CAREER_POSSESSION, per_page=1000)
+        )
+
+        rates = [row[5] / row[26] for row in page]
+        assert rates == sorted(rates, reverse=True)
+
+    def test_nulls_sort_last(self, player_stats_builder):
+        store = _store(_make_season_rows())
+        for order in ["asc", "desc"]:
+            _, page = query_career_rollup(
+                store,
+                player_stats_builder(
+                    **CAREER_POSSESSION,
+                    sort="yards_per_turn",
+                    order=order,
+                    per_page=1000,
+                ),
+            )
+            values = [row[39] for row in page]
+            non_null = [v for v in values if v is not None]
+            assert values[: len(non_null)] == sorted(non_null, reverse=order == "desc")
+
+    def test_custom_filters_use_per_possession_values(self, player_stats_builder):
+        store = _store(_make_season_rows())
+        builder = player_stats_builder(
+            **CAREER_POSSESSION,
+            filters_list=[{"field": "total_goals", "operator": ">=", "value": 40}],
+            per_page=1000,
+        )
+        _, page = query_career_rollup(store, builder)
+
+        assert page
+        assert all(row[5] * 100 / row[26] >= 40 for row in page)
+
+    def test_team_rows_are_per_team(self, player_stats_builder):
+        rows = _make_season_rows()
+        store = _store(rows)
+        total, page = query_career_rollup(
+            store,
+            player_stats_builder(
+                **CAREER_POSSESSION, teams=["hustle", "empire"], per_page=1000
+            ),
+        )
+
+        assert total == len(page)
+        assert {row[3] for row in page} <= {"hustle", "empire"}
+        assert len({(row[43], row[3]) for row in page}) == len(page)
+
+    def test_pagination(self, player_stats_builder):
+        store = _store(_make_season_rows())
+        total, first = query_career_rollup(
+            store, player_stats_builder(**CAREER_POSSESSION, per_page=3)
+        )
+        _, second = query_career_rollup(
+            store, player_stats_builder(**CAREER_POSSESSION, per_page=3, page=2)
+        )
+        _, both = query_career_rollup(
+            store, player_stats_builder(**CAREER_POSSESSION, per_page=6)
+        )
+
+        assert total > 6
+        assert first + second == both
+
+    def test_unsupported_sort_falls_back_to_sql(self, player_stats_builder):
+        store = _store(_make_season_rows())
+        assert (
+            query_career_rollup(
+                store, player_stats_builder(**CAREER_POSSESSION, sort="full_name")
+            )
+            is None
+        )
+        assert (
+            query_career_rollup(
+                store,
+                player_stats_builder(
+                    **CAREER_POSSESSION,
+                    filters_list=[
+                        {"field": "total_catches", "operator": ">", "value": 1}
+                    ],
+                ),
+            )
+            is None
+        )
+
+
+class TestSeasonRollupStore:
+    """The process-global store and its invalidation"""
+
+    def setup_method(self):
+        clear_season_rollup_store()
+
+    def teardown_method(self):
+        clear_season_rollup_store()
+
+    def test_reloads_after_clear(self, monkeypatch):
+        loads = []
+
+        def load(cls, conn):
+            loads.append(conn)
+            return object()
+
+        monkeypatch.setattr(SeasonRollupStore, "load", classmethod(load))
+
+        get_season_rollup_store(None)
+        get_season_rollup_store(None)
+        assert len(loads) == 1
+
+        clear_season_rollup_store()
+        get_season_rollup_store(None)
+        assert len(loads) == 2
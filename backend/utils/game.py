@@ -3,13 +3,25 @@ Detailed game statistics and analysis tools.
 Handles comprehensive game details, individual leaders, and team statistics.
 """
 
+from types import SimpleNamespace
 from typing import Any
 
-from data.possession import (
-    calculate_possessions,
-    calculate_redzone_stats_for_team,
-    calculate_team_percentages,
-)
+from services.box_score_store import get_box_score
+from utils.stats import calculate_percentage
+
+# Leader categories, as box score player line keys; only positive values lead
+LEADER_STATS = ("assists", "goals", "blocks", "completions", "points_played")
+
+# Team statistics percentages: box score stat per percentage key
+TEAM_PERCENTAGES = {
+    "completion_percentage": ("completions", "made", "attempted"),
+    "huck_percentage": ("hucks", "made", "attempted"),
+    "hold_percentage": ("hold", "made", "total"),
+    "o_conversion": ("o_line_conversion", "made", "total"),
+    "break_percentage": ("break", "made", "total"),
+    "d_conversion": ("d_line_conversion", "made", "total"),
+    "redzone_percentage": ("redzone_conversion", "made", "total"),
+}
 
 
 def get_game_details(
@@ -58,203 +70,74 @@ def get_game_details(
     game = game[0]
     game_id = game["game_id"]
 
-    # Get individual leaders (top 1 per category per team)
-    leaders = get_individual_leaders(db, game_id, game)
-
-    # Get basic team statistics
-    team_stats = get_team_statistics(db, game_id)
-
-    # Get possession stats for each team
-    home_possessions = calculate_possessions(
-        db, game_id, game["home_full_team_id"], True
-    )
-    away_possessions = calculate_possessions(
-        db, game_id, game["away_full_team_id"], False
-    )
-
-    # Organize team stats by team and add possession data
-    home_stats = None
-    away_stats = None
-    for stat in team_stats:
-        if stat["team_id"] == game["home_full_team_id"]:
-            home_stats = stat
-        elif stat["team_id"] == game["away_full_team_id"]:
-            away_stats = stat
-
-    # Add possession data if available
-    if home_stats and home_possessions:
-        home_stats.update(home_possessions)
-    if away_stats and away_possessions:
-        away_stats.update(away_possessions)
-
-    # Calculate percentages with exact UFA formulas
-    home_stats = calculate_team_percentages(home_stats, away_stats)
-    away_stats = calculate_team_percentages(away_stats, home_stats)
-
-    # Add redzone percentage to stats if available
-    if home_stats:
-        redzone_data = calculate_redzone_stats_for_team(
-            db, game_id, game["home_full_team_id"], is_home_team=True
-        )
-        if redzone_data is not None:
-            home_stats["redzone_percentage"] = redzone_data["percentage"]
-            home_stats["redzone_percentage_display"] = (
-                f"{redzone_data['percentage']}% ({redzone_data['goals']}/{redzone_data['possessions']})"
-            )
-
-    if away_stats:
-        redzone_data = calculate_redzone_stats_for_team(
-            db, game_id, game["away_full_team_id"], is_home_team=False
-        )
-        if redzone_data is not None:
-            away_stats["redzone_percentage"] = redzone_data["percentage"]
-            away_stats["redzone_percentage_display"] = (
-                f"{redzone_data['percentage']}% ({redzone_data['goals']}/{redzone_data['possessions']})"
-            )
+    # The box score services only need the stats system's db
+    box_score = get_box_score(SimpleNamespace(db=db), game_id)
+    if box_score is None:
+        return {"error": "Game not found"}
 
     return {
         "game": game,
-        "individual_leaders": leaders,
-        "team_statistics": {"home": home_stats, "away": away_stats},
+        "individual_leaders": get_individual_leaders(box_score),
+        "team_statistics": {
+            "home": get_team_statistics(box_score["home_team"]),
+            "away": get_team_statistics(box_score["away_team"]),
+        },
     }
 
 
-def get_individual_leaders(
-    db: Any, game_id: str, game: dict[str, Any]
-) -> dict[str, Any]:
-    """Get individual stat leaders for a game."""
-    leaders = {}
-
-    # Helper function to get top player(s) for a stat - includes ties
-    def get_stat_leader(stat_column: str, stat_name: str) -> dict[str, Any]:
-        # Query to get all players with the maximum value for the stat
-        query = f"""
-        WITH max_stat AS (
-            SELECT MAX(pgs.{stat_column}) as max_value
-            FROM player_game_stats pgs
-            WHERE pgs.game_id = :game_id
-            AND pgs.team_id = :team_id
-            AND pgs.{stat_column} > 0
-        )
-        SELECT DISTINCT p.full_name, pgs.{stat_column} as value, pgs.team_id,
-               t.name as team_name
-        FROM player_game_stats pgs
-        JOIN players p ON pgs.player_id = p.player_id
-        JOIN teams t ON pgs.team_id = t.team_id AND pgs.year = t.year
-        CROSS JOIN max_stat
-        WHERE pgs.game_id = :game_id
-        AND pgs.team_id = :team_id
-        AND pgs.{stat_column} = max_stat.max_value
-        ORDER BY p.full_name
-        """
-
-        home_leaders = db.execute_query(
-            query, {"game_id": game_id, "team_id": game["home_full_team_id"]}
-        )
-
-        away_leaders = db.execute_query(
-            query, {"game_id": game_id, "team_id": game["away_full_team_id"]}
-        )
-
-        # Format multiple leaders with comma separation
-        def format_leaders(leaders_list: list[dict[str, Any]]) -> dict[str, Any] | None:
-            if not leaders_list:
-                return None
-            if len(leaders_list) == 1:
-                return leaders_list[0]
-            # For multiple tied leaders, combine their names
-            names = "; ".join([leader["full_name"] for leader in leaders_list])
-            return {
-                "full_name": names,
-                "value": leaders_list[0]["value"],  # All have the same value
-                "team_id": leaders_list[0]["team_id"],
-                "team_name": leaders_list[0]["team_name"],
-            }
-
-        return {
-            "home": format_leaders(home_leaders),
-            "away": format_leaders(away_leaders),
-        }
-
-    # Get leaders for each category
-    leaders["assists"] = get_stat_leader("assists", "Assists")
-    leaders["goals"] = get_stat_leader("goals", "Goals")
-    leaders["blocks"] = get_stat_leader("blocks", "Blocks")
-    leaders["completions"] = get_stat_leader("completions", "Completions")
-    leaders["points_played"] = get_stat_leader(
-        "o_points_played + d_points_played", "Points Played"
-    )
-
-    # Plus/minus requires special handling - also handle ties
-    pm_query = """
-    WITH max_pm AS (
-        SELECT MAX(pgs.goals + pgs.assists + pgs.blocks - pgs.throwaways - pgs.stalls - pgs.drops) as max_value
-        FROM player_game_stats pgs
-        WHERE pgs.game_id = :game_id
-        AND pgs.team_id = :team_id
-    )
-    SELECT DISTINCT p.full_name,
-           (pgs.goals + pgs.assists + pgs.blocks - pgs.throwaways - pgs.stalls - pgs.drops) as value,
-           pgs.team_id, t.name as team_name
-    FROM player_game_stats pgs
-    JOIN players p ON pgs.player_id = p.player_id
-    JOIN teams t ON pgs.team_id = t.team_id AND pgs.year = t.year
-    CROSS JOIN max_pm
-    WHERE pgs.game_id = :game_id
-    AND pgs.team_id = :team_id
-    AND (pgs.goals + pgs.assists + pgs.blocks - pgs.throwaways - pgs.stalls - pgs.drops) = max_pm.max_value
-    ORDER BY p.full_name
-    """
+def get_individual_leaders(box_score: dict[str, Any]) -> dict[str, Any]:
+    """Get individual stat leaders for a game from its box score."""
 
-    home_pm_leaders = db.execute_query(
-        pm_query, {"game_id": game_id, "team_id": game["home_full_team_id"]}
-    )
-
-    away_pm_leaders = db.execute_query(
-        pm_query, {"game_id": game_id, "team_id": game["away_full_team_id"]}
-    )
-
-    # Format multiple leaders with comma separation
-    def format_leaders(leaders_list: list[dict[str, Any]]) -> dict[str, Any] | None:
-        if not leaders_list:
+    # Top player(s) of a team for a stat - ties are joined into one entry
+    def get_stat_leader(
+        team: dict[str, Any], stat: str, positive_only: bool
+    ) -> dict[str, Any] | None:
+        players = [
+            player
+            for player in team["players"]
+            if player[stat] is not None and (player[stat] > 0 or not positive_only)
+        ]
+        if not players:
             return None
-        if len(leaders_list) == 1:
-            return leaders_list[0]
-        # For multiple tied leaders, combine their names
-        names = "; ".join([leader["full_name"] for leader in leaders_list])
+        value = max(player[stat] for player in players)
+        names = sorted(player["name"] for player in players if player[stat] == value)
         return {
-            "full_name": names,
-            "value": leaders_list[0]["value"],  # All have the same value
-            "team_id": leaders_list[0]["team_id"],
-            "team_name": leaders_list[0]["team_name"],
+            "full_name": "; ".join(names),
+            "value": value,
+            "team_id": team["team_id"],
+            "team_name": team["name"],
         }
 
+    leaders = {
+        stat: {
+            side: get_stat_leader(box_score[f"{side}_team"], stat, True)
+            for side in ("home", "away")
+        }
+        for stat in LEADER_STATS
+    }
     leaders["plus_minus"] = {
-        "home": format_leaders(home_pm_leaders),
-        "away": format_leaders(away_pm_leaders),
+        side: get_stat_leader(box_score[f"{side}_team"], "plus_minus", False)
+        for side in ("home", "away")
     }
-
     return leaders
 
 
-def get_team_statistics(db: Any, game_id: str) -> list[dict[str, Any]]:
-    """Get basic team statistics for a game."""
-    team_stats_query = """
-    SELECT
-        team_id,
-        SUM(completions) as total_completions,
-        SUM(throw_attempts) as total_attempts,
-        SUM(hucks_completed) as total_hucks_completed,
-        SUM(hucks_attempted) as total_hucks_attempted,
-        SUM(blocks) as total_blocks,
-        SUM(throwaways + stalls + drops) as total_turnovers,
-        SUM(o_points_played) as total_o_points,
-        SUM(o_points_scored) as total_o_scores,
-        SUM(d_points_played) as total_d_points,
-        SUM(d_points_scored) as total_d_scores
-    FROM player_game_stats
-    WHERE game_id = :game_id
-    GROUP BY team_id
-    """
-
-    return db.execute_query(team_stats_query, {"game_id": game_id})
+def get_team_statistics(team: dict[str, Any]) -> dict[str, Any]:
+    """Get a team's statistics for a game from its box score."""
+    stats = team["stats"]
+    result = {
+        "team_id": team["team_id"],
+        "total_completions": stats["completions"]["made"],
+        "total_attempts": stats["completions"]["attempted"],
+        "total_hucks_completed": stats["hucks"]["made"],
+        "total_hucks_attempted": stats["hucks"]["attempted"],
+        "total_blocks": stats["blocks"],
+        "total_turnovers": stats["turnovers"],
+    }
+    # Possession percentages are missing for games without events
+    for key, (stat, made, total) in TEAM_PERCENTAGES.items():
+        if stat in stats:
+            pct, display = calculate_percentage(stats[stat][made], stats[stat][total])
+            result[key] = pct
+            result[f"{key}_display"] = display
+    return result
@@ -0,0 +1,136 @@
+"""
+Pass heatmap binning.
+
+Bins pass origins or destinations into a grid over the field and aggregates
+attempts, completions and vertical gain per cell and pass type. Shared by the
+/api/pass-events/heatmap endpoint and the import-time pass_heatmap_cells refresh,
+so live and precomputed cells use the same grid.
+"""
+
+import numpy as np
+from utils.pass_type import PASS_TYPES
+
+# Field coordinates: x across the field (53.3 yards wide, centered on 0),
+# y from the back of one end zone to the back of the other
+FIELD_X_RANGE = (-26.65, 26.65)
+FIELD_Y_RANGE = (0.0, 120.0)
+
+# Default grid: 8 columns of ~6.7 yards by 24 rows of 5 yards
+DEFAULT_BINS_X = 8
+DEFAULT_BINS_Y = 24
+
+HEATMAP_POINTS = ("origin", "destination")
+
+
+def cell_index(x: np.ndarray, y: np.ndarray, bins_x: int, bins_y: int) -> np.ndarray:
+    """
+    Flattened grid cell (row * bins_x + column) of each point.
+
+    Points outside the field are clamped into the edge cells.
+
+    Args:
+        x: X coordinates (NaN when unknown)
+        y: Y coordinates (NaN when unknown)
+        bins_x: Number of columns across the field
+        bins_y: Number of rows along the field
+
+    Returns:
+        int64 cell per point, -1 where either coordinate is unknown
+    """
+    known = ~(np.isnan(x) | np.isnan(y))
+    x_min, x_max = FIELD_X_RANGE
+    y_min, y_max = FIELD_Y_RANGE
+    with np.errstate(invalid="ignore"):
+        column = np.floor((x - x_min) * bins_x / (x_max - x_min))
+        row = np.floor((y - y_min) * bins_y / (y_max - y_min))
+    column = np.clip(np.nan_to_num(column), 0, bins_x - 1).astype(np.int64)
+    row = np.clip(np.nan_to_num(row), 0, bins_y - 1).astype(np.int64)
+    return np.where(known, row * bins_x + column, -1)
+
+
+def pass_type_codes(pass_types: np.ndarray) -> np.ndarray:
+    """PASS_TYPES index of each pass, len(PASS_TYPES) when unclassified."""
+    codes = np.full(len(pass_types), len(PASS_TYPES), dtype=np.int64)
+    for code, pass_type in enumerate(PASS_TYPES):
+        codes[pass_types == pass_type] = code
+    return codes
+
+
+def bin_passes(
+    cells: np.ndarray,
+    type_codes: np.ndarray,
+    completed: np.ndarray,
+    gains: np.ndarray,
+    n_cells: int,
+) -> dict[str, np.ndarray]:
+    """
+    Histogram passes by pass type and cell.
+
+    Args:
+        cells: Result of cell_index(); passes at -1 are skipped
+        type_codes: Result of pass_type_codes()
+        completed: Whether each pass was completed
+        gains: Vertical yards per pass (NaN when unknown)
+        n_cells: bins_x * bins_y
+
+    Returns:
+        attempts, completions, total_gain and gain_count, each shaped
+        (len(PASS_TYPES) + 1, n_cells) with the last row for unclassified passes
+    """
+    binned = cells >= 0
+    slots = type_codes[binned] * n_cells + cells[binned]
+    gains = gains[binned]
+    gained = ~np.isnan(gains)
+    shape = (len(PASS_TYPES) + 1, n_cells)
+    size = shape[0] * n_cells
+
+    def histogram(weights=None, keep=None) -> np.ndarray:
+        counted = slots if keep is None else slots[keep]
+        return np.bincount(counted, weights=weights, minlength=size).reshape(shape)
+
+    return {
+        "attempts": histogram(),
+        "completions": histogram(keep=completed[binned]),
+        "total_gain": histogram(weights=gains[gained], keep=gained),
+        "gain_count": histogram(keep=gained),
+    }
+
+
+def _cell_stats(attempts, completions, total_gain, gain_count) -> dict:
+    return {
+        "count": int(attempts),
+        "completions": int(completions),
+        "turnovers": int(attempts - completions),
+        "completion_pct": round(float(completions / attempts * 100), 1),
+        "avg_gain": round(float(total_gain / gain_count), 1) if gain_count else None,
+    }
+
+
+def heatmap_cells(binned: dict[str, np.ndarray], bins_x: int) -> list[dict]:
+    """
+    Sparse cell list for the heatmap response.
+
+    Args:
+        binned: Result of bin_passes()
+        bins_x: Number of columns across the field
+
+    Returns:
+        One entry per cell with passes: its column and row, totals over all
+        passes, and the same stats per classified pass type
+    """
+    totals = {name: counts.sum(axis=0) for name, counts in binned.items()}
+    cells = []
+    for cell in np.flatnonzero(totals["attempts"]):
+        row, column = divmod(int(cell), bins_x)
+        entry = {
+            "x": column,
+            "y": row,
+            **_cell_stats(*(totals[name][cell] for name in binned)),
+            "by_type": {
+                pass_type: _cell_stats(*(binned[name][code, cell] for name in binned))
+                for code, pass_type in enumerate(PASS_TYPES)
+                if binned["attempts"][code, cell]
+            },
+        }
+        cells.append(entry)
+    return cells
@@ -2,8 +2,74 @@
 SQL query building helpers and data conversion utilities.
 """
 
+from collections.abc import Callable
 from typing import Any
 
+import numpy as np
+
+# Counting stats shown as per-game averages in per-game mode. Sorting and
+# filtering use the same lists so the order matches the displayed values.
+PER_GAME_STATS = (
+    "total_points_played",
+    "possessions",
+    "score_total",
+    "total_assists",
+    "total_goals",
+    "total_blocks",
+    "total_completions",
+    "total_yards",
+    "total_yards_thrown",
+    "total_yards_received",
+    "total_hockey_assists",
+    "total_throwaways",
+    "total_stalls",
+    "total_drops",
+    "total_callahans",
+    "total_hucks_completed",
+    "total_hucks_attempted",
+    "total_hucks_received",
+    "total_pulls",
+    "total_o_points_played",
+    "total_d_points_played",
+    "minutes_played",
+    "total_o_opportunities",
+    "total_d_opportunities",
+    "total_o_opportunity_scores",
+    "calculated_plus_minus",
+)
+
+# Counting stats shown per 100 offensive possessions in per-possession mode
+PER_POSSESSION_STATS = (
+    "score_total",
+    "total_assists",
+    "total_goals",
+    "total_blocks",
+    "total_completions",
+    "total_yards",
+    "total_yards_thrown",
+    "total_yards_received",
+    "total_hockey_assists",
+    "total_throwaways",
+    "total_stalls",
+    "total_drops",
+    "total_callahans",
+    "total_hucks_completed",
+    "total_hucks_attempted",
+    "total_hucks_received",
+    "calculated_plus_minus",
+)
+
+
+def is_rate_stat(
+    stat: str, per_game: bool = False, per_possession: bool = False
+) -> bool:
+    """Whether a stat is displayed (and so sorted/filtered) as a rate in this mode."""
+    if per_possession:
+        return stat in PER_POSSESSION_STATS
+    if per_game:
+        return stat in PER_GAME_STATS
+    return False
+
 
 def get_sort_column(
     sort_key: str,
@@ -53,25 +119,12 @@ def get_sort_column(
         }
         base_column = career_columns.get(sort_key, sort_key)
 
-        # Define non-counting stats
-        non_counting_stats = [
-            "full_name",
-            "completion_percentage",
-            "huck_percentage",
-            "offensive_efficiency",
-            "yards_per_turn",
-            "yards_per_completion",
-            "yards_per_reception",
-            "assists_per_turnover",
-            "games_played",
-        ]
-
         # If per_possession mode and sorting by a counting stat, divide by possessions and multiply by 100
-        if per_possession and sort_key not in non_counting_stats:
+        if per_possession and is_rate_stat(sort_key, per_possession=True):
             return f"CASE WHEN possessions > 0 THEN CAST({base_column} AS NUMERIC) / possessions * 100 ELSE 0 END"
 
         # If per_game mode and sorting by a counting stat, divide by games_played
-        if per_game and sort_key not in non_counting_stats:
+        if per_game and is_rate_stat(sort_key, per_game=True):
             return f"CASE WHEN games_played > 0 THEN CAST({base_column} AS NUMERIC) / games_played ELSE 0 END"
 
         return base_column
@@ -99,7 +152,7 @@ def get_sort_column(
         "total_o_points_played": "pss.total_o_points_played",
         "total_d_points_played": "pss.total_d_points_played",
         "total_seconds_played": "pss.total_seconds_played",
-        "games_played": "COUNT(DISTINCT CASE WHEN (pgs.o_points_played > 0 OR pgs.d_points_played > 0 OR pgs.seconds_played > 0 OR pgs.goals > 0 OR pgs.assists > 0) THEN pgs.game_id ELSE NULL END)",
+        "games_played": "pss.games_played",
         "possessions": "pss.total_o_opportunities",
         "score_total": "(pss.total_goals + pss.total_assists)",
         "total_points_played": "(pss.total_o_points_played + pss.total_d_points_played)",
@@ -116,127 +169,121 @@ def get_sort_column(
     # Get the base column
     base_column = column_mapping.get(sort_key, f"pss.{sort_key}")
 
-    # Define non-counting stats
-    non_counting_stats = [
-        "full_name",
-        "completion_percentage",
-        "huck_percentage",
-        "offensive_efficiency",
-        "yards_per_turn",
-        "yards_per_completion",
-        "yards_per_reception",
-        "assists_per_turnover",
-        "games_played",
-    ]
-
     # If per_possession mode and sorting by a counting stat, divide by possessions and multiply by 100
-    if per_possession and sort_key not in non_counting_stats:
+    if per_possession and is_rate_stat(sort_key, per_possession=True):
         possessions_col = column_mapping["possessions"]
         return f"CASE WHEN {possessions_col} > 0 THEN CAST({base_column} AS NUMERIC) / {possessions_col} * 100 ELSE 0 END"
 
     # If per_game mode and sorting by a counting stat, divide by games_played
-    if per_game and sort_key not in non_counting_stats:
+    if per_game and is_rate_stat(sort_key, per_game=True):
         games_played_col = column_mapping["games_played"]
         return f"CASE WHEN {games_played_col} > 0 THEN CAST({base_column} AS NUMERIC) / {games_played_col} ELSE 0 END"
 
     return base_column
 
 
-def convert_to_per_game_stats(players: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Convert player statistics to per-game averages."""
-    for player in players:
-        games = player["games_played"]
-        if games > 0:
-            # Convert counting stats to per-game averages
-            per_game_stats = [
-                "total_points_played",
-                "possessions",
-                "score_total",
-                "total_assists",
-                "total_goals",
-                "total_blocks",
-                "total_completions",
-                "total_yards",
-                "total_yards_thrown",
-                "total_yards_received",
-                "total_hockey_assists",
-                "total_throwaways",
-                "total_stalls",
-                "total_drops",
-                "total_callahans",
-                "total_hucks_completed",
-                "total_hucks_attempted",
-                "total_hucks_received",
-                "total_pulls",
-                "total_o_points_played",
-                "total_d_points_played",
-                "minutes_played",
-                "total_o_opportunities",
-                "total_d_opportunities",
-                "total_o_opportunity_scores",
-            ]
-
-            for stat in per_game_stats:
-                if stat in player and player[stat] is not None:
-                    # Use proper rounding to avoid floating point precision issues
-                    value = player[stat] / games
-                    # Round to 1 decimal place, ensuring proper precision
-                    player[stat] = float(format(value, ".1f"))
-
-            # Plus/minus also needs to be averaged
-            if (
-                "calculated_plus_minus" in player
-                and player["calculated_plus_minus"] is not None
-            ):
-                value = player["calculated_plus_minus"] / games
-                player["calculated_plus_minus"] = float(format(value, ".1f"))
+def _round_tenths(rates: np.ndarray, exact: Callable[[int], float]) -> np.ndarray:
+    """
+    Round rates to 1 decimal place exactly like float(format(rate, ".1f")).
+
+    np.rint(rate * 10) / 10 agrees with format() except where rate * 10 lands
+    within float error of a .5 tie, so those few entries are rounded by
+    exact(index) instead.
+    """
+    tenths = rates * 10
+    rounded = np.rint(tenths) / 10
+    with np.errstate(invalid="ignore"):
+        near_tie = np.abs(np.abs(tenths - np.trunc(tenths)) - 0.5) <= 1e-6 * np.maximum(
+            1.0, np.abs(tenths)
+        )
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = exact(int(i))
+    return rounded
+
+
+def _convert_players(
+    players: list[dict[str, Any]], per_mode: str, denominator: Callable
+) -> list[dict[str, Any]]:
+    """Convert player dicts in place through NumPy columns, one stat at a time."""
+    stats = PER_GAME_STATS if per_mode == "game" else PER_POSSESSION_STATS
+    scale = 1 if per_mode == "game" else 100
+    denominators = [denominator(player) for player in players]
+    active = [i for i, d in enumerate(denominators) if d > 0]
+    if not active:
+        return players
 
+    rows = [players[i] for i in active]
+    row_denominators = [denominators[i] for i in active]
+    # One (player, stat) table; missing and NULL stats become NaN and are left untouched
+    table = np.array([[*map(row.get, stats)] for row in rows], dtype=np.float64)
+    rates = table / np.array(row_denominators, dtype=np.float64)[:, None]
+    if scale != 1:
+        rates = rates * scale
+
+    def exact(i):
+        # Same arithmetic as the per-player conversion, on the original values
+        row, column = divmod(i, len(stats))
+        value = rows[row][stats[column]] / row_denominators[row]
+        return float(format(value * scale if scale != 1 else value, ".1f"))
+
+    rounded = _round_tenths(rates.ravel(), exact).reshape(rates.shape).tolist()
+    incomplete = np.isnan(table).any(axis=1).tolist()
+    for row, values, skip in zip(rows, rounded, incomplete, strict=True):
+        if skip:
+            row.update((s, v) for s, v in zip(stats, values, strict=True) if v == v)
+        else:
+            row.update(zip(stats, values, strict=True))
     return players
 
 
+def convert_to_per_game_stats(players: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Convert player statistics to per-game averages."""
+    return _convert_players(
+        players, "game", lambda player: player.get("games_played") or 0
+    )
+
+
 def convert_to_per_possession_stats(
     players: list[dict[str, Any]],
 ) -> list[dict[str, Any]]:
     """Convert player statistics to per-100-possession rates."""
-    for player in players:
-        # Use offensive possessions (total_o_opportunities) as the denominator
-        possessions = (
-            player.get("total_o_opportunities") or player.get("possessions") or 0
-        )
-        if possessions > 0:
-            # Convert counting stats to per-100-possession rates
-            per_possession_stats = [
-                "score_total",
-                "total_assists",
-                "total_goals",
-                "total_blocks",
-                "total_completions",
-                "total_yards",
-                "total_yards_thrown",
-                "total_yards_received",
-                "total_hockey_assists",
-                "total_throwaways",
-                "total_stalls",
-                "total_drops",
-                "total_callahans",
-                "total_hucks_completed",
-                "total_hucks_attempted",
-                "total_hucks_received",
-            ]
-
-            for stat in per_possession_stats:
-                if stat in player and player[stat] is not None:
-                    # Calculate per-100-possession rate
-                    value = (player[stat] / possessions) * 100
-                    # Round to 1 decimal place, ensuring proper precision
-                    player[stat] = float(format(value, ".1f"))
-
-            # Plus/minus also needs to be converted
-            if (
-                "calculated_plus_minus" in player
-                and player["calculated_plus_minus"] is not None
-            ):
-                value = (player["calculated_plus_minus"] / possessions) * 100
-                player["calculated_plus_minus"] = float(format(value, ".1f"))
+    # Use offensive possessions (total_o_opportunities) as the denominator
+    return _convert_players(
+        players,
+        "possession",
+        lambda player: player.get("total_o_opportunities")
+        or player.get("possessions")
+        or 0,
+    )
 
-    return players
+
+def parse_fields(fields: str | None) -> list[str] | None:
+    """
+    Parse a comma-separated fields projection.
+
+    Returns:
+        Field names in request order without duplicates, or None for all fields
+    """
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    return list(dict.fromkeys(names)) or None
+
+
+def project_fields(
+    records: list[dict[str, Any]],
+    fields: list[str] | None,
+    always: tuple[str, ...] = (),
+) -> list[dict[str, Any]]:
+    """
+    Keep only the requested fields (plus the always-returned keys) of each record.
+
+    Unknown field names are ignored. With no projection the records are
+    returned unchanged.
+    """
+    if not fields:
+        return records
+    keep = [*always, *(name for name in fields if name not in always)]
+    return [
+        {name: record[name] for name in keep if name in record} for record in records
+    ]
@@ -68,6 +68,14 @@ export interface TeamData {
     logo_url?: string;
 }
 
+export interface ScoringPlay {
+    quarter: number;
+    event_time: number | null;
+    team: 'home' | 'away';
+    home_score: number;
+    away_score: number;
+}
+
 export interface BoxScoreData {
     game_id: string;
     status: string;
@@ -77,6 +85,7 @@ export interface BoxScoreData {
     week: string;
     home_team: TeamData;
     away_team: TeamData;
+    scoring_timeline?: ScoringPlay[];
 }
 
 class GameDetailPage {
@@ -778,15 +778,25 @@ class PlayerStats {
         }
     }
 
-    getPercentile(playerName: string, statKey: string): number | null {
-        if (!this.percentiles || !this.percentiles[playerName]) {
+    // Mirrors percentile_key() in backend/api/player_stats/percentile_calculator.py
+    getPercentileKey(player: PlayerSeasonStats): string {
+        const row = player as any;
+        const key = `${row.player_id}_${row.team_id ?? ''}`;
+        if (row.year === null || row.year === undefined) {
+            return key;
+        }
+        return `${key}_${row.year}`;
+    }
+
+    getPercentile(percentileKey: string, statKey: string): number | null {
+        if (!this.percentiles || !this.percentiles[percentileKey]) {
             return null;
         }
-        return this.percentiles[playerName][statKey] ?? null;
+        return this.percentiles[percentileKey][statKey] ?? null;
     }
 
-    formatCellWithPercentile(value: string, playerName: string, statKey: string): string {
-        const percentile = this.getPercentile(playerName, statKey);
+    formatCellWithPercentile(value: string, percentileKey: string, statKey: string): string {
+        const percentile = this.getPercentile(percentileKey, statKey);
         if (percentile !== null && percentile !== undefined) {
             return `<div class="stat-cell"><div class="stat-value">${value}</div><div class="stat-percentile">${percentile}%</div></div>`;
         }
@@ -807,6 +817,7 @@ class PlayerStats {
 
         tbody.innerHTML = this.players.map(player => {
             const playerName = player.player_name || `${player.first_name || ''} ${player.last_name || ''}`.trim();
+            const percentileKey = this.getPercentileKey(player);
 
             const cells = columns.map(col => {
                 let value: number | string;
@@ -818,19 +829,19 @@ class PlayerStats {
                     case 'total_points_played':
                         value = player.total_points_played || 0;
                         displayValue = this.formatValue(value);
-                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, playerName, col.key)}</td>`;
+                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, percentileKey, col.key)}</td>`;
                     case 'score_total':
                         value = player.score_total || 0;
                         displayValue = this.formatValue(value);
-                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, playerName, col.key)}</td>`;
+                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, percentileKey, col.key)}</td>`;
                     case 'calculated_plus_minus':
                         displayValue = this.formatValue(player[col.key as keyof PlayerSeasonStats] || 0, false);
-                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, playerName, col.key)}</td>`;
+                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, percentileKey, col.key)}</td>`;
                     case 'completion_percentage':
                         // Backend already returns this as a percentage value (e.g., 95.79)
                         const compPct = player[col.key as keyof PlayerSeasonStats] as number;
                         displayValue = compPct ? compPct.toFixed(1) : '-';
-                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, playerName, col.key)}</td>`;
+                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, percentileKey, col.key)}</td>`;
                     case 'huck_percentage':
                         // Require minimum 10 huck attempts to display H%
                         const huckAttempts = (player as any).total_hucks_attempted || 0;
@@ -839,27 +850,27 @@ class PlayerStats {
                         }
                         const huckPct = player.huck_percentage || this.calculateHuckPercentage(player);
                         displayValue = huckPct ? huckPct.toFixed(1) : '-';
-                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, playerName, col.key)}</td>`;
+                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, percentileKey, col.key)}</td>`;
                     case 'yards_per_turn':
                         const yPerTurn = player.yards_per_turn;
                         displayValue = yPerTurn !== null && yPerTurn !== undefined ? yPerTurn.toFixed(1) : '-';
-                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, playerName, col.key)}</td>`;
+                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, percentileKey, col.key)}</td>`;
                     case 'yards_per_completion':
                         const yPerComp = player.yards_per_completion;
                         displayValue = yPerComp !== null && yPerComp !== undefined ? yPerComp.toFixed(1) : '-';
-                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, playerName, col.key)}</td>`;
+                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, percentileKey, col.key)}</td>`;
                     case 'yards_per_reception':
                         const yPerRecep = player.yards_per_reception;
                         displayValue = yPerRecep !== null && yPerRecep !== undefined ? yPerRecep.toFixed(1) : '-';
-                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, playerName, col.key)}</td>`;
+                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, percentileKey, col.key)}</td>`;
                     case 'assists_per_turnover':
                         const astPerTO = player.assists_per_turnover;
                         displayValue = astPerTO !== null && astPerTO !== undefined ? astPerTO.toFixed(2) : '-';
-                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, playerName, col.key)}</td>`;
+                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, percentileKey, col.key)}</td>`;
                     default:
                         const fieldValue = player[col.key as keyof PlayerSeasonStats];
                         displayValue = this.formatValue(fieldValue || 0);
-                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, playerName, col.key)}</td>`;
+                        return `<td class="numeric">${this.formatCellWithPercentile(displayValue, percentileKey, col.key)}</td>`;
                 }
             });
 
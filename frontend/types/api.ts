@@ -41,7 +41,7 @@ export interface StatsResponse {
 export interface PlayerStatsResponse {
   /** List of player statistics for the requested page */
   players: PlayerSeasonStats[];
-  /** Global percentile rankings for each player's stats (0-100 scale) */
+  /** Global percentile rankings (0-100 scale) for this page's players, keyed by player_id_team_id (career) or player_id_team_id_year (season) */
   percentiles: Record<string, Record<string, number>>;
   /** Total number of players matching the query */
   total: number;
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark the team stats of a box score.
+
+Compares calculate_game_team_stats() for games without team_game_stats rows
+(built on the fly: a player stats aggregate, an event fetch and the
+possession processors) with the same call once refresh_team_game_stats() has
+stored them (one lookup), on synthetic games (the generator from
+benchmark_play_by_play.py) in a SQLite database. Reports time per box score
+and the connections and statements each path uses.
+
+SQLite connects in-process, so the time saved per connection against
+Postgres is understated here.
+
+Run this via: uv run python scripts/benchmark_box_score_stats.py [--games 20]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event, text
+
+# Add backend and scripts to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from benchmark_play_by_play import make_game
+from data.database import SQLDatabase
+from services.box_score_service import calculate_game_team_stats
+from services.team_game_stats import (
+    LINE_COLUMNS,
+    SUMMED_COLUMNS,
+    refresh_team_game_stats,
+)
+
+STAT_COLUMNS = SUMMED_COLUMNS + LINE_COLUMNS
+
+MIGRATIONS = [
+    Path(__file__).parent.parent / "backend/migrations" / name
+    for name in (
+        "020_add_team_game_stats.sql",
+        "021_add_team_game_quarter_scores.sql",
+        "022_add_team_game_stats_watermark.sql",
+    )
+]
+
+
+class StatsSystem:
+    def __init__(self, db):
+        self.db = db
+
+
+def make_database(path: Path, games: int) -> tuple[SQLDatabase, list[str]]:
+    """Synthetic games with events and player stat lines."""
+    rng = random.Random(1)
+    db = SQLDatabase(f"sqlite:///{path}")
+    game_ids = [f"2024-game-{n}" for n in range(games)]
+    with db.engine.begin() as conn:
+        for migration in MIGRATIONS:
+            for statement in migration.read_text().split(";")[:-1]:
+                conn.execute(text(statement))
+        conn.execute(
+            text(
+                "CREATE TABLE games (game_id, year, home_team_id, away_team_id, "
+                "game_type)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO games VALUES (:game_id, 2024, 'h', 'a', 'regular')"),
+            [{"game_id": game_id} for game_id in game_ids],
+        )
+        conn.execute(text("""
+            CREATE TABLE game_events (
+                id INTEGER PRIMARY KEY, game_id TEXT, event_index INTEGER,
+                team TEXT, event_type INTEGER, event_time INTEGER,
+                receiver_y REAL, thrower_y REAL
+            )
+            """))
+        conn.execute(text("CREATE INDEX idx_game_events ON game_events(game_id, team)"))
+        conn.execute(text(f"""
+            CREATE TABLE player_game_stats (
+                game_id TEXT, team_id TEXT, player_id TEXT,
+                {", ".join(f"{c} INTEGER" for c in STAT_COLUMNS)}
+            )
+            """))
+        conn.execute(
+            text("CREATE INDEX idx_pgs ON player_game_stats(game_id, team_id)")
+        )
+        for game_id in game_ids:
+            conn.execute(
+                text(
+                    "INSERT INTO game_events (game_id, event_index, team, "
+                    "event_type, event_time, receiver_y, thrower_y) VALUES "
+                    "(:game_id, :event_index, :team, :event_type, :event_time, "
+                    ":receiver_y, :thrower_y)"
+                ),
+                [
+                    {
+                        key: row[key]
+                        for key in (
+                            "event_index",
+                            "team",
+                            "event_type",
+                            "event_time",
+                            "receiver_y",
+                            "thrower_y",
+                        )
+                    }
+                    | {"game_id": game_id}
+                    for row in make_game(rng)
+                ],
+            )
+            conn.execute(
+                text(
+                    f"INSERT INTO player_game_stats VALUES (:game_id, :team, :player, "
+                    f"{', '.join(':' + c for c in STAT_COLUMNS)})"
+                ),
+                [
+                    {"game_id": game_id, "team": team, "player": f"{team}{n}"}
+                    | {c: rng.randint(0, 20) for c in STAT_COLUMNS}
+                    for team in ("h", "a")
+                    for n in range(20)
+                ],
+            )
+    return db, game_ids
+
+
+def measure(fn, game_ids, counts, repeat) -> tuple[float, int, int]:
+    """Best time of fn() over every game, and the connections and statements of a run."""
+    best = float("inf")
+    for _ in range(repeat):
+        counts.update(connections=0, statements=0)
+        start = time.perf_counter()
+        for game_id in game_ids:
+            fn(game_id)
+        best = min(best, time.perf_counter() - start)
+    return best, counts["connections"], counts["statements"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db, game_ids = make_database(Path(tmp) / "box_score.db", args.games)
+        stats_system = StatsSystem(db)
+
+        counts = {"connections": 0, "statements": 0}
+        event.listen(
+            db.engine,
+            "connect",
+            lambda *_: counts.__setitem__("connections", counts["connections"] + 1),
+        )
+        event.listen(
+            db.engine,
+            "before_cursor_execute",
+            lambda *_: counts.__setitem__("statements", counts["statements"] + 1),
+        )
+
+        def run(game_id):
+            return calculate_game_team_stats(stats_system, game_id, "h", "a")
+
+        built = [run(game_id) for game_id in game_ids]
+        timings = [("built", measure(run, game_ids, counts, args.repeat))]
+        refresh_team_game_stats(db, game_ids)
+        assert [run(game_id) for game_id in game_ids] == built
+        timings.append(("stored", measure(run, game_ids, counts, args.repeat)))
+
+        print(
+            f"{'path':<10} {'ms/box score':>13} {'connections':>12} {'statements':>11}"
+        )
+        for name, (seconds, connections, statements) in timings:
+            print(
+                f"{name:<10} {seconds * 1000 / len(game_ids):>13.2f} "
+                f"{connections / len(game_ids):>12.0f} "
+                f"{statements / len(game_ids):>11.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark fields projections on the player and team stats endpoints.
+
+Compares every column against a projection for:
+  - the season player stats query (time and JSON payload of a page)
+  - percentile ranking of a cached population (first request per mode)
+  - the career team stats query
+
+Uses synthetic data in an in-memory SQLite stand-in, so no database is needed.
+
+Run this via: uv run python scripts/benchmark_fields_projection.py [--players 20000]
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from api.player_stats.columns import IDENTITY_COLUMNS, PLAYER_COLUMNS
+from api.player_stats.percentile_calculator import STAT_FIELDS
+from api.player_stats.percentile_engine import PercentilePopulation
+from api.player_stats.query_builder import PlayerStatsQueryBuilder, row_to_player_dict
+from services.chat_system.team_stats import TeamStatsService
+from utils.query import project_fields
+
+FIELDS = ["total_goals", "total_assists", "total_blocks", "calculated_plus_minus"]
+TEAM_FIELDS = ["wins", "losses", "scores", "scores_against"]
+
+
+def best_of(fn, repeat: int) -> float:
+    """Best wall time of fn() in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def make_database(players: int, teams: int = 24) -> sqlite3.Connection:
+    """Synthetic player_season_stats, players, teams and team_season_stats."""
+    rng = random.Random(1)
+    stat_columns = [
+        c
+        for c in PLAYER_COLUMNS
+        if c.startswith("total_") or c in ("games_played", "calculated_plus_minus")
+    ] + ["total_catches"]
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE player_season_stats (player_id TEXT, team_id TEXT, year INTEGER, "
+        f"{', '.join(f'{c} INTEGER' for c in stat_columns)})"
+    )
+    conn.execute(
+        "CREATE TABLE players (player_id TEXT, year INTEGER, team_id TEXT, "
+        "full_name TEXT, first_name TEXT, last_name TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE teams (team_id TEXT, year INTEGER, name TEXT, full_name TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO players VALUES (?, 2024, ?, ?, 'First', ?)",
+        [(f"p{p}", f"t{p % teams}", f"First {p}", str(p)) for p in range(players)],
+    )
+    conn.executemany(
+        f"INSERT INTO player_season_stats VALUES ({', '.join('?' * (len(stat_columns) + 3))})",
+        [
+            (
+                f"p{p}",
+                f"t{p % teams}",
+                2024,
+                *[rng.randint(0, 300) for _ in stat_columns],
+            )
+            for p in range(players)
+        ],
+    )
+
+    team_stats = [
+        "completions", "turnovers", "throw_attempts", "hucks_completed",
+        "hucks_attempted", "blocks", "o_line_scores", "d_line_scores",
+        "hold_percentage", "o_line_conversion", "break_percentage",
+        "d_line_conversion", "red_zone_conversion",
+    ]  # fmt: skip
+    team_columns = [
+        "team_id", "year", "games_played", "wins", "losses", "scores",
+        "scores_against", *team_stats, *(f"opp_{s}" for s in team_stats),
+    ]  # fmt: skip
+    conn.execute(f"CREATE TABLE team_season_stats ({', '.join(team_columns)})")
+    for team in range(teams):
+        for year in range(2012, 2026):
+            conn.execute(
+                "INSERT INTO teams VALUES (?, ?, ?, ?)",
+                (f"t{team}", year, f"T{team}", f"Team {team}"),
+            )
+            conn.execute(
+                f"INSERT INTO team_season_stats VALUES ({', '.join('?' * len(team_columns))})",
+                (f"t{team}", year, *[rng.randint(1, 400) for _ in team_columns[2:]]),
+            )
+    conn.execute("CREATE INDEX idx_pss_year ON player_season_stats(year)")
+    conn.execute("CREATE INDEX idx_players ON players(player_id, year)")
+    conn.execute("CREATE INDEX idx_teams ON teams(team_id, year)")
+    return conn
+
+
+def builder(per_page: int, fields: list[str] | None) -> PlayerStatsQueryBuilder:
+    return PlayerStatsQueryBuilder(
+        seasons=["2024"],
+        teams=["all"],
+        is_career_mode=False,
+        filters_list=[],
+        per_game_mode=False,
+        per_possession_mode=False,
+        sort="total_goals",
+        order="desc",
+        page=1,
+        per_page=per_page,
+        fields=fields,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--players", type=int, default=20000)
+    parser.add_argument("--per-page", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    conn = make_database(args.players)
+    print(
+        f"{args.players:,} players, {args.per_page} per page, fields={','.join(FIELDS)}"
+    )
+    print(f"{'':<28} {'all ms':>10} {'fields ms':>10} {'all KB':>10} {'fields KB':>10}")
+
+    payloads = {}
+    timings = {}
+    for name, fields in [("all", None), ("fields", FIELDS)]:
+        query = builder(args.per_page, fields).build_main_query()
+
+        def page(query=query, fields=fields):
+            players = [row_to_player_dict(row) for row in conn.execute(query)]
+            return project_fields(players, fields, always=IDENTITY_COLUMNS)
+
+        timings[name] = best_of(page, args.repeat)
+        payloads[name] = len(json.dumps(page(), default=float)) / 1024
+    print(
+        f"{'player stats page':<28} {timings['all']:>10.2f} {timings['fields']:>10.2f} "
+        f"{payloads['all']:>10.1f} {payloads['fields']:>10.1f}"
+    )
+
+    rng = np.random.default_rng(2)
+    values = rng.integers(0, 300, size=(args.players, len(STAT_FIELDS))).astype(float)
+    keys = [f"p{i}" for i in range(args.players)]
+    page_keys = keys[: args.per_page]
+    for name, fields in [("all", None), ("fields", FIELDS)]:
+        # A fresh population each run, so the per-mode ranking is included
+        timings[name] = best_of(
+            lambda fields=fields: PercentilePopulation(keys, values).percentiles_for(
+                page_keys, "game", fields
+            ),
+            args.repeat,
+        )
+        payloads[name] = (
+            len(
+                json.dumps(
+                    PercentilePopulation(keys, values).percentiles_for(
+                        page_keys, "game", fields
+                    )
+                )
+            )
+            / 1024
+        )
+    print(
+        f"{'percentiles (first request)':<28} {timings['all']:>10.2f} {timings['fields']:>10.2f} "
+        f"{payloads['all']:>10.1f} {payloads['fields']:>10.1f}"
+    )
+
+    conn.row_factory = sqlite3.Row
+
+    class Database:
+        def execute_query(self, query, params):
+            return [dict(row) for row in conn.execute(query, params)]
+
+    service = TeamStatsService(Database())
+    for name, fields in [("all", None), ("fields", TEAM_FIELDS)]:
+        timings[name] = best_of(
+            lambda fields=fields: service.get_comprehensive_team_stats(
+                "career", fields=fields
+            ),
+            args.repeat,
+        )
+        payloads[name] = (
+            len(
+                json.dumps(
+                    service.get_comprehensive_team_stats("career", fields=fields)
+                )
+            )
+            / 1024
+        )
+    print(
+        f"{'team stats (career)':<28} {timings['all']:>10.2f} {timings['fields']:>10.2f} "
+        f"{payloads['all']:>10.2f} {payloads['fields']:>10.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
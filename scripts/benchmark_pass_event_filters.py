@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark the players facet of /api/pass-events/filters.
+
+At all-seasons scope (and for one season and team), compares finding the
+players with pass events via:
+  - join: players joined to every game_events row on thrower OR receiver
+  - scoped: query_pass_event_filters(), the whole response from queries
+    scoped to the selection against pass_event_participants, as served
+    without caching (where loading the index costs a full load per request)
+  - index: PassEventFacets.players() on the in-memory facet index
+
+Uses a synthetic SQLite database as a stand-in, so no server is needed.
+
+Run this via: uv run python scripts/benchmark_pass_event_filters.py [--games-per-season 100]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.pass_event_facets import PassEventFacets, query_pass_event_filters
+from data.database import SQLDatabase
+
+from scripts.ufa.importers.events_importer import (
+    PASS_EVENT_PARTICIPANTS_INSERT,
+    PASS_EVENTS_INSERT,
+)
+
+YEARS = [y for y in range(2012, 2026) if y != 2020]
+TEAMS = [f"team{t}" for t in range(24)]
+
+OLD_PLAYERS_QUERY = """
+SELECT DISTINCT p.player_id, p.full_name
+FROM players p
+JOIN game_events ge ON (p.player_id = ge.thrower_id OR p.player_id = ge.receiver_id)
+JOIN games g ON ge.game_id = g.game_id AND g.year = p.year
+WHERE ge.event_type IN (18, 19, 20, 22)
+{filters}
+ORDER BY p.full_name LIMIT 500
+"""
+
+
+def best_of(fn, repeat: int) -> float:
+    """Best wall time of fn() in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def make_database(path: Path, games_per_season: int, passes_per_game: int):
+    """Synthetic seasons of games, rosters and pass events."""
+    rng = random.Random(1)
+    db = SQLDatabase(f"sqlite:///{path}")
+    with db.engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE game_events (
+                id INTEGER PRIMARY KEY, game_id TEXT, team TEXT,
+                event_type INTEGER, pass_type TEXT, thrower_id TEXT, receiver_id TEXT,
+                thrower_x REAL, thrower_y REAL, receiver_x REAL, receiver_y REAL,
+                turnover_x REAL, turnover_y REAL, vertical_yards REAL,
+                horizontal_yards REAL, distance REAL
+            )
+            """))
+        conn.execute(
+            text("CREATE INDEX idx_game_events_type ON game_events(event_type)")
+        )
+        conn.execute(text("""
+            CREATE TABLE games (
+                game_id TEXT PRIMARY KEY, year INTEGER, week TEXT,
+                home_team_id TEXT, away_team_id TEXT,
+                home_score INTEGER, away_score INTEGER, start_timestamp TEXT
+            )
+            """))
+        conn.execute(text("CREATE TABLE teams (team_id, year, full_name, abbrev)"))
+        conn.execute(text("CREATE TABLE players (player_id, team_id, year, full_name)"))
+        conn.execute(text("CREATE INDEX idx_players ON players(player_id, year)"))
+        conn.execute(text("""
+            CREATE TABLE pass_events (
+                id INTEGER PRIMARY KEY, game_id TEXT, year INTEGER,
+                off_team_id TEXT, def_team_id TEXT, event_type INTEGER,
+                result INTEGER, pass_type INTEGER, thrower_id TEXT,
+                receiver_id TEXT, thrower_name TEXT, receiver_name TEXT,
+                thrower_x REAL, thrower_y REAL, receiver_x REAL, receiver_y REAL,
+                turnover_x REAL, turnover_y REAL, dest_x REAL, dest_y REAL,
+                vertical_yards REAL, horizontal_yards REAL, distance REAL
+            )
+            """))
+        conn.execute(text("""
+            CREATE TABLE pass_event_participants (
+                year INTEGER, game_id TEXT, team_id TEXT, player_id TEXT,
+                PRIMARY KEY (year, game_id, team_id, player_id)
+            )
+            """))
+
+        rosters = {}
+        for year in YEARS:
+            for t, team in enumerate(TEAMS):
+                conn.execute(
+                    text("INSERT INTO teams VALUES (:team, :year, :name, :abbrev)"),
+                    {
+                        "team": team,
+                        "year": year,
+                        "name": f"Team {t}",
+                        "abbrev": f"T{t}",
+                    },
+                )
+                roster = [f"player{(t * 30 + i + year * 7) % 3000}" for i in range(25)]
+                rosters[year, team] = roster
+                conn.execute(
+                    text("INSERT INTO players VALUES (:id, :team, :year, :name)"),
+                    [
+                        {"id": p, "team": team, "year": year, "name": f"Name {p}"}
+                        for p in roster
+                    ],
+                )
+
+        events = []
+        for year in YEARS:
+            for n in range(games_per_season):
+                home, away = rng.sample(TEAMS, 2)
+                game_id = f"{year}-game-{n}"
+                conn.execute(
+                    text(
+                        "INSERT INTO games VALUES (:id, :year, 'week-1', :home, :away, "
+                        "15, 14, :start)"
+                    ),
+                    {
+                        "id": game_id,
+                        "year": year,
+                        "home": home,
+                        "away": away,
+                        "start": f"{year}-06-01 19:{n % 60:02d}",
+                    },
+                )
+                for _ in range(passes_per_game):
+                    team = rng.choice(["home", "away"])
+                    roster = rosters[year, home if team == "home" else away]
+                    events.append(
+                        {
+                            "game_id": game_id,
+                            "team": team,
+                            "event_type": rng.choice([18, 18, 18, 19, 20, 22]),
+                            "thrower": rng.choice(roster),
+                            "receiver": rng.choice(roster),
+                        }
+                    )
+        conn.execute(
+            text(
+                "INSERT INTO game_events (game_id, team, event_type, thrower_id, "
+                "receiver_id) VALUES (:game_id, :team, :event_type, :thrower, :receiver)"
+            ),
+            events,
+        )
+        game_ids = [row[0] for row in conn.execute(text("SELECT game_id FROM games"))]
+        for game_id in game_ids:
+            conn.execute(text(PASS_EVENTS_INSERT), {"game_id": game_id})
+            conn.execute(text(PASS_EVENT_PARTICIPANTS_INSERT), {"game_id": game_id})
+        conn.execute(text("ANALYZE"))
+    return db, len(events)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--games-per-season", type=int, default=100)
+    parser.add_argument("--passes-per-game", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db, events = make_database(
+            Path(tmp) / "facets.db", args.games_per_season, args.passes_per_game
+        )
+        with db.engine.connect() as conn:
+            load_ms = best_of(lambda: PassEventFacets.load(conn), 1)
+            facets = PassEventFacets.load(conn)
+        print(f"{events:,} pass events; facet index loaded in {load_ms:.0f} ms")
+
+        season, team = YEARS[-1], TEAMS[0]
+        scopes = [
+            ("all seasons", "", {}),
+            (
+                f"{season}, {team}",
+                " AND g.year = :season AND ((ge.team = 'home' AND g.home_team_id = :team)"
+                " OR (ge.team = 'away' AND g.away_team_id = :team))",
+                {"season": season, "team": team},
+            ),
+        ]
+        print(f"{'players facet':<24} {'join ms':>9} {'scoped ms':>10} {'index ms':>9}")
+        for name, old_filters, params in scopes:
+            old_query = OLD_PLAYERS_QUERY.format(filters=old_filters)
+            old_ms = best_of(
+                lambda query=old_query, params=params: db.execute_query(query, params),
+                args.repeat,
+            )
+            scoped_ms = best_of(
+                lambda params=params: query_pass_event_filters(
+                    db, season=params.get("season"), team_id=params.get("team")
+                ),
+                args.repeat,
+            )
+            index_ms = best_of(
+                lambda params=params: facets.players(
+                    season=params.get("season"), team_id=params.get("team")
+                ),
+                args.repeat,
+            )
+            scoped = query_pass_event_filters(
+                db, season=params.get("season"), team_id=params.get("team")
+            )
+            assert scoped["players"] == facets.players(
+                season=params.get("season"), team_id=params.get("team")
+            )
+            print(f"{name:<24} {old_ms:>9.1f} {scoped_ms:>10.1f} {index_ms:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
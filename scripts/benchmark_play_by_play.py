@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark building play-by-play from game events.
+
+Times calculate_play_by_play() on a synthetic ~400-event game and on a full
+synthetic season, with the queries answered from memory so only the event
+processing is measured. Prints a digest of the output so builds from
+different revisions can be checked for identical results.
+
+Uses synthetic data, so no database is needed.
+
+Run this via: uv run python scripts/benchmark_play_by_play.py [--games 150]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from api.responses import dumps
+from services.play_by_play_service import calculate_play_by_play
+
+ROSTER = 28
+LINE = 7
+
+
+def _line(rng: random.Random, team: str) -> str:
+    return json.dumps([f"{team}{n}" for n in rng.sample(range(ROSTER), LINE)])
+
+
+def _coordinates(rng: random.Random) -> dict:
+    return {
+        "thrower_x": rng.uniform(-25, 25),
+        "thrower_y": rng.uniform(20, 100),
+        "receiver_x": rng.uniform(-25, 25),
+        "receiver_y": rng.uniform(20, 110),
+    }
+
+
+def make_game(rng: random.Random, points: int = 32) -> list[dict]:
+    """Synthetic events of both teams, about six per team per point."""
+    streams = {"home": [], "away": []}
+    quarter_ends = {points // 4: 28, points // 2: 29, 3 * points // 4: 30}
+    for point in range(points):
+        start = (point % (points // 4)) * 60
+        offense = rng.choice(["home", "away"])
+        for team, events in streams.items():
+            players = [f"{team}{n}" for n in range(ROSTER)]
+            on_offense = team == offense
+            events.append(
+                {
+                    "event_type": 2 if on_offense else 1,
+                    "event_time": start,
+                    "puller_id": None if on_offense else rng.choice(players),
+                    "line_players": _line(rng, team),
+                }
+            )
+            if not on_offense:
+                events.append({"event_type": 7, "pull_y": rng.uniform(80, 110)})
+
+            for _ in range(rng.randint(1, 6)):
+                thrower, receiver = rng.sample(players, 2)
+                if on_offense:
+                    event_type = rng.choice([18] * 12 + [20, 22, 24, 3])
+                else:
+                    event_type = rng.choice([11, 12, 13, 14, 3, 25])
+                events.append(
+                    {
+                        "event_type": event_type,
+                        "thrower_id": thrower,
+                        "receiver_id": receiver if event_type != 22 else None,
+                        "defender_id": receiver if event_type == 11 else None,
+                        **_coordinates(rng),
+                        "turnover_x": rng.uniform(-25, 25),
+                        "turnover_y": rng.uniform(0, 120),
+                        "line_players": (
+                            _line(rng, team) if event_type in (3, 25) else None
+                        ),
+                    }
+                )
+
+            if on_offense:
+                thrower, receiver = rng.sample(players, 2)
+                goal = {
+                    "event_type": 19,
+                    "thrower_id": thrower,
+                    "receiver_id": receiver,
+                }
+                events.append(goal | _coordinates(rng))
+            else:
+                events.append({"event_type": 15})
+            events[-1]["event_time"] = start + 50
+            if point + 1 in quarter_ends:
+                events.append({"event_type": quarter_ends[point + 1]})
+
+    keys = (
+        "event_time thrower_id receiver_id defender_id puller_id thrower_x "
+        "thrower_y receiver_x receiver_y turnover_x turnover_y pull_x pull_y "
+        "pull_ms line_players"
+    ).split()
+    rows = []
+    for team in ("away", "home"):
+        for index, event in enumerate(streams[team]):
+            rows.append(
+                {
+                    "event_index": index,
+                    "team": team,
+                    "event_type": event["event_type"],
+                    **{key: event.get(key) for key in keys},
+                }
+            )
+    return rows
+
+
+class FakeDB:
+    """Answers the play-by-play queries of one game from memory."""
+
+    def __init__(self, rows: list[dict], players: list[dict]):
+        self.rows = rows
+        self.players = players
+
+    def execute_query(self, query: str, params: dict | None = None):
+        if "FROM game_events" in query:
+            return [dict(row) for row in self.rows]
+        if "FROM players" in query:
+            return self.players
+        return [{"home_team_id": "h", "away_team_id": "a", "year": 2024}]
+
+
+class FakeStatsSystem:
+    def __init__(self, db):
+        self.db = db
+
+
+def best_of(fn, repeat: int) -> float:
+    """Best wall time of fn() in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--games", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    players = [
+        {
+            "player_id": f"{team}{n}",
+            "full_name": f"Player {team}{n}",
+            "last_name": f"P{team}{n}",
+        }
+        for team in ("home", "away")
+        for n in range(ROSTER)
+    ]
+    games = [
+        FakeStatsSystem(FakeDB(make_game(rng), players)) for _ in range(args.games)
+    ]
+
+    one = games[0]
+    game_ms = best_of(lambda: calculate_play_by_play(one, "g"), args.repeat * 10)
+    season_ms = best_of(
+        lambda: [calculate_play_by_play(game, "g") for game in games], args.repeat
+    )
+
+    digest = hashlib.sha256()
+    for game in games:
+        digest.update(dumps(calculate_play_by_play(game, "g")))
+
+    print(f"one game ({len(one.db.rows)} events): {game_ms:.2f} ms")
+    print(
+        f"season ({args.games} games, {sum(len(g.db.rows) for g in games):,} events): "
+        f"{season_ms:.0f} ms"
+    )
+    print(f"output digest: {digest.hexdigest()[:16]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark multi-game play-by-play against the per-game path.
+
+Builds a season of synthetic games (the generator from
+benchmark_play_by_play.py) in a SQLite database and reports games per second
+for calculate_play_by_play() called once per game and for
+iter_play_by_play(), both building every game from its events (no stored
+artifacts) and serving the Final games' stored artifacts. The batch output is
+checked against the per-game results.
+
+SQLite opens connections and answers queries in-process, so the round trips
+the batch path saves against Postgres are understated here.
+
+Run this via: uv run python scripts/benchmark_play_by_play_batch.py [--games 150]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add backend and scripts to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from benchmark_play_by_play import ROSTER, make_game
+from data.database import SQLDatabase
+from services.play_by_play_batch import iter_play_by_play
+from services.play_by_play_service import calculate_play_by_play
+
+EVENT_COLUMNS = (
+    "event_index team event_type event_time thrower_id receiver_id defender_id "
+    "puller_id thrower_x thrower_y receiver_x receiver_y turnover_x turnover_y "
+    "pull_x pull_y pull_ms line_players"
+).split()
+
+
+class StatsSystem:
+    def __init__(self, db):
+        self.db = db
+
+
+def make_database(path: Path, games: int) -> tuple[SQLDatabase, list[str]]:
+    """Synthetic season: two teams' rosters and their games' events."""
+    rng = random.Random(1)
+    db = SQLDatabase(f"sqlite:///{path}")
+    game_ids = [f"2024-game-{n}" for n in range(games)]
+    with db.engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE games (
+                game_id TEXT PRIMARY KEY, year INTEGER, home_team_id TEXT,
+                away_team_id TEXT, status TEXT, start_timestamp TEXT
+            )
+            """))
+        conn.execute(text("CREATE TABLE teams (team_id, year, city, name)"))
+        conn.execute(text("""
+            CREATE TABLE players (
+                id INTEGER PRIMARY KEY, player_id TEXT, year INTEGER,
+                full_name TEXT, last_name TEXT
+            )
+            """))
+        conn.execute(text("CREATE INDEX idx_players ON players(player_id, year)"))
+        conn.execute(text(f"""
+            CREATE TABLE game_events (
+                id INTEGER PRIMARY KEY, game_id TEXT, {", ".join(EVENT_COLUMNS)}
+            )
+            """))
+        conn.execute(text("CREATE INDEX idx_game_events ON game_events(game_id, team)"))
+        conn.execute(text("""
+            CREATE TABLE game_play_by_play (
+                game_id TEXT, schema_version INTEGER, events_version TEXT,
+                points BLOB, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (game_id, schema_version)
+            )
+            """))
+
+        conn.execute(
+            text("INSERT INTO teams VALUES (:team, 2024, :team, :team)"),
+            [{"team": "h"}, {"team": "a"}],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO players (player_id, year, full_name, last_name) "
+                "VALUES (:id, 2024, :name, :last)"
+            ),
+            [
+                {"id": f"{team}{n}", "name": f"Player {team}{n}", "last": f"P{team}{n}"}
+                for team in ("home", "away")
+                for n in range(ROSTER)
+            ],
+        )
+        conn.execute(
+            text("INSERT INTO games VALUES (:id, 2024, 'h', 'a', 'Final', :start)"),
+            [
+                {"id": game_id, "start": f"2024-{n:05d}"}
+                for n, game_id in enumerate(game_ids)
+            ],
+        )
+        insert = text(
+            f"INSERT INTO game_events (game_id, {', '.join(EVENT_COLUMNS)}) "
+            f"VALUES (:game_id, {', '.join(':' + c for c in EVENT_COLUMNS)})"
+        )
+        for game_id in game_ids:
+            conn.execute(insert, [row | {"game_id": game_id} for row in make_game(rng)])
+    return db, game_ids
+
+
+def games_per_second(fn, games: int, repeat: int) -> float:
+    """Best throughput of fn() over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return games / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--games", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db, game_ids = make_database(Path(tmp) / "play_by_play.db", args.games)
+        stats_system = StatsSystem(db)
+
+        def built():
+            db.execute_query("DELETE FROM game_play_by_play")
+            return list(iter_play_by_play(stats_system, game_ids))
+
+        per_game = json.loads(
+            json.dumps([calculate_play_by_play(stats_system, g) for g in game_ids])
+        )
+        for lines in (built(), list(iter_play_by_play(stats_system, game_ids))):
+            assert [json.loads(line)["points"] for line in lines] == per_game
+
+        runs = [
+            (
+                "per game",
+                lambda: [calculate_play_by_play(stats_system, g) for g in game_ids],
+            ),
+            ("batch, built", built),
+            (
+                "batch, stored",
+                lambda: list(iter_play_by_play(stats_system, game_ids)),
+            ),
+        ]
+
+        print(f"{args.games} games")
+        for name, fn in runs:
+            rate = games_per_second(fn, args.games, args.repeat)
+            print(f"{name:<20} {rate:>8.0f} games/s")
+
+
+if __name__ == "__main__":
+    main()
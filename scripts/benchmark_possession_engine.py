@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized possession engine against the event processors.
+
+Runs a season of events through scan_team_events() one team's game at a
+time (what building team_game_stats did) and through the vectorized engine
+in one batch, checks that every team's game gets the same possession and
+redzone stats and every game the same quarter scoring, and reports events
+per second for each.
+
+Each path starts from the rows its query returns: the processors from event
+rows, made into the dicts they read, and the engine from the integer rows of
+EVENT_COLUMNS_SQL, read into arrays by event_columns() as scan_game_events()
+does. The query itself is not timed for either.
+
+By default the season is synthetic (the generator from
+benchmark_play_by_play.py), so no database is needed. With --stored, every
+game in DATABASE_URL is checked and timed instead, season by season.
+
+Run this via: uv run python scripts/benchmark_possession_engine.py [--games 150]
+"""
+
+import argparse
+import random
+import sys
+import time
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+# Add backend and scripts to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from benchmark_play_by_play import make_game
+from domain.possession import scan_team_events
+from services.team_game_stats import (
+    POSSESSION_COLUMNS,
+    encode_event_rows,
+    event_columns,
+    scan_event_columns,
+)
+
+COLUMNS = ("game_id", "team", "event_type", "event_time", "receiver_y", "thrower_y")
+
+# Processing order within a team's events, as the possession calculators sort them
+TIE_ORDER = {19: 0, 15: 0, 1: 1}
+
+
+def synthetic_season(games: int) -> list[tuple]:
+    """Event rows of a synthetic season, in processing order."""
+    rng = random.Random(1)
+    rows = [
+        (f"2024-game-{n:03d}", event["team"], event["event_index"])
+        + tuple(event[c] for c in COLUMNS[2:])
+        for n in range(games)
+        for event in make_game(rng)
+    ]
+    rows.sort(key=lambda row: (row[0], row[1], row[2], TIE_ORDER.get(row[3], 2)))
+    return [row[:2] + row[3:] for row in rows]
+
+
+def stored_seasons(db) -> dict[int, list[tuple]]:
+    """Event rows of every stored game by season, in processing order."""
+    from sqlalchemy import text
+
+    with db.engine.connect() as conn:
+        rows = conn.execute(text(f"""
+            SELECT g.year, {", ".join("e." + c for c in COLUMNS)}
+            FROM game_events e
+            JOIN games g ON g.game_id = e.game_id
+            ORDER BY g.year, e.game_id, e.team, e.event_index,
+                CASE
+                    WHEN e.event_type IN (19, 15) THEN 0
+                    WHEN e.event_type = 1 THEN 1
+                    ELSE 2
+                END
+            """)).fetchall()
+    return {
+        year: [tuple(row[1:]) for row in season]
+        for year, season in groupby(rows, key=itemgetter(0))
+    }
+
+
+def run_processors(rows: list[tuple]) -> tuple[dict, dict]:
+    """scan_team_events() of each team's game, from per-event dicts."""
+    events = [dict(zip(COLUMNS, row, strict=True)) for row in rows]
+    teams, scoring = {}, {}
+    for key, team_events in groupby(events, key=itemgetter("game_id", "team")):
+        possession, redzone, team_scoring = scan_team_events(list(team_events), key[1])
+        teams[key] = (
+            {c: getattr(possession, c) for c in POSSESSION_COLUMNS},
+            redzone.to_dict(),
+        )
+        # A game is scored from the home team's events, else the away team's
+        if key[1] == "home" or key[0] not in scoring:
+            scoring[key[0]] = team_scoring
+    return teams, scoring
+
+
+def run_engine(batch: tuple[list[str], list[tuple]]) -> tuple[dict, dict]:
+    """scan_game_events() of the batch, from its EVENT_COLUMNS_SQL rows."""
+    game_ids, rows = batch
+    return scan_event_columns(game_ids, *event_columns(rows))
+
+
+def best_time(fn, rows, repeat: int) -> tuple[float, dict]:
+    """Best time of fn(rows) over repeat runs, and its result."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(rows)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def compare(name: str, rows: list[tuple], repeat: int) -> bool:
+    """Time both paths over one batch of events and check they agree."""
+    processors_time, (expected, expected_scoring) = best_time(
+        run_processors, rows, repeat
+    )
+    game_ids, columns = encode_event_rows(rows)
+    encoded = list(zip(*(column.tolist() for column in columns), strict=True))
+    engine_time, (actual, actual_scoring) = best_time(
+        run_engine, (game_ids, encoded), repeat
+    )
+    mismatched = [key for key in expected if actual.get(key) != expected[key]]
+    mismatched += [
+        (game_id, "scoring")
+        for game_id in expected_scoring
+        if actual_scoring.get(game_id) != expected_scoring[game_id]
+    ]
+
+    print(
+        f"{name:<10} {len(expected):>7} {len(rows):>9} "
+        f"{len(rows) / processors_time:>12,.0f} {len(rows) / engine_time:>12,.0f} "
+        f"{processors_time / engine_time:>8.1f}x"
+    )
+    for game_id, team in mismatched[:10]:
+        if team == "scoring":
+            got, wanted = actual_scoring.get(game_id), expected_scoring[game_id]
+        else:
+            got, wanted = actual.get((game_id, team)), expected[game_id, team]
+        print(f"  ❌ {game_id} {team}: {got}")
+        print(f"     expected {wanted}")
+    return not mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--games", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--stored", action="store_true", help="check every game in DATABASE_URL"
+    )
+    args = parser.parse_args()
+
+    if args.stored:
+        from data.database import SQLDatabase
+
+        batches = {
+            str(year): rows for year, rows in stored_seasons(SQLDatabase()).items()
+        }
+    else:
+        batches = {"synthetic": synthetic_season(args.games)}
+
+    print(
+        f"{'season':<10} {'teams':>7} {'events':>9} "
+        f"{'processors/s':>12} {'engine/s':>12} {'speedup':>9}"
+    )
+    matched = [compare(name, rows, args.repeat) for name, rows in batches.items()]
+    if not all(matched):
+        sys.exit(1)
+    print("✅ Engine matches the processors on every team's game")
+
+
+if __name__ == "__main__":
+    main()
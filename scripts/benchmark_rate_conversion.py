@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-game / per-possession stat conversion.
+
+Times converting player dicts as the API serves them, for an API page (20
+players), an export chunk (2,000 players) and a whole career export (50,000
+players), with:
+  - loop: the per-player, per-stat float(format(value, ".1f")) conversion
+  - dicts: convert_to_per_game_stats / convert_to_per_possession_stats, which
+    the player stats route and the export run on every page and chunk
+
+Uses synthetic data, so no database is needed.
+
+Run this via: uv run python scripts/benchmark_rate_conversion.py
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from utils.query import (
+    PER_GAME_STATS,
+    PER_POSSESSION_STATS,
+    convert_to_per_game_stats,
+    convert_to_per_possession_stats,
+)
+
+ROW_COUNTS = [20, 2000, 50000]
+
+
+def make_players(count: int, seed: int = 1) -> list[dict]:
+    """Synthetic player dicts with every converted stat."""
+    rng = random.Random(seed)
+    players = []
+    for _ in range(count):
+        player = {stat: rng.randint(0, 900) for stat in PER_GAME_STATS}
+        player["games_played"] = rng.randint(0, 120)
+        player["total_o_opportunities"] = rng.randint(0, 3000)
+        players.append(player)
+    return players
+
+
+def loop_convert(players: list[dict], per_mode: str) -> list[dict]:
+    """The per-player reference conversion."""
+    for player in players:
+        if per_mode == "game":
+            stats, denominator, scale = PER_GAME_STATS, player["games_played"], 1
+        else:
+            stats, scale = PER_POSSESSION_STATS, 100
+            denominator = (
+                player.get("total_o_opportunities") or player.get("possessions") or 0
+            )
+        if denominator > 0:
+            for stat in stats:
+                if player.get(stat) is not None:
+                    value = player[stat] / denominator
+                    value = value * scale if scale != 1 else value
+                    player[stat] = float(format(value, ".1f"))
+    return players
+
+
+def best_of(fn, setup, repeat: int) -> float:
+    """Best wall time of fn(setup()) in milliseconds, excluding setup."""
+    best = float("inf")
+    for _ in range(repeat):
+        data = setup()
+        start = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    converters = {
+        "game": convert_to_per_game_stats,
+        "possession": convert_to_per_possession_stats,
+    }
+
+    print(f"{'mode':>10} {'rows':>7} {'loop ms':>10} {'dicts ms':>10} {'speedup':>8}")
+    for per_mode, convert in converters.items():
+        for count in ROW_COUNTS:
+            players = make_players(count)
+            assert loop_convert(copy.deepcopy(players), per_mode) == convert(
+                copy.deepcopy(players)
+            )
+
+            loop_ms = best_of(
+                lambda data, per_mode=per_mode: loop_convert(data, per_mode),
+                lambda players=players: copy.deepcopy(players),
+                args.repeat,
+            )
+            dicts_ms = best_of(
+                convert, lambda players=players: copy.deepcopy(players), args.repeat
+            )
+            print(
+                f"{per_mode:>10} {count:>7,} {loop_ms:>10.2f} {dicts_ms:>10.2f} "
+                f"{loop_ms / dicts_ms:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
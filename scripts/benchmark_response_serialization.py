@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization and compression of the largest API responses.
+
+For synthetic payloads shaped like the five largest endpoints, compares:
+  - FastAPI's default path (jsonable_encoder + json.dumps) with FastJSONResponse (orjson)
+  - bytes on the wire uncompressed, with gzip and with brotli
+
+Payloads use Decimal and datetime values the way Postgres rows return them.
+
+Run this via: uv run python scripts/benchmark_response_serialization.py [--events 40000]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import brotli
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from api.player_stats.columns import PLAYER_COLUMNS
+from api.player_stats.percentile_calculator import STAT_FIELDS
+from api.responses import FastJSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+PASS_TYPES = ["huck", "swing", "dump", "gainer", "dish"]
+
+
+def best_of(fn, repeat: int) -> float:
+    """Best wall time of fn() in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def pass_events(rng: random.Random, count: int) -> dict:
+    """GET /api/pass-events for a season."""
+    events = []
+    for i in range(count):
+        x, y = rng.uniform(-25, 25), rng.uniform(0, 120)
+        dx, dy = rng.uniform(-25, 25), rng.uniform(0, 120)
+        events.append(
+            {
+                "game_id": f"2024-06-{i % 30:02d}-ATL-BOS",
+                "event_type": "throw",
+                "pass_type": rng.choice(PASS_TYPES),
+                "thrower_id": f"player{i % 400}",
+                "thrower_name": f"Thrower {i % 400}",
+                "receiver_id": f"player{(i + 7) % 400}",
+                "receiver_name": f"Receiver {(i + 7) % 400}",
+                "thrower_x": x,
+                "thrower_y": y,
+                "receiver_x": dx,
+                "receiver_y": dy,
+                "turnover_x": None,
+                "turnover_y": None,
+                "result": rng.choice(["completion", "completion", "goal", "turnover"]),
+                "vertical_yards": round(dy - y, 1),
+                "horizontal_yards": round(abs(dx - x), 1),
+                "distance": round(((dy - y) ** 2 + (dx - x) ** 2) ** 0.5, 1),
+                "year": 2024,
+            }
+        )
+    by_type = {t: {"count": count // 5, "pct": 20.0} for t in PASS_TYPES}
+    return {"events": events, "stats": {"by_type": by_type}, "total": count}
+
+
+def player_stats(rng: random.Random, per_page: int) -> dict:
+    """GET /api/players/stats?season=career&include_percentiles=true."""
+    players = []
+    for i in range(per_page):
+        player = {column: Decimal(rng.randint(0, 3000)) for column in PLAYER_COLUMNS}
+        for column in ("completion_percentage", "huck_percentage", "yards_per_turn"):
+            player[column] = Decimal(rng.randint(0, 1000)) / 10
+        player.update(
+            player_id=f"player{i}",
+            full_name=f"Player {i}",
+            first_name="Player",
+            last_name=str(i),
+            team_id="hustle",
+            team_name="Hustle",
+            team_full_name="Atlanta Hustle",
+            year=None,
+        )
+        player["percentiles"] = {f: rng.randint(0, 100) for f in STAT_FIELDS}
+        players.append(player)
+    return {"players": players, "total": 4000, "page": 1, "per_page": per_page}
+
+
+def box_score(rng: random.Random, roster: int = 28) -> dict:
+    """GET /api/games/{game_id}/box-score."""
+    stats = [
+        "points_played", "o_points_played", "d_points_played", "assists",
+        "goals", "blocks", "plus_minus", "yards_received", "yards_thrown",
+        "total_yards", "completions", "hockey_assists", "hucks_completed",
+        "hucks_received", "turnovers", "stalls", "callahans", "drops",
+    ]  # fmt: skip
+
+    def team(abbrev: str) -> dict:
+        return {
+            "team_id": abbrev.lower(),
+            "abbrev": abbrev,
+            "final_score": 21,
+            "quarter_scores": [5, 6, 4, 6],
+            "players": [
+                {
+                    "name": f"{abbrev} Player {i}",
+                    "jersey_number": str(i),
+                    "team_abbrev": abbrev,
+                    **{s: rng.randint(0, 40) for s in stats},
+                    "completion_percentage": Decimal(rng.randint(600, 1000)) / 10,
+                    "huck_percentage": Decimal(rng.randint(0, 1000)) / 10,
+                    "yards_per_turn": Decimal(rng.randint(0, 500)) / 10,
+                }
+                for i in range(roster)
+            ],
+            "stats": {s: Decimal(rng.randint(0, 1000)) / 10 for s in stats},
+        }
+
+    return {
+        "game_id": "2024-06-01-ATL-BOS",
+        "status": "Final",
+        "start_timestamp": datetime(2024, 6, 1, 19, tzinfo=UTC),
+        "home_team": team("ATL"),
+        "away_team": team("BOS"),
+    }
+
+
+def play_by_play(rng: random.Random, points: int = 90) -> dict:
+    """GET /api/games/{game_id}/play-by-play."""
+    result = []
+    for p in range(points):
+        events = [
+            {
+                "type": rng.choice(["pass", "pass", "pass", "drop", "throwaway"]),
+                "description": f"Player {rng.randint(0, 60)} to Player {rng.randint(0, 60)}",
+                "yard_line": rng.randint(0, 100),
+                "out_of_timeout": False,
+            }
+            for _ in range(rng.randint(4, 20))
+        ]
+        result.append(
+            {
+                "point_number": p + 1,
+                "quarter": p * 4 // points + 1,
+                "team": "home" if p % 2 else "away",
+                "line_type": rng.choice(["O-Line", "D-Line"]),
+                "start_time": str(timedelta(seconds=p * 40)),
+                "duration": f"{rng.randint(0, 3)}:{rng.randint(0, 59):02d}",
+                "players": [f"Player {rng.randint(0, 60)}" for _ in range(7)],
+                "score": f"{p // 2}-{(p + 1) // 2}",
+                "events": events,
+            }
+        )
+    return {"points": result}
+
+
+def games(rng: random.Random, limit: int = 500) -> dict:
+    """GET /api/games."""
+    start = datetime(2024, 4, 20, 19, tzinfo=UTC)
+    rows = [
+        {
+            "game_id": f"2024-game-{i}",
+            "id": f"2024-game-{i}",
+            "home_team_id": f"t{i % 24}",
+            "away_team_id": f"t{(i + 5) % 24}",
+            "home_score": rng.randint(10, 25),
+            "away_score": rng.randint(10, 25),
+            "status": "Final",
+            "date": start + timedelta(days=i // 6),
+            "venue": f"Stadium {i % 24}",
+            "year": 2024,
+            "week": f"week-{i // 12}",
+            "home_team": f"Team {i % 24}",
+            "away_team": f"Team {(i + 5) % 24}",
+        }
+        for i in range(limit)
+    ]
+    return {"games": rows, "total": limit, "page": 1, "pages": 1}
+
+
+def stdlib_render(content) -> bytes:
+    """What FastAPI sends by default: jsonable_encoder then JSONResponse.render."""
+    return JSONResponse(content=None).render(jsonable_encoder(content))
+
+
+def fast_render(content) -> bytes:
+    return FastJSONResponse(content=None).render(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--events", type=int, default=40000)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    endpoints = [
+        (f"pass-events ({args.events:,})", pass_events(rng, args.events)),
+        (f"player stats ({args.per_page}, pct)", player_stats(rng, args.per_page)),
+        ("games list (500)", games(rng)),
+        ("play-by-play", play_by_play(rng)),
+        ("box score", box_score(rng)),
+    ]
+
+    print(
+        f"{'':<28} {'json ms':>9} {'orjson ms':>9} {'raw KB':>9} "
+        f"{'gzip KB':>9} {'gzip ms':>8} {'br KB':>8} {'br ms':>8}"
+    )
+    for name, payload in endpoints:
+        old_ms = best_of(lambda payload=payload: stdlib_render(payload), args.repeat)
+        new_ms = best_of(lambda payload=payload: fast_render(payload), args.repeat)
+        body = fast_render(payload)
+        assert json.loads(body) == json.loads(stdlib_render(payload))
+
+        gzipped = gzip.compress(body, compresslevel=6)
+        gzip_ms = best_of(
+            lambda body=body: gzip.compress(body, compresslevel=6), args.repeat
+        )
+        brotlied = brotli.compress(body, quality=5)
+        br_ms = best_of(lambda body=body: brotli.compress(body, quality=5), args.repeat)
+
+        print(
+            f"{name:<28} {old_ms:>9.2f} {new_ms:>9.2f} {len(body) / 1024:>9.1f} "
+            f"{len(gzipped) / 1024:>9.1f} {gzip_ms:>8.2f} {len(brotlied) / 1024:>8.1f} {br_ms:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark prefix-sum season rollups against re-aggregating season rows.
+
+For career ranges starting at each season (the per-possession career stats
+start at 2014), times summing every player's stats with:
+  - SQL: GROUP BY over player_season_stats (in-memory SQLite stand-in)
+  - rows: NumPy re-aggregation of the matching season rows
+  - prefix: SeasonRollup.range_totals() prefix-sum differences
+
+Uses synthetic data, so no database is needed.
+
+Run this via: uv run python scripts/benchmark_season_rollup.py [--players 6000]
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from api.player_stats.season_rollup import ROLLUP_FIELDS, SeasonRollup
+
+YEARS = [y for y in range(2012, 2026) if y != 2020]
+
+
+def make_rows(players: int, seed: int = 1) -> list[tuple]:
+    """Synthetic (player_id, year, *ROLLUP_FIELDS) season rows."""
+    rng = random.Random(seed)
+    rows = []
+    for p in range(players):
+        first = rng.randrange(len(YEARS))
+        for year in YEARS[first : first + rng.randint(1, 8)]:
+            rows.append((f"p{p}", year, *[rng.randint(0, 300) for _ in ROLLUP_FIELDS]))
+    return rows
+
+
+def best_of(fn, repeat: int) -> float:
+    """Best wall time of fn() in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--players", type=int, default=6000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.players)
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE player_season_stats (player_id TEXT, year INTEGER, "
+        f"{', '.join(f'{f} INTEGER' for f in ROLLUP_FIELDS)})"
+    )
+    conn.executemany(
+        f"INSERT INTO player_season_stats VALUES ({', '.join('?' * (len(ROLLUP_FIELDS) + 2))})",
+        rows,
+    )
+    conn.execute("CREATE INDEX idx_pss_year ON player_season_stats(year)")
+
+    start = time.perf_counter()
+    rollup = SeasonRollup.from_rows(rows)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    player_index = {key: i for i, key in enumerate(rollup.keys)}
+    row_players = np.array([player_index[r[0]] for r in rows])
+    row_years = np.array([r[1] for r in rows])
+    row_stats = np.array([r[2:] for r in rows], dtype=np.int64)
+
+    def reaggregate(years):
+        mask = np.isin(row_years, years)
+        totals = np.zeros((len(rollup), len(ROLLUP_FIELDS)), dtype=np.int64)
+        np.add.at(totals, row_players[mask], row_stats[mask])
+        return totals
+
+    print(
+        f"{len(rows):,} season rows, {len(rollup):,} players, "
+        f"rollup built in {build_ms:.1f} ms"
+    )
+    print(f"{'from':>7} {'SQL ms':>10} {'rows ms':>10} {'prefix ms':>10}")
+
+    for start_year in YEARS:
+        years = [y for y in YEARS if y >= start_year]
+        sql = f"""
+            SELECT player_id, {', '.join(f'SUM({f})' for f in ROLLUP_FIELDS)}
+            FROM player_season_stats
+            WHERE year >= {start_year}
+            GROUP BY player_id
+        """
+        assert np.array_equal(rollup.range_totals(start_year), reaggregate(years))
+
+        sql_ms = best_of(lambda sql=sql: conn.execute(sql).fetchall(), args.repeat)
+        rows_ms = best_of(lambda years=years: reaggregate(years), args.repeat)
+        prefix_ms = best_of(
+            lambda start_year=start_year: rollup.range_totals(start_year), args.repeat
+        )
+        print(f"{start_year:>7} {sql_ms:>10.2f} {rows_ms:>10.2f} {prefix_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
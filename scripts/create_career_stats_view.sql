@@ -135,6 +135,8 @@ LEFT JOIN games_played_count gpc ON pa.player_id = gpc.player_id;
 -- Create index on the materialized view for fast lookups
 CREATE INDEX IF NOT EXISTS idx_career_stats_player ON player_career_stats(player_id);
 CREATE INDEX IF NOT EXISTS idx_career_stats_team ON player_career_stats(most_recent_team_id);
+-- Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_career_stats_player_unique ON player_career_stats(player_id);
 
 -- To refresh the view after data updates, run:
--- REFRESH MATERIALIZED VIEW player_career_stats;
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY player_career_stats;
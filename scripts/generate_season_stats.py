@@ -66,7 +66,8 @@ def generate_player_season_stats(engine):
             total_o_opportunity_scores,
             total_d_opportunities,
             total_d_opportunity_stops,
-            completion_percentage
+            completion_percentage,
+            games_played
         )
         SELECT
             player_id,
@@ -106,7 +107,12 @@ def generate_player_season_stats(engine):
                 WHEN SUM(completions) + SUM(throwaways) + SUM(drops) > 0
                 THEN ROUND((CAST(SUM(completions) AS NUMERIC) / (SUM(completions) + SUM(throwaways) + SUM(drops))) * 100, 2)
                 ELSE 0
-            END as completion_percentage
+            END as completion_percentage,
+            COUNT(DISTINCT CASE
+                WHEN o_points_played > 0 OR d_points_played > 0 OR seconds_played > 0
+                     OR goals > 0 OR assists > 0
+                THEN game_id
+            END) as games_played
         FROM player_game_stats
         GROUP BY player_id, team_id, year
         ON CONFLICT (player_id, team_id, year) DO NOTHING
@@ -134,6 +140,15 @@ def generate_team_season_stats(engine):
     print("🏈 Generating team_season_stats from games and player stats...")
     print("=" * 60)
 
+    # Team totals come from team_game_stats; build the games it is missing
+    sys.path.insert(0, os.path.dirname(__file__))
+    from populate_possession_stats import DatabaseWrapper
+    from services.team_game_stats import refresh_missing_team_game_stats
+
+    built = refresh_missing_team_game_stats(DatabaseWrapper(engine))
+    if built:
+        print(f"  🔄 Built {built:,} team game stats rows for unbuilt games")
+
     with engine.connect() as conn:
         # Check if we have games data
         games_count = conn.execute(text("SELECT COUNT(*) FROM games")).fetchone()[0]
@@ -148,7 +163,7 @@ def generate_team_season_stats(engine):
         conn.execute(text("DELETE FROM team_season_stats"))
         conn.commit()
 
-        # Aggregate team stats from games and player_game_stats
+        # Aggregate team stats from games and the per-game team stats
         print("  🔄 Aggregating team stats...")
 
         aggregate_query = """
@@ -166,7 +181,7 @@ def generate_team_season_stats(engine):
             opp_hucks_completed, opp_hucks_attempted, opp_huck_percentage,
             opp_blocks
         )
-        WITH team_game_stats AS (
+        WITH team_game_results AS (
             -- Home games
             SELECT
                 t.team_id,
@@ -199,52 +214,33 @@ def generate_team_season_stats(engine):
         ),
         team_player_stats AS (
             SELECT
-                pgs.team_id,
-                pgs.year,
-                SUM(pgs.completions) as total_completions,
-                SUM(pgs.throw_attempts) as total_attempts,
-                SUM(pgs.throwaways + pgs.drops + pgs.stalls) as total_turnovers,
-                SUM(pgs.hucks_completed) as hucks_completed,
-                SUM(pgs.hucks_attempted) as hucks_attempted,
-                SUM(pgs.blocks) as total_blocks
-            FROM player_game_stats pgs
-            GROUP BY pgs.team_id, pgs.year
+                tgs.team_id,
+                tgs.year,
+                SUM(tgs.completions) as total_completions,
+                SUM(tgs.throw_attempts) as total_attempts,
+                SUM(tgs.throwaways + tgs.drops + tgs.stalls) as total_turnovers,
+                SUM(tgs.hucks_completed) as hucks_completed,
+                SUM(tgs.hucks_attempted) as hucks_attempted,
+                SUM(tgs.blocks) as total_blocks
+            FROM team_game_stats tgs
+            GROUP BY tgs.team_id, tgs.year
         ),
         opponent_stats AS (
-            -- Get opponent stats from player_game_stats for SPECIFIC GAMES (not season totals)
-            -- For home games: sum away team's stats IN THOSE SPECIFIC GAMES
-            SELECT
-                g.home_team_id as team_id,
-                g.year,
-                SUM(pgs.completions) as opp_completions,
-                SUM(pgs.throw_attempts) as opp_attempts,
-                SUM(pgs.throwaways + pgs.drops + pgs.stalls) as opp_turnovers,
-                SUM(pgs.hucks_completed) as opp_hucks_completed,
-                SUM(pgs.hucks_attempted) as opp_hucks_attempted,
-                SUM(pgs.blocks) as opp_blocks
-            FROM games g
-            INNER JOIN player_game_stats pgs
-                ON pgs.game_id = g.game_id
-                AND pgs.team_id = g.away_team_id
-            GROUP BY g.home_team_id, g.year
-
-            UNION ALL
-
-            -- For away games: sum home team's stats IN THOSE SPECIFIC GAMES
+            -- Opponents' stats IN THE SPECIFIC GAMES each team played
             SELECT
-                g.away_team_id as team_id,
-                g.year,
-                SUM(pgs.completions) as opp_completions,
-                SUM(pgs.throw_attempts) as opp_attempts,
-                SUM(pgs.throwaways + pgs.drops + pgs.stalls) as opp_turnovers,
-                SUM(pgs.hucks_completed) as opp_hucks_completed,
-                SUM(pgs.hucks_attempted) as opp_hucks_attempted,
-                SUM(pgs.blocks) as opp_blocks
-            FROM games g
-            INNER JOIN player_game_stats pgs
-                ON pgs.game_id = g.game_id
-                AND pgs.team_id = g.home_team_id
-            GROUP BY g.away_team_id, g.year
+                tgs.team_id,
+                tgs.year,
+                SUM(opp.completions) as opp_completions,
+                SUM(opp.throw_attempts) as opp_attempts,
+                SUM(opp.throwaways + opp.drops + opp.stalls) as opp_turnovers,
+                SUM(opp.hucks_completed) as opp_hucks_completed,
+                SUM(opp.hucks_attempted) as opp_hucks_attempted,
+                SUM(opp.blocks) as opp_blocks
+            FROM team_game_stats tgs
+            JOIN team_game_stats opp
+                ON opp.game_id = tgs.game_id
+                AND opp.team_id = tgs.opponent_id
+            GROUP BY tgs.team_id, tgs.year
         ),
         aggregated_team_stats AS (
             SELECT
@@ -256,7 +252,7 @@ def generate_team_season_stats(engine):
                 SUM(tg.scores) as total_scores,
                 SUM(tg.scores_against) as total_scores_against
             FROM teams t
-            LEFT JOIN team_game_stats tg ON t.team_id = tg.team_id AND t.year = tg.year
+            LEFT JOIN team_game_results tg ON t.team_id = tg.team_id AND t.year = tg.year
             GROUP BY t.team_id, t.year
         ),
         aggregated_opponent_stats AS (
@@ -2,14 +2,19 @@
 """
 Populate possession-based statistics in team_season_stats table.
 
-This script calculates and stores possession stats (hold%, break%, conversions, etc.)
-by processing game_events data once and storing results in the database for instant API access.
+This script rebuilds the team_game_stats rows of each season from game_events,
+one season per worker process, then sums each team's possession stats (hold%,
+break%, conversions, etc.) and its opponents' over them, and stores the season
+totals for instant API access.
 
-Run this via: uv run python scripts/populate_possession_stats.py
+Run this via: uv run python scripts/populate_possession_stats.py [--seasons 2024 2025] [--workers 4]
 """
 
+import argparse
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 # Add backend to path for imports
@@ -18,166 +23,99 @@ sys.path.insert(0, str(backend_path))
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
-from data.possession import calculate_possessions_batch, calculate_redzone_stats_batch
+from services.team_game_stats import (
+    EVENTS_COVERAGE_PCT,
+    SEASON_PERCENTAGES,
+    SEASON_POSSESSION_FIELDS,
+    TEAM_GAME_CHUNK_GAMES,
+    build_team_game_stats,
+    fetch_season_team_stats,
+    game_checksums,
+    season_percentage,
+    store_team_game_stats,
+)
 
 load_dotenv()
 
 
-def calculate_possession_stats_from_pgs(conn, year, year_teams):
+def possession_totals(row, prefix, use_events):
     """
-    Calculate possession stats from player_game_stats for years without game_events.
+    A team's (prefix "") or its opponents' (prefix "opp_") season possession counts.
 
-    This is a fallback for 2013-2019 where game_events data is not available.
-    We can calculate HLD% and BRK% but not OLC%/DLC% (which require possession counts).
+    Years without game_events fall back to the team lines from
+    player_game_stats: HLD% and BRK% are exact, and OLC%/DLC% use one
+    possession per point. Those years have no red zone data.
 
     Args:
-        conn: Database connection
-        year: Season year
-        year_teams: List of team IDs for this year
+        row: fetch_season_team_stats() row of the team, or {} if it has none
+        prefix: "" for the team, "opp_" for its opponents
+        use_events: Whether the year has enough game_events coverage
 
     Returns:
-        Dict mapping team_id to possession stats
+        Dict with SEASON_POSSESSION_FIELDS keys
     """
-    # Calculate possession stats from player_game_stats using MAX aggregation
-    query = text(
-        """
-        WITH game_team_stats AS (
-            SELECT
-                pgs.team_id,
-                pgs.game_id,
-                MAX(pgs.o_points_played) as o_points,
-                MAX(pgs.d_points_played) as d_points,
-                MAX(pgs.o_points_scored) as o_scored,
-                MAX(pgs.d_points_scored) as d_scored
-            FROM player_game_stats pgs
-            JOIN games g ON pgs.game_id = g.game_id
-            WHERE g.year = :year
-              AND g.game_type NOT IN ('all-star', 'showcase', 'preseason')
-            GROUP BY pgs.team_id, pgs.game_id
-        )
-        SELECT
-            team_id,
-            SUM(o_points) as o_line_points,
-            SUM(o_scored) as o_line_scores,
-            SUM(d_points) as d_line_points,
-            SUM(d_scored) as d_line_scores
-        FROM game_team_stats
-        GROUP BY team_id
-    """
-    )
-
-    results = conn.execute(query, {"year": year}).fetchall()
-
-    stats = {}
-    for row in results:
-        team_id = row[0]
-        o_line_points = row[1] or 0
-        o_line_scores = row[2] or 0
-        d_line_points = row[3] or 0
-        d_line_scores = row[4] or 0
-
-        # For years without game_events, we set OLC%=HLD% and DLC%=BRK%
-        # (approximation: 1 possession per point)
-        stats[team_id] = {
-            "o_line_points": o_line_points,
-            "o_line_scores": o_line_scores,
-            "o_line_possessions": o_line_points,  # Approximation
-            "d_line_points": d_line_points,
-            "d_line_scores": d_line_scores,
-            "d_line_possessions": d_line_points,  # Approximation
+    if use_events:
+        return {
+            field: row.get(prefix + field) or 0 for field in SEASON_POSSESSION_FIELDS
         }
 
-    return stats
-
-
-def calculate_opponent_stats_from_pgs(conn, year, year_teams):
-    """
-    Calculate opponent possession stats from player_game_stats.
-
-    For each team, sums up their opponents' stats from each game played.
-
-    Args:
-        conn: Database connection
-        year: Season year
-        year_teams: List of team IDs for this year
-
-    Returns:
-        Dict mapping team_id to opponent stats
-    """
-    # First get per-game team stats
-    query = text(
-        """
-        WITH game_team_stats AS (
-            SELECT
-                pgs.team_id,
-                pgs.game_id,
-                MAX(pgs.o_points_played) as o_points,
-                MAX(pgs.d_points_played) as d_points,
-                MAX(pgs.o_points_scored) as o_scored,
-                MAX(pgs.d_points_scored) as d_scored
-            FROM player_game_stats pgs
-            JOIN games g ON pgs.game_id = g.game_id
-            WHERE g.year = :year
-              AND g.game_type NOT IN ('all-star', 'showcase', 'preseason')
-            GROUP BY pgs.team_id, pgs.game_id
-        ),
-        games_with_teams AS (
-            SELECT
-                game_id,
-                home_team_id,
-                away_team_id
-            FROM games
-            WHERE year = :year
-              AND game_type NOT IN ('all-star', 'showcase', 'preseason')
-        )
-        SELECT
-            CASE WHEN g.home_team_id = gts.team_id THEN g.away_team_id ELSE g.home_team_id END as team_id,
-            SUM(gts.o_points) as opp_o_points,
-            SUM(gts.o_scored) as opp_o_scored,
-            SUM(gts.d_points) as opp_d_points,
-            SUM(gts.d_scored) as opp_d_scored
-        FROM game_team_stats gts
-        JOIN games_with_teams g ON gts.game_id = g.game_id
-        WHERE (g.home_team_id = gts.team_id OR g.away_team_id = gts.team_id)
-        GROUP BY CASE WHEN g.home_team_id = gts.team_id THEN g.away_team_id ELSE g.home_team_id END
-    """
-    )
-
-    results = conn.execute(query, {"year": year}).fetchall()
-
-    opp_stats = {}
-    for row in results:
-        team_id = row[0]
-        opp_o_points = row[1] or 0
-        opp_o_scores = row[2] or 0
-        opp_d_points = row[3] or 0
-        opp_d_scores = row[4] or 0
-
-        # Calculate percentages
-        opp_hold_pct = (
-            round((opp_o_scores / opp_o_points) * 100, 2) if opp_o_points > 0 else 0.0
-        )
-        opp_break_pct = (
-            round((opp_d_scores / opp_d_points) * 100, 2) if opp_d_points > 0 else 0.0
-        )
-
-        opp_stats[team_id] = {
-            "opp_o_line_points": opp_o_points,
-            "opp_o_line_scores": opp_o_scores,
-            "opp_o_line_possessions": opp_o_points,  # Approximation
-            "opp_d_line_points": opp_d_points,
-            "opp_d_line_scores": opp_d_scores,
-            "opp_d_line_possessions": opp_d_points,  # Approximation
-            "opp_hold_pct": opp_hold_pct,
-            "opp_o_conv": opp_hold_pct,  # Same as hold% when using approximation
-            "opp_break_pct": opp_break_pct,
-            "opp_d_conv": opp_break_pct,  # Same as break% when using approximation
-            "opp_rz_scores": 0,  # Not available without game_events
-            "opp_rz_attempts": 0,
-            "opp_rz_conv": 0.0,
-        }
-
-    return opp_stats
+    o_points = row.get(prefix + "o_points_played") or 0
+    d_points = row.get(prefix + "d_points_played") or 0
+    return {
+        "o_line_points": o_points,
+        "o_line_scores": row.get(prefix + "o_points_scored") or 0,
+        "o_line_possessions": o_points,  # Approximation
+        "d_line_points": d_points,
+        "d_line_scores": row.get(prefix + "d_points_scored") or 0,
+        "d_line_possessions": d_points,  # Approximation
+        "redzone_goals": 0,
+        "redzone_attempts": 0,
+    }
+
+
+def season_update_params(team_id, year, row, use_events):
+    """Parameters of one team's team_season_stats UPDATE."""
+    params = {"team_id": team_id, "year": year}
+    for prefix in ("", "opp_"):
+        totals = possession_totals(row, prefix, use_events)
+        params.update({prefix + field: value for field, value in totals.items()})
+        for column, (made, total) in SEASON_PERCENTAGES.items():
+            params[prefix + column] = season_percentage(totals[made], totals[total])
+    return params
+
+
+SEASON_UPDATE_QUERY = text("""
+    UPDATE team_season_stats
+    SET
+        o_line_points = :o_line_points,
+        o_line_scores = :o_line_scores,
+        o_line_possessions = :o_line_possessions,
+        d_line_points = :d_line_points,
+        d_line_scores = :d_line_scores,
+        d_line_possessions = :d_line_possessions,
+        redzone_goals = :redzone_goals,
+        redzone_attempts = :redzone_attempts,
+        hold_percentage = :hold_percentage,
+        o_line_conversion = :o_line_conversion,
+        break_percentage = :break_percentage,
+        d_line_conversion = :d_line_conversion,
+        red_zone_conversion = :red_zone_conversion,
+        opp_o_line_points = :opp_o_line_points,
+        opp_o_line_scores = :opp_o_line_scores,
+        opp_o_line_possessions = :opp_o_line_possessions,
+        opp_d_line_points = :opp_d_line_points,
+        opp_d_line_scores = :opp_d_line_scores,
+        opp_d_line_possessions = :opp_d_line_possessions,
+        opp_redzone_goals = :opp_redzone_goals,
+        opp_redzone_attempts = :opp_redzone_attempts,
+        opp_hold_percentage = :opp_hold_percentage,
+        opp_o_line_conversion = :opp_o_line_conversion,
+        opp_break_percentage = :opp_break_percentage,
+        opp_d_line_conversion = :opp_d_line_conversion,
+        opp_red_zone_conversion = :opp_red_zone_conversion,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE team_id = :team_id AND year = :year
+    """)
 
 
 class DatabaseWrapper:
@@ -200,565 +138,231 @@ class DatabaseWrapper:
             return []
 
 
-def populate_possession_stats(db):
+def recompute_season(database_url, year):
     """
-    Calculate and populate possession statistics for all team-season records.
+    Build the team_game_stats rows of one season's games.
 
-    Processes game_events data using batch functions and stores results in team_season_stats.
-    This converts a slow on-demand calculation (3-8 seconds) into instant DB reads (10-50ms).
+    Runs in a worker process, with its own connection: events are fetched and
+    run through the possession engine a chunk of games at a time.
 
     Args:
-        db: Database wrapper object with execute_query() and engine attributes
-    """
-    print("🏈 Populating Possession-Based Statistics")
-    print("=" * 70)
+        database_url: Database to read
+        year: Season
 
-    # Get the underlying engine for connection
-    engine = getattr(db, "engine", db)
-
-    with engine.connect() as conn:
-        # Get count of game events for context
-        events_count = conn.execute(
-            text("SELECT COUNT(*) FROM game_events")
-        ).fetchone()[0]
-        print(f"  📊 Total game events to process: {events_count:,}")
-
-        if events_count == 0:
-            print(
-                "  ❌ No game_events data found - possession stats cannot be calculated"
-            )
-            return
-
-        # Get all unique team-season combinations
-        print("\n  🔍 Finding team-season records...")
-        team_seasons = conn.execute(
-            text(
-                """
-            SELECT team_id, year
-            FROM team_season_stats
-            ORDER BY year DESC, team_id
-        """
+    Returns:
+        Dict with year, game_ids, rows (build_team_game_stats() rows of every
+        game), checksums (game_checksums() of every game), events (count) and
+        seconds
+    """
+    start = time.perf_counter()
+    engine = create_engine(database_url)
+    db = DatabaseWrapper(engine)
+    try:
+        game_ids = [
+            row["game_id"]
+            for row in db.execute_query(
+                "SELECT game_id FROM games WHERE year = :year ORDER BY game_id",
+                {"year": year},
             )
-        ).fetchall()
-
-        print(f"  ✅ Found {len(team_seasons)} team-season records\n")
-
-        if not team_seasons:
-            print("  ❌ No team_season_stats records found")
-            return
-
-        # Process by year for better progress tracking and memory management
-        years = sorted(set(ts[1] for ts in team_seasons), reverse=True)
+        ]
+        events = db.execute_query(
+            """
+            SELECT COUNT(*) as events
+            FROM game_events e
+            JOIN games g ON g.game_id = e.game_id
+            WHERE g.year = :year
+            """,
+            {"year": year},
+        )[0]["events"]
+        rows, checksums = [], {}
+        for i in range(0, len(game_ids), TEAM_GAME_CHUNK_GAMES):
+            chunk = game_ids[i : i + TEAM_GAME_CHUNK_GAMES]
+            checksums.update(game_checksums(db, chunk))
+            rows += build_team_game_stats(db, chunk)
+    finally:
+        engine.dispose()
+    return {
+        "year": year,
+        "game_ids": game_ids,
+        "rows": rows,
+        "checksums": checksums,
+        "events": events,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def recompute_seasons(database_url, years, workers):
+    """
+    recompute_season() of each year, as each finishes.
 
-        total_updated = 0
-        total_errors = 0
+    Args:
+        database_url: Database to read
+        years: Seasons
+        workers: Worker processes; 1 recomputes in this process
 
+    Yields:
+        (year, recompute_season() result or the exception it raised)
+    """
+    if workers <= 1:
         for year in years:
-            year_teams = [ts[0] for ts in team_seasons if ts[1] == year]
-            print(f"\n  📅 Processing {year} ({len(year_teams)} teams)...")
-            print("  " + "-" * 66)
-
-            # Check game_events coverage for this year (need >= 80% coverage to use events)
-            coverage_result = conn.execute(
-                text(
-                    """
-                    SELECT
-                        COUNT(DISTINCT g.game_id) as total_games,
-                        COUNT(DISTINCT ge.game_id) as games_with_events
-                    FROM games g
-                    LEFT JOIN game_events ge ON g.game_id = ge.game_id
-                    WHERE g.year = :year
-                      AND g.game_type NOT IN ('all-star', 'showcase', 'preseason')
-                """
-                ),
-                {"year": year},
-            ).fetchone()
+            try:
+                yield year, recompute_season(database_url, year)
+            except Exception as e:
+                yield year, e
+        return
 
-            total_games = coverage_result[0] or 0
-            games_with_events = coverage_result[1] or 0
-            coverage_pct = (
-                (games_with_events / total_games * 100) if total_games > 0 else 0
-            )
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(recompute_season, database_url, year): year
+            for year in years
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
 
-            # Use fallback for years with < 80% game_events coverage
-            use_fallback = coverage_pct < 80
 
-            if use_fallback:
-                if year < 2013:
-                    print(f"     ⏭️  Skipping {year} - no possession data available")
-                    continue
+def update_season(db, year, team_ids):
+    """
+    Store one season's possession stats in team_season_stats.
 
-                print(
-                    f"     📊 Using player_game_stats fallback ({coverage_pct:.0f}% game_events coverage)"
-                )
-                try:
-                    # Calculate from player_game_stats
-                    possession_stats = calculate_possession_stats_from_pgs(
-                        conn, year, year_teams
-                    )
-                    opponent_stats_map = calculate_opponent_stats_from_pgs(
-                        conn, year, year_teams
-                    )
-
-                    # No redzone data available for these years
-                    redzone_stats = {team_id: {} for team_id in year_teams}
-
-                    # Update each team's stats in the database
-                    print(f"     💾 Updating database...")
-                    for team_id in year_teams:
-                        poss = possession_stats.get(team_id, {})
-                        opp = opponent_stats_map.get(team_id, {})
-
-                        # Get team raw counts
-                        o_line_points = poss.get("o_line_points", 0)
-                        o_line_scores = poss.get("o_line_scores", 0)
-                        o_line_possessions = poss.get("o_line_possessions", 0)
-                        d_line_points = poss.get("d_line_points", 0)
-                        d_line_scores = poss.get("d_line_scores", 0)
-                        d_line_possessions = poss.get("d_line_possessions", 0)
-
-                        # Calculate team percentages
-                        hold_pct = (
-                            round((o_line_scores / o_line_points) * 100, 2)
-                            if o_line_points > 0
-                            else 0.0
-                        )
-                        o_conv = (
-                            round((o_line_scores / o_line_possessions) * 100, 2)
-                            if o_line_possessions > 0
-                            else 0.0
-                        )
-                        break_pct = (
-                            round((d_line_scores / d_line_points) * 100, 2)
-                            if d_line_points > 0
-                            else 0.0
-                        )
-                        d_conv = (
-                            round((d_line_scores / d_line_possessions) * 100, 2)
-                            if d_line_possessions > 0
-                            else 0.0
-                        )
-
-                        update_query = text(
-                            """
-                            UPDATE team_season_stats
-                            SET
-                                o_line_points = :o_line_points,
-                                o_line_scores = :o_line_scores,
-                                o_line_possessions = :o_line_possessions,
-                                d_line_points = :d_line_points,
-                                d_line_scores = :d_line_scores,
-                                d_line_possessions = :d_line_possessions,
-                                redzone_goals = 0,
-                                redzone_attempts = 0,
-                                hold_percentage = :hold_pct,
-                                o_line_conversion = :o_conv,
-                                break_percentage = :break_pct,
-                                d_line_conversion = :d_conv,
-                                red_zone_conversion = 0.0,
-                                opp_o_line_points = :opp_o_line_points,
-                                opp_o_line_scores = :opp_o_line_scores,
-                                opp_o_line_possessions = :opp_o_line_possessions,
-                                opp_d_line_points = :opp_d_line_points,
-                                opp_d_line_scores = :opp_d_line_scores,
-                                opp_d_line_possessions = :opp_d_line_possessions,
-                                opp_redzone_goals = 0,
-                                opp_redzone_attempts = 0,
-                                opp_hold_percentage = :opp_hold_pct,
-                                opp_o_line_conversion = :opp_o_conv,
-                                opp_break_percentage = :opp_break_pct,
-                                opp_d_line_conversion = :opp_d_conv,
-                                opp_red_zone_conversion = 0.0,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE team_id = :team_id AND year = :year
-                        """
-                        )
-
-                        conn.execute(
-                            update_query,
-                            {
-                                "o_line_points": o_line_points,
-                                "o_line_scores": o_line_scores,
-                                "o_line_possessions": o_line_possessions,
-                                "d_line_points": d_line_points,
-                                "d_line_scores": d_line_scores,
-                                "d_line_possessions": d_line_possessions,
-                                "hold_pct": hold_pct,
-                                "o_conv": o_conv,
-                                "break_pct": break_pct,
-                                "d_conv": d_conv,
-                                "opp_o_line_points": opp.get("opp_o_line_points", 0),
-                                "opp_o_line_scores": opp.get("opp_o_line_scores", 0),
-                                "opp_o_line_possessions": opp.get(
-                                    "opp_o_line_possessions", 0
-                                ),
-                                "opp_d_line_points": opp.get("opp_d_line_points", 0),
-                                "opp_d_line_scores": opp.get("opp_d_line_scores", 0),
-                                "opp_d_line_possessions": opp.get(
-                                    "opp_d_line_possessions", 0
-                                ),
-                                "opp_hold_pct": opp.get("opp_hold_pct", 0.0),
-                                "opp_o_conv": opp.get("opp_o_conv", 0.0),
-                                "opp_break_pct": opp.get("opp_break_pct", 0.0),
-                                "opp_d_conv": opp.get("opp_d_conv", 0.0),
-                                "team_id": team_id,
-                                "year": year,
-                            },
-                        )
-
-                    conn.commit()
-                    total_updated += len(year_teams)
-                    print(
-                        f"     ✅ Updated {len(year_teams)} teams for {year} (from player_game_stats)"
-                    )
-                    continue
-
-                except Exception as e:
-                    print(f"     ❌ Error processing {year} fallback: {str(e)}")
-                    total_errors += 1
-                    conn.rollback()
-                    continue
-
-            # Year has game_events (>= 80% coverage) - use full calculation
-            try:
-                # Calculate possession stats for all teams in this year (batch operation)
-                print(
-                    f"     🔄 Calculating possession stats from game_events ({coverage_pct:.0f}% coverage)..."
-                )
-                possession_stats = calculate_possessions_batch(
-                    db,  # Pass db wrapper for execute_query() access
-                    year_teams,
-                    season_filter="AND g.year = :season",
-                    season_param=year,
-                )
+    Args:
+        db: Database wrapper object
+        year: Season
+        team_ids: Teams with a team_season_stats row that season
 
-                # Calculate red zone stats for all teams in this year (batch operation)
-                print(f"     🔄 Calculating red zone stats...")
-                redzone_stats = calculate_redzone_stats_batch(
-                    db,
-                    year_teams,
-                    season_filter="AND g.year = :season",
-                    season_param=year,
+    Returns:
+        Number of teams updated, or 0 if the season has no possession data
+    """
+    season_rows = {row["team_id"]: row for row in fetch_season_team_stats(db, year)}
+
+    # Need EVENTS_COVERAGE_PCT game_events coverage to use event-based stats
+    games = sum(row["games"] for row in season_rows.values())
+    games_with_events = sum(row["games_with_events"] for row in season_rows.values())
+    coverage_pct = (games_with_events / games * 100) if games > 0 else 0
+    use_events = coverage_pct >= EVENTS_COVERAGE_PCT
+
+    if not use_events and year < 2013:
+        print(f"     ⏭️  Skipping {year} - no possession data available")
+        return 0
+
+    source = "game_events" if use_events else "player_game_stats fallback"
+    print(f"     📊 Using {source} ({coverage_pct:.0f}% game_events coverage)")
+
+    # Update every team's stats in one statement
+    with db.engine.begin() as conn:
+        conn.execute(
+            SEASON_UPDATE_QUERY,
+            [
+                season_update_params(
+                    team_id, year, season_rows.get(team_id, {}), use_events
                 )
+                for team_id in team_ids
+            ],
+        )
+    return len(team_ids)
 
-                # Calculate opponent stats for each team (game-by-game, not season totals)
-                print(f"     🔄 Calculating opponent stats (per-game)...")
-                opponent_stats_map = {}
 
-                # Build a mapping of game_id -> {home_team_id, away_team_id, home_stats, away_stats}
-                # by processing game events for this year
-                from domain.possession import (
-                    PossessionEventProcessor,
-                    RedzoneEventProcessor,
-                )
+def populate_possession_stats(db, seasons=None, workers=1):
+    """
+    Recompute and populate possession statistics for team-season records.
 
-                # Fetch all game events for this year with game info
-                events_query = text(
-                    """
-                    SELECT
-                        g.game_id,
-                        g.home_team_id,
-                        g.away_team_id,
-                        ge.event_index,
-                        ge.event_type,
-                        ge.team,
-                        ge.receiver_y,
-                        ge.thrower_y
-                    FROM games g
-                    JOIN game_events ge ON g.game_id = ge.game_id
-                    WHERE g.year = :year
-                        AND g.game_type NOT IN ('all-star', 'showcase')
-                    ORDER BY g.game_id, ge.event_index,
-                        CASE
-                            WHEN ge.event_type IN (19, 15) THEN 0
-                            WHEN ge.event_type = 1 THEN 1
-                            ELSE 2
-                        END
-                """
-                )
-                all_events = conn.execute(events_query, {"year": year}).fetchall()
-
-                # Group events by game and team type
-                game_events = {}
-                for event in all_events:
-                    game_id = event[0]
-                    home_team = event[1]
-                    away_team = event[2]
-                    team_type = event[5]  # 'home' or 'away'
-
-                    if game_id not in game_events:
-                        game_events[game_id] = {
-                            "home_team_id": home_team,
-                            "away_team_id": away_team,
-                            "home_events": [],
-                            "away_events": [],
-                        }
-
-                    event_dict = {
-                        "event_index": event[3],
-                        "event_type": event[4],
-                        "team": team_type,
-                        "receiver_y": event[6],
-                        "thrower_y": event[7],
-                    }
-
-                    if team_type == "home":
-                        game_events[game_id]["home_events"].append(event_dict)
-                    else:
-                        game_events[game_id]["away_events"].append(event_dict)
-
-                # Calculate per-game stats for each team (home and away)
-                game_team_stats = {}  # {(game_id, team_id): {poss_stats, rz_stats}}
-                for game_id, game_data in game_events.items():
-                    home_team = game_data["home_team_id"]
-                    away_team = game_data["away_team_id"]
-
-                    # Process home team stats
-                    if game_data["home_events"]:
-                        poss_processor = PossessionEventProcessor("home")
-                        poss_stats = poss_processor.process_events(
-                            game_data["home_events"]
-                        )
-                        rz_processor = RedzoneEventProcessor("home")
-                        rz_stats = rz_processor.process_events(game_data["home_events"])
-                        game_team_stats[(game_id, home_team)] = {
-                            "poss": poss_stats.to_dict(),
-                            "rz": rz_stats.to_dict(),
-                        }
-
-                    # Process away team stats
-                    if game_data["away_events"]:
-                        poss_processor = PossessionEventProcessor("away")
-                        poss_stats = poss_processor.process_events(
-                            game_data["away_events"]
-                        )
-                        rz_processor = RedzoneEventProcessor("away")
-                        rz_stats = rz_processor.process_events(game_data["away_events"])
-                        game_team_stats[(game_id, away_team)] = {
-                            "poss": poss_stats.to_dict(),
-                            "rz": rz_stats.to_dict(),
-                        }
-
-                # Now calculate opponent stats for each team by summing opponent's per-game stats
-                for team_id in year_teams:
-                    opp_o_line_points = 0
-                    opp_o_line_scores = 0
-                    opp_o_line_possessions = 0
-                    opp_d_line_points = 0
-                    opp_d_line_scores = 0
-                    opp_d_line_possessions = 0
-                    opp_rz_scores = 0
-                    opp_rz_attempts = 0
-
-                    # Find all games this team played and get opponent's stats from THAT GAME
-                    for game_id, game_data in game_events.items():
-                        opponent_id = None
-                        if game_data["home_team_id"] == team_id:
-                            opponent_id = game_data["away_team_id"]
-                        elif game_data["away_team_id"] == team_id:
-                            opponent_id = game_data["home_team_id"]
-
-                        if opponent_id:
-                            # Get opponent's stats from THIS SPECIFIC GAME
-                            opp_game_stats = game_team_stats.get(
-                                (game_id, opponent_id), {}
-                            )
-                            opp_poss = opp_game_stats.get("poss", {})
-                            opp_rz = opp_game_stats.get("rz", {})
-
-                            opp_o_line_points += opp_poss.get("o_line_points", 0)
-                            opp_o_line_scores += opp_poss.get("o_line_scores", 0)
-                            opp_o_line_possessions += opp_poss.get(
-                                "o_line_possessions", 0
-                            )
-                            opp_d_line_points += opp_poss.get("d_line_points", 0)
-                            opp_d_line_scores += opp_poss.get("d_line_scores", 0)
-                            opp_d_line_possessions += opp_poss.get(
-                                "d_line_possessions", 0
-                            )
-                            opp_rz_scores += opp_rz.get("redzone_goals", 0)
-                            opp_rz_attempts += opp_rz.get("redzone_attempts", 0)
-
-                    # Calculate opponent percentages
-                    opp_hold_pct = (
-                        round((opp_o_line_scores / opp_o_line_points) * 100, 2)
-                        if opp_o_line_points > 0
-                        else 0.0
-                    )
-                    opp_o_conv = (
-                        round((opp_o_line_scores / opp_o_line_possessions) * 100, 2)
-                        if opp_o_line_possessions > 0
-                        else 0.0
-                    )
-                    opp_break_pct = (
-                        round((opp_d_line_scores / opp_d_line_points) * 100, 2)
-                        if opp_d_line_points > 0
-                        else 0.0
-                    )
-                    opp_d_conv = (
-                        round((opp_d_line_scores / opp_d_line_possessions) * 100, 2)
-                        if opp_d_line_possessions > 0
-                        else 0.0
-                    )
-                    opp_rz_conv = (
-                        round((opp_rz_scores / opp_rz_attempts) * 100, 2)
-                        if opp_rz_attempts > 0
-                        else 0.0
-                    )
-
-                    opponent_stats_map[team_id] = {
-                        "opp_o_line_points": opp_o_line_points,
-                        "opp_o_line_scores": opp_o_line_scores,
-                        "opp_o_line_possessions": opp_o_line_possessions,
-                        "opp_d_line_points": opp_d_line_points,
-                        "opp_d_line_scores": opp_d_line_scores,
-                        "opp_d_line_possessions": opp_d_line_possessions,
-                        "opp_rz_scores": opp_rz_scores,
-                        "opp_rz_attempts": opp_rz_attempts,
-                        "opp_hold_pct": opp_hold_pct,
-                        "opp_o_conv": opp_o_conv,
-                        "opp_break_pct": opp_break_pct,
-                        "opp_d_conv": opp_d_conv,
-                        "opp_rz_conv": opp_rz_conv,
-                    }
-
-                # Update each team's stats in the database
-                print(f"     💾 Updating database...")
-                for team_id in year_teams:
-                    poss = possession_stats.get(team_id, {})
-                    rz = redzone_stats.get(team_id, {})
-                    opp = opponent_stats_map.get(team_id, {})
-
-                    # Get team raw counts
-                    o_line_points = poss.get("o_line_points", 0)
-                    o_line_scores = poss.get("o_line_scores", 0)
-                    o_line_possessions = poss.get("o_line_possessions", 0)
-                    d_line_points = poss.get("d_line_points", 0)
-                    d_line_scores = poss.get("d_line_scores", 0)
-                    d_line_possessions = poss.get("d_line_possessions", 0)
-                    rz_scores = rz.get("redzone_goals", 0)
-                    rz_attempts = rz.get("redzone_attempts", 0)
-
-                    # Calculate team percentages
-                    hold_pct = (
-                        round((o_line_scores / o_line_points) * 100, 2)
-                        if o_line_points > 0
-                        else 0.0
-                    )
-                    o_conv = (
-                        round((o_line_scores / o_line_possessions) * 100, 2)
-                        if o_line_possessions > 0
-                        else 0.0
-                    )
-                    break_pct = (
-                        round((d_line_scores / d_line_points) * 100, 2)
-                        if d_line_points > 0
-                        else 0.0
-                    )
-                    d_conv = (
-                        round((d_line_scores / d_line_possessions) * 100, 2)
-                        if d_line_possessions > 0
-                        else 0.0
-                    )
-                    rz_conv = (
-                        round((rz_scores / rz_attempts) * 100, 2)
-                        if rz_attempts > 0
-                        else 0.0
-                    )
-
-                    update_query = text(
-                        """
-                        UPDATE team_season_stats
-                        SET
-                            o_line_points = :o_line_points,
-                            o_line_scores = :o_line_scores,
-                            o_line_possessions = :o_line_possessions,
-                            d_line_points = :d_line_points,
-                            d_line_scores = :d_line_scores,
-                            d_line_possessions = :d_line_possessions,
-                            redzone_goals = :rz_goals,
-                            redzone_attempts = :rz_attempts,
-                            hold_percentage = :hold_pct,
-                            o_line_conversion = :o_conv,
-                            break_percentage = :break_pct,
-                            d_line_conversion = :d_conv,
-                            red_zone_conversion = :rz_conv,
-                            opp_o_line_points = :opp_o_line_points,
-                            opp_o_line_scores = :opp_o_line_scores,
-                            opp_o_line_possessions = :opp_o_line_possessions,
-                            opp_d_line_points = :opp_d_line_points,
-                            opp_d_line_scores = :opp_d_line_scores,
-                            opp_d_line_possessions = :opp_d_line_possessions,
-                            opp_redzone_goals = :opp_rz_goals,
-                            opp_redzone_attempts = :opp_rz_attempts,
-                            opp_hold_percentage = :opp_hold_pct,
-                            opp_o_line_conversion = :opp_o_conv,
-                            opp_break_percentage = :opp_break_pct,
-                            opp_d_line_conversion = :opp_d_conv,
-                            opp_red_zone_conversion = :opp_rz_conv,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE team_id = :team_id AND year = :year
-                    """
-                    )
-
-                    conn.execute(
-                        update_query,
-                        {
-                            "o_line_points": o_line_points,
-                            "o_line_scores": o_line_scores,
-                            "o_line_possessions": o_line_possessions,
-                            "d_line_points": d_line_points,
-                            "d_line_scores": d_line_scores,
-                            "d_line_possessions": d_line_possessions,
-                            "rz_goals": rz_scores,
-                            "rz_attempts": rz_attempts,
-                            "hold_pct": hold_pct,
-                            "o_conv": o_conv,
-                            "break_pct": break_pct,
-                            "d_conv": d_conv,
-                            "rz_conv": rz_conv,
-                            "opp_o_line_points": opp.get("opp_o_line_points", 0),
-                            "opp_o_line_scores": opp.get("opp_o_line_scores", 0),
-                            "opp_o_line_possessions": opp.get(
-                                "opp_o_line_possessions", 0
-                            ),
-                            "opp_d_line_points": opp.get("opp_d_line_points", 0),
-                            "opp_d_line_scores": opp.get("opp_d_line_scores", 0),
-                            "opp_d_line_possessions": opp.get(
-                                "opp_d_line_possessions", 0
-                            ),
-                            "opp_rz_goals": opp.get("opp_rz_scores", 0),
-                            "opp_rz_attempts": opp.get("opp_rz_attempts", 0),
-                            "opp_hold_pct": opp.get("opp_hold_pct", 0.0),
-                            "opp_o_conv": opp.get("opp_o_conv", 0.0),
-                            "opp_break_pct": opp.get("opp_break_pct", 0.0),
-                            "opp_d_conv": opp.get("opp_d_conv", 0.0),
-                            "opp_rz_conv": opp.get("opp_rz_conv", 0.0),
-                            "team_id": team_id,
-                            "year": year,
-                        },
-                    )
-
-                conn.commit()
-                total_updated += len(year_teams)
-                print(f"     ✅ Updated {len(year_teams)} teams for {year}")
+    Each season's team_game_stats rows are rebuilt from game_events in a
+    worker process, then written in one transaction. The season's rows are
+    then summed (one GROUP BY) and stored in team_season_stats.
 
-            except Exception as e:
-                print(f"     ❌ Error processing {year}: {str(e)}")
-                total_errors += 1
-                conn.rollback()
-                continue
+    Args:
+        db: Database wrapper object with execute_query() and engine attributes
+        seasons: Years to recompute, or None for every year with
+            team_season_stats records
+        workers: Worker processes recomputing seasons in parallel
+    """
+    print("🏈 Populating Possession-Based Statistics")
+    print("=" * 70)
 
-        print("\n" + "=" * 70)
-        print(f"✅ Possession Stats Population Complete!")
-        print(f"   Updated: {total_updated} team-season records")
-        if total_errors > 0:
-            print(f"   Errors: {total_errors} years failed")
-        print("=" * 70)
+    # Get all unique team-season combinations
+    print("\n  🔍 Finding team-season records...")
+    team_seasons = db.execute_query("""
+        SELECT team_id, year
+        FROM team_season_stats
+        ORDER BY year DESC, team_id
+        """)
+    if seasons:
+        team_seasons = [ts for ts in team_seasons if ts["year"] in seasons]
+    print(f"  ✅ Found {len(team_seasons)} team-season records\n")
+
+    if not team_seasons:
+        print("  ❌ No team_season_stats records found")
+        return
+
+    years = sorted({ts["year"] for ts in team_seasons}, reverse=True)
+    print(f"  ⚙️  Recomputing {len(years)} seasons with {workers} workers")
+
+    total_updated = 0
+    total_errors = 0
+    total_events = 0
+    start = time.perf_counter()
+    database_url = db.engine.url.render_as_string(hide_password=False)
+
+    results = recompute_seasons(database_url, years, workers)
+    for done, (year, result) in enumerate(results, 1):
+        year_teams = [ts["team_id"] for ts in team_seasons if ts["year"] == year]
+        print(f"\n  📅 [{done}/{len(years)}] {year} ({len(year_teams)} teams)")
+        print("  " + "-" * 66)
+
+        try:
+            if isinstance(result, Exception):
+                raise result
+
+            seconds = result["seconds"]
+            print(
+                f"     🔄 Built {len(result['rows']):,} team game rows from "
+                f"{result['events']:,} events in {seconds:.1f}s "
+                f"({result['events'] / seconds if seconds else 0:,.0f} events/s)"
+            )
+            store_team_game_stats(
+                db, result["game_ids"], result["rows"], result["checksums"]
+            )
+            total_events += result["events"]
+
+            updated = update_season(db, year, year_teams)
+            total_updated += updated
+            if updated:
+                print(f"     ✅ Updated {updated} teams for {year}")
+
+        except Exception as e:
+            print(f"     ❌ Error processing {year}: {str(e)}")
+            total_errors += 1
+            continue
+
+    elapsed = time.perf_counter() - start
+    print("\n" + "=" * 70)
+    print(f"✅ Possession Stats Population Complete!")
+    print(f"   Updated: {total_updated} team-season records")
+    print(
+        f"   Recomputed {total_events:,} events in {elapsed:.1f}s "
+        f"({total_events / elapsed if elapsed else 0:,.0f} events/s)"
+    )
+    if total_errors > 0:
+        print(f"   Errors: {total_errors} years failed")
+    print("=" * 70)
 
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--seasons", type=int, nargs="+", help="years to recompute (default: all)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="worker processes recomputing seasons in parallel",
+    )
+    args = parser.parse_args()
+
     print("\n🚀 Starting Possession Stats Population")
     print("This will pre-compute possession stats for instant API performance\n")
 
@@ -775,7 +379,7 @@ def main():
     db_wrapper = DatabaseWrapper(engine)
 
     # Override engine with wrapper for batch functions
-    populate_possession_stats(db_wrapper)
+    populate_possession_stats(db_wrapper, args.seasons, args.workers)
 
     print("\n📝 Next steps:")
     print("  - Team stats API will now load instantly (10-50ms)")
@@ -16,6 +16,12 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "../..", "backend"))
 
 from backend.data.database import get_db
 from backend.data.processor import StatsProcessor
+from backend.services.box_score_store import refresh_box_scores
+from backend.services.play_by_play_store import refresh_play_by_play
+from backend.services.team_game_stats import (
+    refresh_changed_team_game_stats,
+    refresh_team_game_stats,
+)
 
 from scripts.ufa.api_client import UFAAPIClient
 from scripts.ufa.importers import (
@@ -27,7 +33,6 @@ from scripts.ufa.importers import (
 )
 from scripts.ufa.parallel_processor import ParallelProcessor
 
-
 logger = logging.getLogger(__name__)
 
 
@@ -110,6 +115,13 @@ class UFADataManager:
                     players_data, years
                 )
 
+            self._refresh_player_rollups()
+            self.refresh_pass_heatmaps(years)
+            self.refresh_play_by_play(years)
+            self.refresh_team_game_stats(years)
+            self.refresh_box_scores(years)
+            self._clear_cached_results()
+
             logger.info(f"Import complete. Total: {counts}")
             return counts
 
@@ -193,6 +205,13 @@ class UFADataManager:
                     players_data, years
                 )
 
+            self._refresh_player_rollups()
+            self.refresh_pass_heatmaps(years)
+            self.refresh_play_by_play(years)
+            self.refresh_team_game_stats(years)
+            self.refresh_box_scores(years)
+            self._clear_cached_results()
+
             logger.info(f"Parallel import complete. Total: {counts}")
             return counts
 
@@ -252,6 +271,9 @@ class UFADataManager:
                     f"Season stats already imported ({existing_season} records)"
                 )
 
+            self._refresh_player_rollups()
+            self._clear_cached_results()
+
             logger.info(f"Missing imports complete. Imported: {counts}")
             return counts
 
@@ -259,11 +281,124 @@ class UFADataManager:
             logger.error(f"Error completing missing imports: {e}")
             raise
 
+    def refresh_pass_heatmaps(self, years: list[int] | None = None) -> int:
+        """
+        Rebuild the precomputed pass heatmap cells from game events.
+
+        Args:
+            years: Seasons to rebuild. If None, rebuilds every season with games
+
+        Returns:
+            Number of cell rows written
+        """
+        if years is None:
+            rows = self.db.execute_query("SELECT DISTINCT year FROM games")
+            years = [row["year"] for row in rows]
+
+        logger.info(f"Refreshing pass heatmap cells for years: {years}")
+        try:
+            return self.events_importer.refresh_pass_heatmap_cells(years)
+        except Exception as e:
+            logger.warning(f"  Failed to refresh pass heatmap cells: {e}")
+            return 0
+
+    def refresh_play_by_play(self, years: list[int] | None = None) -> int:
+        """
+        Build the stored play-by-play of Final games missing one, or whose
+        events changed since it was built.
+
+        Args:
+            years: Seasons to refresh. If None, refreshes every season
+
+        Returns:
+            Number of games whose play-by-play was written
+        """
+        query = "SELECT game_id FROM games WHERE status = 'Final'"
+        params = {}
+        if years:
+            query += " AND year IN :years"
+            params["years"] = tuple(years)
+        game_ids = [row["game_id"] for row in self.db.execute_query(query, params)]
+
+        logger.info(f"Refreshing play-by-play for {len(game_ids)} Final games")
+        try:
+            # The play-by-play service only needs the stats system's db
+            return refresh_play_by_play(self, game_ids)
+        except Exception as e:
+            logger.warning(f"  Failed to refresh play-by-play: {e}")
+            return 0
+
+    def refresh_team_game_stats(
+        self, years: list[int] | None = None, changed_only: bool = True
+    ) -> int:
+        """
+        Rebuild the team_game_stats rows of every game.
+
+        Args:
+            years: Seasons to refresh. If None, refreshes every season
+            changed_only: Only rebuild games that are new or whose events or
+                player stats changed since they were built, recomputing their
+                teams' season possession stats. False rebuilds every game, as
+                needed after the possession processors change.
+
+        Returns:
+            Number of rows written
+        """
+        query = "SELECT game_id FROM games"
+        params = {}
+        if years:
+            query += " WHERE year IN :years"
+            params["years"] = tuple(years)
+        game_ids = [row["game_id"] for row in self.db.execute_query(query, params)]
+
+        logger.info(f"Refreshing team game stats for {len(game_ids)} games")
+        try:
+            if changed_only:
+                return refresh_changed_team_game_stats(self.db, game_ids)
+            return refresh_team_game_stats(self.db, game_ids)
+        except Exception as e:
+            logger.warning(f"  Failed to refresh team game stats: {e}")
+            return 0
+
+    def refresh_box_scores(self, years: list[int] | None = None) -> int:
+        """
+        Build the stored box score of Final games missing one, or whose
+        events or player stats changed since it was built.
+
+        Args:
+            years: Seasons to refresh. If None, refreshes every season
+
+        Returns:
+            Number of games whose box score was written
+        """
+        query = "SELECT game_id FROM games WHERE status = 'Final'"
+        params = {}
+        if years:
+            query += " AND year IN :years"
+            params["years"] = tuple(years)
+        game_ids = [row["game_id"] for row in self.db.execute_query(query, params)]
+
+        logger.info(f"Refreshing box scores for {len(game_ids)} Final games")
+        try:
+            # The box score services only need the stats system's db
+            return refresh_box_scores(self, game_ids)
+        except Exception as e:
+            logger.warning(f"  Failed to refresh box scores: {e}")
+            return 0
+
     # ===== PRIVATE HELPER METHODS =====
 
     def _clear_database(self):
         """Clear all UFA data from the database."""
+        # Derived tables first; the import rebuilds them from the new rows
         tables = [
+            "game_box_scores",
+            "game_play_by_play",
+            "pass_heatmap_cells",
+            "pass_event_participants",
+            "pass_events",
+            "team_game_stats_watermark",
+            "team_game_stats",
             "player_game_stats",
             "player_season_stats",
             "team_season_stats",
@@ -278,6 +413,20 @@ class UFADataManager:
             except Exception as e:
                 logger.warning(f"  Failed to clear {table}: {e}")
 
+    def _clear_cached_results(self):
+        """Drop API results cached in this process, now stale after an import."""
+        # The API's module names, so an in-process app sees the same instances
+        from api.pass_event_facets import clear_pass_event_facets
+        from api.player_stats.percentile_engine import get_percentile_engine
+        from api.player_stats.season_rollup import clear_season_rollup_store
+        from data.cache import get_cache
+
+        get_cache().clear()
+        get_percentile_engine().clear()
+        clear_season_rollup_store()
+        clear_pass_event_facets()
+        logger.info("  Cleared cached results")
+
     def _import_player_game_stats_sequential(
         self, games_data: list[dict[str, Any]]
     ) -> int:
@@ -362,6 +511,26 @@ class UFADataManager:
         season_stats_data = self.api_client.get_player_stats(player_ids, years)
 
         # Import using stats importer
-        return self.stats_importer.import_player_season_stats(
+        count = self.stats_importer.import_player_season_stats(
             season_stats_data, players_data
         )
+        self.stats_importer.update_season_games_played(years)
+        return count
+
+    def _refresh_player_rollups(self):
+        """Refresh the career materialized views built on player_season_stats."""
+        for view in ["player_career_stats", "player_team_career_stats"]:
+            try:
+                # CONCURRENTLY keeps the view readable during the refresh, but
+                # needs a unique index and an already populated view
+                self.db.execute_query(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+                logger.info(f"  Refreshed {view}")
+            except Exception as e:
+                logger.warning(
+                    f"  Concurrent refresh of {view} failed ({e}), refreshing with a lock"
+                )
+                try:
+                    self.db.execute_query(f"REFRESH MATERIALIZED VIEW {view}")
+                    logger.info(f"  Refreshed {view}")
+                except Exception as e:
+                    logger.warning(f"  Failed to refresh {view}: {e}")
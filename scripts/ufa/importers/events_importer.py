@@ -5,13 +5,97 @@ Events importer for UFA game event data.
 
 import json
 
-from backend.utils.pass_type import classify_pass
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+from backend.utils.pass_heatmap import (
+    DEFAULT_BINS_X,
+    DEFAULT_BINS_Y,
+    HEATMAP_POINTS,
+    cell_index,
+)
+from backend.utils.pass_type import PASS_TYPES, classify_pass
 
 from .base_importer import BaseImporter
 
 # Event types that represent throws (PASS=18, GOAL=19)
 THROW_EVENT_TYPES = {18, 19}
 
+# A game's throw events with teams, names, codes and geometry resolved. Events
+# never change once imported, but re-importing a game refreshes its teams and
+# player names, as a full re-import replaces the games and players rows.
+PASS_EVENTS_INSERT = f"""
+    INSERT INTO pass_events
+    SELECT
+        ge.id,
+        ge.game_id,
+        g.year,
+        CASE WHEN ge.team = 'home' THEN g.home_team_id ELSE g.away_team_id END,
+        CASE WHEN ge.team = 'home' THEN g.away_team_id ELSE g.home_team_id END,
+        ge.event_type,
+        CASE ge.event_type WHEN 18 THEN 0 WHEN 19 THEN 1 ELSE 2 END,
+        CASE ge.pass_type
+            {" ".join(f"WHEN '{t}' THEN {code}" for code, t in enumerate(PASS_TYPES))}
+        END,
+        ge.thrower_id,
+        ge.receiver_id,
+        (SELECT p.full_name FROM players p
+         WHERE p.player_id = ge.thrower_id AND p.year = g.year LIMIT 1),
+        (SELECT p.full_name FROM players p
+         WHERE p.player_id = ge.receiver_id AND p.year = g.year LIMIT 1),
+        ge.thrower_x,
+        ge.thrower_y,
+        ge.receiver_x,
+        ge.receiver_y,
+        ge.turnover_x,
+        ge.turnover_y,
+        COALESCE(ge.receiver_x, ge.turnover_x),
+        COALESCE(ge.receiver_y, ge.turnover_y),
+        ge.vertical_yards,
+        ge.horizontal_yards,
+        ge.distance
+    FROM game_events ge
+    JOIN games g ON ge.game_id = g.game_id
+    WHERE ge.game_id = :game_id
+      AND ge.event_type IN (18, 19, 20, 22)
+    ON CONFLICT (id) DO UPDATE SET
+        year = excluded.year,
+        off_team_id = excluded.off_team_id,
+        def_team_id = excluded.def_team_id,
+        thrower_name = excluded.thrower_name,
+        receiver_name = excluded.receiver_name
+"""
+
+# Throwers and receivers of a game's pass events, by offensive team. The
+# game's rows are deleted first, so they follow refreshed pass_events teams.
+PASS_EVENT_PARTICIPANTS_DELETE = """
+    DELETE FROM pass_event_participants WHERE game_id = :game_id
+"""
+PASS_EVENT_PARTICIPANTS_INSERT = """
+    INSERT INTO pass_event_participants (year, game_id, team_id, player_id)
+    SELECT year, game_id, off_team_id, thrower_id
+    FROM pass_events
+    WHERE game_id = :game_id AND thrower_id IS NOT NULL
+    UNION
+    SELECT year, game_id, off_team_id, receiver_id
+    FROM pass_events
+    WHERE game_id = :game_id AND receiver_id IS NOT NULL
+    ON CONFLICT DO NOTHING
+"""
+
+HEATMAP_CELL_COLUMNS = [
+    "year",
+    "team_id",
+    "thrower_id",
+    "pass_type",
+    "point",
+    "cell",
+    "attempts",
+    "completions",
+    "total_gain",
+    "gain_count",
+]
+
 
 class EventsImporter(BaseImporter):
     """Handles importing game event data from UFA API"""
@@ -48,6 +132,9 @@ class EventsImporter(BaseImporter):
 
         if count > 0:
             self.logger.info(f"  Imported {count} game events for {game_id}")
+            self.db.execute_query(PASS_EVENTS_INSERT, {"game_id": game_id})
+            self.db.execute_query(PASS_EVENT_PARTICIPANTS_DELETE, {"game_id": game_id})
+            self.db.execute_query(PASS_EVENT_PARTICIPANTS_INSERT, {"game_id": game_id})
 
         return count
 
@@ -129,3 +216,99 @@ class EventsImporter(BaseImporter):
                 pass  # Silently skip individual event errors
 
         return count
+
+    def refresh_pass_heatmap_cells(self, years: list[int]) -> int:
+        """
+        Rebuild pass_heatmap_cells for the given seasons
+
+        Bins every pass origin and destination into the default heatmap grid and
+        stores per-cell totals for each (season, offensive team, thrower, pass type).
+
+        Args:
+            years: Seasons to rebuild
+
+        Returns:
+            Number of cell rows written
+        """
+        query = text("""
+            SELECT
+                year,
+                off_team_id as team_id,
+                thrower_id,
+                pass_type,
+                result,
+                thrower_x,
+                thrower_y,
+                dest_x,
+                dest_y,
+                vertical_yards
+            FROM pass_events
+            WHERE thrower_x IS NOT NULL
+              AND thrower_y IS NOT NULL
+              AND year IN :years
+            """).bindparams(bindparam("years", expanding=True))
+
+        with self.db.engine.connect() as conn:
+            passes = pd.DataFrame(
+                conn.execute(query, {"years": list(years)}).mappings().all()
+            )
+
+        cells = []
+        if not passes.empty:
+            passes["completed"] = passes["result"] < 2
+            passes["pass_type"] = passes["pass_type"].map(dict(enumerate(PASS_TYPES)))
+            passes["gain"] = passes["vertical_yards"].astype(float)
+            for point in HEATMAP_POINTS:
+                prefix = "thrower" if point == "origin" else "dest"
+                binned = passes.assign(
+                    point=point,
+                    cell=cell_index(
+                        passes[f"{prefix}_x"].to_numpy(dtype=float),
+                        passes[f"{prefix}_y"].to_numpy(dtype=float),
+                        DEFAULT_BINS_X,
+                        DEFAULT_BINS_Y,
+                    ),
+                )
+                totals = (
+                    binned[binned["cell"] >= 0]
+                    .groupby(
+                        ["year", "team_id", "thrower_id", "pass_type", "point", "cell"],
+                        dropna=False,
+                    )
+                    .agg(
+                        attempts=("cell", "size"),
+                        completions=("completed", "sum"),
+                        total_gain=("gain", "sum"),
+                        gain_count=("gain", "count"),
+                    )
+                    .reset_index()
+                )
+                cells.append(totals)
+
+        rows = []
+        if cells:
+            frame = pd.concat(cells, ignore_index=True)[HEATMAP_CELL_COLUMNS]
+            # Plain Python values, with NULL thrower and pass type kept as None
+            rows = frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+        columns = ", ".join(HEATMAP_CELL_COLUMNS)
+        placeholders = ", ".join(f":{column}" for column in HEATMAP_CELL_COLUMNS)
+        with self.db.engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM pass_heatmap_cells WHERE year IN :years").bindparams(
+                    bindparam("years", expanding=True)
+                ),
+                {"years": list(years)},
+            )
+            if rows:
+                conn.execute(
+                    text(
+                        f"INSERT INTO pass_heatmap_cells ({columns}) VALUES ({placeholders})"
+                    ),
+                    rows,
+                )
+
+        self.logger.info(
+            f"  Refreshed {len(rows)} pass heatmap cells for {len(years)} seasons"
+        )
+        return len(rows)
@@ -198,3 +198,39 @@ class StatsImporter(BaseImporter):
 
         self.logger.info(f"  Imported {count} player season stats")
         return count
+
+    def update_season_games_played(self, years: list[int] | None = None) -> None:
+        """
+        Store games_played on player_season_stats from player_game_stats.
+
+        A game counts when the player recorded any points, time, goals or
+        assists in it, matching the rule the stats endpoints used to apply
+        with a COUNT(DISTINCT game_id) on every request.
+
+        Args:
+            years: Seasons to update. If None, updates every season.
+        """
+        year_filter = " AND pgs.year = ANY(:years)" if years else ""
+        self.db.execute_query(
+            f"""
+            UPDATE player_season_stats pss
+            SET games_played = gc.games_played
+            FROM (
+                SELECT
+                    pgs.player_id,
+                    pgs.team_id,
+                    pgs.year,
+                    COUNT(DISTINCT pgs.game_id) as games_played
+                FROM player_game_stats pgs
+                WHERE (pgs.o_points_played > 0 OR pgs.d_points_played > 0
+                       OR pgs.seconds_played > 0 OR pgs.goals > 0 OR pgs.assists > 0)
+                      {year_filter}
+                GROUP BY pgs.player_id, pgs.team_id, pgs.year
+            ) gc
+            WHERE pss.player_id = gc.player_id
+              AND pss.team_id = gc.team_id
+              AND pss.year = gc.year
+            """,
+            {"years": list(years)} if years else None,
+        )
+        self.logger.info("  Updated games_played on player season stats")
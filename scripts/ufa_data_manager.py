@@ -29,6 +29,10 @@ def main():
             "  python ufa_data_manager.py import-api-parallel [--workers N] [years...]"
         )
         print("  python ufa_data_manager.py complete-missing [years...]")
+        print("  python ufa_data_manager.py refresh-heatmaps [years...]")
+        print("  python ufa_data_manager.py refresh-play-by-play [years...]")
+        print("  python ufa_data_manager.py refresh-team-game-stats [years...]")
+        print("  python ufa_data_manager.py refresh-box-scores [years...]")
         print("")
         print("Examples:")
         print(
@@ -49,6 +53,18 @@ def main():
         print(
             "  python ufa_data_manager.py complete-missing    # Complete missing games and season stats"
         )
+        print(
+            "  python ufa_data_manager.py refresh-heatmaps    # Rebuild pass heatmap cells from events"
+        )
+        print(
+            "  python ufa_data_manager.py refresh-play-by-play  # Store play-by-play of Final games"
+        )
+        print(
+            "  python ufa_data_manager.py refresh-team-game-stats  # Rebuild per-game team stats"
+        )
+        print(
+            "  python ufa_data_manager.py refresh-box-scores  # Store box scores of Final games"
+        )
         sys.exit(1)
 
     manager = UFADataManager()
@@ -58,7 +74,15 @@ def main():
     years = None
     workers = None
 
-    if command in ["import-api", "import-api-parallel", "complete-missing"]:
+    if command in [
+        "import-api",
+        "import-api-parallel",
+        "complete-missing",
+        "refresh-heatmaps",
+        "refresh-play-by-play",
+        "refresh-team-game-stats",
+        "refresh-box-scores",
+    ]:
         args = sys.argv[2:]
 
         # Handle --workers option for parallel command
@@ -96,10 +120,26 @@ def main():
             result = manager.complete_missing_imports(years)
             print(f"Successfully completed missing imports: {result}")
 
+        elif command == "refresh-heatmaps":
+            result = manager.refresh_pass_heatmaps(years)
+            print(f"Successfully refreshed {result} pass heatmap cells")
+
+        elif command == "refresh-play-by-play":
+            result = manager.refresh_play_by_play(years)
+            print(f"Successfully stored play-by-play for {result} games")
+
+        elif command == "refresh-team-game-stats":
+            result = manager.refresh_team_game_stats(years, changed_only=False)
+            print(f"Successfully stored {result} team game stats rows")
+
+        elif command == "refresh-box-scores":
+            result = manager.refresh_box_scores(years)
+            print(f"Successfully stored box scores for {result} games")
+
         else:
             print(f"Unknown command: {command}")
             print(
-                "Supported commands: 'import-api', 'import-api-parallel', 'complete-missing'"
+                "Supported commands: 'import-api', 'import-api-parallel', 'complete-missing', 'refresh-heatmaps', 'refresh-play-by-play', 'refresh-team-game-stats', 'refresh-box-scores'"
             )
             sys.exit(1)
 